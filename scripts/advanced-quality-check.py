@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+WebSys Phase2 高度品質チェック
+作成日: 2026-10-19
+目的: クロスリファレンス・用語統一・コンテンツ品質・アクセシビリティをコーパスの1回の走査で検査する
+"""
+
+import argparse
+import sys
+import time
+
+from docs_quality.advanced import ANALYSIS_LEVELS, AdvancedQualityEngine, write_report
+from docs_quality.corpus import Corpus
+
+
+def print_report(report, elapsed: float) -> None:
+    checks = report['checks']
+    summary = report['summary']
+    cross_reference = checks['cross_reference']
+    print(f"🔗 クロスリファレンス: 壊れたリンク{len(cross_reference['broken_links'])}件 / "
+          f"修正候補{len(cross_reference['suggestions'])}件 / 自動修正{cross_reference['auto_fixes']}件")
+    terminology = checks['terminology']
+    print(f"📝 用語統一: {len(terminology['inconsistencies'])}ファイル ({terminology['occurrences']}箇所) / "
+          f"自動修正{terminology['auto_fixes']}件")
+    print(f"📊 コンテンツ品質: {checks['content_quality']['average_score']}/100")
+    print(f"♿ アクセシビリティ: {checks['accessibility']['total_issues']}件")
+    print("━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━")
+    print(f"対象ファイル数: {summary['total_files']} ({elapsed:.2f}秒)")
+    print(f"検出問題数: {summary['total_issues']}")
+    print(f"自動修正数: {summary['auto_fixed']}")
+    print(f"全体品質スコア: {summary['quality_score']}/100")
+    if summary['auto_fixed']:
+        print(f"改善率: {summary['improvement_rate']}%")
+    print("━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='WebSys Phase2 Advanced Quality Check')
+    parser.add_argument('--docs-dir', default='docs', help='ドキュメントディレクトリ')
+    parser.add_argument('--exclude', action='append', default=[], metavar='PATTERN',
+                        help='対象外とするパス（.gitignore 形式、複数指定可。例: legacy/）')
+    parser.add_argument('--output-dir', default='docs/quality-reports', help='出力ディレクトリ')
+    parser.add_argument('--auto-fix', action='store_true', help='リンク切れ（修正候補あり）・用語の表記揺れを自動修正')
+    parser.add_argument('--analysis-level', choices=ANALYSIS_LEVELS, default='comprehensive', help='分析レベル')
+    parser.add_argument('--no-fail', action='store_true', help='未修正の問題があっても終了コード0')
+
+    args = parser.parse_args()
+
+    print("🔮 WebSys Phase2 高度品質チェックシステム")
+    print(f"自動修正モード: {'true' if args.auto_fix else 'false'}")
+    print(f"分析レベル: {args.analysis_level}")
+    print()
+
+    started = time.perf_counter()
+    engine = AdvancedQualityEngine(Corpus(args.docs_dir, exclude=args.exclude), auto_fix=args.auto_fix, analysis_level=args.analysis_level)
+    report = engine.run()
+    elapsed = time.perf_counter() - started
+    report_file = write_report(report, args.output_dir)
+
+    print_report(report, elapsed)
+    print(f"詳細レポート: {report_file}")
+
+    summary = report['summary']
+    if summary['total_issues'] == 0:
+        print("🎉 すべての品質チェックをパスしました！")
+    elif summary['auto_fixed'] == summary['total_issues']:
+        print("🔧 すべての問題が自動修正されました！")
+    else:
+        print("⚠️ 手動対応が必要な問題があります")
+        if not args.no_fail:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -8,154 +8,579 @@ WebSys Phase2 AI活用品質分析システム
 """
 
 import json
+import math
 import os
 import sys
 import datetime
 import re
 from pathlib import Path
-from typing import Dict, List, Any, Tuple
+from typing import Dict, List, Any, Optional, Sequence, Tuple
 import argparse
 
+from docs_quality.advanced import AdvancedQualityEngine, write_report as write_advanced_report
+from docs_quality.api_drift import ApiDriftConfig, ApiDriftConfigError, FactCache, api_drift
+from docs_quality.assets import AssetIndex, PageWeightAnalyzer
+from docs_quality.code_samples import (DEFAULT_TIMEOUT as DEFAULT_SAMPLE_TIMEOUT, CodeSampleConfig,
+                                       CodeSampleConfigError, SampleCache, validate_code_samples)
+from docs_quality.checks import (CheckConfigError, CheckRegistry, CostModel, check_stats_report,
+                                 merge_check_counters)
+from docs_quality.corpus import Corpus, CorpusChanges, content_digest
+from docs_quality.fsutil import atomic_write_text
+from docs_quality.markdownlint import MarkdownLinter, format_violation
+from docs_quality.pipeline import StagedPipeline, analyze_in_worker, default_workers, init_analysis_worker
+from docs_quality.records import CodeBlocks, FileRecord, HeaderColumns
+from docs_quality.related import DEFAULT_THRESHOLD, DEFAULT_TOP_K, TermCountCache, related_documents
+from docs_quality.report_shards import ShardedReportWriter
+from docs_quality.retention import ReportIndex, summarize_report
+from docs_quality.rules import RuleEngine, merge_rule_counters, rule_stats_report
+from docs_quality.sampling import SampleSpec, StratifiedSampler, population_of
+from docs_quality.sharding import ShardError, ShardSpec, load_partials, merge_disjoint, write_partial
+from docs_quality.spelling import SpellChecker
+from docs_quality.stats import DirectoryRollup, StreamingStats
+from docs_quality.tokenizer import TextStats, text_stats
+from docs_quality.translations import (SectionCache, TranslationConfig, TranslationConfigError, TranslationState,
+                                       translation_status)
+
+DEFAULT_RULES_PATH = Path(__file__).resolve().parent.parent / ".docs-quality-rules.json"
+DEFAULT_SPELL_CONFIG = Path(__file__).resolve().parent.parent / ".cspell.json"
+DEFAULT_LINT_CONFIG = Path(__file__).resolve().parent.parent / ".markdownlint.json"
+DEFAULT_TRANSLATIONS_CONFIG = Path(__file__).resolve().parent.parent / ".docs-translations.json"
+DEFAULT_API_CONFIG = Path(__file__).resolve().parent.parent / ".docs-api.json"
+DEFAULT_CODE_SAMPLES_CONFIG = Path(__file__).resolve().parent.parent / ".docs-code-samples.json"
+DEFAULT_PUBLIC_DIR = Path(__file__).resolve().parent.parent / "docs-site" / "public"
+# 変更ファイルがこれ未満の場合はプロセス起動コストの方が大きいため逐次分析
+PIPELINE_MIN_FILES = 16
+# スコア区分（score_distribution）の [下限, 上限)
+SCORE_BANDS = {"excellent": (90, math.inf), "good": (80, 90), "fair": (70, 80), "poor": (-math.inf, 70)}
+# 時間予算（--budget）でも省略しないチェック（前提チェックを含めて常に実行）。翻訳の鮮度はどの分析にも含める
+CORE_CHECKS = ("overall_score", "translations")
+# 全文書を対象とするチェック（scope="corpus"）の設定とキャッシュの既定値（CLI の --related-cache 等で上書き）
+CORPUS_CHECK_SETTINGS = {
+    "related_cache": ".quality-cache/related-terms.pickle",
+    "related_top_k": DEFAULT_TOP_K,
+    "related_threshold": DEFAULT_THRESHOLD,
+    "translations_config": str(DEFAULT_TRANSLATIONS_CONFIG),
+    "translation_state": ".quality-cache/translations.json",
+    "translation_cache": ".quality-cache/translation-sections.pickle",
+    "api_config": str(DEFAULT_API_CONFIG),
+    "api_cache": ".quality-cache/api-index.pickle",
+    "code_samples_config": str(DEFAULT_CODE_SAMPLES_CONFIG),
+    "code_samples_cache": ".quality-cache/code-samples.pickle",
+    "code_sample_timeout": DEFAULT_SAMPLE_TIMEOUT,
+    "asset_index": ".quality-cache/asset-index.json",
+    "public_dir": str(DEFAULT_PUBLIC_DIR),
+    "page_budget_kb": 1024,
+    "image_budget_kb": 300,
+}
+# 全文書を対象とするチェックの設定の誤り（分析を中止する）
+CORPUS_CHECK_ERRORS = (TranslationConfigError, ApiDriftConfigError, CodeSampleConfigError)
+# 総合スコアの重み
+SCORE_WEIGHTS = {"structure": 0.4, "readability": 0.3, "ai": 0.3}
+
+
+def score_stats() -> StreamingStats:
+    """スコア集計（overall_score は小数第2位で丸め済みのため 1/100 点単位で厳密、1点刻みのヒストグラム）"""
+    return StreamingStats(scale=100, bin_width=1)
+
+
 class AIQualityAnalyzer:
-    def __init__(self, docs_dir: str = "docs", output_dir: str = "docs/quality-reports"):
+    score_weights = SCORE_WEIGHTS
+
+    def __init__(self, docs_dir: str = "docs", output_dir: str = "docs/quality-reports",
+                 rules_path: Optional[str] = None, workers: int = 0, readers: int = 4, queue_size: int = 16,
+                 shard: Optional[ShardSpec] = None, exclude: Sequence[str] = (),
+                 spell_config: Optional[str] = str(DEFAULT_SPELL_CONFIG), spell_cache: Optional[str] = None,
+                 spell_system_dictionaries: bool = False,
+                 lint_config: Optional[str] = str(DEFAULT_LINT_CONFIG), checks: Optional[Sequence[str]] = None,
+                 corpus_settings: Optional[Dict[str, Any]] = None):
         self.docs_dir = Path(docs_dir)
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(exist_ok=True)
         self.timestamp = datetime.datetime.now()
 
+        # メモリ常駐コーパスとファイル別分析結果（変更ファイルのみ再分析）
+        self.corpus = Corpus(self.docs_dir, shard=shard, exclude=exclude)
+        self.shard = shard
+        self.file_results: Dict[str, FileRecord] = {}
+
+        # 改善提案・推奨事項ルール（.docs-quality-rules.json）
+        self.rules_path = str(rules_path or DEFAULT_RULES_PATH)
+        self.rules = RuleEngine.load(self.rules_path)
+
+        # スペルチェック（.cspell.json、spell_config=None で無効）。結果は内容ハッシュごとに spell_cache へ保存
+        # システム辞書は環境によって結果が変わるため spell_system_dictionaries=True のときだけ読み込む
+        self.spell_config = spell_config
+        self.spell_cache = spell_cache
+        self.spell_system_dictionaries = spell_system_dictionaries
+        self.spelling: Optional[SpellChecker] = None
+        if spell_config is not None:
+            self.spelling = SpellChecker.load(spell_config, system_dictionaries=spell_system_dictionaries)
+            if spell_cache:
+                self.spelling.load_cache(spell_cache)
+
+        # Markdown 構文チェック（.markdownlint.json、lint_config=None で無効）
+        self.lint_config = lint_config
+        self.linter = MarkdownLinter.load(lint_config) if lint_config is not None else None
+
+        # 全文書を対象とするチェック（関連ドキュメント・翻訳・API仕様照合・コードサンプル・ページ重量）の設定とキャッシュ
+        self.corpus_settings = {**CORPUS_CHECK_SETTINGS, **(corpus_settings or {})}
+
+        # 実行するチェック（CHECKS に登録、None は全チェック）。必要な特徴量だけを抽出する実行計画を作る
+        self.check_budget: Optional[Dict[str, Any]] = None
+        self.configure_checks(checks)
+
+        # 読み込み・解析・集約の段階パイプライン設定（workers=0 は逐次分析）
+        self.workers = workers
+        self.readers = readers
+        self.queue_size = queue_size
+        self.pipeline_stats: Optional[Dict[str, Any]] = None
+
         # AI分析のシミュレーション（将来的にはGPT API統合）
         self.ai_enabled = False  # 実際のAI APIが利用可能かどうか
 
+    def available_checks(self) -> List[str]:
+        """登録済みチェックのうち、この分析器で実行できるもの
+
+        スペル・構文チェックは設定が無効なら、翻訳の鮮度・API仕様照合は設定ファイルが無ければ除く。
+        """
+        unavailable = set()
+        if self.spelling is None:
+            unavailable.add("spelling")
+        if self.linter is None:
+            unavailable.add("markdownlint")
+        if not Path(self.corpus_settings["translations_config"]).exists():
+            unavailable.add("translations")
+        if not Path(self.corpus_settings["api_config"]).exists():
+            unavailable.add("api_drift")
+        return [name for name in CHECKS.checks if name not in unavailable]
+
+    def configure_checks(self, checks: Optional[Sequence[str]] = None) -> None:
+        """実行するチェックを設定（前提チェックは自動的に含める）"""
+        available = self.available_checks()
+        names = available if checks is None else [name for name in checks if name in available]
+        self.plan = CHECKS.plan(names)
+
     def analyze_content_quality(self) -> Dict[str, Any]:
         """AI活用コンテンツ品質分析"""
         print("🤖 AI品質分析開始...")
 
-        md_files = list(self.docs_dir.glob("**/*.md"))
+        self.refresh_analysis()
+        return self.assemble_results()
+
+    def refresh_analysis(self) -> CorpusChanges:
+        """コーパスを再走査し、変更ファイルのみ再分析"""
+        stats = self.corpus.stat_files()
+        changed = self._analyze_pending(self.corpus.pending(stats))
+
+        removed = self.corpus.prune(stats)
+        for key in removed:
+            self.file_results.pop(key, None)
+
+        return self.corpus.finish_scan(changed, removed)
+
+    def _analyze_pending(self, pending: List[Tuple[str, Path, int, int]], pipelined: bool = True) -> List[str]:
+        """読み直しが必要なファイルを分析（件数が多ければ段階パイプライン）"""
+        if pipelined and self.workers and len(pending) >= PIPELINE_MIN_FILES:
+            return self._analyze_pipelined(pending)
+
+        changed = []
+        for key, file, size, mtime_ns in pending:
+            entry = self.corpus.read(file, size, mtime_ns)
+            if entry is None or self.corpus.touch_if_unchanged(entry):
+                continue
+            self.corpus.store(entry)
+            print(f"🔍 分析中: {entry.path.name}")
+            self.file_results[key] = self._analyze_single_file(entry.path, entry.content)
+            changed.append(key)
+        return changed
+
+    def analyze_sample(self, spec: SampleSpec) -> Dict[str, Any]:
+        """層化サンプリングによる概算分析（要求精度に達した時点で打ち切り）"""
+        print("🎲 サンプリング分析開始...")
+
+        stats = self.corpus.stat_files()
+        sampler = StratifiedSampler(spec, population_of(stats, self.docs_dir), metric="overall_score")
+        for batch in sampler:
+            # バッチは小さく、バッチごとにワーカープロセスを起動すると逐次分析より遅くなるため同一プロセスで分析
+            self._analyze_pending(self.corpus.pending({key: stats[key] for key in batch}), pipelined=False)
+            for key in batch:
+                record = self.file_results.get(key)
+                score = record.overall_score if record is not None else None
+                if score is not None:
+                    sampler.observe(key, {"overall_score": score, **{
+                        label: float(low <= score < high) for label, (low, high) in SCORE_BANDS.items()
+                    }})
+            estimate = sampler.estimate("overall_score")
+            print(f"🎲 {sampler.sampled}/{sampler.population}件: 平均スコア {estimate.mean:.2f} ± {estimate.half_width:.2f}")
+        self.corpus.finish_scan(list(self.file_results), [])
+
+        # 関連ドキュメント・翻訳の鮮度等は全文書が必要なため、全文書を対象とするチェックは省略
+        results = self.assemble_results(corpus_checks=False)
+        self._apply_sample_estimates(results, sampler)
+        return results
+
+    def _apply_sample_estimates(self, results: Dict[str, Any], sampler: StratifiedSampler) -> None:
+        """サマリーを母集団の推定値（信頼区間つき）に置き換える。statistics・directories は標本の値"""
+        population = sampler.population
+        average = sampler.estimate("overall_score")
+        bands = {label: sampler.estimate(label).scaled(population) for label in SCORE_BANDS}
+
+        summary = results["quality_summary"]
+        summary["sampled_files"] = summary["total_files"]
+        summary["average_score"] = round(average.mean, 2)
+        summary["total_files"] = population
+        summary["score_distribution"] = {label: round(estimate.mean) for label, estimate in bands.items()}
+        summary["quality_level"] = self._get_quality_level(average.mean)
+        summary["confidence_intervals"] = {
+            "average_score": average.to_dict(),
+            "score_distribution": {label: estimate.to_dict(digits=1) for label, estimate in bands.items()},
+        }
+        results["metadata"]["sampling"] = sampler.summary()
+
+    def _analyze_pipelined(self, pending: List[Tuple[str, Path, int, int]]) -> List[str]:
+        """読み込み（スレッド）→ 解析（プロセス）→ 集約 の段階パイプラインで分析"""
+        changed = []
+
+        def read(item):
+            key, file, size, mtime_ns = item
+            entry = self.corpus.read(file, size, mtime_ns)
+            if entry is None or self.corpus.touch_if_unchanged(entry):
+                return None
+            return entry, (key, entry.content)
+
+        def aggregate(entry, result):
+            file_result, rule_stats, check_stats = result
+            self.corpus.store(entry)
+            self.file_results[entry.key] = file_result
+            self.rules.merge_stats(rule_stats)
+            self.plan.merge_stats(check_stats)
+            if self.spelling is not None:
+                self.spelling.remember(entry.content, file_result.misspellings)
+            changed.append(entry.key)
+            print(f"🔍 分析完了: {entry.path.name}")
+
+        pipeline = StagedPipeline(
+            read, analyze_in_worker, aggregate,
+            readers=self.readers, workers=self.workers, queue_size=self.queue_size,
+            initializer=init_analysis_worker,
+            initargs=("ai-quality-analyzer", str(self.docs_dir), str(self.output_dir), self.rules_path,
+                      self.spell_config, self.spell_cache, self.lint_config, self.plan.names,
+                      self.spell_system_dictionaries),
+        )
+        self.pipeline_stats = pipeline.run(pending)
+        return changed
+
+    def fix_markdown(self) -> List[Path]:
+        """修正可能な Markdown 構文違反を自動修正（内容が変わったファイルのみ書き込む）"""
+        if self.linter is None:
+            return []
+        return [file for file, _, _ in self.corpus.stat_files().values() if self.linter.fix_file(file)]
+
+    def save_spelling_cache(self) -> None:
+        """スペルチェック結果のキャッシュを保存（現存する文書の分のみ）"""
+        if self.spelling is not None and self.spell_cache:
+            self.spelling.save_cache(self.spell_cache,
+                                     keep=(content_digest(entry.content.encode("utf-8")) for entry in self.corpus))
+
+    def assemble_results(self, corpus_checks: bool = True) -> Dict[str, Any]:
+        """ファイル別分析結果から全体結果を組み立て（単一ノードも部分結果のマージを経由）"""
+        return self.finalize(self.merge_partials([self.build_partial()]), corpus_checks=corpus_checks)
+
+    def build_partial(self) -> Dict[str, Any]:
+        """マージ可能な部分結果（ファイル別結果・スコア集計・推奨事項集計・ルール統計）
+
+        ファイル別結果は FileRecord のまま保持し、部分結果ファイルへは to_state() の配列で書き出す。
+        コードブロックの本文はここでコーパスの内容から切り出す。
+        """
+        entries = self.corpus.entries
+        content_analysis = {key: self.file_results[key].with_source(entries[key].content)
+                            for key in sorted(self.file_results)}
+        scores = score_stats()
+        directories = DirectoryRollup(score_stats)
+        for key, record in content_analysis.items():
+            if record.overall_score is None:
+                continue
+            scores.add(record.overall_score)
+            directories.add(self._relative_key(key), record.overall_score)
+
+        return {
+            "files": content_analysis,
+            "scores": scores.state(),
+            "directories": directories.state(),
+            "recommendations": self.rules.recommendation_aggregates(content_analysis, self.docs_dir),
+            "rule_counters": self.rules.export_stats(),
+            "check_counters": self.plan.export_stats(),
+        }
+
+    def merge_partials(self, partials: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """シャードごとの部分結果を1つに統合"""
+        merged = {
+            "files": {},
+            "scores": score_stats(),
+            "directories": DirectoryRollup(score_stats),
+            "recommendations": {},
+            "rule_counters": {"rules": {}, "scan": [0, 0.0], "prefiltered": 0},
+            "check_counters": {"checks": {}, "features": {}},
+        }
+        for partial in partials:
+            merge_disjoint(merged["files"], {key: FileRecord.coerce(record) for key, record in partial["files"].items()},
+                           "content_analysis")
+            merged["scores"].merge(StreamingStats.from_state(partial["scores"]))
+            merged["directories"].merge(DirectoryRollup.from_state(partial["directories"], score_stats))
+            self.rules.merge_recommendation_aggregates(merged["recommendations"], partial["recommendations"])
+            merge_rule_counters(merged["rule_counters"], partial["rule_counters"])
+            merge_check_counters(merged["check_counters"], partial.get("check_counters", {}))
+
+        merged["files"] = {key: merged["files"][key] for key in sorted(merged["files"])}
+        return merged
+
+    def finalize(self, partial: Dict[str, Any], corpus_checks: bool = True) -> Dict[str, Any]:
+        """統合済みの部分結果から最終レポートを作成（ファイル別結果はここで既存のJSONスキーマへ変換）
+
+        corpus_checks が真なら、全文書を対象とするチェックの節と推奨事項も加える（CLI・常駐サービス共通）。
+        """
+        content_analysis = {key: record.to_dict() for key, record in partial["files"].items()}
 
         analysis_results = {
             "metadata": {
                 "timestamp": self.timestamp.isoformat(),
                 "analyzer": "AIQualityAnalyzer v1.0",
                 "ai_enabled": self.ai_enabled,
-                "total_files": len(md_files)
+                "total_files": len(content_analysis),
+                "pipeline": self.pipeline_stats,
+                "spell_dictionaries": self.spelling.dictionaries
+                if self.spelling is not None and "spelling" in self.plan.names else None
             },
-            "content_analysis": {},
+            "content_analysis": content_analysis,
             "readability_scores": {},
             "structure_scores": {},
             "improvement_suggestions": {},
             "ai_recommendations": [],
-            "quality_summary": {}
+            "quality_summary": {},
+            "rule_stats": {},
+            "check_stats": {}
         }
 
-        for file in md_files:
-            print(f"🔍 分析中: {file.name}")
-            file_analysis = self._analyze_single_file(file)
-            analysis_results["content_analysis"][str(file)] = file_analysis
-
         # 全体サマリー生成
-        analysis_results["quality_summary"] = self._generate_quality_summary(
-            analysis_results["content_analysis"]
-        )
+        analysis_results["quality_summary"] = self._generate_quality_summary(partial["scores"], partial["directories"])
 
         # AI推奨事項生成
-        analysis_results["ai_recommendations"] = self._generate_ai_recommendations(
-            analysis_results["content_analysis"]
-        )
+        analysis_results["ai_recommendations"] = self.rules.render_recommendations(partial["recommendations"])
+        analysis_results["rule_stats"] = rule_stats_report(partial["rule_counters"])
+
+        check_counters = partial["check_counters"]
+        if corpus_checks:
+            check_counters = merge_check_counters(check_counters, self.run_corpus_checks(analysis_results))
+        analysis_results["check_stats"] = check_stats_report(check_counters, self.check_budget)
 
         return analysis_results
 
-    def _analyze_single_file(self, file_path: Path) -> Dict[str, Any]:
-        """単一ファイルの詳細分析"""
+    def run_corpus_checks(self, analysis_data: Dict[str, Any]) -> Dict[str, Any]:
+        """実行計画に含まれる全文書を対象とするチェックを実行し、今回の計測カウンタを返す
+
+        シャードのマージ時はコーパスが未走査のため、ここでツリー全体を読み込む。
+        """
+        if not self.plan.corpus_checks:
+            return {"checks": {}, "features": {}}
+        self.corpus.ensure_scanned()
+        return self.plan.run_corpus(self, analysis_data, {"corpus": self.corpus}, len(self.corpus.entries))
+
+    def add_related_documents(self, analysis_data: Dict[str, Any], corpus: Corpus, cache_path,
+                              top_k: int = DEFAULT_TOP_K, threshold: float = DEFAULT_THRESHOLD) -> Dict[str, Any]:
+        """関連ドキュメント（TF-IDF類似度）と未リンクの組を結果へ追加し、相互リンクを推奨事項へ加える
+
+        語の出現回数は内容ハッシュごとに cache_path へ保存し、次回は変更された文書だけをトークン化する。
+        """
+        cache = TermCountCache.load(cache_path)
+        related = related_documents(corpus, cache, top_k=top_k, threshold=threshold)
+        cache.save(cache_path, keep=(entry.digest for entry in corpus))
+
+        analysis_data["related_documents"] = related
+        missing = related["missing_links"]
+        if missing:
+            analysis_data["ai_recommendations"].append({
+                "priority": "medium",
+                "category": "navigation",
+                "title": "関連ドキュメントの相互リンク",
+                "description": f"内容の近い{len(missing)}組の文書が相互にリンクしていません",
+                "action": "関連ドキュメント節へ相互リンクを追加",
+                "impact": "関連仕様間の回遊性向上",
+                "affected_files": [f"{link['source']} ↔ {link['target']}" for link in missing[:5]],
+            })
+        return related
+
+    def add_translation_status(self, analysis_data: Dict[str, Any], corpus: Corpus, config_path, state_path,
+                               cache_path) -> Dict[str, Any]:
+        """翻訳ツリーとの対応・節ごとの鮮度を結果へ追加し、原文が更新された翻訳を推奨事項へ加える
+
+        節の同期記録とファイルの対応は state_path へ、節の分解結果は内容ハッシュごとに cache_path へ保存する。
+        """
+        config = TranslationConfig.load(config_path)
+        state = TranslationState.load(state_path)
+        cache = SectionCache.load(cache_path)
+        translations = translation_status(corpus, config, state, cache, self.timestamp.isoformat())
+        state.save(state_path)
+        cache.save(cache_path)
+
+        analysis_data["translations"] = translations
+        for language, status in translations.items():
+            stale_files: Dict[str, int] = {}
+            for item in status["stale"]:
+                stale_files[item["target"]] = stale_files.get(item["target"], 0) + 1
+            if not stale_files:
+                continue
+            analysis_data["ai_recommendations"].append({
+                "priority": "medium",
+                "category": "translation",
+                "title": f"翻訳（{language}）の更新",
+                "description": f"翻訳後に原文が変更された節が{len(status['stale'])}件（{len(stale_files)}ファイル）あります",
+                "action": "原文の変更箇所を翻訳へ反映",
+                "impact": "翻訳版の内容の正確性維持",
+                "affected_files": [f"{target} ({count}節)" for target, count in
+                                   sorted(stale_files.items(), key=lambda item: (-item[1], item[0]))[:5]],
+            })
+        return translations
+
+    def add_api_drift(self, analysis_data: Dict[str, Any], corpus: Corpus, config_path, cache_path) -> Dict[str, Any]:
+        """API仕様書とルート実装の差分を結果へ追加し、実装と食い違う記載を推奨事項へ加える
+
+        ルート宣言・仕様書の抽出結果は内容ハッシュごとに cache_path へ保存する。
+        """
+        config = ApiDriftConfig.load(config_path)
+        source_corpus = config.source_corpus()
+        cache = FactCache.load(cache_path)
+        drift = api_drift(config, corpus, source_corpus, cache)
+        cache.save(cache_path, keep=[entry.digest for entry in source_corpus] + [entry.digest for entry in corpus])
+
+        analysis_data["api_drift"] = drift
+        outdated = drift["stale"] + drift["mismatched"]
+        if outdated:
+            analysis_data["ai_recommendations"].append({
+                "priority": "high",
+                "category": "api",
+                "title": "API仕様書と実装の食い違い",
+                "description": f"実装のないエンドポイントの記載が{len(drift['stale'])}件、"
+                               f"メソッド・パラメータ名の食い違いが{len(drift['mismatched'])}件あります",
+                "action": "API仕様書を現在のルート定義に合わせて更新",
+                "impact": "API利用者の実装ミス防止",
+                "affected_files": [f"{item['method']} {item['path']} ({item['documented_in'][0]})"
+                                   for item in outdated[:5]],
+            })
+        undocumented = [item for item in drift["undocumented"] if item["mounted"]]
+        if undocumented:
+            analysis_data["ai_recommendations"].append({
+                "priority": "medium",
+                "category": "api",
+                "title": "未記載のAPIエンドポイント",
+                "description": f"API仕様書に記載のないエンドポイントが{len(undocumented)}件あります",
+                "action": "公開しているエンドポイントをAPI仕様書へ追記",
+                "impact": "API仕様書の網羅性向上",
+                "affected_files": [f"{item['method']} {item['path']} ({item['implemented_in'][0]})"
+                                   for item in undocumented[:5]],
+            })
+        return drift
+
+    def add_code_sample_validation(self, analysis_data: Dict[str, Any], corpus: Corpus, config_path, cache_path,
+                                   timeout: float = DEFAULT_SAMPLE_TIMEOUT) -> Dict[str, Any]:
+        """コードブロックの構文検査結果を追加し、構文エラーのあるサンプルを推奨事項へ加える
+
+        検査結果はブロックの本文ハッシュごとに cache_path へ保存する。検査は self.workers のプロセスで並列に行う。
+        """
+        config = CodeSampleConfig.load(config_path)
+        cache = SampleCache.load(cache_path)
+        samples = validate_code_samples(corpus, config, cache, workers=self.workers, timeout=timeout)
+        cache.save(cache_path, keep=cache.results)
+
+        analysis_data["code_samples"] = samples
+        if samples["invalid"]:
+            invalid_files: Dict[str, int] = {}
+            for item in samples["invalid"]:
+                invalid_files[item["file"]] = invalid_files.get(item["file"], 0) + 1
+            languages = ", ".join(language for language, counts in samples["languages"].items() if counts["invalid"])
+            analysis_data["ai_recommendations"].append({
+                "priority": "high",
+                "category": "code_samples",
+                "title": "コードサンプルの構文エラー修正",
+                "description": f"構文エラーのあるコードサンプルが{len(samples['invalid'])}件"
+                               f"（{len(invalid_files)}ファイル、{languages}）あります",
+                "action": "サンプルをそのまま実行・貼り付けできる正しい構文に修正",
+                "impact": "サンプルを利用する開発者の問い合わせ削減",
+                "affected_files": [f"{item['file']}:{item['line']} ({item['language']})"
+                                   for item in samples["invalid"][:5]],
+            })
+        return samples
+
+    def add_page_weight(self, analysis_data: Dict[str, Any], corpus: Corpus, index_path, public_dir,
+                        page_budget_kb: int = 1024, image_budget_kb: int = 300) -> Dict[str, Any]:
+        """ページ重量（本文＋画像）の予算判定を結果へ追加し、予算超過・画像の欠落を推奨事項へ加える
+
+        画像のサイズ・寸法は index_path のアセットインデックスへ保存し、次回は変更された画像だけを読み直す。
+        """
+        index = AssetIndex.load(index_path)
+        weight = PageWeightAnalyzer(corpus, index, public_dir=Path(public_dir), page_budget=page_budget_kb * 1024,
+                                    image_budget=image_budget_kb * 1024).analyze()
+        index.prune()
+        if index.dirty:
+            index.save(index_path)
+
+        analysis_data["page_weight"] = weight
+        summary = weight["summary"]
+        if summary["pages_over_budget"] or summary["oversized_images"]:
+            analysis_data["ai_recommendations"].append({
+                "priority": "medium",
+                "category": "performance",
+                "title": "ページ重量の削減",
+                "description": f"予算（{page_budget_kb}KB）を超えるページが{summary['pages_over_budget']}件、"
+                               f"1枚{image_budget_kb}KBを超える画像が{summary['oversized_images']}件あります",
+                "action": "画像の圧縮・縮小、長いページの分割",
+                "impact": "ページ表示の高速化",
+                "affected_files": [f"{page} ({weight['pages'][page]['total_bytes'] // 1024}KB)"
+                                   for page in weight["over_budget"][:5]] or
+                                  [f"{image['path']} ({image['bytes'] // 1024}KB)"
+                                   for image in weight["oversized_images"][:5]],
+            })
+        if weight["missing"]:
+            analysis_data["ai_recommendations"].append({
+                "priority": "high",
+                "category": "performance",
+                "title": "画像参照の欠落",
+                "description": f"参照先の画像が見つからない箇所が{len(weight['missing'])}件あります",
+                "action": "画像ファイルを追加するか参照パスを修正",
+                "impact": "表示崩れの防止",
+                "affected_files": [f"{item['page']} → {item['src']}" for item in weight["missing"][:5]],
+            })
+        return weight
+
+    def _analyze_single_file(self, file_path: Path, content: Optional[str] = None) -> FileRecord:
+        """単一ファイルの詳細分析（JSONスキーマへの変換はレポート出力時。docs_quality.records）"""
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-
-            # 基本メトリクス
-            lines = content.split('\n')
-            words = len(content.split())
-            chars = len(content)
-
-            # 構造分析
-            headers = self._analyze_headers(lines)
-            links = self._analyze_links(content)
-            images = self._analyze_images(content)
-            code_blocks = self._analyze_code_blocks(content)
-            tables = self._analyze_tables(lines)
-
-            # 可読性分析
-            readability = self._analyze_readability(content, words)
-
-            # 構造品質スコア
-            structure_score = self._calculate_structure_score(
-                headers, links, images, code_blocks, tables, words
-            )
-
-            # AI品質分析（シミュレート）
-            ai_analysis = self._simulate_ai_analysis(content, file_path.name)
-
-            return {
-                "basic_metrics": {
-                    "lines": len(lines),
-                    "words": words,
-                    "characters": chars,
-                    "avg_line_length": chars / len(lines) if lines else 0
-                },
-                "structure_analysis": {
-                    "headers": headers,
-                    "links": links,
-                    "images": images,
-                    "code_blocks": code_blocks,
-                    "tables": tables
-                },
-                "readability": readability,
-                "structure_score": structure_score,
-                "ai_analysis": ai_analysis,
-                "overall_score": self._calculate_overall_score(
-                    structure_score, readability["score"], ai_analysis["score"]
-                )
-            }
+            if content is None:
+                with open(file_path, 'r', encoding='utf-8') as f:
+                    content = f.read()
+
+            # 登録済みチェックを実行計画に従って実行（必要な特徴量だけを抽出）
+            fields = self.plan.run(self, {"content": content, "file_path": file_path})
+            return FileRecord(checks=self.plan.names, **fields)
 
         except Exception as e:
             print(f"⚠️ ファイル分析エラー {file_path}: {e}")
-            return {"error": str(e)}
+            return FileRecord.failed(str(e))
 
-    def _analyze_headers(self, lines: List[str]) -> Dict[str, Any]:
-        """見出し構造分析"""
-        headers = []
-        header_hierarchy = []
+    def _analyze_headers(self, lines: List[str]) -> HeaderColumns:
+        """見出し構造分析（階層の飛躍・最深レベルは出力時に算出）"""
+        headers = HeaderColumns()
 
         for i, line in enumerate(lines):
             line = line.strip()
             if line.startswith('#'):
                 level = len(line) - len(line.lstrip('#'))
                 text = line.lstrip('#').strip()
-                headers.append({
-                    "level": level,
-                    "text": text,
-                    "line_number": i + 1
-                })
-
-        # 階層構造チェック
-        hierarchy_issues = []
-        for i in range(1, len(headers)):
-            current_level = headers[i]["level"]
-            previous_level = headers[i-1]["level"]
-
-            if current_level > previous_level + 1:
-                hierarchy_issues.append({
-                    "line": headers[i]["line_number"],
-                    "issue": f"見出しレベル{current_level}が{previous_level}から飛躍"
-                })
+                headers.append(level, text, i + 1)
 
-        return {
-            "total": len(headers),
-            "hierarchy": headers,
-            "hierarchy_issues": hierarchy_issues,
-            "deepest_level": max([h["level"] for h in headers]) if headers else 0
-        }
+        return headers
 
-    def _analyze_links(self, content: str) -> Dict[str, Any]:
-        """リンク分析"""
+    def _analyze_links(self, content: str) -> Tuple[List[Tuple[str, str]], List[Tuple[str, str]], int]:
+        """リンク分析（内部リンク, 外部リンク, 空リンク数）"""
         # 内部リンク
         internal_links = re.findall(r'\[([^\]]*)\]\(\./([^)]*)\)', content)
 
@@ -165,49 +590,29 @@ class AIQualityAnalyzer:
         # 空リンク
         empty_links = re.findall(r'\[\]\([^)]*\)', content)
 
-        return {
-            "total": len(internal_links) + len(external_links),
-            "internal": len(internal_links),
-            "external": len(external_links),
-            "empty": len(empty_links),
-            "internal_details": internal_links,
-            "external_details": external_links
-        }
+        return internal_links, external_links, len(empty_links)
 
-    def _analyze_images(self, content: str) -> Dict[str, Any]:
-        """画像分析"""
+    def _analyze_images(self, content: str) -> Tuple[List[Tuple[str, str]], int]:
+        """画像分析（(alt, パス), altなしの数）"""
         images = re.findall(r'!\[([^\]]*)\]\(([^)]*)\)', content)
         images_without_alt = re.findall(r'!\[\]\([^)]*\)', content)
 
-        return {
-            "total": len(images),
-            "with_alt": len([img for img in images if img[0]]),
-            "without_alt": len(images_without_alt),
-            "details": images
-        }
+        return images, len(images_without_alt)
 
-    def _analyze_code_blocks(self, content: str) -> Dict[str, Any]:
-        """コードブロック分析"""
+    def _analyze_code_blocks(self, content: str) -> Tuple[CodeBlocks, int]:
+        """コードブロック分析（言語名と本文の位置, インラインコード数）"""
         # バッククォート3つのコードブロック
-        code_blocks = re.findall(r'```(\w+)?\n(.*?)\n```', content, re.DOTALL)
+        code_blocks = CodeBlocks()
+        for match in re.finditer(r'```(\w+)?\n(.*?)\n```', content, re.DOTALL):
+            code_blocks.append(match.group(1) or '', *match.span(2))
 
         # インラインコード
         inline_code = re.findall(r'`([^`]+)`', content)
 
-        languages = [block[0] for block in code_blocks if block[0]]
-        language_count = {}
-        for lang in languages:
-            language_count[lang] = language_count.get(lang, 0) + 1
-
-        return {
-            "total_blocks": len(code_blocks),
-            "inline_code": len(inline_code),
-            "languages": language_count,
-            "details": code_blocks
-        }
+        return code_blocks, len(inline_code)
 
-    def _analyze_tables(self, lines: List[str]) -> Dict[str, Any]:
-        """テーブル分析"""
+    def _analyze_tables(self, lines: List[str]) -> Tuple[int, int]:
+        """テーブル分析（テーブル数, 表形式の行数）"""
         table_lines = [line for line in lines if '|' in line and line.strip().startswith('|')]
 
         # テーブル数をカウント（連続する表形式行をグループ化）
@@ -222,25 +627,17 @@ class AIQualityAnalyzer:
             elif not is_table_line:
                 in_table = False
 
-        return {
-            "total": tables,
-            "total_rows": len(table_lines)
-        }
+        return tables, len(table_lines)
 
-    def _analyze_readability(self, content: str, word_count: int) -> Dict[str, Any]:
-        """可読性分析"""
-        # 文の数（ピリオド、感嘆符、疑問符で区切り）
-        sentences = re.split(r'[.!?。！？]', content)
-        sentence_count = len([s for s in sentences if s.strip()])
+    def _analyze_readability(self, text: TextStats) -> Tuple[float, float]:
+        """可読性分析（スコア, 平均文長）。語数・文数は字種の連続で数える（docs_quality.tokenizer）"""
+        sentence_count = text.sentences
 
         # 平均文長
-        avg_words_per_sentence = word_count / sentence_count if sentence_count > 0 else 0
+        avg_words_per_sentence = text.words / sentence_count if sentence_count > 0 else 0
 
-        # 長い文の数（20単語以上）
-        long_sentences = 0
-        for sentence in sentences:
-            if len(sentence.split()) > 20:
-                long_sentences += 1
+        # 長い文の数（20語超）
+        long_sentences = text.long_sentences
 
         # 可読性スコア計算（簡易版）
         readability_score = 100
@@ -256,107 +653,59 @@ class AIQualityAnalyzer:
 
         readability_score = max(0, min(100, readability_score))
 
-        return {
-            "score": round(readability_score, 2),
-            "sentences": sentence_count,
-            "avg_words_per_sentence": round(avg_words_per_sentence, 2),
-            "long_sentences": long_sentences,
-            "readability_level": self._get_readability_level(readability_score)
-        }
+        return round(readability_score, 2), round(avg_words_per_sentence, 2)
 
-    def _get_readability_level(self, score: float) -> str:
-        """可読性レベル判定"""
-        if score >= 90:
-            return "非常に読みやすい"
-        elif score >= 80:
-            return "読みやすい"
-        elif score >= 70:
-            return "やや読みやすい"
-        elif score >= 60:
-            return "普通"
-        elif score >= 50:
-            return "やや読みにくい"
-        else:
-            return "読みにくい"
-
-    def _calculate_structure_score(self, headers, links, images, code_blocks, tables, words) -> float:
+    def _calculate_structure_score(self, record: FileRecord) -> float:
         """構造品質スコア計算"""
         score = 0
 
         # 見出し構造 (0-25点)
-        if headers["total"] > 0:
-            score += min(headers["total"] * 5, 25)
+        if len(record.headers) > 0:
+            score += min(len(record.headers) * 5, 25)
             # 階層問題があればペナルティ
-            if headers["hierarchy_issues"]:
-                score -= len(headers["hierarchy_issues"]) * 3
+            hierarchy_issues = record.headers.hierarchy_issues()
+            if hierarchy_issues:
+                score -= len(hierarchy_issues) * 3
 
         # リンク (0-20点)
-        if links["total"] > 0:
-            score += min(links["total"] * 2, 20)
+        links = len(record.internal_links) + len(record.external_links)
+        if links > 0:
+            score += min(links * 2, 20)
             # 空リンクがあればペナルティ
-            score -= links["empty"] * 2
+            score -= record.empty_links * 2
 
         # 視覚要素 (0-20点)
-        if images["total"] > 0:
-            score += min(images["total"] * 3, 15)
+        if record.images:
+            score += min(len(record.images) * 3, 15)
             # altテキストなしはペナルティ
-            score -= images["without_alt"] * 2
+            score -= record.images_without_alt * 2
 
-        if tables["total"] > 0:
-            score += min(tables["total"] * 2, 5)
+        if record.tables > 0:
+            score += min(record.tables * 2, 5)
 
         # コード例 (0-15点)
-        if code_blocks["total_blocks"] > 0:
-            score += min(code_blocks["total_blocks"] * 3, 15)
+        if record.code_blocks:
+            score += min(len(record.code_blocks) * 3, 15)
 
         # コンテンツ量 (0-20点)
-        if words > 0:
-            score += min(words / 50, 20)
+        if record.words > 0:
+            score += min(record.words / 50, 20)
 
         return min(score, 100)
 
-    def _simulate_ai_analysis(self, content: str, filename: str) -> Dict[str, Any]:
+    def _simulate_ai_analysis(self, content: str, file_path: Path, features: FileRecord) -> Dict[str, Any]:
         """AI分析のシミュレーション（将来的にはGPT API統合）"""
-        # 簡易AI分析シミュレーション
-        ai_score = 75  # デフォルトスコア
-
-        suggestions = []
-
-        # ルールベースの分析
-        if len(content.split()) < 100:
-            suggestions.append("コンテンツが短すぎます。より詳細な説明を追加することを推奨します。")
-            ai_score -= 10
-
-        if not re.search(r'```', content):
-            if 'api' in filename.lower() or 'code' in filename.lower():
-                suggestions.append("技術ドキュメントにコード例があると理解しやすくなります。")
-                ai_score -= 5
-
-        if not re.search(r'!\[.*\]\(.*\)', content):
-            if 'guide' in filename.lower() or 'tutorial' in filename.lower():
-                suggestions.append("ガイドドキュメントには図表があると分かりやすくなります。")
-                ai_score -= 5
-
-        # 見出し構造チェック
-        if not re.search(r'^#+ ', content, re.MULTILINE):
-            suggestions.append("適切な見出し構造を追加することで文書の構造が明確になります。")
-            ai_score -= 15
-
-        return {
-            "score": max(0, ai_score),
-            "suggestions": suggestions,
-            "ai_enabled": self.ai_enabled,
-            "analysis_method": "rule_based_simulation" if not self.ai_enabled else "gpt_analysis"
-        }
+        # ルールベースの分析（.docs-quality-rules.json）
+        try:
+            relative_path = file_path.relative_to(self.docs_dir).as_posix()
+        except ValueError:
+            relative_path = file_path.name
+        return self.rules.apply(content, relative_path, features)
 
     def _calculate_overall_score(self, structure_score: float, readability_score: float, ai_score: float) -> float:
         """総合スコア計算"""
         # 重み付き平均
-        weights = {
-            "structure": 0.4,
-            "readability": 0.3,
-            "ai": 0.3
-        }
+        weights = self.score_weights
 
         overall = (
             structure_score * weights["structure"] +
@@ -366,28 +715,35 @@ class AIQualityAnalyzer:
 
         return round(overall, 2)
 
-    def _generate_quality_summary(self, content_analysis: Dict[str, Any]) -> Dict[str, Any]:
-        """品質サマリー生成"""
-        scores = []
-        for file_data in content_analysis.values():
-            if "overall_score" in file_data:
-                scores.append(file_data["overall_score"])
-
-        avg_score = sum(scores) / len(scores) if scores else 0
-
-        # スコア分布
-        score_distribution = {
-            "excellent": len([s for s in scores if s >= 90]),
-            "good": len([s for s in scores if 80 <= s < 90]),
-            "fair": len([s for s in scores if 70 <= s < 80]),
-            "poor": len([s for s in scores if s < 70])
+    def _relative_key(self, key: str) -> str:
+        """ファイルキーを docs ルートからの相対パス（POSIX形式）に変換"""
+        path = Path(key)
+        try:
+            return path.relative_to(self.docs_dir).as_posix()
+        except ValueError:
+            return path.as_posix()
+
+    def _score_distribution(self, scores: StreamingStats) -> Dict[str, int]:
+        """スコア分布（1点刻みのヒストグラムから区分別に集計）"""
+        histogram = scores.histogram
+        return {
+            "excellent": histogram.count_between(90, None),
+            "good": histogram.count_between(80, 90),
+            "fair": histogram.count_between(70, 80),
+            "poor": histogram.count_between(None, 70),
         }
 
+    def _generate_quality_summary(self, scores: StreamingStats, directories: DirectoryRollup) -> Dict[str, Any]:
+        """品質サマリー生成（マージ済みのスコア集計から）"""
+        avg_score = scores.moments.mean
+
         return {
             "average_score": round(avg_score, 2),
-            "total_files": len(scores),
-            "score_distribution": score_distribution,
-            "quality_level": self._get_quality_level(avg_score)
+            "total_files": scores.count,
+            "score_distribution": self._score_distribution(scores),
+            "quality_level": self._get_quality_level(avg_score),
+            "statistics": scores.summary(),
+            "directories": directories.summary()
         }
 
     def _get_quality_level(self, score: float) -> str:
@@ -401,45 +757,6 @@ class AIQualityAnalyzer:
         else:
             return "要改善"
 
-    def _generate_ai_recommendations(self, content_analysis: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """AI推奨事項生成"""
-        recommendations = []
-
-        # 低スコアファイルの分析
-        low_score_files = []
-        for file_path, file_data in content_analysis.items():
-            if "overall_score" in file_data and file_data["overall_score"] < 70:
-                low_score_files.append((file_path, file_data))
-
-        if low_score_files:
-            recommendations.append({
-                "priority": "high",
-                "category": "content_quality",
-                "title": "低品質ファイルの改善",
-                "description": f"{len(low_score_files)}件のファイルが品質基準を下回っています",
-                "action": "見出し構造、リンク、視覚要素の追加・改善",
-                "affected_files": [file for file, _ in low_score_files[:5]]  # 最初の5件
-            })
-
-        # 構造改善推奨
-        structure_issues = 0
-        for file_data in content_analysis.values():
-            if "structure_analysis" in file_data:
-                if file_data["structure_analysis"]["headers"]["hierarchy_issues"]:
-                    structure_issues += 1
-
-        if structure_issues > 0:
-            recommendations.append({
-                "priority": "medium",
-                "category": "structure",
-                "title": "見出し階層の改善",
-                "description": f"{structure_issues}件のファイルで見出し階層に問題があります",
-                "action": "適切な見出しレベル（h1→h2→h3）の使用",
-                "impact": "文書構造の明確化・アクセシビリティ向上"
-            })
-
-        return recommendations
-
     def generate_detailed_report(self, analysis_data: Dict[str, Any]) -> str:
         """詳細HTMLレポート生成"""
         html_template = f"""
@@ -584,6 +901,11 @@ class AIQualityAnalyzer:
 
         return html_template
 
+    def generate_sharded_report(self, analysis_data: Dict[str, Any], report_dir: Path) -> Dict[str, int]:
+        """分割HTMLレポート生成（シェルページ + ディレクトリ別JSONシャード、全ファイル収録）"""
+        writer = ShardedReportWriter(report_dir)
+        return writer.write(analysis_data, self.docs_dir)
+
     def _get_score_class(self, score: float) -> str:
         """スコアに基づくCSSクラス取得"""
         if score >= 90:
@@ -595,48 +917,518 @@ class AIQualityAnalyzer:
         else:
             return "poor"
 
+# ----------------------------------------------------------------------
+# 分析チェックの登録（docs_quality.checks）
+# 新しいチェックはここへ特徴量・チェックを登録する（_analyze_single_file の変更は不要）。
+# チェックは登録順に実行されるため、ルール（ai_rules）が参照できるようスペル・構文チェックを先に登録する
+# ----------------------------------------------------------------------
+CHECKS = CheckRegistry()
+
+
+@CHECKS.feature("lines")
+def _lines_feature(analyzer: AIQualityAnalyzer, context: Dict[str, Any]) -> List[str]:
+    return context["content"].split('\n')
+
+
+@CHECKS.feature("text")
+def _text_feature(analyzer: AIQualityAnalyzer, context: Dict[str, Any]) -> TextStats:
+    return text_stats(context["content"])
+
+
+@CHECKS.feature("headers", requires=("lines",))
+def _headers_feature(analyzer: AIQualityAnalyzer, context: Dict[str, Any]) -> HeaderColumns:
+    return analyzer._analyze_headers(context["lines"])
+
+
+@CHECKS.feature("links")
+def _links_feature(analyzer: AIQualityAnalyzer, context: Dict[str, Any]):
+    return analyzer._analyze_links(context["content"])
+
+
+@CHECKS.feature("images")
+def _images_feature(analyzer: AIQualityAnalyzer, context: Dict[str, Any]):
+    return analyzer._analyze_images(context["content"])
+
+
+@CHECKS.feature("code_blocks")
+def _code_blocks_feature(analyzer: AIQualityAnalyzer, context: Dict[str, Any]):
+    return analyzer._analyze_code_blocks(context["content"])
+
+
+@CHECKS.feature("tables", requires=("lines",))
+def _tables_feature(analyzer: AIQualityAnalyzer, context: Dict[str, Any]):
+    return analyzer._analyze_tables(context["lines"])
+
+
+@CHECKS.check("basic_metrics", features=("lines", "text"), cost="cheap", value=10,
+              outputs=("lines", "words", "characters"), description="基本メトリクス（行数・語数・文字数）")
+def _basic_metrics_check(analyzer: AIQualityAnalyzer, fields: Dict[str, Any], context: Dict[str, Any]):
+    return {"lines": len(context["lines"]), "words": context["text"].words, "characters": len(context["content"])}
+
+
+@CHECKS.check("structure", features=("headers", "links", "images", "code_blocks", "tables"),
+              checks=("basic_metrics",), cost="cheap", value=8,
+              outputs=("headers", "internal_links", "external_links", "empty_links", "images", "images_without_alt",
+                       "code_blocks", "inline_code", "tables", "table_rows", "structure_score"),
+              description="構造分析（見出し・リンク・画像・コード・テーブル）と構造品質スコア")
+def _structure_check(analyzer: AIQualityAnalyzer, fields: Dict[str, Any], context: Dict[str, Any]):
+    internal_links, external_links, empty_links = context["links"]
+    images, images_without_alt = context["images"]
+    code_blocks, inline_code = context["code_blocks"]
+    tables, table_rows = context["tables"]
+    outputs = {
+        "headers": context["headers"],
+        "internal_links": internal_links, "external_links": external_links, "empty_links": empty_links,
+        "images": images, "images_without_alt": images_without_alt,
+        "code_blocks": code_blocks, "inline_code": inline_code, "tables": tables, "table_rows": table_rows,
+    }
+    outputs["structure_score"] = analyzer._calculate_structure_score(FileRecord(**fields, **outputs))
+    return outputs
+
+
+@CHECKS.check("readability", features=("text",), cost="cheap", value=6,
+              outputs=("readability_score", "sentences", "avg_words_per_sentence", "long_sentences", "scripts"),
+              description="可読性（文長・長文・字種構成）")
+def _readability_check(analyzer: AIQualityAnalyzer, fields: Dict[str, Any], context: Dict[str, Any]):
+    text = context["text"]
+    readability_score, avg_words_per_sentence = analyzer._analyze_readability(text)
+    return {
+        "readability_score": readability_score, "sentences": text.sentences,
+        "avg_words_per_sentence": avg_words_per_sentence, "long_sentences": text.long_sentences,
+        "scripts": text.scripts.values(),
+    }
+
+
+@CHECKS.check("spelling", cost="expensive", value=3, outputs=("misspellings",),
+              description="スペルチェック（.cspell.json）")
+def _spelling_check(analyzer: AIQualityAnalyzer, fields: Dict[str, Any], context: Dict[str, Any]):
+    return {"misspellings": analyzer.spelling.check(context["content"], context["file_path"])}
+
+
+@CHECKS.check("markdownlint", features=("lines",), cost="moderate", value=4, outputs=("lint_violations",),
+              description="Markdown 構文チェック（.markdownlint.json）")
+def _markdownlint_check(analyzer: AIQualityAnalyzer, fields: Dict[str, Any], context: Dict[str, Any]):
+    return {"lint_violations": analyzer.linter.lint(context["lines"])}
+
+
+@CHECKS.check("ai_rules", checks=("basic_metrics", "structure", "readability"), cost="moderate", value=5,
+              outputs=("ai_score", "suggestions", "findings", "ai_enabled"),
+              description="改善提案ルール（.docs-quality-rules.json、AI分析のシミュレーション）")
+def _ai_rules_check(analyzer: AIQualityAnalyzer, fields: Dict[str, Any], context: Dict[str, Any]):
+    # 抽出済みの特徴量をルールへ渡す
+    ai_analysis = analyzer._simulate_ai_analysis(context["content"], context["file_path"], FileRecord(**fields))
+    return {
+        "ai_score": ai_analysis["score"],
+        "suggestions": ai_analysis["suggestions"],
+        "findings": [(finding["rule"], finding["severity"]) for finding in ai_analysis["findings"]],
+        "ai_enabled": analyzer.ai_enabled,
+    }
+
+
+@CHECKS.check("overall_score", checks=("structure", "readability", "ai_rules"), cost="cheap", value=10,
+              outputs=("overall_score",), description="総合スコア（構造 40% + 可読性 30% + AI分析 30%）")
+def _overall_score_check(analyzer: AIQualityAnalyzer, fields: Dict[str, Any], context: Dict[str, Any]):
+    return {"overall_score": analyzer._calculate_overall_score(
+        fields["structure_score"], fields["readability_score"], fields["ai_score"]
+    )}
+
+
+# 全文書を対象とするチェック（全文書の分析後に1回実行し、レポートへ節と推奨事項を追加）
+@CHECKS.check("related_documents", cost="moderate", value=4, outputs=("related_documents",), scope="corpus",
+              description="関連ドキュメント（TF-IDF類似度）と相互リンクのない組")
+def _related_documents_check(analyzer: AIQualityAnalyzer, results: Dict[str, Any], context: Dict[str, Any]):
+    settings = analyzer.corpus_settings
+    return {"related_documents": analyzer.add_related_documents(
+        results, context["corpus"], settings["related_cache"],
+        top_k=settings["related_top_k"], threshold=settings["related_threshold"]
+    )}
+
+
+@CHECKS.check("translations", cost="cheap", value=5, outputs=("translations",), scope="corpus",
+              description="翻訳ツリーの対応と節ごとの鮮度（.docs-translations.json）")
+def _translations_check(analyzer: AIQualityAnalyzer, results: Dict[str, Any], context: Dict[str, Any]):
+    settings = analyzer.corpus_settings
+    return {"translations": analyzer.add_translation_status(
+        results, context["corpus"], settings["translations_config"], settings["translation_state"],
+        settings["translation_cache"]
+    )}
+
+
+@CHECKS.check("api_drift", cost="moderate", value=5, outputs=("api_drift",), scope="corpus",
+              description="API仕様書とルート実装の照合（.docs-api.json）")
+def _api_drift_check(analyzer: AIQualityAnalyzer, results: Dict[str, Any], context: Dict[str, Any]):
+    settings = analyzer.corpus_settings
+    return {"api_drift": analyzer.add_api_drift(results, context["corpus"], settings["api_config"],
+                                                settings["api_cache"])}
+
+
+@CHECKS.check("code_samples", cost="expensive", value=4, outputs=("code_samples",), scope="corpus",
+              description="コードサンプルの構文検査（.docs-code-samples.json、外部プロセスで並列実行）")
+def _code_samples_check(analyzer: AIQualityAnalyzer, results: Dict[str, Any], context: Dict[str, Any]):
+    settings = analyzer.corpus_settings
+    return {"code_samples": analyzer.add_code_sample_validation(
+        results, context["corpus"], settings["code_samples_config"], settings["code_samples_cache"],
+        timeout=settings["code_sample_timeout"]
+    )}
+
+
+@CHECKS.check("page_weight", cost="moderate", value=3, outputs=("page_weight",), scope="corpus",
+              description="ページ重量（本文＋画像）の予算判定と画像の欠落・重複")
+def _page_weight_check(analyzer: AIQualityAnalyzer, results: Dict[str, Any], context: Dict[str, Any]):
+    settings = analyzer.corpus_settings
+    return {"page_weight": analyzer.add_page_weight(
+        results, context["corpus"], settings["asset_index"], settings["public_dir"],
+        page_budget_kb=settings["page_budget_kb"], image_budget_kb=settings["image_budget_kb"]
+    )}
+
+
 def main():
     parser = argparse.ArgumentParser(description='WebSys AI Quality Analyzer')
     parser.add_argument('--docs-dir', default='docs', help='ドキュメントディレクトリ')
+    parser.add_argument('--exclude', action='append', default=[], metavar='PATTERN',
+                        help='対象外とするパス（.gitignore 形式、複数指定可。例: legacy/）')
     parser.add_argument('--output-dir', default='docs/quality-reports', help='出力ディレクトリ')
     parser.add_argument('--format', choices=['json', 'html', 'both'], default='both', help='出力形式')
+    parser.add_argument('--html-layout', choices=['sharded', 'inline'], default='sharded',
+                        help='HTML出力形式（sharded: シェル+遅延読み込みシャード / inline: 単一HTML・上位10件）')
     parser.add_argument('--ai-enabled', action='store_true', help='実際のAI分析を有効化')
+    parser.add_argument('--rules', default=str(DEFAULT_RULES_PATH), help='改善提案ルール設定ファイル')
+    parser.add_argument('--rule-stats', action='store_true', help='ルール別のヒット数・評価時間を表示')
+    parser.add_argument('--workers', type=int, default=default_workers(),
+                        help='解析ワーカープロセス数（0: 逐次分析）')
+    parser.add_argument('--readers', type=int, default=4, help='ファイル先読みスレッド数')
+    parser.add_argument('--queue-size', type=int, default=16, help='段間キューの上限（背圧）')
+    parser.add_argument('--pipeline-stats', action='store_true', help='パイプライン各段の稼働率を表示')
+    parser.add_argument('--shard', help='分散分析の担当シャード（i/N、i は 1 始まり）。部分結果のみ出力')
+    parser.add_argument('--partial-out', help='部分結果の出力先（--shard時、既定: <output-dir>/partials/ai-quality-<i>-of-<N>.json）')
+    parser.add_argument('--merge', nargs='+', metavar='PARTIAL', help='全シャードの部分結果をマージして最終レポートを出力')
+    parser.add_argument('--sample', action='store_true', help='層化サンプリングによる概算分析（信頼区間つき、要求精度で打ち切り）')
+    parser.add_argument('--sample-precision', type=float, default=1.0, help='平均スコアの信頼区間の半幅（点、--sample時）')
+    parser.add_argument('--sample-confidence', type=float, default=0.95, help='信頼水準（--sample時）')
+    parser.add_argument('--sample-seed', type=int, default=0, help='抽出順の乱数シード（--sample時）')
+    parser.add_argument('--sample-batch', type=int, default=64, help='精度判定ごとの分析件数（--sample時）')
+    parser.add_argument('--sample-max', type=int, help='分析件数の上限（--sample時）')
+    parser.add_argument('--no-related', action='store_true',
+                        help='関連ドキュメント（相互リンク候補）の推定を省略（--skip-checks related_documents と同じ）')
+    parser.add_argument('--related-cache', default=CORPUS_CHECK_SETTINGS['related_cache'],
+                        help='関連ドキュメント推定の語彙キャッシュ（内容ハッシュ単位）')
+    parser.add_argument('--related-top-k', type=int, default=CORPUS_CHECK_SETTINGS['related_top_k'],
+                        help='文書ごとの関連ドキュメント数')
+    parser.add_argument('--related-threshold', type=float, default=CORPUS_CHECK_SETTINGS['related_threshold'],
+                        help='関連とみなすコサイン類似度の下限')
+    parser.add_argument('--no-translations', action='store_true',
+                        help='翻訳ツリーの鮮度判定を省略（--skip-checks translations と同じ）')
+    parser.add_argument('--translations-config', default=CORPUS_CHECK_SETTINGS['translations_config'],
+                        help='翻訳ツリーの設定（.docs-translations.json、無ければ省略）')
+    parser.add_argument('--translation-state', default=CORPUS_CHECK_SETTINGS['translation_state'],
+                        help='翻訳の節ごとの同期記録（原文・翻訳の節ハッシュ）')
+    parser.add_argument('--translation-cache', default=CORPUS_CHECK_SETTINGS['translation_cache'],
+                        help='節の分解結果のキャッシュ（内容ハッシュ単位）')
+    parser.add_argument('--no-api-drift', action='store_true',
+                        help='API仕様書とルート実装の照合を省略（--skip-checks api_drift と同じ）')
+    parser.add_argument('--api-config', default=CORPUS_CHECK_SETTINGS['api_config'],
+                        help='API仕様照合の設定（.docs-api.json、無ければ省略）')
+    parser.add_argument('--api-cache', default=CORPUS_CHECK_SETTINGS['api_cache'],
+                        help='ルート宣言・仕様書の抽出結果のキャッシュ（内容ハッシュ単位）')
+    parser.add_argument('--no-code-samples', action='store_true',
+                        help='コードサンプルの構文検査を省略（--skip-checks code_samples と同じ）')
+    parser.add_argument('--code-samples-config', default=CORPUS_CHECK_SETTINGS['code_samples_config'],
+                        help='コードサンプル検査の設定（.docs-code-samples.json、言語の別名・外部コマンドのフック）')
+    parser.add_argument('--code-samples-cache', default=CORPUS_CHECK_SETTINGS['code_samples_cache'],
+                        help='コードサンプルの検査結果のキャッシュ（ブロックの本文ハッシュ単位）')
+    parser.add_argument('--code-sample-timeout', type=float, default=CORPUS_CHECK_SETTINGS['code_sample_timeout'],
+                        help='コードサンプル1件あたりの検査時間の上限（秒）')
+    parser.add_argument('--asset-index', default=CORPUS_CHECK_SETTINGS['asset_index'],
+                        help='画像アセットのインデックス（サイズ・寸法、コンテンツハッシュ単位）')
+    parser.add_argument('--public-dir', default=CORPUS_CHECK_SETTINGS['public_dir'], help='`/` 始まりの画像参照の解決先')
+    parser.add_argument('--page-budget-kb', type=int, default=CORPUS_CHECK_SETTINGS['page_budget_kb'],
+                        help='ページ重量（本文＋画像）の予算 (KB)')
+    parser.add_argument('--image-budget-kb', type=int, default=CORPUS_CHECK_SETTINGS['image_budget_kb'],
+                        help='画像1枚あたりの予算 (KB)')
+    parser.add_argument('--no-spell', action='store_true', help='スペルチェックを省略')
+    parser.add_argument('--spell-config', default=str(DEFAULT_SPELL_CONFIG), help='スペルチェック設定（.cspell.json）')
+    parser.add_argument('--spell-system-dictionaries', action='store_true',
+                        help='システム辞書（/usr/share/dict・hunspell）も読み込む（環境によって結果が変わる）')
+    parser.add_argument('--spell-cache', default='.quality-cache/spelling.json',
+                        help='スペルチェック結果のキャッシュ（内容ハッシュ単位）')
+    parser.add_argument('--no-lint', action='store_true', help='Markdown構文チェックを省略')
+    parser.add_argument('--lint-config', default=str(DEFAULT_LINT_CONFIG), help='Markdown構文チェック設定（.markdownlint.json）')
+    parser.add_argument('--lint-fix', action='store_true', help='修正可能な構文違反を分析前に自動修正（変更したファイルのみ書き込み）')
+    parser.add_argument('--lint-output', choices=['summary', 'cli'], default='summary',
+                        help='構文違反の表示形式（cli: markdownlint-cli と同じ1行形式で全件）')
+    parser.add_argument('--profile', choices=['full', 'quick'], default='full',
+                        help='実行するチェックの組（full: 全チェック / quick: 高コストのチェック（スペル・コードサンプル）を除く）')
+    parser.add_argument('--checks', help='実行するチェック（カンマ区切り、--profile より優先。前提チェックは自動で追加）')
+    parser.add_argument('--skip-checks', help='実行しないチェック（カンマ区切り、これを前提とするチェックも除く）')
+    parser.add_argument('--budget', type=float, metavar='SECONDS',
+                        help='分析時間の予算（秒）。計測済みのチェック別コストから、予算内で価値の高いチェックを選ぶ')
+    parser.add_argument('--check-costs', default='.quality-cache/check-costs.json',
+                        help='チェック別の計測コスト（1ファイルあたりの秒数、--budget の見積もりに使用）')
+    parser.add_argument('--check-stats', action='store_true', help='チェック別の実行時間を表示')
+    parser.add_argument('--list-checks', action='store_true', help='登録済みチェックの一覧を表示して終了')
+    parser.add_argument('--advanced', action='store_true',
+                        help='同じコーパスで高度品質チェック（advanced-quality-*.json）も実行')
+    parser.add_argument('--serve', action='store_true', help='常駐HTTPサービスとして起動')
+    parser.add_argument('--host', default='127.0.0.1', help='サービスの待ち受けアドレス（--serve時）')
+    parser.add_argument('--port', type=int, default=8765, help='サービスの待ち受けポート（--serve時）')
+    parser.add_argument('--refresh-interval', type=float, default=5.0, help='変更検知の間隔（秒、--serve時）')
+    parser.add_argument('--lsp', action='store_true',
+                        help='エディタ向け診断サーバー（stdio の JSON-RPC / LSP）として起動')
 
     args = parser.parse_args()
 
+    # --lsp では標準出力をプロトコル専用にし、進捗表示は標準エラーへ
+    protocol = sys.stdout.buffer
+    if args.lsp:
+        sys.stdout = sys.stderr
+
     print("🤖 WebSys AI品質分析システム開始")
     print(f"ドキュメントディレクトリ: {args.docs_dir}")
     print(f"出力ディレクトリ: {args.output_dir}")
     print(f"AI分析: {'有効' if args.ai_enabled else '無効（シミュレーション）'}")
     print()
 
-    analyzer = AIQualityAnalyzer(args.docs_dir, args.output_dir)
+    try:
+        shard = ShardSpec.parse(args.shard) if args.shard else None
+        sample = SampleSpec(seed=args.sample_seed, precision=args.sample_precision, confidence=args.sample_confidence,
+                            batch_size=args.sample_batch, max_files=args.sample_max) if args.sample else None
+    except (ShardError, ValueError) as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    if sample and (shard or args.merge or args.serve or args.lsp):
+        print("❌ --sample は --shard / --merge / --serve / --lsp と同時に指定できません")
+        sys.exit(1)
+
+    analyzer = AIQualityAnalyzer(args.docs_dir, args.output_dir, rules_path=args.rules,
+                                 workers=args.workers, readers=args.readers, queue_size=args.queue_size,
+                                 shard=shard, exclude=args.exclude,
+                                 spell_config=None if args.no_spell else args.spell_config,
+                                 spell_cache=None if args.no_spell else args.spell_cache,
+                                 spell_system_dictionaries=args.spell_system_dictionaries,
+                                 lint_config=None if args.no_lint else args.lint_config,
+                                 corpus_settings={name: getattr(args, name) for name in CORPUS_CHECK_SETTINGS})
     analyzer.ai_enabled = args.ai_enabled
 
-    analysis_data = analyzer.analyze_content_quality()
+    # 実行するチェック（プロファイル・明示指定・時間予算）
+    costs = CostModel.load(args.check_costs)
+    if args.list_checks:
+        for check in CHECKS.describe(costs):
+            requires = ", ".join(check["features"] + check["requires"]) or "-"
+            scope = "、全文書で1回" if check["scope"] == "corpus" else ""
+            print(f"  {check['name']}: {check['description']} [{check['cost']}{scope}, 価値{check['value']:g}, "
+                  f"{check['ms_per_file']:.3f}ms/ファイル] 前提: {requires}")
+        return
+    skipped = args.skip_checks.split(",") if args.skip_checks else []
+    for flag, name in (("no_related", "related_documents"), ("no_translations", "translations"),
+                       ("no_api_drift", "api_drift"), ("no_code_samples", "code_samples")):
+        if getattr(args, flag):
+            skipped.append(name)
+    try:
+        names = CHECKS.resolve(args.profile, include=args.checks.split(",") if args.checks else None, exclude=skipped)
+    except CheckConfigError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    names = [name for name in names if name in analyzer.available_checks()]
+    if args.budget is not None and not args.merge and not args.serve and not args.lsp:
+        files = len(analyzer.corpus.stat_files())
+        parallelism = args.workers if args.workers and files >= PIPELINE_MIN_FILES else 1
+        names, analyzer.check_budget = CHECKS.select(names, args.budget, files, costs, parallelism=parallelism,
+                                                     required=CORE_CHECKS)
+        dropped = analyzer.check_budget["dropped"]
+        print(f"⏳ 時間予算 {args.budget:g}秒: {len(names)}チェックを実行 (見積もり"
+              f"{analyzer.check_budget['estimated_seconds']:g}秒)" + (f" / 省略: {', '.join(dropped)}" if dropped else ""))
+    analyzer.configure_checks(names)
+
+    # 構文違反の自動修正（分析より前に書き込み、分析は修正後の内容に対して行う）
+    if args.lint_fix and not args.no_lint and not args.merge and not args.serve and not args.lsp:
+        fixed = analyzer.fix_markdown()
+        print(f"🛠️ Markdown構文の自動修正: {len(fixed)}ファイルを更新")
+
+    if args.lsp:
+        from docs_quality.lsp import serve_stdio
+
+        sys.exit(serve_stdio(analyzer, sys.stdin.buffer, protocol))
+
+    if args.serve:
+        from docs_quality.loader import load_script
+        from docs_quality.server import serve
+
+        report_module = load_script("dynamic-report-generator")
+        generator = report_module.DynamicReportGenerator(args.docs_dir, args.output_dir, corpus=analyzer.corpus)
+        try:
+            serve(analyzer, generator, args.host, args.port, args.refresh_interval)
+        except CORPUS_CHECK_ERRORS as e:
+            print(f"❌ {e}")
+            sys.exit(1)
+        return
+
+    if shard:
+        print(f"🧩 シャード {shard} を分析")
+        analyzer.refresh_analysis()
+        partial_file = Path(args.partial_out or Path(args.output_dir) / "partials" /
+                            f"ai-quality-{shard.index}-of-{shard.count}.json")
+        write_partial(partial_file, "ai-quality", shard, analyzer.build_partial())
+        print(f"✅ 部分結果出力: {partial_file} ({len(analyzer.file_results)}ファイル)")
+        return
+
+    try:
+        if args.merge:
+            try:
+                partials = load_partials(args.merge, "ai-quality")
+                analysis_data = analyzer.finalize(analyzer.merge_partials(partials))
+            except ShardError as e:
+                print(f"❌ 部分結果のマージに失敗しました: {e}")
+                sys.exit(1)
+            print(f"🧩 {len(partials)}シャードの部分結果をマージ")
+        elif sample:
+            analysis_data = analyzer.analyze_sample(sample)
+        else:
+            analysis_data = analyzer.analyze_content_quality()
+    except CORPUS_CHECK_ERRORS as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+    if "spelling" in analyzer.plan.names:
+        if not args.merge:
+            analyzer.save_spelling_cache()
+        spelling = [result["spelling"] for result in analysis_data["content_analysis"].values() if "spelling" in result]
+        dictionaries = ", ".join(f"{item['path']} {item['words']}語" for item in analysis_data["metadata"]["spell_dictionaries"])
+        print(f"🔤 スペルチェック: 未知語のあるファイル {sum(1 for result in spelling if result['unknown_words'])}"
+              f"/{len(spelling)}件 (延べ{sum(result['occurrences'] for result in spelling)}語) / 辞書: {dictionaries}")
+
+    if "markdownlint" in analyzer.plan.names:
+        rule_counts: Dict[str, int] = {}
+        for key, result in analysis_data["content_analysis"].items():
+            lint = result.get("markdownlint")
+            if lint is None:
+                continue
+            for rule, count in lint["rules"].items():
+                rule_counts[rule] = rule_counts.get(rule, 0) + count
+            if args.lint_output == 'cli':
+                file_name = Path(key).as_posix()
+                for violation in lint["details"]:
+                    print(format_violation({"fileName": file_name, **violation}))
+        top_rules = " / ".join(f"{rule} {count}" for rule, count in
+                               sorted(rule_counts.items(), key=lambda item: (-item[1], item[0]))[:5])
+        print(f"📏 Markdown構文チェック: 違反{sum(rule_counts.values())}件" + (f" ({top_rules})" if top_rules else ""))
+
+    # 計測したチェック別コストを保存（次回の --budget の見積もりに使う）
+    if not args.merge:
+        costs.update(analyzer.plan.export_stats())
+        costs.save(args.check_costs)
+
+    # 全文書を対象とするチェックの結果（分析器が実行計画に従って追加した節）
+    related = analysis_data.get("related_documents")
+    if related is not None:
+        print(f"🔗 関連ドキュメント: {related['documents']}件 (語彙{related['vocabulary']} / "
+              f"トークン化{related['vectorized']}件・キャッシュ{related['cached']}件) / "
+              f"未リンクの組 {len(related['missing_links'])}件")
+
+    for language, status in analysis_data.get("translations", {}).items():
+        sections = status["sections"]
+        print(f"🌐 翻訳（{language}）: 対応{status['files']['paired']}/{status['files']['sources']}ファイル "
+              f"(パス{status['files']['methods']['path'] + status['files']['methods']['name']} / "
+              f"内容{status['files']['methods']['content']}) / 原文更新{sections['stale']}節 / "
+              f"未翻訳{sections['untranslated']}節 / 照合{status['aligned']}組・再利用{status['reused']}組")
+
+    drift = analysis_data.get("api_drift")
+    if drift is not None:
+        print(f"🔌 API仕様照合: 実装{drift['implemented']} / 記載{drift['documented']} / 一致{drift['matched']} / "
+              f"未記載{len(drift['undocumented'])} / 実装なし{len(drift['stale'])} / 食い違い{len(drift['mismatched'])} "
+              f"({drift['elapsed_ms']:.0f}ms, キャッシュ{drift['cache']['hits']}件)")
+
+    samples = analysis_data.get("code_samples")
+    if samples is not None:
+        print(f"🧪 コードサンプル検査: {samples['checked']}/{samples['blocks']}ブロック / 構文エラー{len(samples['invalid'])}件 / "
+              f"時間切れ{len(samples['timeouts'])}件 (検査{samples['validated']}件・キャッシュ{samples['cached']}件, "
+              f"{samples['elapsed_ms']:.0f}ms)")
+        for item in samples["invalid"][:5]:
+            print(f"  {item['file']}:{item['line']}:{item['column']} [{item['language']}] {item['message']}")
+
+    weight = analysis_data.get("page_weight")
+    if weight is not None:
+        summary = weight["summary"]
+        print(f"🖼️ ページ重量: 予算超過{summary['pages_over_budget']}/{summary['pages']}ページ / "
+              f"大きな画像{summary['oversized_images']}件 / 重複{summary['duplicate_groups']}組 / "
+              f"欠落{summary['missing_images']}件 (画像を含む{summary['pages_with_images']}ページ)")
 
     timestamp = datetime.datetime.now().strftime('%Y%m%d-%H%M%S')
+    report_files = []
 
-    # JSON出力
+    # JSON出力（一時ファイル経由で書き込み、保持管理と同時実行しても書きかけを読ませない）
     if args.format in ['json', 'both']:
         json_file = Path(args.output_dir) / f"ai-quality-{timestamp}.json"
-        with open(json_file, 'w', encoding='utf-8') as f:
-            json.dump(analysis_data, f, ensure_ascii=False, indent=2)
+        atomic_write_text(json_file, json.dumps(analysis_data, ensure_ascii=False, indent=2))
+        report_files.append(json_file.name)
         print(f"✅ AI分析JSON出力: {json_file}")
 
-    # HTML出力
-    if args.format in ['html', 'both']:
+    # HTML出力（分割形式: 固定ディレクトリに出力し、変更のないシャードは再利用）
+    if args.format in ['html', 'both'] and args.html_layout == 'sharded':
+        report_dir = Path(args.output_dir) / "ai-quality-report"
+        stats = analyzer.generate_sharded_report(analysis_data, report_dir)
+        print(f"✅ AI分析HTML出力: {report_dir / 'index.html'} "
+              f"(シャード{stats['shards']}件: 新規{stats['written']} / 再利用{stats['reused']} / 削除{stats['removed']})")
+
+    elif args.format in ['html', 'both']:
         html_content = analyzer.generate_detailed_report(analysis_data)
         html_file = Path(args.output_dir) / f"ai-quality-{timestamp}.html"
-        with open(html_file, 'w', encoding='utf-8') as f:
-            f.write(html_content)
+        atomic_write_text(html_file, html_content)
+        report_files.append(html_file.name)
         print(f"✅ AI分析HTML出力: {html_file}")
 
+    # レポートインデックスへ登録（トレンド照会はインデックスのみを読む）
+    if report_files:
+        ReportIndex(args.output_dir).register(
+            "ai-quality", timestamp, report_files,
+            summarize_report("ai-quality", analysis_data), analysis_data['metadata']['timestamp']
+        )
+
+    # 高度品質チェック（読み込み済みのコーパスを共有するため、ファイルを再読込しない）
+    if args.advanced and not args.merge:
+        advanced_report = AdvancedQualityEngine(analyzer.corpus).run()
+        advanced_file = write_advanced_report(advanced_report, args.output_dir)
+        print(f"✅ 高度品質チェックJSON出力: {advanced_file} "
+              f"(問題{advanced_report['summary']['total_issues']}件 / スコア{advanced_report['summary']['quality_score']}/100)")
+
     print("\n🎉 AI品質分析完了！")
     print(f"🤖 総合スコア: {analysis_data['quality_summary']['average_score']}/100")
     print(f"📚 分析ファイル: {analysis_data['quality_summary']['total_files']}件")
     print(f"🏆 品質レベル: {analysis_data['quality_summary']['quality_level']}")
+    statistics = analysis_data['quality_summary']['statistics']
+    print(f"📊 スコア分布: 中央値{statistics['p50']} / p90 {statistics['p90']} / p99 {statistics['p99']} (標準偏差{statistics['stddev']})")
     print(f"💡 改善提案: {len(analysis_data['ai_recommendations'])}項目")
+    if sample:
+        sampling = analysis_data['metadata']['sampling']
+        interval = analysis_data['quality_summary']['confidence_intervals']['average_score']
+        print(f"🎲 サンプリング: {sampling['analyzed']}/{sampling['population']}件 ({sampling['strata']}層, "
+              f"seed {sampling['seed']}, 終了理由 {sampling['stop_reason']}) / "
+              f"平均スコア {sampling['confidence'] * 100:g}%信頼区間 {interval['low']}〜{interval['high']}")
+
+    if args.rule_stats:
+        rule_stats = analysis_data['rule_stats']
+        print("\n📏 ルール別統計:")
+        for rule_id, stats in rule_stats['rules'].items():
+            print(f"  {rule_id}: ヒット{stats['hits']}/{stats['evaluated']}件 ({stats['seconds'] * 1000:.2f}ms)")
+        scan = rule_stats['text_scan']
+        print(f"  テキスト走査: {scan['documents']}文書 ({scan['seconds'] * 1000:.2f}ms)")
+
+    if args.check_stats:
+        check_stats = analysis_data['check_stats']
+        print("\n🧮 チェック別統計:")
+        for kind, label in (('checks', 'チェック'), ('features', '特徴量')):
+            for name, stats in check_stats[kind].items():
+                print(f"  {label} {name}: {stats['files']}件 / {stats['seconds'] * 1000:.2f}ms "
+                      f"({stats['ms_per_file']:.3f}ms/ファイル)")
+
+    if args.pipeline_stats:
+        pipeline_stats = analysis_data['metadata']['pipeline']
+        if pipeline_stats is None:
+            print("\n⏱️ パイプライン: 未使用（逐次分析）")
+        else:
+            print(f"\n⏱️ パイプライン: {pipeline_stats['wall_seconds']:.2f}秒 (キュー上限{pipeline_stats['queue_size']})")
+            for name, stage in pipeline_stats['stages'].items():
+                print(f"  {name}: {stage['workers']}並列 / {stage['items']}件 / 稼働率{stage['utilization'] * 100:.0f}% / "
+                      f"待機{stage['blocked_seconds']:.2f}秒 / 最大キュー{stage['max_queue']}")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
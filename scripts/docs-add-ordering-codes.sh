@@ -376,7 +376,12 @@ cat > ../update-ordered-links.py << 'EOF'
 #!/usr/bin/env python3
 import os
 import re
-import glob
+import sys
+from pathlib import Path
+
+# 分析ツールと同じ走査（.gitignore / .docsignore・node_modules・バックアップを除外）
+sys.path.insert(0, str(Path(__file__).resolve().parent / "scripts"))
+from docs_quality.walker import Walker  # noqa: E402
 
 def update_ordered_links():
     """順序コード付きフォルダ名・ファイル名に対応したリンク更新"""
@@ -425,7 +430,7 @@ def update_ordered_links():
     updated_files = []
 
     # docsフォルダ内の全てのmdファイルを処理
-    for md_file in glob.glob('docs/**/*.md', recursive=True):
+    for md_file in (str(entry.path) for entry in Walker('docs').files()):
         try:
             with open(md_file, 'r', encoding='utf-8') as f:
                 content = f.read()
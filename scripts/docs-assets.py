@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+WebSys ドキュメント画像アセット・ページ重量チェック
+作成日: 2026-10-19
+目的: 画像参照の実体・サイズ・寸法を索引化し、ページ重量の予算超過と重複コピーされた画像を報告する
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+from docs_quality.assets import AssetIndex, PageWeightAnalyzer
+from docs_quality.corpus import Corpus
+from docs_quality.fsutil import atomic_write_text
+
+
+def _kb(size: int) -> str:
+    return f"{size / 1024:,.1f}KB"
+
+
+def main():
+    parser = argparse.ArgumentParser(description='WebSys Docs Asset Index & Page Weight Budget')
+    parser.add_argument('--docs-dir', default='docs', help='ドキュメントディレクトリ')
+    parser.add_argument('--exclude', action='append', default=[], metavar='PATTERN',
+                        help='対象外とするパス（.gitignore 形式、複数指定可。例: legacy/）')
+    parser.add_argument('--public-dir', default='docs-site/public', help='`/` 始まりの画像参照の解決先')
+    parser.add_argument('--index', default='.quality-cache/asset-index.json', help='アセットインデックスファイル')
+    parser.add_argument('--page-budget-kb', type=int, default=1024, help='ページ重量（本文＋画像）の予算 (KB)')
+    parser.add_argument('--image-budget-kb', type=int, default=300, help='画像1枚あたりの予算 (KB)')
+    parser.add_argument('--duplicate-min-refs', type=int, default=2, help='重複コピーとして報告する最小参照数')
+    parser.add_argument('--output', help='結果JSONの出力先')
+    parser.add_argument('--fail-on-budget', action='store_true', help='予算超過・画像欠落がある場合は終了コード1')
+
+    args = parser.parse_args()
+
+    print("🖼️ 画像アセット分析開始...")
+    started = time.perf_counter()
+    index = AssetIndex.load(args.index)
+    analyzer = PageWeightAnalyzer(
+        Corpus(args.docs_dir, exclude=args.exclude), index, public_dir=Path(args.public_dir),
+        page_budget=args.page_budget_kb * 1024, image_budget=args.image_budget_kb * 1024,
+        duplicate_min_refs=args.duplicate_min_refs,
+    )
+    result = analyzer.analyze()
+    index.prune()
+    if index.dirty:
+        index.save(args.index)
+    elapsed = (time.perf_counter() - started) * 1000
+
+    summary = result['summary']
+    stats = result['index_stats']
+    print(f"📄 ページ: {summary['pages']}件 (画像を含む{summary['pages_with_images']}件) / アセット: {summary['assets']}件 "
+          f"({_kb(summary['asset_bytes'])}) / 外部画像: {summary['external_images']}件")
+    print(f"🗂️ インデックス: stat {stats['stat']}件 / ハッシュ計算 {stats['hashed']}件 / 寸法解析 {stats['probed']}件 ({elapsed:.1f}ms)")
+
+    for page in result['over_budget']:
+        data = result['pages'][page]
+        print(f"  ⚠️ 予算超過: {page} {_kb(data['total_bytes'])} (画像{_kb(data['image_bytes'])})")
+    for image in result['oversized_images']:
+        size = f" {image['width']}x{image['height']}" if image['width'] else ""
+        print(f"  🐘 大きな画像: {image['path']} {_kb(image['bytes'])}{size} ({len(image['pages'])}ページ)")
+    for group in result['duplicates']:
+        print(f"  📑 重複コピー: {_kb(group['bytes'])} x {len(group['copies'])}件 "
+              f"(参照{group['references']}回, 無駄{_kb(group['wasted_bytes'])}): {', '.join(group['copies'])}")
+    for item in result['missing']:
+        print(f"  ❌ 画像が見つかりません: {item['page']} → {item['src']}")
+
+    if args.output:
+        atomic_write_text(Path(args.output), json.dumps(result, ensure_ascii=False, indent=2))
+        print(f"✅ 結果出力: {args.output}")
+
+    failed = summary['pages_over_budget'] or summary['missing_images']
+    print(f"\n{'⚠️' if failed else '🎉'} 予算超過{summary['pages_over_budget']}ページ / 大きな画像{summary['oversized_images']}件 / "
+          f"重複{summary['duplicate_groups']}組 / 欠落{summary['missing_images']}件")
+    if args.fail_on_budget and failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
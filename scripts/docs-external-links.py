@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+WebSys ドキュメント外部リンクチェック
+作成日: 2026-10-19
+目的: docs/ の外部URLを並行検証し、TTL付きキャッシュで再実行時は期限切れのURLのみ再検証する
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+from docs_quality.corpus import Corpus
+from docs_quality.fsutil import atomic_write_text
+from docs_quality.linkcheck import ExternalLinkChecker, LinkCache, check_corpus
+
+STATE_ICONS = {"ok": "✅", "broken": "❌", "error": "⚠️", "rate_limited": "⏳"}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='WebSys Docs External Link Checker')
+    parser.add_argument('--docs-dir', default='docs', help='ドキュメントディレクトリ')
+    parser.add_argument('--exclude', action='append', default=[], metavar='PATTERN',
+                        help='対象外とするパス（.gitignore 形式、複数指定可。例: legacy/）')
+    parser.add_argument('--cache', default='.quality-cache/external-links.json', help='結果キャッシュファイル')
+    parser.add_argument('--ttl-hours', type=float, default=168, help='成功結果の有効期間（時間）')
+    parser.add_argument('--failure-ttl-hours', type=float, default=24, help='失敗結果の有効期間（時間）')
+    parser.add_argument('--concurrency', type=int, default=32, help='全体の同時検証数')
+    parser.add_argument('--per-host', type=int, default=4, help='ホストあたりの同時接続数')
+    parser.add_argument('--rate', type=float, default=5.0, help='ホストあたりの毎秒リクエスト数（0で無制限）')
+    parser.add_argument('--timeout', type=float, default=10.0, help='リクエストのタイムアウト（秒）')
+    parser.add_argument('--insecure', action='store_true', help='TLS証明書を検証しない')
+    parser.add_argument('--force', action='store_true', help='キャッシュを無視して全URLを再検証')
+    parser.add_argument('--output', help='結果JSONの出力先')
+    parser.add_argument('--tsv', help='状態<TAB>ステータス<TAB>URL 形式の出力先（link-check.sh 用）')
+    parser.add_argument('--quiet', action='store_true', help='URLごとの結果を表示しない')
+    parser.add_argument('--fail-on-broken', action='store_true', help='リンク切れがある場合は終了コード1')
+
+    args = parser.parse_args()
+
+    cache = LinkCache.load(args.cache, ttl=args.ttl_hours * 3600, failure_ttl=args.failure_ttl_hours * 3600)
+    checker = ExternalLinkChecker(concurrency=args.concurrency, per_host=args.per_host, rate=args.rate,
+                                  timeout=args.timeout, verify_tls=not args.insecure)
+    print("🌐 外部リンクチェック開始...")
+    result = check_corpus(Corpus(args.docs_dir, exclude=args.exclude), cache, checker, force=args.force)
+    cache.save(args.cache)
+
+    summary = result['summary']
+    connections = summary['connections']
+    print(f"🔗 URL: {summary['urls']}件 (検証{summary['checked']}件 / キャッシュ{summary['cached']}件) "
+          f"{summary['seconds']:.2f}秒, 接続 新規{connections['opened']} / 再利用{connections['reused']}")
+
+    if not args.quiet:
+        for url, link in result['links'].items():
+            if link['state'] == 'ok' and link['final_url'] == url:
+                continue
+            detail = link['status'] if link['status'] is not None else link['error']
+            redirect = f" → {link['final_url']}" if link['final_url'] != url else ""
+            print(f"  {STATE_ICONS.get(link['state'], '?')} {url}{redirect} ({detail}) [{', '.join(link['sources'])}]")
+
+    if args.output:
+        atomic_write_text(Path(args.output), json.dumps(result, ensure_ascii=False, indent=2))
+        print(f"✅ 結果出力: {args.output}")
+    if args.tsv:
+        lines = [f"{link['state']}\t{link['status'] or ''}\t{url}" for url, link in result['links'].items()]
+        atomic_write_text(Path(args.tsv), "\n".join(lines) + "\n" if lines else "")
+
+    states = summary['states']
+    print("\n" + " / ".join(f"{STATE_ICONS.get(state, '?')} {state}: {count}件" for state, count in sorted(states.items())))
+    if args.fail_on_broken and states.get('broken'):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
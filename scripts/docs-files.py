@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+WebSys ドキュメントファイル一覧
+作成日: 2026-10-19
+目的: シェルスクリプトの対象ファイルを、分析ツールと同じ走査（docs_quality.walker の除外ルール）で列挙する
+
+- 1行に1ファイル（docs-dir を先頭に付けたパス、名前順の深さ優先）
+- .gitignore / .docsignore・既定の除外（node_modules・バックアップ等）は分析ツールと共通
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+from docs_quality.walker import Walker
+
+
+def main():
+    parser = argparse.ArgumentParser(description='WebSys Docs File Lister')
+    parser.add_argument('--docs-dir', default='docs', help='ドキュメントディレクトリ')
+    parser.add_argument('--include', action='append', metavar='GLOB',
+                        help='対象とするパス（docs-dir からの相対グロブ、複数指定可。既定: **/*.md）')
+    parser.add_argument('--exclude', action='append', default=[], metavar='PATTERN',
+                        help='対象外とするパス（.gitignore 形式、複数指定可。例: legacy/）')
+    args = parser.parse_args()
+
+    if not Path(args.docs_dir).is_dir():
+        print(f"❌ ドキュメントディレクトリが見つかりません: {args.docs_dir}", file=sys.stderr)
+        sys.exit(1)
+
+    walker = Walker(args.docs_dir, include=args.include or ("**/*.md",), exclude=args.exclude)
+    for entry in walker.files():
+        print(f"{args.docs_dir.rstrip('/')}/{entry.relative}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+WebSys ドキュメント移行ツール
+作成日: 2026-10-19
+目的: 移動計画（JSON）に従いファイル移動と全リンクの書き換えを1パスで実行する
+
+docs-restructure.sh / docs-japanese-rename.sh / docs-add-ordering-codes.sh と
+update-*-links.py の組み合わせを置き換える。
+"""
+
+import argparse
+import sys
+
+from docs_quality.migration import MigrationError, MigrationPlan, MigrationPlanner
+
+
+def main():
+    parser = argparse.ArgumentParser(description='WebSys Docs Migration Planner')
+    parser.add_argument('plan', help='移動計画JSONファイル')
+    parser.add_argument('--docs-dir', default='docs', help='ドキュメントディレクトリ')
+    parser.add_argument('--exclude', action='append', default=[], metavar='PATTERN',
+                        help='対象外とするパス（.gitignore 形式、複数指定可。例: legacy/）')
+    parser.add_argument('--dry-run', action='store_true', help='計画のみ表示し、ファイルを変更しない')
+    parser.add_argument('--show-links', action='store_true', help='書き換えるリンクを一覧表示')
+
+    args = parser.parse_args()
+
+    print("🚚 WebSys ドキュメント移行開始")
+    print(f"ドキュメントディレクトリ: {args.docs_dir}")
+    print(f"移動計画: {args.plan}")
+    print()
+
+    planner = MigrationPlanner(args.docs_dir, MigrationPlan.load(args.plan), exclude=args.exclude)
+    try:
+        stats = planner.prepare()
+    except MigrationError as e:
+        print(f"❌ 移動計画エラー: {e}")
+        sys.exit(1)
+
+    print(f"📄 移動ファイル: {stats['moves']}件")
+    print(f"🔗 リンク書き換え: {stats['link_changes']}件 ({stats['rewritten_files']}ファイル)")
+
+    if args.show_links or args.dry_run:
+        for change in planner.link_changes:
+            print(f"  {change['file']}: {change['from']} → {change['to']}")
+
+    if args.dry_run:
+        print("\n🔍 ドライランのため変更は行っていません")
+        return
+
+    result = planner.apply()
+    print(f"\n🎉 移行完了！ 移動{result['moved']}件 / 書き込み{result['written']}件 / 空ディレクトリ削除{result['removed_dirs']}件")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+WebSys ドキュメント全文検索
+作成日: 2026-10-19
+目的: 増分更新される転置インデックスで docs/ を検索し、docs-site 向け静的インデックスを書き出す
+"""
+
+import argparse
+import time
+
+from docs_quality.corpus import Corpus
+from docs_quality.search import SearchIndex
+
+
+def _update(args) -> SearchIndex:
+    index = SearchIndex.load(args.index)
+    started = time.perf_counter()
+    stats = index.update(Corpus(args.docs_dir, exclude=args.exclude))
+    elapsed = (time.perf_counter() - started) * 1000
+    if stats['added'] or stats['updated'] or stats['removed']:
+        index.save(args.index)
+    print(f"🗂️ インデックス更新: 追加{stats['added']}件 / 更新{stats['updated']}件 / "
+          f"削除{stats['removed']}件 / 変更なし{stats['unchanged']}件 ({elapsed:.1f}ms)")
+    return index
+
+
+def main():
+    parser = argparse.ArgumentParser(description='WebSys Docs Full-text Search')
+    parser.add_argument('--docs-dir', default='docs', help='ドキュメントディレクトリ')
+    parser.add_argument('--exclude', action='append', default=[], metavar='PATTERN',
+                        help='対象外とするパス（.gitignore 形式、複数指定可。例: legacy/）')
+    parser.add_argument('--index', default='.quality-cache/search-index.pickle', help='インデックスファイル')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    subparsers.add_parser('build', help='インデックスを作成・増分更新')
+
+    query_parser = subparsers.add_parser('query', help='検索')
+    query_parser.add_argument('terms', nargs='+', help='検索語')
+    query_parser.add_argument('-k', '--limit', type=int, default=10, help='表示件数')
+    query_parser.add_argument('--refresh', action='store_true', help='検索前にインデックスを増分更新')
+
+    export_parser = subparsers.add_parser('export', help='docs-site 向け静的インデックスを書き出し')
+    export_parser.add_argument('--out-dir', default='docs-site/public/search-index', help='出力ディレクトリ')
+    export_parser.add_argument('--shards', type=int, default=64, help='語シャード数')
+
+    args = parser.parse_args()
+
+    if args.command == 'build':
+        index = _update(args)
+        print(f"📚 文書数: {index.live_docs}件 / 語彙数: {len(index.postings):,}")
+
+    elif args.command == 'query':
+        index = SearchIndex.load(args.index)
+        if args.refresh or not index.live_docs:
+            index = _update(args)
+        query = ' '.join(args.terms)
+        started = time.perf_counter()
+        results = index.search(query, limit=args.limit)
+        elapsed = (time.perf_counter() - started) * 1000
+        print(f"🔍 「{query}」: {len(results)}件 ({elapsed:.1f}ms)")
+        for score, doc in results:
+            print(f"  {score:7.3f}  {doc['rel_path']}  {doc['title']}")
+
+    elif args.command == 'export':
+        index = _update(args)
+        stats = index.export_static(args.out_dir, shard_count=args.shards)
+        print(f"📦 静的インデックス出力: {args.out_dir} (シャード{stats['shards']}件 / 語彙{stats['terms']:,} / 文書{stats['docs']}件)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,16 @@
+# -*- coding: utf-8 -*-
+
+"""
+WebSys ドキュメント品質分析 共通ライブラリ
+作成日: 2026-10-19
+目的: ai-quality-analyzer.py / dynamic-report-generator.py 等のスクリプト間で共有する処理
+
+scripts/ 配下のスクリプトを `python3 scripts/xxx.py` で実行すると scripts/ が
+sys.path に入るため、各スクリプトからは `from docs_quality.corpus import Corpus`
+のように参照できる。
+"""
+
+from docs_quality.corpus import Corpus, CorpusEntry, CorpusChanges
+from docs_quality.loader import load_script
+
+__all__ = ["Corpus", "CorpusEntry", "CorpusChanges", "load_script"]
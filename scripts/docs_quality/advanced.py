@@ -0,0 +1,390 @@
+# -*- coding: utf-8 -*-
+
+"""
+高度品質チェックエンジン
+作成日: 2026-10-19
+目的: advanced-quality-check.sh のクロスリファレンス・用語統一・コンテンツ品質・アクセシビリティの
+      4チェックを、コーパスの1回の走査（文書ごとに1回の解析）で実行する
+
+- 各文書は ParsedDocument として1度だけ解析し（コードブロック範囲・見出し・リンク・画像・表）、
+  4つのチェック段がその結果を共有する
+- コーパスは AIQualityAnalyzer と共有できる（ai-quality-analyzer.py --advanced）
+- 出力は advanced-quality-*.json の既存スキーマ（checks.* / summary）を維持する
+- 自動修正はチェック完了後に文書ごとにまとめて原子的に書き込む
+"""
+
+import bisect
+import datetime
+import difflib
+import json
+import posixpath
+import re
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from docs_quality.corpus import Corpus, CorpusEntry
+from docs_quality.fsutil import atomic_write_text
+from docs_quality.links import is_external, relative_link, resolve_link
+from docs_quality.migration import INLINE_LINK, fenced_ranges
+from docs_quality.retention import ReportIndex, summarize_report
+from docs_quality.tokenizer import count_words
+
+ANALYSIS_LEVELS = ("basic", "comprehensive", "ai-enhanced")
+
+# 技術用語の表記統一（推奨表記: 揺れ）
+TECH_TERMS = {
+    "Vue.js": ["Vue.JS", "VueJS"],
+    "TypeScript": ["Typescript", "typescript"],
+    "JavaScript": ["Javascript", "javascript"],
+    "GitHub": ["Github", "github"],
+    "PostgreSQL": ["Postgres", "postgres"],
+    "API": ["api"],
+    "JSON": ["json"],
+    "HTTP": ["http"],
+    "HTTPS": ["https"],
+    "Docker": ["docker"],
+}
+
+HEADING = re.compile(r'^(#{1,6})\s+(.*?)\s*#*\s*$', re.MULTILINE)
+TABLE_ROW = re.compile(r'^\s*\|.*\|\s*$', re.MULTILINE)
+INLINE_CODE = re.compile(r'(`+)(?:(?!\1).)+?\1')
+URL = re.compile(r'https?://[^\s)>\]]+')
+HTML_TAG = re.compile(r'<[^>\n]+>')
+HTML_IMAGE = re.compile(r'<img\b[^>]*>', re.IGNORECASE)
+HTML_ALT = re.compile(r'\balt\s*=\s*["\'][^"\']+["\']', re.IGNORECASE)
+
+
+def _term_pattern(terms: Dict[str, List[str]]) -> Tuple["re.Pattern", Dict[str, str]]:
+    """全表記揺れを1つの正規表現に（パス・ファイル名・識別子の一部は対象外）"""
+    preferred = {variant: term for term, variants in terms.items() for variant in variants}
+    # 長い表記を先に（"https" を "http" より優先）
+    alternatives = "|".join(re.escape(variant) for variant in sorted(preferred, key=len, reverse=True))
+    return re.compile(rf'(?<![\w./\-@(])(?:{alternatives})(?![\w/\-@]|\.\w)'), preferred
+
+
+def _merge_ranges(ranges: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    """重なる範囲を統合（開始位置順）"""
+    merged: List[Tuple[int, int]] = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+class ParsedDocument:
+    """1文書の解析結果（4チェックで共有）"""
+
+    __slots__ = ("entry", "path", "relative", "content", "fenced", "protected", "_starts", "headings",
+                 "links", "images", "html_images", "words", "has_code_block", "has_table")
+
+    def __init__(self, entry: CorpusEntry, relative: str):
+        self.entry = entry
+        self.path = str(entry.path)
+        self.relative = relative
+        content = self.content = entry.content
+        self.fenced = fenced_ranges(content)
+
+        # 用語チェックの対象外範囲（コード・URL・リンク先・HTMLタグ）
+        protected = list(self.fenced)
+        for pattern in (INLINE_CODE, URL, HTML_TAG):
+            protected.extend(match.span() for match in pattern.finditer(content))
+
+        self.links: List[Tuple[str, str, Tuple[int, int]]] = []   # (テキスト, リンク先, リンク先の範囲)
+        self.images: List[Tuple[str, str]] = []                    # (alt, src)
+        for match in INLINE_LINK.finditer(content):
+            if self._in_fence(match.start()):
+                continue
+            protected.append(match.span(3))
+            text = match.group(1)
+            label = text[text.index("[") + 1:text.rindex("]")]
+            if text.startswith("!"):
+                self.images.append((label, match.group(3)))
+            else:
+                self.links.append((label, match.group(3), match.span(3)))
+        self.protected = _merge_ranges(protected)
+        self._starts = [start for start, _ in self.protected]
+
+        self.headings = [(len(match.group(1)), match.group(2), match.start())
+                         for match in HEADING.finditer(content) if not self._in_fence(match.start())]
+        self.html_images = [match.group(0) for match in HTML_IMAGE.finditer(content) if not self._in_fence(match.start())]
+        self.words = count_words(content)
+        self.has_code_block = bool(self.fenced)
+        self.has_table = any(not self._in_fence(match.start()) for match in TABLE_ROW.finditer(content))
+
+    def _in_fence(self, position: int) -> bool:
+        return any(start <= position < end for start, end in self.fenced)
+
+    def is_protected(self, start: int, end: int) -> bool:
+        """[start, end) が対象外範囲と重なるか"""
+        index = bisect.bisect_left(self._starts, end)
+        return index > 0 and self.protected[index - 1][1] > start
+
+
+# ----------------------------------------------------------------------
+# チェック段
+# ----------------------------------------------------------------------
+class CrossReferenceCheck:
+    """内部リンク切れの検出と修正候補（同名ファイル → 部分一致 → 類似名）"""
+
+    def __init__(self, known: List[str], docs_prefix: str):
+        self.known = set(known)
+        self.docs_prefix = docs_prefix
+        self.by_name: Dict[str, List[str]] = {}
+        for path in sorted(known):
+            self.by_name.setdefault(posixpath.basename(path), []).append(path)
+        self.names = sorted(self.by_name)
+        self.broken_links: List[str] = []
+        self.suggestions: List[str] = []
+        self.auto_fixes = 0
+        self.issues = 0
+
+    def _nearest(self, missing: str, name: str) -> str:
+        """同名ファイルが複数ある場合はリンク切れ先とディレクトリ階層が最も近いもの"""
+        parts = missing.split("/")[:-1]
+
+        def shared(path: str) -> int:
+            count = 0
+            for left, right in zip(parts, path.split("/")[:-1]):
+                if left != right:
+                    break
+                count += 1
+            return count
+
+        return max(self.by_name[name], key=lambda path: (shared(path), -path.count("/")))
+
+    def suggest(self, missing: str) -> Optional[str]:
+        name = posixpath.basename(missing)
+        if name in self.by_name:
+            return self._nearest(missing, name)
+        stem = posixpath.splitext(name)[0]
+        if stem:
+            for candidate in self.names:
+                if stem in candidate:
+                    return self._nearest(missing, candidate)
+        close = difflib.get_close_matches(name, self.names, n=1, cutoff=0.8)
+        return self._nearest(missing, close[0]) if close else None
+
+    def check(self, doc: ParsedDocument, edits: List[Tuple[int, int, str]], auto_fix: bool) -> None:
+        for _, target, span in doc.links:
+            if is_external(target):
+                continue
+            resolved = resolve_link(doc.relative, target)
+            if resolved is None:
+                continue
+            path, anchor = resolved
+            if not path.endswith(".md") or path in self.known:
+                continue
+
+            self.issues += 1
+            self.broken_links.append(f"{doc.path} → {self.docs_prefix}{path}")
+            suggestion = self.suggest(path)
+            if suggestion is None:
+                continue
+            self.suggestions.append(f"{doc.path} → {self.docs_prefix}{path} | 修正候補: {self.docs_prefix}{suggestion}")
+            if auto_fix:
+                fixed = relative_link(doc.relative, suggestion)
+                if target.startswith("./") and not fixed.startswith("."):
+                    fixed = "./" + fixed
+                edits.append((span[0], span[1], fixed + (f"#{anchor}" if anchor else "")))
+                self.auto_fixes += 1
+
+    def result(self) -> Dict[str, Any]:
+        return {
+            "status": "completed",
+            "broken_links": self.broken_links,
+            "suggestions": self.suggestions,
+            "auto_fixes": self.auto_fixes,
+        }
+
+
+class TerminologyCheck:
+    """技術用語の表記揺れ（コード・URL・リンク先・HTMLタグ内は対象外）"""
+
+    def __init__(self, terms: Dict[str, List[str]] = TECH_TERMS):
+        self.pattern, self.preferred = _term_pattern(terms)
+        self.details: Dict[str, List[str]] = {}
+        self.occurrences = 0
+        self.auto_fixes = 0
+        self.issues = 0
+
+    def matches(self, doc: ParsedDocument) -> Iterator[Tuple[int, int, str, str]]:
+        """表記揺れ (開始位置, 終了位置, 表記, 推奨表記)"""
+        for match in self.pattern.finditer(doc.content):
+            if not doc.is_protected(match.start(), match.end()):
+                yield match.start(), match.end(), match.group(0), self.preferred[match.group(0)]
+
+    def check(self, doc: ParsedDocument, edits: List[Tuple[int, int, str]], auto_fix: bool) -> None:
+        found: Dict[str, int] = {}
+        for start, end, variant, preferred in self.matches(doc):
+            found[variant] = found.get(variant, 0) + 1
+            if auto_fix:
+                edits.append((start, end, preferred))
+        if not found:
+            return
+        # 問題数は文書×表記揺れ単位（旧シェル実装と同じ数え方）
+        self.issues += len(found)
+        self.occurrences += sum(found.values())
+        if auto_fix:
+            self.auto_fixes += len(found)
+        self.details[doc.path] = [f"{variant}→{self.preferred[variant]} ({count}件)" for variant, count in found.items()]
+
+    def result(self) -> Dict[str, Any]:
+        return {
+            "status": "completed",
+            "inconsistencies": sorted(self.details),
+            "details": {path: self.details[path] for path in sorted(self.details)},
+            "occurrences": self.occurrences,
+            "auto_fixes": self.auto_fixes,
+        }
+
+
+class ContentQualityCheck:
+    """文書ごとの品質スコア（100点満点、旧シェル実装の配点）"""
+
+    def __init__(self):
+        self.scores: Dict[str, int] = {}
+
+    @staticmethod
+    def score(doc: ParsedDocument) -> int:
+        structure = 20 if doc.headings else 0
+        content = 30 if doc.words > 100 else doc.words * 30 // 100
+        links = 25 if doc.links or doc.images else 0
+        images = 15 if doc.images or doc.html_images else 0
+        special = (5 if doc.has_code_block else 0) + (5 if doc.has_table else 0)
+        return structure + content + links + images + special
+
+    def check(self, doc: ParsedDocument, edits: List[Tuple[int, int, str]], auto_fix: bool) -> None:
+        self.scores[doc.path] = self.score(doc)
+
+    @property
+    def average_score(self) -> int:
+        return sum(self.scores.values()) // len(self.scores) if self.scores else 0
+
+    def result(self) -> Dict[str, Any]:
+        return {
+            "status": "completed",
+            "average_score": self.average_score,
+            "scores": {path: self.scores[path] for path in sorted(self.scores)},
+        }
+
+
+class AccessibilityCheck:
+    """画像の代替テキスト・見出し階層の飛び・空のリンクテキスト"""
+
+    def __init__(self):
+        self.issues_list: List[str] = []
+
+    @property
+    def issues(self) -> int:
+        return len(self.issues_list)
+
+    def check(self, doc: ParsedDocument, edits: List[Tuple[int, int, str]], auto_fix: bool) -> None:
+        without_alt = sum(1 for alt, _ in doc.images if not alt.strip())
+        without_alt += sum(1 for tag in doc.html_images if not HTML_ALT.search(tag))
+        if without_alt:
+            self.issues_list.append(f"{doc.path}: 画像にaltテキストが設定されていません ({without_alt}件)")
+
+        previous = None
+        for level, text, _ in doc.headings:
+            if previous is not None and level > previous + 1:
+                self.issues_list.append(f"{doc.path}: 見出し階層が不正です（h{previous}の次にh{level}: {text}）")
+                break
+            previous = level
+
+        empty = sum(1 for text, _, _ in doc.links if not text.strip())
+        if empty:
+            self.issues_list.append(f"{doc.path}: 空のリンクテキストがあります ({empty}件)")
+
+    def result(self) -> Dict[str, Any]:
+        return {
+            "status": "completed",
+            "issues": self.issues_list,
+            "total_issues": self.issues,
+        }
+
+
+# ----------------------------------------------------------------------
+# エンジン
+# ----------------------------------------------------------------------
+class AdvancedQualityEngine:
+    """4チェックをコーパスの1回の走査で実行し、advanced-quality レポートを作成"""
+
+    def __init__(self, corpus: Corpus, auto_fix: bool = False, analysis_level: str = "comprehensive"):
+        if analysis_level not in ANALYSIS_LEVELS:
+            raise ValueError(f"分析レベルは {', '.join(ANALYSIS_LEVELS)} のいずれかです: {analysis_level}")
+        self.corpus = corpus
+        self.auto_fix = auto_fix
+        self.analysis_level = analysis_level
+        self.fixed_files: List[str] = []
+
+    def run(self) -> Dict[str, Any]:
+        self.corpus.ensure_scanned()
+        entries = sorted(self.corpus, key=lambda entry: entry.key)
+        relatives = [self.corpus.relative_path(entry) for entry in entries]
+        docs_prefix = self.corpus.docs_dir.as_posix().rstrip("/") + "/"
+
+        cross_reference = CrossReferenceCheck(relatives, docs_prefix)
+        terminology = TerminologyCheck()
+        content_quality = ContentQualityCheck()
+        accessibility = AccessibilityCheck()
+        checks = (cross_reference, terminology, content_quality, accessibility)
+
+        pending: List[Tuple[CorpusEntry, List[Tuple[int, int, str]]]] = []
+        for entry, relative in zip(entries, relatives):
+            doc = ParsedDocument(entry, relative)
+            edits: List[Tuple[int, int, str]] = []
+            for check in checks:
+                check.check(doc, edits, self.auto_fix)
+            if edits:
+                pending.append((entry, edits))
+
+        for entry, edits in pending:
+            self._apply_edits(entry, edits)
+
+        total_issues = cross_reference.issues + terminology.issues + accessibility.issues
+        auto_fixed = cross_reference.auto_fixes + terminology.auto_fixes
+        return {
+            "timestamp": datetime.datetime.now().astimezone().isoformat(timespec="seconds"),
+            "analysis_level": self.analysis_level,
+            "auto_fix_enabled": self.auto_fix,
+            "checks": {
+                "cross_reference": cross_reference.result(),
+                "terminology": terminology.result(),
+                "content_quality": content_quality.result(),
+                "accessibility": accessibility.result(),
+            },
+            "summary": {
+                "total_files": len(entries),
+                "total_issues": total_issues,
+                "auto_fixed": auto_fixed,
+                "quality_score": content_quality.average_score,
+                "improvement_rate": auto_fixed * 100 // max(total_issues, 1),
+            },
+        }
+
+    def _apply_edits(self, entry: CorpusEntry, edits: List[Tuple[int, int, str]]) -> None:
+        """後ろから置換（範囲が重なる編集は先に登録された方を優先）"""
+        content = entry.content
+        last_start = len(content) + 1
+        for start, end, replacement in sorted(edits, key=lambda edit: edit[0], reverse=True):
+            if end > last_start:
+                continue
+            content = content[:start] + replacement + content[end:]
+            last_start = start
+        if content != entry.content:
+            atomic_write_text(entry.path, content)
+            self.fixed_files.append(str(entry.path))
+
+
+def write_report(report: Dict[str, Any], output_dir) -> Path:
+    """advanced-quality-<日時>.json を出力し、レポートインデックスへ登録"""
+    output_dir = Path(output_dir)
+    stamp = datetime.datetime.now().strftime("%Y%m%d-%H%M%S")
+    report_file = output_dir / f"advanced-quality-{stamp}.json"
+    atomic_write_text(report_file, json.dumps(report, ensure_ascii=False, indent=2))
+    ReportIndex(output_dir).register("advanced-quality", stamp, [report_file.name],
+                                     summarize_report("advanced-quality", report), report["timestamp"])
+    return report_file
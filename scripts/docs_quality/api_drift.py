@@ -0,0 +1,364 @@
+# -*- coding: utf-8 -*-
+
+"""
+API仕様書とルート実装の差分検出
+作成日: 2026-10-19
+目的: backend/src のルート宣言（メソッド + パス）と docs/04_API仕様 に記載されたエンドポイントを照合し、
+      未記載・実装のない記載・メソッドやパラメータ名の食い違いを報告する
+
+- 実装側: ルートディレクトリ配下の TypeScript から、コメントを除いたうえで正規表現により
+  `router.get('/path', ...)` 形式の宣言・既定 import・`.use('/prefix', router)` のマウントを抽出する（構文解析はしない）
+- マウント: エントリ（backend/src/index.ts）から import とマウントをたどってファイルごとのパス接頭辞を求める。
+  エントリから到達しないファイル（旧ルート等）は、ルートディレクトリからの相対パスが同じ到達済みファイルの接頭辞を使い、
+  未マウント（mounted: false）として扱う。どちらでもなければ unmounted に挙げる
+- 仕様側: 仕様書のフェンス外にある `### GET /api/...` 形式の見出しと、`| GET | /api/... |` 形式の表の行
+- 照合: パラメータ（`:id`・`{id}`）を同一視したパスとメソッドの組で照合する。
+  パスが同じでメソッドが異なるもの・パラメータ名が異なるものは mismatched
+- キャッシュ: ファイルごとの抽出結果を内容ハッシュ単位で保存する（変更のないファイルは正規表現を再実行しない）
+"""
+
+import json
+import pickle
+import posixpath
+import re
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from docs_quality.corpus import Corpus, CorpusEntry
+from docs_quality.fsutil import atomic_write
+from docs_quality.walker import glob_to_regex
+
+SOURCE_EXCLUDES = ("__tests__/", "*.test.ts", "*.spec.ts", "*.d.ts")
+
+# TypeScript（文字列は残し、コメントは改行だけ残して消す）
+TS_TOKEN = re.compile(r"//[^\n]*|/\*.*?\*/|'(?:\\.|[^'\\\n])*'|\"(?:\\.|[^\"\\\n])*\"|`(?:\\.|[^`\\])*`", re.S)
+ROUTE = re.compile(r"\.\s*(get|post|put|patch|delete|options|head|all)\s*\(\s*(['\"`])(/[^'\"`$]*)\2")
+IMPORT = re.compile(r"\bimport\s+(\w+)\s*(?:,\s*\{[^}]*\}\s*)?from\s*['\"]([^'\"]+)['\"]"
+                    r"|\b(?:const|let|var)\s+(\w+)\s*=\s*require\(\s*['\"]([^'\"]+)['\"]\s*\)")
+MOUNT = re.compile(r"\.\s*use\s*\(\s*(?:(['\"`])([^'\"`$]*)\1\s*,)?([^;\n]*)")
+IDENTIFIER = re.compile(r"\b[A-Za-z_$][\w$]*\b")
+
+# Markdown（仕様書）
+FENCE = re.compile(r"^ {0,3}(```|~~~)")
+SPEC_HEADING = re.compile(r"^ {0,3}#{1,6}[ \t]+`?(GET|POST|PUT|PATCH|DELETE|OPTIONS|HEAD)[ \t]+(/[^\s`?#]*)")
+SPEC_ROW = re.compile(r"^\s*\|\s*`?(GET|POST|PUT|PATCH|DELETE|OPTIONS|HEAD)`?\s*\|\s*`?(/[^\s`|?#]*)")
+
+PARAMETER = re.compile(r":(\w+)(?:\([^)]*\))?\??|\{(\w+)\}")
+SLASHES = re.compile(r"/{2,}")
+
+
+class ApiDriftConfigError(Exception):
+    pass
+
+
+class SourceFacts(NamedTuple):
+    """TypeScript 1ファイルの抽出結果"""
+    routes: Tuple[Tuple[str, str, int], ...]               # (メソッド, パス, 行)
+    imports: Tuple[Tuple[str, str], ...]                   # (名前, import 先)
+    mounts: Tuple[Tuple[str, Tuple[str, ...], int], ...]   # (接頭辞, 引数の識別子, 行)
+
+
+def _strip_comments(source: str) -> str:
+    return TS_TOKEN.sub(lambda match: "\n" * match.group(0).count("\n") if match.group(0)[0] == "/" else match.group(0),
+                        source)
+
+
+def extract_source(content: str) -> SourceFacts:
+    """ルート宣言・import・マウント"""
+    code = _strip_comments(content)
+
+    def line_of(offset: int) -> int:
+        return code.count("\n", 0, offset) + 1
+
+    routes = tuple((match.group(1).upper(), match.group(3), line_of(match.start())) for match in ROUTE.finditer(code))
+    imports = tuple((match.group(1) or match.group(3), match.group(2) or match.group(4))
+                    for match in IMPORT.finditer(code))
+    mounts = tuple((match.group(2) or "", tuple(IDENTIFIER.findall(match.group(3))), line_of(match.start()))
+                   for match in MOUNT.finditer(code))
+    return SourceFacts(routes, imports, mounts)
+
+
+def extract_spec(content: str) -> Tuple[Tuple[str, str, int], ...]:
+    """仕様書に記載されたエンドポイント (メソッド, パス, 行)"""
+    found = []
+    in_fence = False
+    for number, line in enumerate(content.split("\n"), 1):
+        if FENCE.match(line):
+            in_fence = not in_fence
+            continue
+        if in_fence:
+            continue
+        match = SPEC_HEADING.match(line) or SPEC_ROW.match(line)
+        if match:
+            found.append((match.group(1), match.group(2), number))
+    return tuple(found)
+
+
+def join_path(prefix: str, path: str) -> str:
+    """Express のパス連結（末尾の "/" は除く）"""
+    joined = SLASHES.sub("/", f"/{prefix.strip('/')}/{path.lstrip('/')}")
+    return joined.rstrip("/") or "/"
+
+
+def path_shape(path: str) -> Tuple[str, Tuple[str, ...]]:
+    """(パラメータを ":" にそろえたパス, パラメータ名)"""
+    names = tuple(match.group(1) or match.group(2) for match in PARAMETER.finditer(path))
+    return join_path("", PARAMETER.sub(":", path)), names
+
+
+class FactCache:
+    """内容ハッシュ → 抽出結果（TypeScript・仕様書）"""
+
+    VERSION = 1
+
+    def __init__(self):
+        self.facts: Dict[str, Any] = {}
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def load(cls, path) -> "FactCache":
+        cache = cls()
+        path = Path(path)
+        if not path.exists():
+            return cache
+        try:
+            with open(path, "rb") as f:
+                version, facts = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, ValueError, AttributeError):
+            return cache
+        if version == cls.VERSION:
+            cache.facts = facts
+        return cache
+
+    def save(self, path, keep: Optional[Iterable[str]] = None) -> None:
+        """keep（現存するファイルの内容ハッシュ）以外のエントリは捨てて保存"""
+        if keep is not None:
+            keep = set(keep)
+            self.facts = {key: value for key, value in self.facts.items() if key[1] in keep}
+        facts = {key: tuple(value) for key, value in self.facts.items()}
+        atomic_write(Path(path), pickle.dumps((self.VERSION, facts), protocol=pickle.HIGHEST_PROTOCOL))
+
+    def get(self, kind: str, entry: CorpusEntry):
+        key = (kind, entry.digest)
+        cached = self.facts.get(key)
+        if cached is not None:
+            self.hits += 1
+            return SourceFacts(*cached) if kind == "source" else cached
+        self.misses += 1
+        cached = self.facts[key] = extract_source(entry.content) if kind == "source" else extract_spec(entry.content)
+        return cached
+
+
+class ApiDriftConfig:
+    """.docs-api.json（パスはリポジトリルート、specs は docs_dir からの相対）
+
+        {
+          "source_root": "backend/src",
+          "entry": "index.ts",
+          "routes": ["routes/**", "core/routes/**", "custom/routes/**"],
+          "specs": ["04_API仕様/**"],
+          "ignore": ["/api/internal/**"]
+        }
+    """
+
+    def __init__(self, source_root: str, entry: str, routes: List[str], specs: List[str], ignore: List[str]):
+        self.source_root = source_root
+        self.entry = entry
+        self.routes = routes
+        self.specs = specs
+        self.ignore = ignore
+        self.route_patterns = [re.compile(glob_to_regex(pattern)) for pattern in routes]
+        self.spec_patterns = [re.compile(glob_to_regex(pattern)) for pattern in specs]
+        self.ignore_patterns = [re.compile(glob_to_regex(pattern.lstrip("/"))) for pattern in ignore]
+
+    @classmethod
+    def load(cls, path) -> "ApiDriftConfig":
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                document = json.load(f)
+        except (OSError, ValueError) as e:
+            raise ApiDriftConfigError(f"API仕様照合の設定を読み込めません: {path}: {e}") from e
+        for key in ("source_root", "entry", "routes", "specs"):
+            if key not in document:
+                raise ApiDriftConfigError(f"API仕様照合の設定に {key} がありません: {path}")
+        return cls(document["source_root"], document["entry"], list(document["routes"]), list(document["specs"]),
+                   list(document.get("ignore", [])))
+
+    def source_corpus(self) -> Corpus:
+        """エントリとルートファイルだけを対象とするコーパス（他の TypeScript は読まない）"""
+        return Corpus(self.source_root, pattern=[self.entry, *self.routes], exclude=SOURCE_EXCLUDES)
+
+    def route_root(self, relative: str) -> Optional[str]:
+        """ルートファイルなら、そのパターンの固定部分（"core/routes/**" → "core/routes/"）"""
+        for pattern, regex in zip(self.routes, self.route_patterns):
+            if regex.fullmatch(relative):
+                return re.split(r"[*?\[]", pattern, maxsplit=1)[0]
+        return None
+
+    def is_spec(self, relative: str) -> bool:
+        return any(regex.fullmatch(relative) for regex in self.spec_patterns)
+
+    def is_ignored(self, path: str) -> bool:
+        return any(regex.fullmatch(path.lstrip("/")) for regex in self.ignore_patterns)
+
+
+def _resolve_import(source: str, target: str, files: Set[str]) -> Optional[str]:
+    """相対 import の解決（.js 拡張子は .ts へ、ディレクトリは index.ts）"""
+    if not target.startswith("."):
+        return None
+    base = posixpath.normpath(posixpath.join(posixpath.dirname(source), target))
+    base = re.sub(r"\.(js|ts)$", "", base)
+    for candidate in (f"{base}.ts", f"{base}/index.ts"):
+        if candidate in files:
+            return candidate
+    return None
+
+
+def _module_key(relative: str, root: str) -> str:
+    """ルートディレクトリからのモジュール名（"core/routes/permissions/index.ts" → "permissions"）"""
+    key = relative[len(root):] if relative.startswith(root) else relative
+    return re.sub(r"(/index)?\.ts$", "", key)
+
+
+def _mount_prefixes(config: ApiDriftConfig, facts: Dict[str, SourceFacts]) -> Tuple[Dict[str, Set[str]], Set[str]]:
+    """ファイル → パス接頭辞の集合、エントリから到達したファイル"""
+    files = set(facts)
+    prefixes: Dict[str, Set[str]] = {}
+    reached: Set[str] = set()
+    if config.entry in facts:
+        prefixes[config.entry] = {""}
+        stack = [config.entry]
+        while stack:
+            source = stack.pop()
+            reached.add(source)
+            imported = {name: _resolve_import(source, target, files) for name, target in facts[source].imports}
+            for prefix, names, _ in facts[source].mounts:
+                for name in names:
+                    child = imported.get(name)
+                    if child is None:
+                        continue
+                    joined = {join_path(parent, prefix) for parent in prefixes[source]}
+                    known = prefixes.setdefault(child, set())
+                    if not joined <= known:
+                        known |= joined
+                        stack.append(child)
+
+    # 到達しないルートファイルは同じモジュール名の到達済みファイルの接頭辞を使う
+    by_module: Dict[str, Set[str]] = {}
+    for relative in reached:
+        root = config.route_root(relative)
+        if root is not None:
+            by_module.setdefault(_module_key(relative, root), set()).update(prefixes[relative])
+    for relative in files - reached:
+        root = config.route_root(relative)
+        if root is not None and _module_key(relative, root) in by_module:
+            prefixes[relative] = by_module[_module_key(relative, root)]
+    return prefixes, reached
+
+
+def _endpoint_index(declarations: Iterable[Tuple[str, str, str, int]]) -> Dict[Tuple[str, str], Dict[str, Any]]:
+    """(メソッド, パスの形) → {"method", "path", "parameters", "locations"}"""
+    index: Dict[Tuple[str, str], Dict[str, Any]] = {}
+    for method, path, location, line in declarations:
+        shape, parameters = path_shape(path)
+        item = index.setdefault((method, shape), {"method": method, "path": path, "parameters": parameters,
+                                                  "locations": []})
+        item["locations"].append(f"{location}:{line}")
+    return index
+
+
+def api_drift(config: ApiDriftConfig, docs_corpus: Corpus, source_corpus: Corpus, cache: FactCache) -> Dict[str, Any]:
+    """実装と仕様書の照合結果"""
+    started = time.perf_counter()
+    source_corpus.ensure_scanned()
+    docs_corpus.ensure_scanned()
+
+    # 実装側（エントリとルートファイル）
+    facts: Dict[str, SourceFacts] = {}
+    for entry in source_corpus:
+        relative = source_corpus.relative_path(entry)
+        if relative == config.entry or config.route_root(relative) is not None:
+            facts[relative] = cache.get("source", entry)
+    prefixes, reached = _mount_prefixes(config, facts)
+    unmounted = sorted(relative for relative in facts if relative not in prefixes and facts[relative].routes)
+
+    declarations = []
+    mounted_paths: Set[Tuple[str, str]] = set()
+    for relative, file_facts in facts.items():
+        for prefix in prefixes.get(relative, ()):
+            for method, path, line in file_facts.routes:
+                full = join_path(prefix, path)
+                if config.is_ignored(full):
+                    continue
+                declarations.append((method, full, relative, line))
+                if relative in reached:
+                    mounted_paths.add((method, path_shape(full)[0]))
+    implemented = _endpoint_index(declarations)
+
+    # 仕様側
+    spec_declarations = []
+    spec_files = 0
+    for entry in docs_corpus:
+        relative = docs_corpus.relative_path(entry)
+        if not config.is_spec(relative):
+            continue
+        spec_files += 1
+        for method, path, line in cache.get("spec", entry):
+            full = join_path("", path)
+            if not config.is_ignored(full):
+                spec_declarations.append((method, full, relative, line))
+    documented = _endpoint_index(spec_declarations)
+
+    # 照合（router.all はすべてのメソッドに一致）
+    methods_by_shape: Dict[str, Set[str]] = {}
+    for method, shape in implemented:
+        methods_by_shape.setdefault(shape, set()).add(method)
+    documented_shapes = {shape for _, shape in documented}
+
+    matched = 0
+    method_mismatches: Set[str] = set()
+    stale: List[Dict[str, Any]] = []
+    mismatched: List[Dict[str, Any]] = []
+    for (method, shape), item in sorted(documented.items(), key=lambda pair: (pair[0][1], pair[0][0])):
+        actual = implemented.get((method, shape)) or implemented.get(("ALL", shape))
+        if actual is not None:
+            matched += 1
+            if actual["parameters"] != item["parameters"]:
+                mismatched.append({"kind": "parameters", "method": method, "path": item["path"],
+                                   "documented_in": item["locations"], "implemented_path": actual["path"],
+                                   "implemented_in": actual["locations"]})
+        elif shape in methods_by_shape:
+            others = sorted(methods_by_shape[shape])
+            method_mismatches.add(shape)
+            mismatched.append({"kind": "method", "method": method, "path": item["path"],
+                               "documented_in": item["locations"], "implemented_methods": others,
+                               "implemented_in": [location for other in others
+                                                  for location in implemented[(other, shape)]["locations"]]})
+        else:
+            stale.append({"method": method, "path": item["path"], "documented_in": item["locations"]})
+
+    undocumented = [
+        {"method": method, "path": item["path"], "implemented_in": item["locations"],
+         "mounted": (method, shape) in mounted_paths}
+        for (method, shape), item in sorted(implemented.items(), key=lambda pair: (pair[0][1], pair[0][0]))
+        if (method, shape) not in documented and shape not in method_mismatches
+        and not (method == "ALL" and shape in documented_shapes)
+    ]
+
+    return {
+        "source_root": config.source_root,
+        "entry": config.entry,
+        "source_files": len(facts),
+        "spec_files": spec_files,
+        "implemented": len(implemented),
+        "documented": len(documented),
+        "matched": matched,
+        "undocumented": undocumented,
+        "stale": stale,
+        "mismatched": mismatched,
+        "unmounted": unmounted,
+        "cache": {"hits": cache.hits, "misses": cache.misses},
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 2),
+    }
@@ -0,0 +1,317 @@
+# -*- coding: utf-8 -*-
+
+"""
+画像アセットインデックスとページ重量分析
+作成日: 2026-10-19
+目的: 画像参照を解決し、アセットごとのバイト数・寸法をコンテンツハッシュ単位でキャッシュして、
+      ページ重量の予算超過・重複コピーされた画像を検出する
+
+- 画像ファイルは1回の実行で1度だけ stat する。サイズ・更新時刻が前回と同じならハッシュを再計算しない
+- 寸法・バイト数はコンテンツハッシュをキーに保持するため、同一内容のコピーは1度だけ解析する
+- `/` 始まりの参照は docs-site の public ディレクトリ、それ以外は参照元ファイルからの相対パスとして解決する
+- 外部URL（http(s):// 等）は取得しない（件数のみ集計）
+"""
+
+import hashlib
+import json
+import os
+import re
+import struct
+from pathlib import Path
+from stat import S_ISREG
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import unquote
+
+from docs_quality.corpus import Corpus
+from docs_quality.fsutil import atomic_write_text
+from docs_quality.links import is_external, split_anchor
+
+INDEX_VERSION = 1
+
+# ![alt](src "title") 形式と <img src="..."> 形式
+MARKDOWN_IMAGE_PATTERN = re.compile(r'!\[([^\]]*)\]\(\s*<?([^)\s>]*)>?(?:\s+"[^"]*")?\s*\)')
+HTML_IMAGE_PATTERN = re.compile(r'<img\s[^>]*?src\s*=\s*["\']([^"\']+)["\']', re.IGNORECASE)
+# コードブロック・インラインコード内の記法は画像参照ではない
+CODE_PATTERN = re.compile(r'^(```|~~~).*?^\1[^\n]*$|`[^`\n]+`', re.MULTILINE | re.DOTALL)
+
+
+def extract_images(content: str) -> List[str]:
+    """画像参照（src）の一覧（出現順、重複を含む。コード内は除外）"""
+    content = CODE_PATTERN.sub("", content)
+    found = [(match.start(), match.group(2)) for match in MARKDOWN_IMAGE_PATTERN.finditer(content)]
+    found.extend((match.start(), match.group(1)) for match in HTML_IMAGE_PATTERN.finditer(content))
+    return [src for _, src in sorted(found)]
+
+
+# ----------------------------------------------------------------------
+# 画像寸法（ヘッダのみ解析、外部ライブラリ不要）
+# ----------------------------------------------------------------------
+def _png_size(data: bytes) -> Optional[Tuple[int, int]]:
+    if data[:8] == b"\x89PNG\r\n\x1a\n" and data[12:16] == b"IHDR":
+        return struct.unpack(">II", data[16:24])
+    return None
+
+
+def _gif_size(data: bytes) -> Optional[Tuple[int, int]]:
+    if data[:6] in (b"GIF87a", b"GIF89a"):
+        return struct.unpack("<HH", data[6:10])
+    return None
+
+
+def _jpeg_size(data: bytes) -> Optional[Tuple[int, int]]:
+    if data[:2] != b"\xff\xd8":
+        return None
+    offset = 2
+    while offset + 9 < len(data):
+        if data[offset] != 0xFF:
+            offset += 1
+            continue
+        marker = data[offset + 1]
+        if marker in (0xD8, 0x01) or 0xD0 <= marker <= 0xD7 or marker == 0xFF:
+            offset += 1 if marker == 0xFF else 2
+            continue
+        length = struct.unpack(">H", data[offset + 2:offset + 4])[0]
+        # SOF0〜SOF15（DHT・JPG・DAC を除く）
+        if 0xC0 <= marker <= 0xCF and marker not in (0xC4, 0xC8, 0xCC):
+            height, width = struct.unpack(">HH", data[offset + 5:offset + 9])
+            return width, height
+        offset += 2 + length
+    return None
+
+
+def _webp_size(data: bytes) -> Optional[Tuple[int, int]]:
+    if data[:4] != b"RIFF" or data[8:12] != b"WEBP" or len(data) < 30:
+        return None
+    chunk = data[12:16]
+    if chunk == b"VP8 ":
+        width, height = struct.unpack("<HH", data[26:30])
+        return width & 0x3FFF, height & 0x3FFF
+    if chunk == b"VP8L":
+        bits = int.from_bytes(data[21:25], "little")
+        return (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+    if chunk == b"VP8X":
+        return int.from_bytes(data[24:27], "little") + 1, int.from_bytes(data[27:30], "little") + 1
+    return None
+
+
+_SVG_LENGTH = r'\s*=\s*["\']\s*([\d.]+)(?:px)?\s*["\']'
+
+
+def _svg_size(data: bytes) -> Optional[Tuple[int, int]]:
+    head = data[:4096].decode("utf-8", "ignore")
+    tag = re.search(r"<svg\b[^>]*>", head, re.IGNORECASE | re.DOTALL)
+    if not tag:
+        return None
+    width = re.search(r"\swidth" + _SVG_LENGTH, tag.group(0))
+    height = re.search(r"\sheight" + _SVG_LENGTH, tag.group(0))
+    if width and height:
+        return round(float(width.group(1))), round(float(height.group(1)))
+    view_box = re.search(r'viewBox\s*=\s*["\']\s*[\d.\-]+[\s,]+[\d.\-]+[\s,]+([\d.]+)[\s,]+([\d.]+)', tag.group(0))
+    if view_box:
+        return round(float(view_box.group(1))), round(float(view_box.group(2)))
+    return None
+
+
+IMAGE_FORMATS = [("png", _png_size), ("gif", _gif_size), ("jpeg", _jpeg_size), ("webp", _webp_size), ("svg", _svg_size)]
+
+
+def probe_image(data: bytes) -> Dict[str, Any]:
+    """形式と寸法（判別できない場合は None）"""
+    for name, probe in IMAGE_FORMATS:
+        try:
+            size = probe(data)
+        except (struct.error, ValueError):
+            size = None
+        if size:
+            return {"format": name, "width": size[0], "height": size[1]}
+    return {"format": None, "width": None, "height": None}
+
+
+# ----------------------------------------------------------------------
+# アセットインデックス
+# ----------------------------------------------------------------------
+class AssetIndex:
+    """パス → (サイズ, 更新時刻, ハッシュ)、ハッシュ → (バイト数, 形式, 寸法) のキャッシュ"""
+
+    def __init__(self):
+        self.paths: Dict[str, List[Any]] = {}
+        self.assets: Dict[str, Dict[str, Any]] = {}
+        self.stats = {"stat": 0, "hashed": 0, "probed": 0}
+        self._seen: Dict[str, Optional[str]] = {}
+        self.dirty = False
+
+    @classmethod
+    def load(cls, path) -> "AssetIndex":
+        index = cls()
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return index
+        if data.get("version") == INDEX_VERSION:
+            index.paths = data.get("paths", {})
+            index.assets = data.get("assets", {})
+        return index
+
+    def save(self, path) -> None:
+        document = {"version": INDEX_VERSION, "paths": self.paths, "assets": self.assets}
+        atomic_write_text(Path(path), json.dumps(document, ensure_ascii=False, sort_keys=True))
+        self.dirty = False
+
+    def lookup(self, file: Path) -> Optional[str]:
+        """アセットのコンテンツハッシュ（存在しない場合は None）。同じパスは1回の実行で1度だけ stat する"""
+        key = str(file)
+        if key in self._seen:
+            return self._seen[key]
+
+        self.stats["stat"] += 1
+        try:
+            stat = os.stat(file)
+        except OSError:
+            stat = None
+        if stat is None or not S_ISREG(stat.st_mode):
+            self._seen[key] = None
+            if self.paths.pop(key, None) is not None:
+                self.dirty = True
+            return None
+
+        cached = self.paths.get(key)
+        if cached and cached[0] == stat.st_size and cached[1] == stat.st_mtime_ns and cached[2] in self.assets:
+            digest = cached[2]
+        else:
+            with open(file, "rb") as f:
+                data = f.read()
+            self.stats["hashed"] += 1
+            digest = hashlib.blake2b(data, digest_size=16).hexdigest()
+            if digest not in self.assets:
+                self.stats["probed"] += 1
+                self.assets[digest] = dict(probe_image(data), bytes=len(data))
+            self.paths[key] = [stat.st_size, stat.st_mtime_ns, digest]
+            self.dirty = True
+
+        self._seen[key] = digest
+        return digest
+
+    def prune(self) -> int:
+        """今回参照されなかったパスと、どのパスからも参照されないハッシュを削除"""
+        removed = [key for key in self.paths if key not in self._seen]
+        for key in removed:
+            del self.paths[key]
+        live = {entry[2] for entry in self.paths.values()}
+        for digest in [digest for digest in self.assets if digest not in live]:
+            del self.assets[digest]
+        if removed:
+            self.dirty = True
+        return len(removed)
+
+
+# ----------------------------------------------------------------------
+# ページ重量分析
+# ----------------------------------------------------------------------
+class PageWeightAnalyzer:
+    """ページごとの重量（本文＋ページ内で一意な画像の合計）と重複画像の検出"""
+
+    def __init__(self, corpus: Corpus, index: AssetIndex, public_dir: Optional[Path] = None,
+                 page_budget: int = 1024 * 1024, image_budget: int = 300 * 1024, duplicate_min_refs: int = 2):
+        self.corpus = corpus
+        self.index = index
+        self.public_dir = Path(public_dir) if public_dir else None
+        self.page_budget = page_budget
+        self.image_budget = image_budget
+        self.duplicate_min_refs = duplicate_min_refs
+
+    def resolve(self, source: Path, src: str) -> Optional[Path]:
+        path, _ = split_anchor(src.split("?", 1)[0])
+        path = unquote(path)
+        if not path:
+            return None
+        if path.startswith("/"):
+            if self.public_dir is None:
+                return None
+            return Path(os.path.normpath(self.public_dir / path.lstrip("/")))
+        return Path(os.path.normpath(source.parent / path))
+
+    def analyze(self) -> Dict[str, Any]:
+        """全ページの重量と予算超過（画像のないページも本文のバイト数で判定する）"""
+        self.corpus.ensure_scanned()
+        pages: Dict[str, Dict[str, Any]] = {}
+        references: Dict[str, List[str]] = {}   # ハッシュ → 参照元ページ（重複を含む）
+        copies: Dict[str, set] = {}             # ハッシュ → 実ファイルパス
+        missing: List[Dict[str, str]] = []
+        oversized: Dict[str, Dict[str, Any]] = {}
+        external = 0
+
+        for entry in self.corpus:
+            page = self.corpus.relative_path(entry)
+            images = extract_images(entry.content)
+            unique: Dict[str, str] = {}
+            page_external = 0
+            # 画像のないページは参照の解決だけを省略する
+            for src in images:
+                if not src or src.startswith("data:"):
+                    continue
+                if is_external(src):
+                    page_external += 1
+                    continue
+                file = self.resolve(entry.path, src)
+                digest = self.index.lookup(file) if file is not None else None
+                if digest is None:
+                    missing.append({"page": page, "src": src})
+                    continue
+                references.setdefault(digest, []).append(page)
+                copies.setdefault(digest, set()).add(str(file))
+                unique.setdefault(digest, str(file))
+                asset = self.index.assets[digest]
+                if asset["bytes"] > self.image_budget:
+                    oversized.setdefault(str(file), dict(asset, path=str(file), pages=[]))["pages"].append(page)
+
+            image_bytes = sum(self.index.assets[digest]["bytes"] for digest in unique)
+            external += page_external
+            pages[page] = {
+                "images": len(images),
+                "unique_images": len(unique),
+                "external_images": page_external,
+                "content_bytes": entry.size,
+                "image_bytes": image_bytes,
+                "total_bytes": entry.size + image_bytes,
+                "over_budget": entry.size + image_bytes > self.page_budget,
+            }
+
+        duplicates = []
+        for digest, paths in copies.items():
+            refs = len(references[digest])
+            if len(paths) > 1 and refs >= self.duplicate_min_refs:
+                size = self.index.assets[digest]["bytes"]
+                duplicates.append({
+                    "digest": digest,
+                    "bytes": size,
+                    "copies": sorted(paths),
+                    "references": refs,
+                    "pages": sorted(set(references[digest])),
+                    "wasted_bytes": size * (len(paths) - 1),
+                })
+        duplicates.sort(key=lambda item: (-item["wasted_bytes"], item["digest"]))
+
+        over_budget = sorted((page for page, data in pages.items() if data["over_budget"]),
+                             key=lambda page: -pages[page]["total_bytes"])
+        return {
+            "budget": {"page_bytes": self.page_budget, "image_bytes": self.image_budget},
+            "summary": {
+                "pages": len(pages),
+                "pages_with_images": sum(1 for data in pages.values() if data["images"]),
+                "assets": len(references),
+                "asset_bytes": sum(self.index.assets[digest]["bytes"] for digest in references),
+                "external_images": external,
+                "missing_images": len(missing),
+                "pages_over_budget": len(over_budget),
+                "oversized_images": len(oversized),
+                "duplicate_groups": len(duplicates),
+                "wasted_bytes": sum(item["wasted_bytes"] for item in duplicates),
+            },
+            "pages": {page: pages[page] for page in sorted(pages)},
+            "over_budget": over_budget,
+            "oversized_images": sorted(oversized.values(), key=lambda item: -item["bytes"]),
+            "duplicates": duplicates,
+            "missing": missing,
+            "index_stats": dict(self.index.stats),
+        }
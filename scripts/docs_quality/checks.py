@@ -0,0 +1,378 @@
+# -*- coding: utf-8 -*-
+
+"""
+チェックの登録と実行計画（チェック別のコスト計測・時間予算つき実行）
+作成日: 2026-10-19
+目的: 分析器の固定のメソッド呼び出しを登録制のチェックへ置き換え、有効なチェックが必要とする特徴量だけを抽出する
+
+- 特徴量（feature）: 本文から1回だけ抽出する中間結果（行分割・字種統計・リンク等）。前提とする特徴量を宣言する
+- チェック（check）: 必要な特徴量・前提チェック・コスト区分（cheap / moderate / expensive）・価値・
+  出力項目を宣言し、出力項目の dict を返す（宣言外の項目は CheckConfigError）。登録順に実行されるため、前提チェックは先に登録する
+- 適用範囲（scope）: file は文書ごとに実行、corpus（関連ドキュメント・翻訳の鮮度等）は全文書の分析後に1回だけ実行し、
+  レポートへ節と推奨事項を追加する。corpus のチェックは特徴量を持たず、計測は対象文書数で割った1ファイルあたりの値にする
+- 実行計画（plan）: 有効なチェックと、その前提チェック・特徴量の閉包。どのチェックも必要としない特徴量は抽出しない
+- 計測: チェック・特徴量ごとの実行回数と所要時間。ワーカーからは drain して集約側で合算し、シャード間もマージできる
+- 時間予算（budget）: 1ファイルあたりの所要時間（前回までの計測値、未計測はコスト区分の既定値）から、
+  前提チェック・特徴量の追加分を含めた費用あたりの価値が高い順に、予算に収まるチェックを選ぶ。
+  必須チェック（required、総合スコア等）とその前提は予算にかかわらず残し、残りの予算を他のチェックに配分する
+"""
+
+import json
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from docs_quality.fsutil import atomic_write_text
+
+# コスト区分と、未計測時に仮定する1ファイルあたりの所要時間（秒）
+COST_CLASSES = {"cheap": 0.0002, "moderate": 0.002, "expensive": 0.01}
+# プロファイル: full は全チェック、quick は expensive を除くチェック
+PROFILES = ("full", "quick")
+# 適用範囲: file は文書ごと、corpus は全文書の分析後に1回
+SCOPES = ("file", "corpus")
+
+
+class CheckConfigError(Exception):
+    """チェックの登録・指定の誤り"""
+
+
+class Feature:
+    __slots__ = ("name", "requires", "extract")
+
+    def __init__(self, name: str, requires: Sequence[str], extract: Callable[[Any, Dict[str, Any]], Any]):
+        self.name = name
+        self.requires = tuple(requires)
+        self.extract = extract
+
+
+class Check:
+    __slots__ = ("name", "features", "checks", "cost", "value", "outputs", "run", "description", "scope")
+
+    def __init__(self, name: str, features: Sequence[str], checks: Sequence[str], cost: str, value: float,
+                 outputs: Sequence[str], run: Callable[[Any, Dict[str, Any], Dict[str, Any]], Dict[str, Any]],
+                 description: str, scope: str = "file"):
+        self.name = name
+        self.features = tuple(features)
+        self.checks = tuple(checks)
+        self.cost = cost
+        self.value = value
+        self.outputs = frozenset(outputs)
+        self.run = run
+        self.description = description
+        self.scope = scope
+
+
+class CheckStats:
+    """チェック・特徴量別の実行回数と所要時間"""
+
+    __slots__ = ("evaluated", "seconds")
+
+    def __init__(self, evaluated: int = 0, seconds: float = 0.0):
+        self.evaluated = evaluated
+        self.seconds = seconds
+
+
+class CostModel:
+    """1ファイルあたりの所要時間（秒）。計測値はファイルに保存し、次回の予算配分に使う"""
+
+    def __init__(self, seconds: Optional[Dict[str, float]] = None):
+        # キーは "check:名前" / "feature:名前"
+        self.seconds: Dict[str, float] = dict(seconds or {})
+
+    @classmethod
+    def load(cls, path) -> "CostModel":
+        path = Path(path)
+        if not path.exists():
+            return cls()
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return cls(json.load(f).get("seconds_per_file", {}))
+        except (OSError, ValueError):
+            return cls()
+
+    def save(self, path) -> None:
+        document = {"seconds_per_file": {key: round(value, 8) for key, value in sorted(self.seconds.items())}}
+        atomic_write_text(Path(path), json.dumps(document, ensure_ascii=False, indent=2))
+
+    def update(self, counters: Dict[str, Any]) -> None:
+        """export_stats() 形式のカウンタで計測値を置き換える（実行されたものだけ）"""
+        for kind in ("checks", "features"):
+            for name, (evaluated, seconds) in counters.get(kind, {}).items():
+                if evaluated:
+                    self.seconds[f"{kind[:-1]}:{name}"] = seconds / evaluated
+
+    def check(self, check: Check) -> float:
+        return self.seconds.get(f"check:{check.name}", COST_CLASSES[check.cost])
+
+    def feature(self, feature: Feature) -> float:
+        return self.seconds.get(f"feature:{feature.name}", COST_CLASSES["cheap"])
+
+
+class ExecutionPlan:
+    """有効なチェックと必要な特徴量（いずれも実行順）。corpus_checks は全文書の分析後に run_corpus で実行する"""
+
+    def __init__(self, checks: List[Check], features: List[Feature], corpus_checks: Sequence[Check] = ()):
+        self.checks = checks
+        self.features = features
+        self.corpus_checks = list(corpus_checks)
+        self.check_stats: Dict[str, CheckStats] = {check.name: CheckStats() for check in checks + self.corpus_checks}
+        self.feature_stats: Dict[str, CheckStats] = {feature.name: CheckStats() for feature in features}
+
+    @property
+    def names(self) -> Tuple[str, ...]:
+        return tuple(check.name for check in self.checks + self.corpus_checks)
+
+    def run(self, owner: Any, context: Dict[str, Any]) -> Dict[str, Any]:
+        """特徴量を抽出して context へ入れ、チェックを順に実行して出力項目をまとめる
+
+        各チェックにはそれまでのチェックの出力（fields）も渡す。
+        """
+        clock = time.perf_counter
+        fields: Dict[str, Any] = {}
+        for feature in self.features:
+            begin = clock()
+            context[feature.name] = feature.extract(owner, context)
+            stats = self.feature_stats[feature.name]
+            stats.evaluated += 1
+            stats.seconds += clock() - begin
+        for check in self.checks:
+            begin = clock()
+            outputs = check.run(owner, fields, context)
+            stats = self.check_stats[check.name]
+            stats.evaluated += 1
+            stats.seconds += clock() - begin
+            self._ensure_declared(check, outputs)
+            fields.update(outputs)
+        return fields
+
+    def run_corpus(self, owner: Any, results: Dict[str, Any], context: Dict[str, Any],
+                   documents: int) -> Dict[str, Any]:
+        """corpus のチェックを順に実行し、出力（レポートの節）を results へ追加する
+
+        計測は documents 件の評価として記録し、今回の実行分のカウンタ（export_stats() 形式）を返す。
+        """
+        clock = time.perf_counter
+        counters: Dict[str, Any] = {"checks": {}, "features": {}}
+        for check in self.corpus_checks:
+            begin = clock()
+            outputs = check.run(owner, results, context)
+            elapsed = clock() - begin
+            stats = self.check_stats[check.name]
+            stats.evaluated += documents
+            stats.seconds += elapsed
+            counters["checks"][check.name] = [documents, elapsed]
+            self._ensure_declared(check, outputs)
+            results.update(outputs)
+        return counters
+
+    @staticmethod
+    def _ensure_declared(check: Check, outputs: Dict[str, Any]) -> None:
+        if not check.outputs.issuperset(outputs):
+            undeclared = ", ".join(sorted(set(outputs) - check.outputs))
+            raise CheckConfigError(f"チェック {check.name} が宣言外の項目を出力しました: {undeclared}")
+
+    def export_stats(self) -> Dict[str, Any]:
+        """統計カウンタ（JSON化・マージ可能な形式）"""
+        return {
+            "checks": {name: [stats.evaluated, stats.seconds] for name, stats in self.check_stats.items()},
+            "features": {name: [stats.evaluated, stats.seconds] for name, stats in self.feature_stats.items()},
+        }
+
+    def drain_stats(self) -> Dict[str, Any]:
+        """統計を取り出してリセット（別プロセスのワーカーから集約側へ渡す）"""
+        drained = self.export_stats()
+        self.check_stats = {name: CheckStats() for name in self.check_stats}
+        self.feature_stats = {name: CheckStats() for name in self.feature_stats}
+        return drained
+
+    def merge_stats(self, drained: Dict[str, Any]) -> None:
+        for kind, table in (("checks", self.check_stats), ("features", self.feature_stats)):
+            for name, (evaluated, seconds) in drained[kind].items():
+                stats = table.setdefault(name, CheckStats())
+                stats.evaluated += evaluated
+                stats.seconds += seconds
+
+
+class CheckRegistry:
+    """特徴量とチェックの登録簿
+
+        registry = CheckRegistry()
+
+        @registry.feature("lines")
+        def lines(owner, context):
+            return context["content"].split("\\n")
+
+        @registry.check("line_count", features=("lines",), cost="cheap", value=1, outputs=("lines",))
+        def line_count(owner, fields, context):
+            return {"lines": len(context["lines"])}
+    """
+
+    def __init__(self):
+        self.features: Dict[str, Feature] = {}
+        self.checks: Dict[str, Check] = {}
+
+    def feature(self, name: str, requires: Sequence[str] = ()):
+        def register(extract):
+            self._ensure_new(name, self.features, "特徴量")
+            for required in requires:
+                if required not in self.features:
+                    raise CheckConfigError(f"特徴量 {name} の前提 {required} が未登録です")
+            self.features[name] = Feature(name, requires, extract)
+            return extract
+        return register
+
+    def check(self, name: str, features: Sequence[str] = (), checks: Sequence[str] = (), cost: str = "cheap",
+              value: float = 1.0, outputs: Sequence[str] = (), description: str = "", scope: str = "file"):
+        def register(run):
+            self._ensure_new(name, self.checks, "チェック")
+            if cost not in COST_CLASSES:
+                raise CheckConfigError(f"チェック {name} のコスト区分が不正です: {cost}")
+            if scope not in SCOPES:
+                raise CheckConfigError(f"チェック {name} の適用範囲が不正です: {scope}")
+            if scope == "corpus" and features:
+                raise CheckConfigError(f"チェック {name} は corpus のため特徴量を指定できません")
+            for feature in features:
+                if feature not in self.features:
+                    raise CheckConfigError(f"チェック {name} の特徴量 {feature} が未登録です")
+            for required in checks:
+                if required not in self.checks:
+                    raise CheckConfigError(f"チェック {name} の前提チェック {required} が未登録です（先に登録してください）")
+                if scope == "file" and self.checks[required].scope == "corpus":
+                    raise CheckConfigError(f"チェック {name} は corpus のチェック {required} を前提にできません")
+            self.checks[name] = Check(name, features, checks, cost, value, outputs, run, description, scope)
+            return run
+        return register
+
+    @staticmethod
+    def _ensure_new(name: str, table: Dict[str, Any], label: str) -> None:
+        if name in table:
+            raise CheckConfigError(f"{label} {name} が重複しています")
+
+    # ------------------------------------------------------------------
+    # 実行計画
+    # ------------------------------------------------------------------
+    def resolve(self, profile: str = "full", include: Optional[Iterable[str]] = None,
+                exclude: Iterable[str] = ()) -> List[str]:
+        """プロファイル・明示指定・除外指定から有効にするチェック名（前提チェックが除外されたものも除く）"""
+        if profile not in PROFILES:
+            raise CheckConfigError(f"不明なプロファイルです: {profile}（{' / '.join(PROFILES)}）")
+        names = list(include) if include is not None else [
+            name for name, check in self.checks.items() if profile == "full" or check.cost != "expensive"
+        ]
+        unknown = [name for name in list(names) + list(exclude) if name not in self.checks]
+        if unknown:
+            raise CheckConfigError(f"不明なチェックです: {', '.join(unknown)}（登録済み: {', '.join(self.checks)}）")
+        excluded = set(exclude)
+        return [name for name in self.checks if name in names and not (self._check_closure([name]) & excluded)]
+
+    def _check_closure(self, names: Iterable[str]) -> Set[str]:
+        closure: Set[str] = set()
+        pending = list(names)
+        while pending:
+            name = pending.pop()
+            if name not in closure:
+                closure.add(name)
+                pending.extend(self.checks[name].checks)
+        return closure
+
+    def _feature_closure(self, checks: Iterable[str]) -> Set[str]:
+        closure: Set[str] = set()
+        pending = [feature for name in checks for feature in self.checks[name].features]
+        while pending:
+            name = pending.pop()
+            if name not in closure:
+                closure.add(name)
+                pending.extend(self.features[name].requires)
+        return closure
+
+    def plan(self, names: Iterable[str]) -> ExecutionPlan:
+        """names と前提チェックを登録順に、必要な特徴量を登録順（前提が先）に並べた実行計画"""
+        checks = self._check_closure(names)
+        features = self._feature_closure(checks)
+        return ExecutionPlan([check for name, check in self.checks.items() if name in checks and check.scope == "file"],
+                             [feature for name, feature in self.features.items() if name in features],
+                             [check for name, check in self.checks.items() if name in checks and check.scope == "corpus"])
+
+    def select(self, candidates: Sequence[str], budget_seconds: float, files: int, costs: CostModel,
+               parallelism: int = 1, required: Iterable[str] = ()) -> Tuple[List[str], Dict[str, Any]]:
+        """予算内で価値の合計が大きくなるチェック（貪欲法: 追加費用あたりの追加価値が高い順）
+
+        required（candidates に含まれるもの）とその前提は予算を超えても必ず選ぶ。
+        """
+        per_file = budget_seconds * max(parallelism, 1) / max(files, 1)
+        selected = self._check_closure(name for name in required if name in candidates)
+        features = self._feature_closure(selected)
+        spent = sum(costs.check(self.checks[check]) for check in selected) + \
+            sum(costs.feature(self.features[feature]) for feature in features)
+        remaining = [name for name in candidates if name not in selected]
+        while remaining:
+            best = None
+            for name in remaining:
+                added = self._check_closure([name]) - selected
+                added_features = self._feature_closure(added) - features
+                cost = sum(costs.check(self.checks[check]) for check in added) + \
+                    sum(costs.feature(self.features[feature]) for feature in added_features)
+                if spent + cost > per_file:
+                    continue
+                gain = sum(self.checks[check].value for check in added)
+                density = gain / max(cost, 1e-9)
+                if best is None or density > best[0]:
+                    best = (density, added, added_features, cost)
+            if best is None:
+                break
+            _, added, added_features, cost = best
+            selected |= added
+            features |= added_features
+            spent += cost
+            remaining = [name for name in remaining if name not in selected]
+
+        chosen = [name for name in self.checks if name in selected]
+        return chosen, {
+            "seconds": budget_seconds,
+            "files": files,
+            "parallelism": max(parallelism, 1),
+            "estimated_seconds": round(spent * files / max(parallelism, 1), 3),
+            "selected": chosen,
+            "required": [name for name in chosen if name in self._check_closure(
+                name for name in required if name in candidates)],
+            "dropped": [name for name in candidates if name not in selected],
+        }
+
+    def describe(self, costs: Optional[CostModel] = None) -> List[Dict[str, Any]]:
+        """登録済みチェックの一覧（--list-checks 用）"""
+        costs = costs or CostModel()
+        return [{
+            "name": check.name,
+            "description": check.description,
+            "cost": check.cost,
+            "scope": check.scope,
+            "value": check.value,
+            "features": list(check.features),
+            "requires": list(check.checks),
+            "outputs": sorted(check.outputs),
+            "ms_per_file": round(costs.check(check) * 1000, 3),
+        } for check in self.checks.values()]
+
+
+def merge_check_counters(target: Dict[str, Any], source: Dict[str, Any]) -> Dict[str, Any]:
+    for kind in ("checks", "features"):
+        for name, values in source.get(kind, {}).items():
+            current = target.setdefault(kind, {}).setdefault(name, [0, 0.0])
+            current[0] += values[0]
+            current[1] += values[1]
+    return target
+
+
+def check_stats_report(counters: Dict[str, Any], budget: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """export_stats() 形式のカウンタからレポート用の統計を作成"""
+    def table(kind: str) -> Dict[str, Dict[str, Any]]:
+        return {
+            name: {
+                "files": evaluated,
+                "seconds": round(seconds, 6),
+                "ms_per_file": round(seconds / evaluated * 1000, 4) if evaluated else 0.0,
+            }
+            for name, (evaluated, seconds) in counters.get(kind, {}).items()
+        }
+
+    return {"checks": table("checks"), "features": table("features"), "budget": budget}
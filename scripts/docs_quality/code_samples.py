@@ -0,0 +1,364 @@
+# -*- coding: utf-8 -*-
+
+"""
+コードサンプルの構文検査
+作成日: 2026-10-19
+目的: 文書中のフェンスドコードブロックを言語ごとに構文検査し、壊れたサンプル（JSON のリクエスト例・YAML 設定等）を
+      ファイルと行の位置つきで報告する
+
+- 抽出: フェンス（``` / ~~~、閉じフェンスは同じ記号で同じ長さ以上）の情報文字列の先頭語を言語名とする
+- 検査: 組み込みは json（標準ライブラリ。行全体の // コメントはファイル名等の注記として除いて検査）・
+  python（compile）・yaml（PyYAML がある場合のみ）。その他の言語は .docs-code-samples.json の hooks に
+  外部コマンドを登録する（ブロックを一時ファイルへ書き出して {file} を置き換え、終了コード 0 以外を構文エラーとする）
+- 時間制限: ブロックごとに timeout 秒（組み込みは SIGALRM のタイマー、フックは subprocess の timeout）。
+  SIGALRM のない環境では組み込みの検査は制限なし
+- 並列: 検査が必要なブロックが一定数以上ならプロセスプール（docs_quality.pipeline と同じ開始方式）で検査する
+- キャッシュ: (言語, 検査方法, 本文) のハッシュ → 結果。変更のないブロックは再検査しない（時間切れは次回再検査）
+"""
+
+import heapq
+import json
+import multiprocessing
+import os
+import pickle
+import re
+import signal
+import subprocess
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+from docs_quality.corpus import Corpus, content_digest
+from docs_quality.fsutil import atomic_write
+
+try:
+    import yaml
+except ImportError:  # PyYAML がなければ yaml は未検査として集計
+    yaml = None
+
+FENCE = re.compile(r" {0,3}(`{3,}|~{3,})[ \t]*([^\s`{]*)([^\n]*)")
+# 記号列の候補（固定文字列の検索は高速なため、記号ごとに探して位置順に併合する）
+FENCE_MARKS = (re.compile("```"), re.compile("~~~"))
+# JSON サンプルの行全体のコメント（"// backend/package.json に追加" 等）
+JSON_COMMENT_LINE = re.compile(r"^[ \t]*//.*$", re.MULTILINE)
+# フックの出力中の位置（"<sample>:12:5:" 形式、または "line 12" 形式）
+HOOK_LINE = re.compile(r":(\d+)(?::(\d+))?:|\bline (\d+)")
+DEFAULT_TIMEOUT = 2.0
+# 検査が必要なブロックがこれ未満の場合はプロセス起動コストの方が大きいため逐次検査
+POOL_MIN_BLOCKS = 32
+
+# (ブロック内の行, 桁, メッセージ)。構文が正しければ None
+SyntaxIssue = Optional[Tuple[int, int, str]]
+VALIDATORS: Dict[str, Callable[[str], SyntaxIssue]] = {}
+
+
+class CodeSampleConfigError(Exception):
+    pass
+
+
+class SampleTimeout(Exception):
+    pass
+
+
+class CodeSample(NamedTuple):
+    language: str
+    line: int      # 本文1行目の行番号（1始まり）
+    text: str
+
+
+def validator(*languages: str):
+    """組み込み検査の登録（言語名は小文字）"""
+    def register(function: Callable[[str], SyntaxIssue]):
+        for language in languages:
+            VALIDATORS[language] = function
+        return function
+    return register
+
+
+@validator("json")
+def _validate_json(text: str) -> SyntaxIssue:
+    try:
+        json.loads(JSON_COMMENT_LINE.sub("", text))
+    except json.JSONDecodeError as e:
+        return e.lineno, e.colno, e.msg
+    return None
+
+
+@validator("python", "py", "python3")
+def _validate_python(text: str) -> SyntaxIssue:
+    try:
+        compile(text, "<sample>", "exec", dont_inherit=True)
+    except SyntaxError as e:
+        return e.lineno or 1, e.offset or 1, e.msg
+    except ValueError as e:  # NUL 文字等
+        return 1, 1, str(e)
+    return None
+
+
+if yaml is not None:
+    @validator("yaml", "yml")
+    def _validate_yaml(text: str) -> SyntaxIssue:
+        try:
+            for _ in yaml.safe_load_all(text):
+                pass
+        except yaml.YAMLError as e:
+            mark = getattr(e, "problem_mark", None)
+            problem = getattr(e, "problem", None) or str(e).split("\n")[0]
+            return (mark.line + 1, mark.column + 1, problem) if mark is not None else (1, 1, problem)
+        return None
+
+
+def _fence_lines(content: str) -> Iterator[re.Match]:
+    """フェンスの行（行頭の正規表現で全位置を試すより、記号列を探してから行頭を確かめる方が速い）"""
+    end = 0
+    for position in heapq.merge(*((mark.start() for mark in pattern.finditer(content)) for pattern in FENCE_MARKS)):
+        if position < end:
+            continue
+        start = content.rfind("\n", 0, position) + 1
+        match = FENCE.match(content, start)
+        if match is not None and match.start(1) == position:
+            end = match.end()
+            yield match
+
+
+def code_samples(content: str) -> Iterator[CodeSample]:
+    """フェンスドコードブロック（閉じていないブロックは文書末まで）"""
+    fences = _fence_lines(content)
+    line = 1
+    position = 0
+    for opening in fences:
+        marker = opening.group(1)
+        body = opening.end() + 1
+        closing = None
+        for candidate in fences:
+            if candidate.group(1)[0] == marker[0] and len(candidate.group(1)) >= len(marker) \
+                    and not candidate.group(2) and not candidate.group(3).strip():
+                closing = candidate
+                break
+        line += content.count("\n", position, body)
+        text = content[body:closing.start() - 1] if closing is not None else content[body:]
+        yield CodeSample(opening.group(2).lower(), line, text if body <= len(content) else "")
+        if closing is None:
+            return
+        position = body
+
+
+class CodeSampleConfig:
+    """.docs-code-samples.json（無ければ組み込みの検査のみ）
+
+        {
+          "aliases": {"jsonc": "json"},
+          "hooks": {
+            "bash": {"command": ["bash", "-n", "{file}"], "suffix": ".sh"}
+          }
+        }
+    """
+
+    def __init__(self, aliases: Optional[Dict[str, str]] = None, hooks: Optional[Dict[str, Dict[str, Any]]] = None):
+        self.aliases = {key.lower(): value.lower() for key, value in (aliases or {}).items()}
+        self.hooks = {key.lower(): value for key, value in (hooks or {}).items()}
+
+    @classmethod
+    def load(cls, path) -> "CodeSampleConfig":
+        if path is None or not Path(path).exists():
+            return cls()
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                document = json.load(f)
+        except (OSError, ValueError) as e:
+            raise CodeSampleConfigError(f"コードサンプル検査の設定を読み込めません: {path}: {e}") from e
+        hooks = {}
+        for language, hook in document.get("hooks", {}).items():
+            if isinstance(hook, list):
+                hook = {"command": hook}
+            command = hook.get("command") if isinstance(hook, dict) else None
+            if not command or not any("{file}" in part for part in command):
+                raise CodeSampleConfigError(f"フック {language} の command に {{file}} がありません: {path}")
+            hooks[language] = {"command": list(command), "suffix": hook.get("suffix", "")}
+        return cls(document.get("aliases", {}), hooks)
+
+    def method(self, language: str) -> Optional[Tuple[str, Optional[Dict[str, Any]]]]:
+        """(検査する言語名, フック)。検査方法がなければ None（フックは組み込みより優先）"""
+        language = self.aliases.get(language, language)
+        if language in self.hooks:
+            return language, self.hooks[language]
+        if language in VALIDATORS:
+            return language, None
+        return None
+
+
+@contextmanager
+def time_limit(seconds: float):
+    """SIGALRM による時間制限（メインスレッド以外・SIGALRM のない環境では制限なし）"""
+    if not seconds or not hasattr(signal, "SIGALRM") or threading.current_thread() is not threading.main_thread():
+        yield
+        return
+
+    def expired(signum, frame):
+        raise SampleTimeout()
+
+    previous = signal.signal(signal.SIGALRM, expired)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+def _run_hook(hook: Dict[str, Any], text: str, timeout: float) -> SyntaxIssue:
+    descriptor, name = tempfile.mkstemp(suffix=hook.get("suffix", ""), prefix="docs-sample-")
+    try:
+        with os.fdopen(descriptor, "w", encoding="utf-8") as f:
+            f.write(text)
+        command = [part.replace("{file}", name) for part in hook["command"]]
+        try:
+            result = subprocess.run(command, capture_output=True, text=True, timeout=timeout or None)
+        except FileNotFoundError as e:
+            raise CodeSampleConfigError(f"フックのコマンドが見つかりません: {command[0]}") from e
+        except subprocess.TimeoutExpired as e:
+            raise SampleTimeout() from e
+        if result.returncode == 0:
+            return None
+        output = [line.replace(name, "<sample>") for line in (result.stderr + result.stdout).splitlines() if line.strip()]
+        message = output[0] if output else f"終了コード {result.returncode}"
+        position = HOOK_LINE.search(message)
+        if position:
+            return int(position.group(1) or position.group(3)), int(position.group(2) or 1), message
+        return 1, 1, message
+    finally:
+        os.unlink(name)
+
+
+def validate_sample(task: Tuple[str, Optional[Dict[str, Any]], str, float]) -> Tuple[str, int, int, str]:
+    """1ブロックの検査 (状態, 行, 桁, メッセージ)。状態は valid / invalid / timeout（プロセスプールから呼ぶ）"""
+    language, hook, text, timeout = task
+    try:
+        if hook is not None:
+            issue = _run_hook(hook, text, timeout)
+        else:
+            with time_limit(timeout):
+                issue = VALIDATORS[language](text)
+    except SampleTimeout:
+        return "timeout", 0, 0, f"{timeout:g}秒以内に検査が終わりませんでした"
+    if issue is None:
+        return "valid", 0, 0, ""
+    return ("invalid", *issue)
+
+
+def validate_samples(tasks: Sequence[Tuple[str, Optional[Dict[str, Any]], str, float]],
+                     workers: int) -> List[Tuple[str, int, int, str]]:
+    """ブロックの列を検査（件数が少なければ逐次）"""
+    if workers <= 1 or len(tasks) < POOL_MIN_BLOCKS:
+        return [validate_sample(task) for task in tasks]
+    methods = multiprocessing.get_all_start_methods()
+    context = multiprocessing.get_context("forkserver" if "forkserver" in methods else None)
+    with ProcessPoolExecutor(workers, mp_context=context) as executor:
+        return list(executor.map(validate_sample, tasks, chunksize=max(1, len(tasks) // (workers * 4))))
+
+
+class SampleCache:
+    """(言語, 検査方法, 本文) のハッシュ → 検査結果"""
+
+    VERSION = 1
+
+    def __init__(self):
+        self.results: Dict[str, Tuple[str, int, int, str]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def load(cls, path) -> "SampleCache":
+        cache = cls()
+        path = Path(path)
+        if not path.exists():
+            return cache
+        try:
+            with open(path, "rb") as f:
+                version, results = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, ValueError, AttributeError):
+            return cache
+        if version == cls.VERSION:
+            cache.results = results
+        return cache
+
+    def save(self, path, keep: Optional[Iterable[str]] = None) -> None:
+        """keep（現存するブロックのキー）以外のエントリは捨てて保存"""
+        if keep is not None:
+            keep = set(keep)
+            self.results = {key: value for key, value in self.results.items() if key in keep}
+        atomic_write(Path(path), pickle.dumps((self.VERSION, self.results), protocol=pickle.HIGHEST_PROTOCOL))
+
+    @staticmethod
+    def key(language: str, hook: Optional[Dict[str, Any]], text: str) -> str:
+        method = json.dumps(hook["command"]) if hook is not None else "builtin"
+        return content_digest(f"{language}\0{method}\0{text}".encode("utf-8"))
+
+
+def validate_code_samples(corpus: Corpus, config: CodeSampleConfig, cache: SampleCache, workers: int = 0,
+                          timeout: float = DEFAULT_TIMEOUT) -> Dict[str, Any]:
+    """コーパス内の全コードブロックの検査結果（キャッシュにない本文だけを検査）"""
+    started = time.perf_counter()
+    corpus.ensure_scanned()
+
+    blocks = 0
+    unchecked: Dict[str, int] = {}
+    located: List[Tuple[str, CodeSample, str, str]] = []     # (相対パス, ブロック, 検査する言語名, キー)
+    pending: Dict[str, Tuple[str, Optional[Dict[str, Any]], str, float]] = {}
+    for entry in sorted(corpus, key=lambda item: item.key):
+        relative = corpus.relative_path(entry)
+        for sample in code_samples(entry.content):
+            blocks += 1
+            method = config.method(sample.language)
+            if method is None:
+                name = sample.language or "(なし)"
+                unchecked[name] = unchecked.get(name, 0) + 1
+                continue
+            language, hook = method
+            key = SampleCache.key(language, hook, sample.text)
+            located.append((relative, sample, language, key))
+            if key in cache.results:
+                cache.hits += 1
+            elif key not in pending:
+                cache.misses += 1
+                pending[key] = (language, hook, sample.text, timeout)
+
+    results = dict(cache.results)
+    for key, result in zip(pending, validate_samples(list(pending.values()), workers)):
+        results[key] = result
+        if result[0] != "timeout":
+            cache.results[key] = result
+
+    invalid: List[Dict[str, Any]] = []
+    timeouts: List[Dict[str, Any]] = []
+    languages: Dict[str, Dict[str, int]] = {}
+    for relative, sample, language, key in located:
+        status, line, column, message = results[key]
+        counts = languages.setdefault(language, {"checked": 0, "invalid": 0})
+        counts["checked"] += 1
+        if status == "valid":
+            continue
+        item = {"file": relative, "line": sample.line + max(line, 1) - 1, "column": column, "language": language,
+                "message": message}
+        if status == "timeout":
+            timeouts.append(item)
+        else:
+            counts["invalid"] += 1
+            invalid.append(item)
+
+    return {
+        "blocks": blocks,
+        "checked": len(located),
+        "validated": len(pending),
+        "cached": cache.hits,
+        "invalid": invalid,
+        "timeouts": timeouts,
+        "languages": dict(sorted(languages.items())),
+        "unchecked_languages": dict(sorted(unchecked.items(), key=lambda item: (-item[1], item[0]))),
+        "workers": workers if workers > 1 and len(pending) >= POOL_MIN_BLOCKS else 0,
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 2),
+    }
@@ -0,0 +1,168 @@
+# -*- coding: utf-8 -*-
+
+"""
+ドキュメントコーパス（メモリ常駐）
+作成日: 2026-10-19
+目的: Markdownファイルの内容・メタ情報を保持し、変更ファイルのみ再読み込みする
+"""
+
+import hashlib
+import time
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+from docs_quality.walker import Walker
+
+
+def content_digest(data: bytes) -> str:
+    """コンテンツハッシュ（キャッシュキー用）"""
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+class CorpusEntry:
+    """コーパス内の1ファイル"""
+
+    __slots__ = ("path", "key", "size", "mtime_ns", "digest", "content")
+
+    def __init__(self, path: Path, size: int, mtime_ns: int, digest: str, content: str):
+        self.path = path
+        self.key = str(path)
+        self.size = size
+        self.mtime_ns = mtime_ns
+        self.digest = digest
+        self.content = content
+
+
+class CorpusChanges:
+    """scan() の差分結果"""
+
+    def __init__(self, changed: List[str], removed: List[str]):
+        self.changed = changed
+        self.removed = removed
+
+    def __bool__(self) -> bool:
+        return bool(self.changed or self.removed)
+
+
+class Corpus:
+    """docs_dir 配下の Markdown をメモリに保持するコーパス
+
+    キーは `str(path)`（従来の content_analysis のキーと同じ形式）。
+    scan() は stat のみで変更を判定し、サイズまたは mtime が変わったファイルだけを読み直す。
+    shard（docs_quality.sharding.ShardSpec）を指定すると、担当シャードのファイルのみを対象とする。
+    走査は docs_quality.walker（exclude・.gitignore / .docsignore に一致するディレクトリには降りない）。
+    pattern は包含パターン1つ、または複数パターンの列。
+    """
+
+    def __init__(self, docs_dir, pattern: Union[str, Sequence[str]] = "**/*.md", shard=None, exclude: Sequence[str] = ()):
+        self.docs_dir = Path(docs_dir)
+        self.pattern = pattern
+        self.shard = shard
+        self.exclude = tuple(exclude)
+        self.entries: Dict[str, CorpusEntry] = {}
+        self.generation = 0
+        self.last_scan: Optional[float] = None
+
+    def stat_files(self) -> Dict[str, Tuple[Path, int, int]]:
+        """読み込みなしで対象ファイルと (size, mtime_ns) を列挙（キー順）"""
+        stats = {}
+        include = (self.pattern,) if isinstance(self.pattern, str) else tuple(self.pattern)
+        for item in Walker(self.docs_dir, include=include, exclude=self.exclude).files():
+            if self.shard is not None and not self.shard.contains(item.relative):
+                continue
+            stats[str(item.path)] = (item.path, item.size, item.mtime_ns)
+        return stats
+
+    def scan(self) -> CorpusChanges:
+        """ファイルツリーを走査し、追加・変更・削除を反映する"""
+        changed = []
+        stats = self.stat_files()
+
+        for key, file, size, mtime_ns in self.pending(stats):
+            entry = self.read(file, size, mtime_ns)
+            if entry is not None and not self.touch_if_unchanged(entry):
+                self.store(entry)
+                changed.append(key)
+
+        return self.finish_scan(changed, self.prune(stats))
+
+    def pending(self, stats: Dict[str, Tuple[Path, int, int]]) -> List[Tuple[str, Path, int, int]]:
+        """stat_files() の結果のうち、サイズまたは mtime が変わった（読み直しが必要な）ファイル"""
+        pending = []
+        for key, (file, size, mtime_ns) in stats.items():
+            current = self.entries.get(key)
+            if current and current.size == size and current.mtime_ns == mtime_ns:
+                continue
+            pending.append((key, file, size, mtime_ns))
+        return pending
+
+    def touch_if_unchanged(self, entry: CorpusEntry) -> bool:
+        """内容が既存エントリと同じなら mtime のみ更新して True（touch のみ）"""
+        current = self.entries.get(entry.key)
+        if current and current.digest == entry.digest:
+            current.mtime_ns = entry.mtime_ns
+            return True
+        return False
+
+    def store(self, entry: CorpusEntry) -> None:
+        self.entries[entry.key] = entry
+
+    def prune(self, stats: Dict[str, Tuple[Path, int, int]]) -> List[str]:
+        """削除されたファイルのエントリを除去"""
+        removed = [key for key in self.entries if key not in stats]
+        for key in removed:
+            del self.entries[key]
+        return removed
+
+    def finish_scan(self, changed: List[str], removed: List[str]) -> CorpusChanges:
+        self.last_scan = time.time()
+        changes = CorpusChanges(changed, removed)
+        if changes:
+            self.generation += 1
+        return changes
+
+    def read(self, file: Path, size: int, mtime_ns: int) -> Optional[CorpusEntry]:
+        """1ファイルを読み込みエントリを作成（コーパスへは登録しない）"""
+        try:
+            data = file.read_bytes()
+        except OSError as e:
+            print(f"⚠️ ファイル読み込みエラー {file}: {e}")
+            return None
+
+        content = data.decode("utf-8", errors="replace")
+        return CorpusEntry(file, size, mtime_ns, content_digest(data), content)
+
+    def refresh(self, file: Path) -> Optional[CorpusEntry]:
+        """1ファイルだけ読み直す（変更通知用、ツリーは走査しない）。削除されていればエントリを除いて None"""
+        key = str(file)
+        try:
+            stat = file.stat()
+        except OSError:
+            if self.entries.pop(key, None) is not None:
+                self.generation += 1
+            return None
+        entry = self.read(file, stat.st_size, stat.st_mtime_ns)
+        if entry is None:
+            return None
+        if not self.touch_if_unchanged(entry):
+            self.store(entry)
+            self.generation += 1
+        return self.entries[key]
+
+    def ensure_scanned(self) -> None:
+        """未走査の場合のみ scan() する（共有コーパスの二重走査防止）"""
+        if self.last_scan is None:
+            self.scan()
+
+    def get(self, key: str) -> Optional[CorpusEntry]:
+        return self.entries.get(key)
+
+    def relative_path(self, entry: CorpusEntry) -> str:
+        """docs_dir からの相対パス（POSIX形式）"""
+        return entry.path.relative_to(self.docs_dir).as_posix()
+
+    def __iter__(self) -> Iterator[CorpusEntry]:
+        return iter(self.entries.values())
+
+    def __len__(self) -> int:
+        return len(self.entries)
@@ -0,0 +1,32 @@
+# -*- coding: utf-8 -*-
+
+"""
+ファイル書き込みユーティリティ
+作成日: 2026-10-19
+目的: レポート・インデックス等を途中状態なしで書き出す
+"""
+
+import os
+import tempfile
+from pathlib import Path
+
+
+def atomic_write(path: Path, data: bytes) -> None:
+    """一時ファイルへ書き込み後に置き換える（読み手が途中状態を見ない）"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=str(path.parent), prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        # mkstemp は 0600 で作成するため、静的ホスティング向けに通常の権限へ戻す
+        os.chmod(tmp_name, 0o644)
+        os.replace(tmp_name, path)
+    except BaseException:
+        if os.path.exists(tmp_name):
+            os.unlink(tmp_name)
+        raise
+
+
+def atomic_write_text(path: Path, text: str) -> None:
+    atomic_write(path, text.encode("utf-8"))
@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+
+"""
+ストリーミングJSON読み込み
+作成日: 2026-10-19
+目的: 数MBのレポートJSONを全体を読み込まずに、オブジェクトのメンバーを1件ずつ取り出す
+
+    with JsonStream.open(path) as stream:
+        for key in stream.members():           # 最上位オブジェクトのキー
+            if key == "content_analysis":
+                for file_key in stream.members():
+                    record = stream.value()     # 1ファイル分だけデコード
+            else:
+                stream.skip()                   # 不要な値は構築せずに読み飛ばす
+
+値のデコードは json.JSONDecoder.raw_decode（C実装）に任せ、構造の走査のみを Python で行う。
+メモリ使用量はチャンクサイズと、取り出した値のうち最大のものに比例する。
+"""
+
+import json
+import re
+from typing import IO, Any, Iterator, Optional
+
+CHUNK_SIZE = 64 * 1024
+WHITESPACE = " \t\n\r"
+SCALAR_END = re.compile(r"[\s,\]}]")
+
+
+class JsonStreamError(ValueError):
+    """JSONの構文エラー・想定外の構造"""
+
+
+class JsonStream:
+    """テキストストリーム上の逐次JSONリーダー"""
+
+    def __init__(self, source: IO[str], chunk_size: int = CHUNK_SIZE):
+        self.source = source
+        self.chunk_size = chunk_size
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+
+    @classmethod
+    def open(cls, path, chunk_size: int = CHUNK_SIZE) -> "JsonStream":
+        return cls(open(path, "r", encoding="utf-8"), chunk_size)
+
+    def close(self) -> None:
+        self.source.close()
+
+    def __enter__(self) -> "JsonStream":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    # ------------------------------------------------------------------
+    # バッファ
+    # ------------------------------------------------------------------
+    def _fill(self, size: Optional[int] = None) -> bool:
+        """チャンクを追加で読み込む（読み込み済み部分は捨てる）"""
+        if self.eof:
+            return False
+        chunk = self.source.read(size or self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        if self.pos:
+            self.buffer = self.buffer[self.pos:]
+            self.pos = 0
+        self.buffer += chunk
+        return True
+
+    def _peek(self) -> str:
+        """空白を読み飛ばし、次の文字を返す（終端では空文字）"""
+        while True:
+            buffer, pos = self.buffer, self.pos
+            while pos < len(buffer) and buffer[pos] in WHITESPACE:
+                pos += 1
+            self.pos = pos
+            if pos < len(buffer):
+                return buffer[pos]
+            if not self._fill():
+                return ""
+
+    def _expect(self, char: str) -> None:
+        found = self._peek()
+        if found != char:
+            raise JsonStreamError(f"'{char}' を期待しましたが '{found or 'EOF'}' でした")
+        self.pos += 1
+
+    # ------------------------------------------------------------------
+    # 値
+    # ------------------------------------------------------------------
+    def value(self) -> Any:
+        """次の値を1つデコード（値が途中で切れている場合は読み足して再試行）"""
+        if self._peek() not in '"{[':
+            # 数値・リテラルはバッファ末尾で切れていてもデコードに成功してしまうため、終端まで読み足す
+            while not SCALAR_END.search(self.buffer, self.pos) and self._fill():
+                pass
+        size = self.chunk_size
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError as e:
+                if not self._fill(size):
+                    raise JsonStreamError(f"JSONの構文エラー: {e}") from None
+                size *= 2
+                continue
+            self.pos = end
+            return value
+
+    def skip(self) -> None:
+        """次の値を読み飛ばす（オブジェクト・配列は要素単位で走査し、全体を構築しない）"""
+        char = self._peek()
+        if char == "{":
+            for _ in self.members():
+                self.skip()
+        elif char == "[":
+            for _ in self.items():
+                self.skip()
+        else:
+            self.value()
+
+    def members(self) -> Iterator[str]:
+        """オブジェクトのキーを順に返す。呼び出し側はキーごとに value() / skip() / members() で値を消費する"""
+        self._expect("{")
+        if self._peek() == "}":
+            self.pos += 1
+            return
+        while True:
+            key = self.value()
+            if not isinstance(key, str):
+                raise JsonStreamError("オブジェクトのキーが文字列ではありません")
+            self._expect(":")
+            yield key
+            char = self._peek()
+            self.pos += 1
+            if char == "}":
+                return
+            if char != ",":
+                raise JsonStreamError(f"',' または '}}' を期待しましたが '{char or 'EOF'}' でした")
+
+    def items(self) -> Iterator[int]:
+        """配列の要素位置を順に返す。呼び出し側は要素ごとに値を消費する"""
+        self._expect("[")
+        if self._peek() == "]":
+            self.pos += 1
+            return
+        index = 0
+        while True:
+            yield index
+            index += 1
+            char = self._peek()
+            self.pos += 1
+            if char == "]":
+                return
+            if char != ",":
+                raise JsonStreamError(f"',' または ']' を期待しましたが '{char or 'EOF'}' でした")
@@ -0,0 +1,356 @@
+# -*- coding: utf-8 -*-
+
+"""
+外部リンクチェッカー（asyncio）
+作成日: 2026-10-19
+目的: コーパス全体の外部URLを重複排除し、ホスト単位の接続再利用・同時実行数・レート制限付きで並行検証する
+
+- HTTP/1.1 keep-alive の接続をホストごとにプールして再利用（標準ライブラリのみ、外部依存なし）
+- HEAD で確認し、HEAD を受け付けない／エラーを返すサーバーには GET で再確認
+- リダイレクトは MAX_REDIRECTS 回まで追跡
+- 結果は TTL 付きでキャッシュし（.quality-cache/external-links.json）、期限切れのURLのみ再検証する
+"""
+
+import asyncio
+import json
+import ssl
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urljoin, urlsplit
+
+from docs_quality.corpus import Corpus
+from docs_quality.fsutil import atomic_write_text
+from docs_quality.links import LinkGraph, split_anchor
+
+CACHE_VERSION = 1
+MAX_REDIRECTS = 5
+# GET 応答の本文をこれ以上読まない（超える場合は接続を再利用しない）
+MAX_BODY_BYTES = 1024 * 1024
+USER_AGENT = "WebSys-DocsLinkChecker/1.0"
+# HEAD ではなく GET で再確認するステータス（HEAD 非対応・HEAD のみ拒否するサーバー）
+HEAD_FALLBACK_STATUSES = {400, 403, 404, 405, 406, 500, 501, 503}
+REDIRECT_STATUSES = {301, 302, 303, 307, 308}
+
+
+def collect_external_urls(corpus: Corpus) -> Dict[str, List[str]]:
+    """http(s) の外部URL → 参照元文書（URLはアンカーを除いて重複排除）"""
+    corpus.ensure_scanned()
+    urls: Dict[str, List[str]] = {}
+    for source, targets in LinkGraph.build(corpus).external.items():
+        for target in targets:
+            if not target.lower().startswith(("http://", "https://")):
+                continue
+            url, _ = split_anchor(target)
+            sources = urls.setdefault(url, [])
+            if source not in sources:
+                sources.append(source)
+    return {url: urls[url] for url in sorted(urls)}
+
+
+# ----------------------------------------------------------------------
+# 結果キャッシュ
+# ----------------------------------------------------------------------
+class LinkCache:
+    """URL → 検証結果（checked_at からの経過で期限切れを判定）"""
+
+    def __init__(self, ttl: float = 7 * 86400, failure_ttl: float = 86400):
+        self.ttl = ttl
+        self.failure_ttl = failure_ttl
+        self.results: Dict[str, Dict[str, Any]] = {}
+
+    @classmethod
+    def load(cls, path, ttl: float = 7 * 86400, failure_ttl: float = 86400) -> "LinkCache":
+        cache = cls(ttl, failure_ttl)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return cache
+        if data.get("version") == CACHE_VERSION:
+            cache.results = data.get("results", {})
+        return cache
+
+    def save(self, path) -> None:
+        document = {"version": CACHE_VERSION, "results": self.results}
+        atomic_write_text(Path(path), json.dumps(document, ensure_ascii=False, indent=1, sort_keys=True))
+
+    def fresh(self, url: str, now: float) -> Optional[Dict[str, Any]]:
+        result = self.results.get(url)
+        if result is None:
+            return None
+        ttl = self.ttl if result["state"] == "ok" else self.failure_ttl
+        return result if now - result["checked_at"] < ttl else None
+
+    def prune(self, urls) -> int:
+        """コーパスから参照されなくなったURLを削除"""
+        stale = [url for url in self.results if url not in urls]
+        for url in stale:
+            del self.results[url]
+        return len(stale)
+
+
+# ----------------------------------------------------------------------
+# HTTP/1.1 クライアント（最小限）
+# ----------------------------------------------------------------------
+class _Connection:
+    __slots__ = ("reader", "writer", "reusable")
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+        self.reusable = True
+
+    def close(self) -> None:
+        self.reusable = False
+        self.writer.close()
+
+    async def request(self, method: str, host_header: str, target: str) -> Tuple[int, Dict[str, str]]:
+        self.writer.write(
+            f"{method} {target} HTTP/1.1\r\nHost: {host_header}\r\nUser-Agent: {USER_AGENT}\r\n"
+            f"Accept: */*\r\nConnection: keep-alive\r\n\r\n".encode("latin-1")
+        )
+        await self.writer.drain()
+
+        status_line = await self.reader.readline()
+        if not status_line:
+            raise ConnectionResetError("接続が閉じられました")
+        parts = status_line.decode("latin-1").split(None, 2)
+        if len(parts) < 2 or not parts[0].startswith("HTTP/"):
+            raise ConnectionError(f"不正な応答: {status_line[:80]!r}")
+        status = int(parts[1])
+        headers: Dict[str, str] = {}
+        while True:
+            line = await self.reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        if parts[0] == "HTTP/1.0" or headers.get("connection", "").lower() == "close":
+            self.reusable = False
+        if method != "HEAD" and status not in (204, 304) and not 100 <= status < 200:
+            await self._discard_body(headers)
+        return status, headers
+
+    async def _discard_body(self, headers: Dict[str, str]) -> None:
+        """次のリクエストで接続を再利用できるよう本文を読み捨てる（大きい場合は再利用しない）"""
+        if "chunked" in headers.get("transfer-encoding", "").lower():
+            total = 0
+            while True:
+                size = int((await self.reader.readline()).split(b";")[0].strip() or b"0", 16)
+                if size == 0:
+                    # トレーラー
+                    while (await self.reader.readline()) not in (b"\r\n", b"\n", b""):
+                        pass
+                    return
+                total += size
+                if total > MAX_BODY_BYTES:
+                    self.reusable = False
+                    return
+                await self.reader.readexactly(size + 2)
+        length = headers.get("content-length")
+        if length is None:
+            # 本文の終端は接続断
+            self.reusable = False
+        elif int(length) > MAX_BODY_BYTES:
+            self.reusable = False
+        elif int(length):
+            await self.reader.readexactly(int(length))
+
+
+class _HostPool:
+    """ホスト単位の接続プール・同時実行数・レート制限"""
+
+    def __init__(self, scheme: str, host: str, port: int, concurrency: int, rate: float,
+                 ssl_context: Optional[ssl.SSLContext]):
+        self.scheme = scheme
+        self.host = host
+        self.port = port
+        self.idle: List[_Connection] = []
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self.next_start = 0.0
+        self.rate_lock = asyncio.Lock()
+        self.ssl_context = ssl_context if scheme == "https" else None
+        self.opened = 0
+        self.reused = 0
+
+    @property
+    def host_header(self) -> str:
+        default = 443 if self.scheme == "https" else 80
+        return self.host if self.port == default else f"{self.host}:{self.port}"
+
+    async def _throttle(self) -> None:
+        if not self.interval:
+            return
+        async with self.rate_lock:
+            now = time.monotonic()
+            wait = self.next_start - now
+            self.next_start = max(now, self.next_start) + self.interval
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    async def request(self, method: str, target: str, timeout: Optional[float] = None) -> Tuple[int, Dict[str, str]]:
+        """timeout は接続・送受信のみに適用（同時実行数の空き待ち・レート制限の待ちは含めない）"""
+        async with self.semaphore:
+            await self._throttle()
+            return await asyncio.wait_for(self._exchange(method, target), timeout)
+
+    async def _exchange(self, method: str, target: str) -> Tuple[int, Dict[str, str]]:
+        while self.idle:
+            # 再利用した接続はサーバー側で閉じられている可能性があるため、失敗時は新規接続でやり直す
+            connection = self.idle.pop()
+            try:
+                result = await connection.request(method, self.host_header, target)
+            except (ConnectionError, asyncio.IncompleteReadError, OSError):
+                connection.close()
+                continue
+            except BaseException:
+                connection.close()
+                raise
+            self.reused += 1
+            self._release(connection)
+            return result
+
+        reader, writer = await asyncio.open_connection(
+            self.host, self.port, ssl=self.ssl_context,
+            server_hostname=self.host if self.ssl_context else None)
+        self.opened += 1
+        connection = _Connection(reader, writer)
+        try:
+            result = await connection.request(method, self.host_header, target)
+        except BaseException:
+            connection.close()
+            raise
+        self._release(connection)
+        return result
+
+    def _release(self, connection: _Connection) -> None:
+        if connection.reusable:
+            self.idle.append(connection)
+        else:
+            connection.close()
+
+    def close(self) -> None:
+        for connection in self.idle:
+            connection.close()
+        self.idle.clear()
+
+
+class ExternalLinkChecker:
+    """外部URLの並行検証"""
+
+    def __init__(self, concurrency: int = 32, per_host: int = 4, rate: float = 5.0, timeout: float = 10.0,
+                 verify_tls: bool = True):
+        self.concurrency = concurrency
+        self.per_host = per_host
+        self.rate = rate
+        self.timeout = timeout
+        self.ssl_context = ssl.create_default_context()
+        if not verify_tls:
+            self.ssl_context.check_hostname = False
+            self.ssl_context.verify_mode = ssl.CERT_NONE
+        self.pools: Dict[Tuple[str, str, int], _HostPool] = {}
+
+    def _pool(self, url: str) -> Tuple[_HostPool, str]:
+        parts = urlsplit(url)
+        scheme = parts.scheme.lower()
+        if scheme not in ("http", "https") or not parts.hostname:
+            raise ValueError(f"未対応のURLです: {url}")
+        port = parts.port or (443 if scheme == "https" else 80)
+        key = (scheme, parts.hostname.lower(), port)
+        pool = self.pools.get(key)
+        if pool is None:
+            pool = self.pools[key] = _HostPool(scheme, key[1], port, self.per_host, self.rate, self.ssl_context)
+        target = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+        return pool, target
+
+    async def _fetch(self, method: str, url: str) -> Tuple[int, Dict[str, str]]:
+        pool, target = self._pool(url)
+        return await pool.request(method, target, self.timeout)
+
+    async def check(self, url: str) -> Dict[str, Any]:
+        """1URLを検証（HEAD → 必要なら GET、リダイレクト追跡）"""
+        started = time.monotonic()
+        current = url
+        result: Dict[str, Any] = {"state": "error", "status": None, "final_url": url, "error": None, "method": "HEAD"}
+        try:
+            for _ in range(MAX_REDIRECTS + 1):
+                method = "HEAD"
+                status, headers = await self._fetch(method, current)
+                if status in HEAD_FALLBACK_STATUSES:
+                    method = "GET"
+                    status, headers = await self._fetch(method, current)
+                if status in REDIRECT_STATUSES and headers.get("location"):
+                    current = urljoin(current, headers["location"])
+                    continue
+                break
+            else:
+                raise ConnectionError(f"リダイレクトが多すぎます（{MAX_REDIRECTS}回超）")
+            result.update(status=status, final_url=current, method=method)
+            if status == 429:
+                result["state"] = "rate_limited"
+            elif 200 <= status < 400:
+                result["state"] = "ok"
+            else:
+                result["state"] = "broken"
+        except asyncio.TimeoutError:
+            result["error"] = f"タイムアウト（{self.timeout}秒）"
+        except (OSError, ConnectionError, ValueError, asyncio.IncompleteReadError, ssl.SSLError) as e:
+            result["error"] = f"{type(e).__name__}: {e}"
+        result["elapsed_ms"] = round((time.monotonic() - started) * 1000, 1)
+        result["checked_at"] = time.time()
+        return result
+
+    async def check_all(self, urls: List[str]) -> Dict[str, Dict[str, Any]]:
+        limit = asyncio.Semaphore(self.concurrency)
+
+        async def bounded(url: str) -> Tuple[str, Dict[str, Any]]:
+            async with limit:
+                return url, await self.check(url)
+
+        try:
+            return dict(await asyncio.gather(*(bounded(url) for url in urls)))
+        finally:
+            for pool in self.pools.values():
+                pool.close()
+
+    def run(self, urls: List[str]) -> Dict[str, Dict[str, Any]]:
+        return asyncio.run(self.check_all(urls))
+
+    def connection_stats(self) -> Dict[str, int]:
+        return {
+            "hosts": len(self.pools),
+            "opened": sum(pool.opened for pool in self.pools.values()),
+            "reused": sum(pool.reused for pool in self.pools.values()),
+        }
+
+
+def check_corpus(corpus: Corpus, cache: LinkCache, checker: ExternalLinkChecker,
+                 force: bool = False) -> Dict[str, Any]:
+    """コーパスの外部リンクを検証（キャッシュが有効なURLは再検証しない）"""
+    urls = collect_external_urls(corpus)
+    now = time.time()
+    expired = [url for url in urls if force or cache.fresh(url, now) is None]
+    started = time.perf_counter()
+    checked = checker.run(expired) if expired else {}
+    elapsed = time.perf_counter() - started
+    cache.results.update(checked)
+    cache.prune(urls)
+
+    links = {url: dict(cache.results[url], sources=sources) for url, sources in urls.items()}
+    states: Dict[str, int] = {}
+    for result in links.values():
+        states[result["state"]] = states.get(result["state"], 0) + 1
+    return {
+        "summary": {
+            "urls": len(urls),
+            "checked": len(expired),
+            "cached": len(urls) - len(expired),
+            "states": states,
+            "seconds": round(elapsed, 3),
+            "connections": checker.connection_stats(),
+        },
+        "links": links,
+    }
@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+
+"""
+リンク抽出・解決・リンクグラフ
+作成日: 2026-10-19
+目的: Markdownリンクをコーパス内の絶対パスへ解決し、文書間のリンクグラフを構築する
+"""
+
+import posixpath
+import re
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+from urllib.parse import unquote
+
+from docs_quality.corpus import Corpus
+
+# 画像（![...]）を除く [text](target "title") 形式
+LINK_PATTERN = re.compile(r'(?<!!)\[([^\]]*)\]\(\s*<?([^)\s>]*)>?(?:\s+"[^"]*")?\s*\)')
+
+EXTERNAL_PREFIXES = ("http://", "https://", "mailto:", "ftp://", "tel:", "data:")
+ANCHOR_STRIP = re.compile(r"[^\w\- ]", re.UNICODE)
+
+
+def extract_links(content: str) -> List[Tuple[str, str]]:
+    """(リンクテキスト, リンク先) の一覧"""
+    return LINK_PATTERN.findall(content)
+
+
+def is_external(target: str) -> bool:
+    return target.lower().startswith(EXTERNAL_PREFIXES)
+
+
+def split_anchor(target: str) -> Tuple[str, str]:
+    path, _, anchor = target.partition("#")
+    return path, anchor
+
+
+def resolve_link(source: str, target: str, allow_outside: bool = False) -> Optional[Tuple[str, str]]:
+    """source（コーパス相対パス）から見た target をコーパス相対パスへ解決する
+
+    戻り値は (解決済みパス, アンカー)。外部リンクや空リンクは None。
+    同一文書内アンカー（`#section`）は source 自身を返す。
+    コーパス外を指すリンクは allow_outside=True の場合のみ `../` 始まりのパスで返す。
+    """
+    if not target or is_external(target):
+        return None
+
+    path, anchor = split_anchor(target)
+    path = unquote(path)
+    if not path:
+        return source, anchor
+
+    if path.startswith("/"):
+        resolved = posixpath.normpath(path.lstrip("/"))
+    else:
+        resolved = posixpath.normpath(posixpath.join(posixpath.dirname(source), path))
+
+    if (resolved.startswith("../") or resolved == "..") and not allow_outside:
+        # コーパス外
+        return None
+    return resolved, anchor
+
+
+def heading_anchor(text: str) -> str:
+    """見出しのアンカー（GitHub と同じ規則: 小文字化し、英数字・かな漢字・ハイフン・空白以外を除いて空白をハイフンに）"""
+    return ANCHOR_STRIP.sub("", text.strip().lower()).replace(" ", "-")
+
+
+def heading_anchors(texts: Iterable[str]) -> Set[str]:
+    """文書内の全アンカー（同じアンカーの2つ目以降は "-1", "-2" を付ける）"""
+    anchors: Set[str] = set()
+    seen: Dict[str, int] = {}
+    for text in texts:
+        anchor = heading_anchor(text)
+        count = seen.get(anchor, 0)
+        seen[anchor] = count + 1
+        anchors.add(anchor if count == 0 else f"{anchor}-{count}")
+    return anchors
+
+
+def relative_link(source: str, destination: str) -> str:
+    """source 文書から destination への相対リンク文字列"""
+    start = posixpath.dirname(source) or "."
+    return posixpath.relpath(destination, start)
+
+
+class LinkGraph:
+    """コーパス内の文書間リンクグラフ"""
+
+    def __init__(self):
+        self.outgoing: Dict[str, List[str]] = {}
+        self.broken: Dict[str, List[str]] = {}
+        self.external: Dict[str, List[str]] = {}
+
+    @classmethod
+    def build(cls, corpus: Corpus) -> "LinkGraph":
+        graph = cls()
+        known = {corpus.relative_path(entry) for entry in corpus}
+
+        for entry in corpus:
+            source = corpus.relative_path(entry)
+            targets, broken, external = [], [], []
+
+            for _, target in extract_links(entry.content):
+                if is_external(target):
+                    external.append(target)
+                    continue
+                resolved = resolve_link(source, target)
+                if resolved is None:
+                    continue
+                path, _ = resolved
+                if not path.endswith(".md"):
+                    continue
+                if path in known:
+                    if path != source and path not in targets:
+                        targets.append(path)
+                else:
+                    broken.append(target)
+
+            graph.outgoing[source] = targets
+            if broken:
+                graph.broken[source] = broken
+            if external:
+                graph.external[source] = external
+
+        return graph
+
+    def incoming_counts(self) -> Dict[str, int]:
+        counts = {source: 0 for source in self.outgoing}
+        for targets in self.outgoing.values():
+            for target in targets:
+                counts[target] = counts.get(target, 0) + 1
+        return counts
+
+    def to_dict(self) -> Dict[str, Any]:
+        incoming = self.incoming_counts()
+        return {
+            "nodes": [
+                {"path": path, "outgoing": len(targets), "incoming": incoming.get(path, 0)}
+                for path, targets in self.outgoing.items()
+            ],
+            "edges": [
+                {"source": source, "target": target}
+                for source, targets in self.outgoing.items()
+                for target in targets
+            ],
+            "broken_links": self.broken,
+            "orphaned_files": sorted(path for path, count in incoming.items() if count == 0),
+            "total_edges": sum(len(targets) for targets in self.outgoing.values()),
+            "total_broken": sum(len(targets) for targets in self.broken.values()),
+        }
@@ -0,0 +1,31 @@
+# -*- coding: utf-8 -*-
+
+"""
+ハイフン区切りスクリプトの読み込み
+作成日: 2026-10-19
+目的: ai-quality-analyzer.py 等、import 文で参照できないスクリプトのクラスを再利用する
+"""
+
+import importlib.util
+import sys
+from pathlib import Path
+from types import ModuleType
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent
+
+
+def load_script(name: str) -> ModuleType:
+    """scripts/<name>.py をモジュールとして読み込む（読み込み済みなら再利用）"""
+    module_name = "_script_" + name.replace("-", "_")
+    if module_name in sys.modules:
+        return sys.modules[module_name]
+
+    script_path = SCRIPTS_DIR / f"{name}.py"
+    spec = importlib.util.spec_from_file_location(module_name, script_path)
+    if spec is None or spec.loader is None:
+        raise ImportError(f"スクリプトを読み込めません: {script_path}")
+
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    spec.loader.exec_module(module)
+    return module
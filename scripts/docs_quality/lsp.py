@@ -0,0 +1,433 @@
+# -*- coding: utf-8 -*-
+
+"""
+エディタ向け診断サーバー（stdio JSON-RPC、LSP 準拠）
+作成日: 2026-10-19
+目的: 編集中の1文書（未保存のバッファ）の品質診断を、全体分析を待たずに返す
+
+- プロトコル: Content-Length ヘッダ付きの JSON-RPC 2.0（LSP の stdio トランスポート）。
+  initialize / shutdown / exit、textDocument/didOpen・didChange（全文同期）・didSave・didClose、
+  workspace/didChangeWatchedFiles に対応
+- 常駐インデックス: コーパス（AIQualityAnalyzer と共有）と、文書ごとの見出しアンカー・リンク先。
+  起動時に1回だけ走査し、以降は変更通知のあったファイルだけを読み直す（ツリーは再走査しない）。
+  開いている文書はバッファの内容でインデックスを更新する（保存前の見出しもアンカーとして参照できる）
+- 診断（textDocument/publishDiagnostics）: 見出し階層の飛躍・リンク切れ（修正候補つき）・存在しないアンカー・
+  用語の表記揺れ（docs_quality.advanced と同じ辞書）、分析器で有効なら Markdown 構文違反・未知語
+- スコア内訳: 分析器の実行計画（docs_quality.checks）をバッファに対して実行し、docsQuality/score 通知で送る。
+  docsQuality/diagnose リクエストでは診断とスコア内訳をまとめて返す
+- 位置は LSP の規定どおり 0 始まりの行と UTF-16 単位の桁
+"""
+
+import json
+import time
+from bisect import bisect_right
+from pathlib import Path
+from typing import Any, BinaryIO, Callable, Dict, List, Optional, Set, Tuple
+from urllib.parse import quote, unquote, urlsplit
+
+from docs_quality.advanced import HEADING, CrossReferenceCheck, ParsedDocument, TerminologyCheck
+from docs_quality.corpus import Corpus, CorpusEntry
+from docs_quality.links import extract_links, heading_anchors, is_external, relative_link, resolve_link
+from docs_quality.markdownlint import RULES as LINT_RULES
+from docs_quality.migration import fenced_ranges
+from docs_quality.records import HeaderColumns
+
+ERROR, WARNING, INFORMATION, HINT = 1, 2, 3, 4
+SOURCE = "docs-quality"
+
+# JSON-RPC エラーコード
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+SERVER_NOT_INITIALIZED = -32002
+
+
+def read_message(stream: BinaryIO) -> Optional[Dict[str, Any]]:
+    """Content-Length ヘッダ付きのメッセージを1件読む（EOF は None、JSON として不正なら ValueError）"""
+    length = None
+    while True:
+        line = stream.readline()
+        if not line:
+            return None
+        line = line.strip()
+        if not line:
+            if length is None:
+                continue
+            break
+        name, _, value = line.decode("ascii", errors="replace").partition(":")
+        if name.strip().lower() == "content-length":
+            length = int(value)
+    return json.loads(stream.read(length).decode("utf-8"))
+
+
+def write_message(stream: BinaryIO, message: Dict[str, Any]) -> None:
+    body = json.dumps(message, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    stream.write(b"Content-Length: %d\r\n\r\n" % len(body) + body)
+    stream.flush()
+
+
+def uri_to_path(uri: str) -> Path:
+    return Path(unquote(urlsplit(uri).path))
+
+
+def path_to_uri(path: Path) -> str:
+    return "file://" + quote(path.resolve().as_posix())
+
+
+class Positions:
+    """文字位置 → LSP の位置（0 始まりの行, UTF-16 単位の桁）"""
+
+    def __init__(self, content: str):
+        self.content = content
+        self.starts = [0]
+        position = content.find("\n")
+        while position >= 0:
+            self.starts.append(position + 1)
+            position = content.find("\n", position + 1)
+
+    def line_of(self, offset: int) -> int:
+        return bisect_right(self.starts, offset) - 1
+
+    def line_text(self, line: int) -> str:
+        if line >= len(self.starts):
+            return ""
+        end = self.starts[line + 1] - 1 if line + 1 < len(self.starts) else len(self.content)
+        return self.content[self.starts[line]:end]
+
+    def position(self, offset: int) -> Dict[str, int]:
+        line = self.line_of(offset)
+        prefix = self.content[self.starts[line]:offset]
+        character = len(prefix) if prefix.isascii() else len(prefix.encode("utf-16-le")) // 2
+        return {"line": line, "character": character}
+
+    def range(self, start: int, end: int) -> Dict[str, Dict[str, int]]:
+        return {"start": self.position(start), "end": self.position(end)}
+
+    def line_range(self, line: int, column: int = 0, length: Optional[int] = None) -> Dict[str, Dict[str, int]]:
+        """行（0 始まり）内の [column, column + length) の文字範囲。length=None は行末まで"""
+        if line >= len(self.starts):
+            line = len(self.starts) - 1
+        text = self.line_text(line)
+        column = min(column, len(text))
+        end = len(text) if length is None else min(column + length, len(text))
+        start = self.starts[line]
+        return self.range(start + column, start + end)
+
+
+def _headings(content: str) -> List[str]:
+    """フェンス外の見出し文字列"""
+    fenced = fenced_ranges(content)
+    return [match.group(2) for match in HEADING.finditer(content)
+            if not any(start <= match.start() < end for start, end in fenced)]
+
+
+class WorkspaceIndex:
+    """常駐インデックス（文書の相対パス → 見出しアンカー・リンク先の文書）"""
+
+    def __init__(self, corpus: Corpus):
+        self.corpus = corpus
+        self.anchors: Dict[str, Set[str]] = {}
+        self.outgoing: Dict[str, Set[str]] = {}
+        self.generation = 0
+        self._cross_reference: Optional[Tuple[int, CrossReferenceCheck]] = None
+
+    def build(self) -> None:
+        self.corpus.ensure_scanned()
+        for entry in self.corpus:
+            self.update(self.corpus.relative_path(entry), entry.content)
+
+    def update(self, relative: str, content: str) -> None:
+        self.anchors[relative] = heading_anchors(_headings(content))
+        targets = set()
+        for _, target in extract_links(content):
+            resolved = resolve_link(relative, target)
+            if resolved is not None and resolved[0].endswith(".md"):
+                targets.add(resolved[0])
+        self.outgoing[relative] = targets
+        self.generation += 1
+
+    def remove(self, relative: str) -> None:
+        if self.anchors.pop(relative, None) is not None:
+            self.outgoing.pop(relative, None)
+            self.generation += 1
+
+    def backlinks(self, relative: str) -> List[str]:
+        return sorted(source for source, targets in self.outgoing.items() if relative in targets and source != relative)
+
+    def cross_reference(self) -> CrossReferenceCheck:
+        """リンク切れの修正候補（インデックスが変わった場合のみ作り直す）"""
+        if self._cross_reference is None or self._cross_reference[0] != self.generation:
+            self._cross_reference = (self.generation, CrossReferenceCheck(list(self.anchors), ""))
+        return self._cross_reference[1]
+
+
+class DiagnosticsServer:
+    """1文書単位の診断サーバー（読み込み・処理・応答を1スレッドで順に行う）"""
+
+    def __init__(self, analyzer, reader: BinaryIO, writer: BinaryIO):
+        self.analyzer = analyzer
+        self.corpus: Corpus = analyzer.corpus
+        self.docs_dir = analyzer.docs_dir.resolve()
+        self.reader = reader
+        self.writer = writer
+        self.index = WorkspaceIndex(self.corpus)
+        self.terminology = TerminologyCheck()
+        self.documents: Dict[str, str] = {}
+        self.initialized = False
+        self.shutdown_requested = False
+        self.requests: Dict[str, Callable[[Dict[str, Any]], Any]] = {
+            "initialize": self._initialize,
+            "shutdown": self._shutdown,
+            "docsQuality/diagnose": self._diagnose_request,
+        }
+        self.notifications: Dict[str, Callable[[Dict[str, Any]], None]] = {
+            "initialized": lambda params: None,
+            "textDocument/didOpen": self._did_open,
+            "textDocument/didChange": self._did_change,
+            "textDocument/didSave": self._did_save,
+            "textDocument/didClose": self._did_close,
+            "workspace/didChangeWatchedFiles": self._did_change_watched_files,
+        }
+
+    # ------------------------------------------------------------------
+    # メッセージループ
+    # ------------------------------------------------------------------
+    def run(self) -> int:
+        """exit 通知または EOF まで処理（終了コード: shutdown 後の exit なら 0）"""
+        while True:
+            try:
+                message = read_message(self.reader)
+            except ValueError as e:
+                self._send({"jsonrpc": "2.0", "id": None, "error": {"code": PARSE_ERROR, "message": str(e)}})
+                continue
+            if message is None:
+                return 1
+            if message.get("method") == "exit":
+                return 0 if self.shutdown_requested else 1
+            self.handle(message)
+
+    def handle(self, message: Dict[str, Any]) -> None:
+        method = message.get("method")
+        params = message.get("params") or {}
+        if "id" not in message:
+            handler = self.notifications.get(method)
+            if handler is not None and (self.initialized or method == "initialized"):
+                handler(params)
+            return
+
+        response: Dict[str, Any] = {"jsonrpc": "2.0", "id": message["id"]}
+        handler = self.requests.get(method)
+        if not isinstance(method, str):
+            response["error"] = {"code": INVALID_REQUEST, "message": "method がありません"}
+        elif handler is None:
+            response["error"] = {"code": METHOD_NOT_FOUND, "message": f"未対応のメソッドです: {method}"}
+        elif not self.initialized and method != "initialize":
+            response["error"] = {"code": SERVER_NOT_INITIALIZED, "message": "initialize の前です"}
+        else:
+            response["result"] = handler(params)
+        self._send(response)
+
+    def _send(self, message: Dict[str, Any]) -> None:
+        write_message(self.writer, message)
+
+    def _notify(self, method: str, params: Dict[str, Any]) -> None:
+        self._send({"jsonrpc": "2.0", "method": method, "params": params})
+
+    # ------------------------------------------------------------------
+    # ライフサイクル・文書同期
+    # ------------------------------------------------------------------
+    def _initialize(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        started = time.perf_counter()
+        self.index.build()
+        self.initialized = True
+        print(f"📝 診断サーバー起動: {len(self.index.anchors)}文書をインデックス "
+              f"({(time.perf_counter() - started) * 1000:.0f}ms)")
+        return {
+            "capabilities": {
+                "textDocumentSync": {"openClose": True, "change": 1, "save": {"includeText": False}},
+            },
+            "serverInfo": {"name": "docs-quality", "version": "1.0"},
+        }
+
+    def _shutdown(self, params: Dict[str, Any]) -> None:
+        self.shutdown_requested = True
+        return None
+
+    def _did_open(self, params: Dict[str, Any]) -> None:
+        document = params["textDocument"]
+        self._set_buffer(document["uri"], document["text"])
+
+    def _did_change(self, params: Dict[str, Any]) -> None:
+        changes = params.get("contentChanges") or []
+        if changes:
+            # 全文同期（textDocumentSync.change = 1）のため最後の変更が現在の全文
+            self._set_buffer(params["textDocument"]["uri"], changes[-1]["text"])
+
+    def _did_save(self, params: Dict[str, Any]) -> None:
+        uri = params["textDocument"]["uri"]
+        path = uri_to_path(uri)
+        relative = self._relative(path)
+        if relative is not None:
+            self.corpus.refresh(self.analyzer.docs_dir / relative)
+
+    def _did_close(self, params: Dict[str, Any]) -> None:
+        uri = params["textDocument"]["uri"]
+        self.documents.pop(uri, None)
+        relative = self._relative(uri_to_path(uri))
+        if relative is not None:
+            # 保存されていない編集は捨て、インデックスをディスクの内容へ戻す
+            self._reindex_from_disk(relative)
+        self._notify("textDocument/publishDiagnostics", {"uri": uri, "diagnostics": []})
+
+    def _did_change_watched_files(self, params: Dict[str, Any]) -> None:
+        changed = []
+        for change in params.get("changes", []):
+            relative = self._relative(uri_to_path(change["uri"]))
+            if relative is None or not relative.endswith(".md"):
+                continue
+            if change["uri"] in self.documents:
+                # 開いている文書はバッファが正
+                self.corpus.refresh(self.analyzer.docs_dir / relative)
+                continue
+            self._reindex_from_disk(relative)
+            changed.append(relative)
+        self._rediagnose_linking(changed)
+
+    def _reindex_from_disk(self, relative: str) -> None:
+        entry = self.corpus.refresh(self.analyzer.docs_dir / relative)
+        if entry is None:
+            self.index.remove(relative)
+        else:
+            self.index.update(relative, entry.content)
+
+    def _set_buffer(self, uri: str, text: str) -> None:
+        self.documents[uri] = text
+        relative = self._relative(uri_to_path(uri))
+        if relative is not None:
+            self.index.update(relative, text)
+        self._publish(uri)
+        if relative is not None:
+            self._rediagnose_linking([relative], skip=uri)
+
+    def _rediagnose_linking(self, changed: List[str], skip: Optional[str] = None) -> None:
+        """変更された文書へリンクしている、開いている文書を診断し直す"""
+        if not changed:
+            return
+        changed_set = set(changed)
+        for uri in list(self.documents):
+            if uri == skip:
+                continue
+            relative = self._relative(uri_to_path(uri))
+            if relative is not None and self.index.outgoing.get(relative, set()) & changed_set:
+                self._publish(uri)
+
+    def _relative(self, path: Path) -> Optional[str]:
+        """docs_dir からの相対パス（docs_dir の外は None）"""
+        try:
+            return path.resolve().relative_to(self.docs_dir).as_posix()
+        except ValueError:
+            return None
+
+    # ------------------------------------------------------------------
+    # 診断
+    # ------------------------------------------------------------------
+    def _publish(self, uri: str) -> None:
+        result = self.diagnose(uri, self.documents[uri])
+        self._notify("textDocument/publishDiagnostics", {"uri": uri, "diagnostics": result["diagnostics"]})
+        self._notify("docsQuality/score", {"uri": uri, "score": result["score"], "elapsed_ms": result["elapsed_ms"]})
+
+    def _diagnose_request(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        uri = params["textDocument"]["uri"]
+        text = params.get("text")
+        if text is None:
+            text = self.documents.get(uri)
+        if text is None:
+            text = uri_to_path(uri).read_text(encoding="utf-8", errors="replace")
+        return self.diagnose(uri, text)
+
+    def diagnose(self, uri: str, content: str) -> Dict[str, Any]:
+        """1バッファの診断とスコア内訳"""
+        started = time.perf_counter()
+        path = uri_to_path(uri)
+        relative = self._relative(path)
+        doc = ParsedDocument(CorpusEntry(path, len(content), 0, "", content), relative or path.name)
+        positions = Positions(content)
+        diagnostics: List[Dict[str, Any]] = []
+
+        def add(range_: Dict[str, Any], severity: int, code: str, message: str) -> None:
+            diagnostics.append({"range": range_, "severity": severity, "source": SOURCE, "code": code,
+                                "message": message})
+
+        # 見出し階層（フェンス外の見出しで分析器と同じ判定）
+        headers = HeaderColumns()
+        for level, text, offset in doc.headings:
+            headers.append(level, text, positions.line_of(offset) + 1)
+        for line, level, previous in headers.hierarchy_issues():
+            add(positions.line_range(line - 1), WARNING, "heading-hierarchy", f"見出しレベル{level}が{previous}から飛躍")
+
+        # リンク切れ・アンカー
+        if relative is not None:
+            own_anchors = heading_anchors(text for _, text, _ in doc.headings)
+            for _, target, span in doc.links:
+                if is_external(target):
+                    continue
+                resolved = resolve_link(relative, target)
+                if resolved is None:
+                    continue
+                linked, anchor = resolved
+                anchors = own_anchors if linked == relative else self.index.anchors.get(linked)
+                if linked.endswith(".md") and anchors is None:
+                    suggestion = self.index.cross_reference().suggest(linked)
+                    hint = f"（修正候補: {relative_link(relative, suggestion)}）" if suggestion else ""
+                    add(positions.range(*span), ERROR, "broken-link", f"リンク先の文書がありません: {target}{hint}")
+                    continue
+                if not linked.endswith(".md"):
+                    if not (self.docs_dir / linked).exists():
+                        add(positions.range(*span), ERROR, "broken-link", f"リンク先のファイルがありません: {target}")
+                    continue
+                if anchor and unquote(anchor).lower() not in anchors:
+                    add(positions.range(*span), WARNING, "broken-anchor", f"アンカーが見つかりません: #{anchor}")
+
+        # 用語の表記揺れ
+        for start, end, variant, preferred in self.terminology.matches(doc):
+            add(positions.range(start, end), INFORMATION, "terminology", f"表記揺れ: {variant} → {preferred}")
+
+        # 分析器の登録済みチェック（スコア内訳・構文違反・未知語）
+        record = self.analyzer._analyze_single_file(path, content)
+        for rule, line, detail, context, column, length in record.lint_violations or ():
+            message = LINT_RULES[rule][1] + (f" [{detail}]" if detail else "")
+            add(positions.line_range(line - 1, (column or 1) - 1, length), WARNING, rule, message)
+        for word, count, line in record.misspellings or ():
+            text = positions.line_text(line - 1)
+            column = text.find(word)
+            add(positions.line_range(line - 1, max(column, 0), len(word) if column >= 0 else None), HINT,
+                "spelling", f"未知語: {word}" + (f"（{count}箇所）" if count > 1 else ""))
+
+        diagnostics.sort(key=lambda item: (item["range"]["start"]["line"], item["range"]["start"]["character"]))
+        return {
+            "diagnostics": diagnostics,
+            "score": self._score_breakdown(record, relative),
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 2),
+        }
+
+    def _score_breakdown(self, record, relative: Optional[str]) -> Dict[str, Any]:
+        if record.error is not None:
+            return {"error": record.error}
+        breakdown = {
+            "overall": record.overall_score,
+            "structure": record.structure_score,
+            "readability": record.readability_score,
+            "ai": record.ai_score,
+            "weights": self.analyzer.score_weights,
+            "suggestions": list(record.suggestions),
+            "checks": list(record.checks) if record.checks is not None else None,
+            "backlinks": len(self.index.backlinks(relative)) if relative is not None else 0,
+        }
+        if record.overall_score is not None:
+            breakdown["quality_level"] = self.analyzer._get_quality_level(record.overall_score)
+        return breakdown
+
+
+def serve_stdio(analyzer, reader: BinaryIO, writer: BinaryIO) -> int:
+    """stdio で診断サーバーを起動（終了コードを返す）"""
+    return DiagnosticsServer(analyzer, reader, writer).run()
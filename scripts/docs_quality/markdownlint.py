@@ -0,0 +1,806 @@
+# -*- coding: utf-8 -*-
+
+"""
+Markdown 構文チェック（.markdownlint.json のルールを分析パス内で評価）
+作成日: 2026-10-19
+目的: markdownlint（Node）の別パスでツリー全体を再読込せず、品質分析の1パスで同じルールID・行番号の違反を出す
+
+- 設定: .markdownlint.json（"default" と、ルールID・別名ごとの true / false / パラメータ）
+- 対象ルール: RULES の20ルール（.markdownlint.json でパラメータを指定しているルールと、行単位で判定できる既定ルール）。
+  それ以外の既定ルールは評価しない
+- 行の分類（フロントマター・フェンス/インデントのコードブロック・HTMLコメント・見出し・リスト項目・表）は1回だけ行い、
+  全ルールで共有する
+- 出力は markdownlint の JSON 出力（--json）と同じ項目名（lineNumber, ruleNames, ruleDescription, errorDetail,
+  errorContext, errorRange）。行番号・列番号は1始まり、行長は markdownlint と同じく UTF-16 単位
+- 自動修正（fix）: FIXABLE のルールのみ。内容が変わったファイルだけを書き込む
+"""
+
+import json
+import re
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from docs_quality.fsutil import atomic_write_text
+
+# ルールID → (別名, 説明)
+RULES: Dict[str, Tuple[str, str]] = {
+    "MD001": ("heading-increment", "Heading levels should only increment by one level at a time"),
+    "MD003": ("heading-style", "Heading style"),
+    "MD007": ("ul-indent", "Unordered list indentation"),
+    "MD009": ("no-trailing-spaces", "Trailing spaces"),
+    "MD010": ("no-hard-tabs", "Hard tabs"),
+    "MD012": ("no-multiple-blanks", "Multiple consecutive blank lines"),
+    "MD013": ("line-length", "Line length"),
+    "MD018": ("no-missing-space-atx", "No space after hash on atx style heading"),
+    "MD019": ("no-multiple-space-atx", "Multiple spaces after hash on atx style heading"),
+    "MD022": ("blanks-around-headings", "Headings should be surrounded by blank lines"),
+    "MD024": ("no-duplicate-heading", "Multiple headings with the same content"),
+    "MD025": ("single-title", "Multiple top-level headings in the same document"),
+    "MD026": ("no-trailing-punctuation", "Trailing punctuation in heading"),
+    "MD029": ("ol-prefix", "Ordered list item prefix"),
+    "MD031": ("blanks-around-fences", "Fenced code blocks should be surrounded by blank lines"),
+    "MD033": ("no-inline-html", "Inline HTML"),
+    "MD036": ("no-emphasis-as-heading", "Emphasis used instead of a heading"),
+    "MD046": ("code-block-style", "Code block style"),
+    "MD049": ("emphasis-style", "Emphasis style"),
+    "MD050": ("strong-style", "Strong style"),
+}
+# 旧名（markdownlint が互換のために受け付ける別名）
+LEGACY_ALIASES = {
+    "MD001": "header-increment", "MD003": "header-style", "MD022": "blanks-around-headers",
+    "MD024": "no-duplicate-header", "MD025": "single-h1",
+}
+DEFAULTS: Dict[str, Dict[str, Any]] = {
+    "MD003": {"style": "consistent"},
+    "MD007": {"indent": 2, "start_indented": False, "start_indent": 2},
+    "MD009": {"br_spaces": 2, "strict": False},
+    "MD010": {"code_blocks": True, "spaces_per_tab": 1},
+    "MD012": {"maximum": 1},
+    "MD013": {"line_length": 80, "heading_line_length": 80, "code_block_line_length": 80,
+              "code_blocks": True, "tables": True, "headings": True, "strict": False, "stern": False},
+    "MD022": {"lines_above": 1, "lines_below": 1},
+    "MD024": {"siblings_only": False},
+    "MD025": {"level": 1},
+    "MD026": {"punctuation": ".,;:!。，；：！"},
+    "MD029": {"style": "one_or_ordered"},
+    "MD031": {"list_items": True},
+    "MD033": {"allowed_elements": []},
+    "MD036": {"punctuation": ".,;:!?。，；：！？"},
+    "MD046": {"style": "consistent"},
+    "MD049": {"style": "consistent"},
+    "MD050": {"style": "consistent"},
+}
+FIXABLE = ("MD009", "MD010", "MD012", "MD018", "MD019", "MD022", "MD026", "MD031", "MD049", "MD050")
+
+# 行の種類
+BLANK, TEXT, FRONT_MATTER, FENCE, CODE, INDENTED_CODE, COMMENT, HEADING, SETEXT, LIST_ITEM, TABLE, BREAK = range(12)
+NOT_INLINE = (FRONT_MATTER, FENCE, CODE, INDENTED_CODE, COMMENT, SETEXT, BLANK, BREAK)
+# 段落以外のブロックを始めうる先頭文字（数字は別途判定）
+BLOCK_START = frozenset("-*_+#`~<=|")
+
+ATX_HEADING = re.compile(r"^ {0,3}(#{1,6})(?:([ \t]+)(.*?))?(?:[ \t]+(#+))?[ \t]*$")
+MISSING_SPACE_ATX = re.compile(r"^#+[^#\s]")
+SETEXT_UNDERLINE = re.compile(r"^ {0,3}(=+|-+)[ \t]*$")
+THEMATIC_BREAK = re.compile(r"^ {0,3}([-*_])[ \t]*(?:\1[ \t]*){2,}$")
+FENCE_OPEN = re.compile(r"^(\s*)(`{3,}(?!.*`)|~{3,})(.*)$")
+FENCE_CLOSE = re.compile(r"^\s*(`{3,}|~{3,})\s*$")
+LIST_ITEM_MARKER = re.compile(r"^(\s*)([-*+]|(\d{1,9})[.)])(?:([ \t]+)|$)")
+TABLE_DELIMITER = re.compile(r"^\s*\|?\s*:?-+:?\s*(?:\|\s*:?-+:?\s*)+\|?\s*$")
+REFERENCE_DEFINITION = re.compile(r"^\s*\[[^\]]+\]:\s*\S+(?:\s+[\"'(].*)?\s*$")
+CODE_SPAN = re.compile(r"(`+)(?!`)(.+?)(?<!`)\1(?!`)")
+LINK_TARGET = re.compile(r"\]\([^)]*\)|<?https?://[^\s>)]+>?")
+HTML_ELEMENT = re.compile(r"(?<!\\)<([A-Za-z][A-Za-z0-9-]*)(?:\s[^<>]*)?/?>")
+HTML_ENTITY_END = re.compile(r"&#?[0-9A-Za-z]+;$")
+EMPHASIS = {
+    "underscore": re.compile(r"(?<![\w\\_])_(?![_\s])(.+?)(?<![\s_\\])_(?![\w_])"),
+    "asterisk": re.compile(r"(?<![\\*])\*(?![*\s])(.+?)(?<![\s*\\])\*(?!\*)"),
+}
+STRONG = {
+    "underscore": re.compile(r"(?<![\w\\_])__(?![_\s])(.+?)(?<![\s_\\])__(?![\w_])"),
+    "asterisk": re.compile(r"(?<![\\*])\*\*(?![*\s])(.+?)(?<![\s*\\])\*\*(?!\*)"),
+}
+EMPHASIS_ONLY = (
+    re.compile(r"^\*\*([^*]+)\*\*$"), re.compile(r"^__([^_]+)__$"),
+    re.compile(r"^\*([^*]+)\*$"), re.compile(r"^_([^_]+)_$"),
+)
+# 修正の繰り返し上限（見出しの修正で MD022 が新たに生じる等、1回で収束しない場合）
+FIX_PASSES = 3
+
+
+class LintViolation(NamedTuple):
+    rule: str
+    line: int
+    detail: Optional[str] = None
+    context: Optional[str] = None
+    column: Optional[int] = None
+    length: Optional[int] = None
+
+
+def violation_to_dict(violation: Sequence, file_name: Optional[str] = None) -> Dict[str, Any]:
+    """markdownlint の JSON 出力（--json）と同じ形式"""
+    rule, line, detail, context, column, length = violation
+    alias, description = RULES[rule]
+    result: Dict[str, Any] = {}
+    if file_name is not None:
+        result["fileName"] = file_name
+    result.update({
+        "lineNumber": line,
+        "ruleNames": [rule, alias],
+        "ruleDescription": description,
+        "errorDetail": detail,
+        "errorContext": context,
+        "errorRange": [column, length] if column is not None else None,
+    })
+    return result
+
+
+def format_violation(result: Dict[str, Any]) -> str:
+    """violation_to_dict() の結果を markdownlint-cli と同じ1行形式で
+    （path:line[:column] MDxxx/alias 説明 [詳細] [Context: "..."]）"""
+    error_range = result.get("errorRange")
+    text = (f"{result.get('fileName', '')}:{result['lineNumber']}{f':{error_range[0]}' if error_range else ''} "
+            f"{'/'.join(result['ruleNames'])} {result['ruleDescription']}")
+    if result.get("errorDetail"):
+        text += f" [{result['errorDetail']}]"
+    if result.get("errorContext"):
+        text += f' [Context: "{result["errorContext"]}"]'
+    return text
+
+
+def _indent(line: str) -> int:
+    """先頭の空白の桁数（タブは4桁単位）"""
+    column = 0
+    for char in line:
+        if char == " ":
+            column += 1
+        elif char == "\t":
+            column += 4 - column % 4
+        else:
+            break
+    return column
+
+
+def _js_length(text: str) -> int:
+    """JavaScript の String.length（UTF-16 単位）"""
+    return len(text) if text.isascii() else len(text.encode("utf-16-le")) // 2
+
+
+def _js_tail(text: str, units: int) -> str:
+    """UTF-16 で units 単位目以降の部分"""
+    return text[units:] if text.isascii() else text.encode("utf-16-le")[2 * units:].decode("utf-16-le", "ignore")
+
+
+def _blank_spans(text: str, pattern: "re.Pattern") -> str:
+    return pattern.sub(lambda match: " " * len(match.group(0)), text)
+
+
+class _Heading(NamedTuple):
+    index: int
+    level: int
+    text: str
+    style: str  # atx / atx_closed / setext
+    end: int  # 見出しの最終行（setext は下線の行）
+
+
+class _List:
+    """リスト（同じ種類・同じ階層の項目の並び）"""
+
+    __slots__ = ("indent", "content", "ordered", "marker", "depth", "unordered_path", "items")
+
+    def __init__(self, indent: int, content: int, ordered: bool, marker: str, depth: int, unordered_path: bool):
+        self.indent = indent
+        self.content = content
+        self.ordered = ordered
+        self.marker = marker
+        self.depth = depth
+        self.unordered_path = unordered_path
+        self.items: List[Tuple[int, int, str]] = []  # (行, 桁, 番号)
+
+
+class _Document:
+    """行の分類結果（全ルールで共有）"""
+
+    __slots__ = ("lines", "kinds", "start", "headings", "fences", "indented_blocks", "lists", "_inline")
+
+    def __init__(self, lines: List[str]):
+        self.lines = lines
+        self.kinds = [TEXT] * len(lines)
+        self.start = 0
+        self.headings: List[_Heading] = []
+        self.fences: List[Tuple[int, Optional[int]]] = []  # (開始行, 終了行)
+        self.indented_blocks: List[int] = []
+        self.lists: List[_List] = []
+        self._inline: Optional[List[Tuple[int, str]]] = None
+
+    def blank(self, index: int) -> bool:
+        return self.kinds[index] == BLANK
+
+    def inline_lines(self) -> List[Tuple[int, str]]:
+        """インライン要素を含みうる行（コードスパン・リンク先・URL は同じ長さの空白に置き換え）"""
+        if self._inline is None:
+            self._inline = []
+            for index, line in enumerate(self.lines):
+                if self.kinds[index] in NOT_INLINE:
+                    continue
+                if "`" in line:
+                    line = _blank_spans(line, CODE_SPAN)
+                if "](" in line or "://" in line:
+                    line = _blank_spans(line, LINK_TARGET)
+                self._inline.append((index, line))
+        return self._inline
+
+
+def scan(lines: List[str]) -> _Document:
+    """各行を分類し、見出し・コードブロック・リストを抽出"""
+    document = _Document(lines)
+    kinds = document.kinds
+    count = len(lines)
+
+    if count and lines[0].rstrip() == "---":
+        for index in range(1, count):
+            if lines[index].rstrip() in ("---", "..."):
+                kinds[:index + 1] = [FRONT_MATTER] * (index + 1)
+                document.start = index + 1
+                break
+
+    fence: Optional[Tuple[str, int, int]] = None
+    comment = False
+    stack: List[_List] = []
+    previous_blank = True
+    paragraph = False
+
+    for index in range(document.start, count):
+        line = lines[index]
+        if fence is not None:
+            closing = FENCE_CLOSE.match(line) if fence[0] in line else None
+            if closing and closing.group(1)[0] == fence[0] and len(closing.group(1)) >= fence[1]:
+                kinds[index] = FENCE
+                document.fences.append((fence[2], index))
+                fence = None
+                previous_blank, paragraph = False, False
+            else:
+                kinds[index] = CODE
+            continue
+        if comment:
+            kinds[index] = COMMENT
+            comment = "-->" not in line
+            continue
+
+        stripped = line.strip()
+        if not stripped:
+            kinds[index] = BLANK
+            previous_blank, paragraph = True, False
+            continue
+
+        # 先頭文字で候補を絞ってから正規表現を適用する（大半を占める段落の行は分類のみ）
+        first = stripped[0]
+        if first not in BLOCK_START and line[0] not in " \t" and not first.isdigit() and "|" not in stripped:
+            if previous_blank:
+                stack.clear()
+            kinds[index] = TEXT
+            previous_blank, paragraph = False, True
+            continue
+        indent = _indent(line) if line[0] in " \t" else 0
+        thematic = THEMATIC_BREAK.match(line) if first in "-*_" else None
+        item = LIST_ITEM_MARKER.match(line) if not thematic and (first in "-*+" or first.isdigit()) else None
+        if item is None and (previous_blank or thematic or first in "#`~"):
+            while stack and indent < stack[-1].content:
+                stack.pop()
+        relative = indent - (stack[-1].content if stack else 0)
+
+        if relative >= 4 and not paragraph and (previous_blank or kinds[index - 1] == INDENTED_CODE):
+            if kinds[index - 1] != INDENTED_CODE:
+                document.indented_blocks.append(index)
+            kinds[index] = INDENTED_CODE
+            previous_blank, paragraph = False, False
+            continue
+
+        opening = FENCE_OPEN.match(line) if first in "`~" and relative < 4 else None
+        heading = ATX_HEADING.match(line) if first == "#" and relative < 4 else None
+        if opening:
+            marker = opening.group(2)
+            fence = (marker[0], len(marker), index)
+            kinds[index] = FENCE
+        elif first == "<" and stripped.startswith("<!--") and "-->" not in stripped[4:]:
+            kinds[index] = COMMENT
+            comment = True
+        elif heading:
+            style = "atx_closed" if heading.group(4) and heading.group(2) else "atx"
+            kinds[index] = HEADING
+            document.headings.append(_Heading(index, len(heading.group(1)), (heading.group(3) or "").strip(),
+                                              style, index))
+        elif first in "=-" and paragraph and not stack and kinds[index - 1] == TEXT and SETEXT_UNDERLINE.match(line):
+            # 直前の段落全体が見出しになる
+            top = index - 1
+            while top > document.start and kinds[top - 1] == TEXT:
+                top -= 1
+            kinds[top:index] = [HEADING] * (index - top)
+            kinds[index] = SETEXT
+            text = " ".join(lines[position].strip() for position in range(top, index))
+            document.headings.append(_Heading(top, 1 if first == "=" else 2, text, "setext", index))
+        elif thematic:
+            kinds[index] = BREAK
+        elif item is not None:
+            kinds[index] = LIST_ITEM
+            _add_list_item(document, stack, index, item)
+        elif "|" in stripped and (first == "|" or kinds[index - 1] == TABLE or (
+                index + 1 < count and TABLE_DELIMITER.match(lines[index + 1]))):
+            kinds[index] = TABLE
+        else:
+            kinds[index] = TEXT
+
+        previous_blank = False
+        paragraph = kinds[index] in (TEXT, LIST_ITEM)
+
+    if fence is not None:
+        document.fences.append((fence[2], None))
+    return document
+
+
+def _add_list_item(document: _Document, stack: List[_List], index: int, item: "re.Match") -> None:
+    indent = _indent(item.group(1))
+    marker = item.group(2)
+    ordered = item.group(3) is not None
+    spaces = len((item.group(4) or " ").expandtabs(4))
+    content = indent + len(marker) + (spaces if spaces <= 4 else 1)
+
+    # 兄弟項目（直前のリストの内容桁より浅く、親の内容桁以上）か子リストかを決める
+    while stack and indent < stack[-1].content:
+        parent_content = stack[-2].content if len(stack) > 1 else 0
+        if indent >= parent_content:
+            break
+        stack.pop()
+    current = stack[-1] if stack and indent < stack[-1].content else None
+    kind = marker[-1] if ordered else marker
+    if current is not None and (current.ordered != ordered or current.marker != kind):
+        stack.pop()
+        current = None
+    if current is None:
+        current = _List(indent, content, ordered, kind, len(stack), all(not frame.ordered for frame in stack))
+        stack.append(current)
+        document.lists.append(current)
+    current.content = content
+    current.items.append((index, indent, item.group(3) or ""))
+
+
+class MarkdownLinter:
+    """.markdownlint.json の設定で Markdown を検査・修正
+
+        linter = MarkdownLinter.load(".markdownlint.json")
+        violations = linter.lint(content.split("\\n"))
+        fixed = linter.fix(content)
+    """
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        config = dict(config or {})
+        default = config.get("default", True)
+        self.params: Dict[str, Dict[str, Any]] = {}
+        for rule, (alias, _) in RULES.items():
+            value = default
+            for name in (LEGACY_ALIASES.get(rule), alias, rule):
+                if name in config:
+                    value = config[name]
+            if value is False or value is None:
+                continue
+            params = dict(DEFAULTS.get(rule, {}))
+            if isinstance(value, dict):
+                params.update(value)
+            self.params[rule] = params
+        md013 = self.params.get("MD013")
+        if md013 is not None and "headers" in md013:
+            md013["headings"] = md013["headers"]
+
+    @classmethod
+    def load(cls, path) -> "MarkdownLinter":
+        """設定ファイルから作成（存在しない場合は既定設定）"""
+        path = Path(path)
+        if not path.exists():
+            return cls()
+        with open(path, "r", encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    @property
+    def rules(self) -> List[str]:
+        return list(self.params)
+
+    # ------------------------------------------------------------------
+    # 検査
+    # ------------------------------------------------------------------
+    def lint(self, lines: List[str]) -> List[LintViolation]:
+        """違反の一覧（行番号・ルールID順）。lines は content.split("\\n")"""
+        lines = [line[:-1] if line.endswith("\r") else line for line in lines]
+        if lines and lines[-1] == "":
+            lines.pop()
+        document = scan(lines)
+        violations: List[LintViolation] = []
+        for rule in self.params:
+            getattr(self, f"_{rule.lower()}")(document, self.params[rule], violations)
+        violations.sort(key=lambda violation: (violation.line, violation.rule, violation.column or 0))
+        return violations
+
+    def _md001(self, document: _Document, params, out: List[LintViolation]) -> None:
+        previous = 0
+        for heading in document.headings:
+            if previous and heading.level > previous + 1:
+                out.append(LintViolation("MD001", heading.index + 1,
+                                         f"Expected: h{previous + 1}; Actual: h{heading.level}"))
+            previous = heading.level
+
+    def _md003(self, document: _Document, params, out: List[LintViolation]) -> None:
+        expected = params.get("style", "consistent")
+        for heading in document.headings:
+            if expected == "consistent":
+                expected = heading.style
+            if heading.style != expected and not (expected.startswith("setext_with_") and (
+                    heading.style == "setext" if heading.level <= 2 else heading.style == expected[12:])):
+                out.append(LintViolation("MD003", heading.index + 1, f"Expected: {expected}; Actual: {heading.style}"))
+
+    def _md007(self, document: _Document, params, out: List[LintViolation]) -> None:
+        indent = params.get("indent", 2)
+        start = params.get("start_indent", indent) if params.get("start_indented") else 0
+        for item_list in document.lists:
+            if item_list.ordered or not item_list.unordered_path:
+                continue
+            expected = start + item_list.depth * indent
+            for index, actual, _ in item_list.items:
+                if actual != expected:
+                    out.append(LintViolation("MD007", index + 1, f"Expected: {expected}; Actual: {actual}",
+                                             column=1, length=actual))
+
+    def _md009(self, document: _Document, params, out: List[LintViolation]) -> None:
+        br_spaces = params.get("br_spaces", 2)
+        expected = br_spaces if br_spaces >= 2 else 0
+        for index, line in enumerate(document.lines):
+            if not line or line[-1] not in " \t":
+                continue
+            kind = document.kinds[index]
+            if kind in (CODE, INDENTED_CODE):
+                continue
+            trailing = len(line) - len(line.rstrip())
+            allowed = (expected > 0 and trailing == expected and line[-trailing:] == " " * trailing
+                       and kind != BLANK and not (params.get("strict") and _paragraph_end(document, index)))
+            if not allowed:
+                out.append(LintViolation("MD009", index + 1,
+                                         f"Expected: {'0 or ' if expected else ''}{expected}; Actual: {trailing}",
+                                         column=len(line) - trailing + 1, length=trailing))
+
+    def _md010(self, document: _Document, params, out: List[LintViolation]) -> None:
+        code_blocks = params.get("code_blocks", True)
+        for index, line in enumerate(document.lines):
+            if "\t" not in line or (not code_blocks and document.kinds[index] in (CODE, INDENTED_CODE)):
+                continue
+            for match in re.finditer(r"\t+", line):
+                out.append(LintViolation("MD010", index + 1, f"Column: {match.start() + 1}",
+                                         column=match.start() + 1, length=len(match.group(0))))
+
+    def _md012(self, document: _Document, params, out: List[LintViolation]) -> None:
+        maximum = params.get("maximum", 1)
+        kinds = document.kinds
+        run = 0
+        for index in range(document.start, len(kinds)):
+            run = run + 1 if kinds[index] == BLANK else 0
+            if run > maximum:
+                out.append(LintViolation("MD012", index + 1, f"Expected: {maximum}; Actual: {run}"))
+
+    def _md013(self, document: _Document, params, out: List[LintViolation]) -> None:
+        limits = {HEADING: params.get("heading_line_length", params.get("line_length", 80)),
+                  CODE: params.get("code_block_line_length", params.get("line_length", 80))}
+        line_length = params.get("line_length", 80)
+        skipped = {FRONT_MATTER, BLANK}
+        if not params.get("code_blocks", True):
+            skipped.update((CODE, FENCE, INDENTED_CODE))
+        if not params.get("tables", True):
+            skipped.add(TABLE)
+        if not params.get("headings", True):
+            skipped.update((HEADING, SETEXT))
+        strict, stern = params.get("strict"), params.get("stern")
+        for index, line in enumerate(document.lines):
+            kind = document.kinds[index]
+            if kind in skipped or len(line) <= min(limits.values()) // 2:
+                continue
+            limit = limits.get(CODE if kind in (FENCE, INDENTED_CODE) else HEADING if kind == SETEXT else kind,
+                               line_length)
+            length = _js_length(line)
+            if length <= limit or REFERENCE_DEFINITION.match(line):
+                continue
+            # 制限桁以降に空白が無い行（長いURL等）は strict / stern 以外では許容
+            if not strict and not re.search(r"\s", _js_tail(line, limit)) and \
+                    not (stern and re.search(r"\s", line[:limit])):
+                continue
+            out.append(LintViolation("MD013", index + 1, f"Expected: {limit}; Actual: {length}",
+                                     column=limit + 1, length=length - limit))
+
+    def _md018(self, document: _Document, params, out: List[LintViolation]) -> None:
+        for index, line in enumerate(document.lines):
+            if document.kinds[index] == TEXT and MISSING_SPACE_ATX.match(line) and \
+                    not re.search(r"#\s*$", line) and not line.startswith("#️⃣"):
+                hashes = len(line) - len(line.lstrip("#"))
+                out.append(LintViolation("MD018", index + 1, context=line.strip(), column=1, length=hashes + 1))
+
+    def _md019(self, document: _Document, params, out: List[LintViolation]) -> None:
+        for heading in document.headings:
+            if heading.style == "setext":
+                continue
+            line = document.lines[heading.index]
+            match = re.match(r"^ {0,3}(#+)([ \t]{2,})\S", line)
+            if match:
+                out.append(LintViolation("MD019", heading.index + 1, context=line.strip(),
+                                         column=match.start(2) + 1, length=len(match.group(2))))
+
+    def _md022(self, document: _Document, params, out: List[LintViolation]) -> None:
+        above, below = params.get("lines_above", 1), params.get("lines_below", 1)
+        for heading in document.headings:
+            context = document.lines[heading.index].strip()
+            actual = _blank_run(document, heading.index - 1, -1)
+            if above >= 0 and heading.index > document.start and actual < above:
+                out.append(LintViolation("MD022", heading.index + 1,
+                                         f"Expected: {above}; Actual: {actual}; Above", context))
+            actual = _blank_run(document, heading.end + 1, 1)
+            if below >= 0 and heading.end + 1 < len(document.lines) and actual < below:
+                out.append(LintViolation("MD022", heading.index + 1,
+                                         f"Expected: {below}; Actual: {actual}; Below", context))
+
+    def _md024(self, document: _Document, params, out: List[LintViolation]) -> None:
+        siblings_only = params.get("siblings_only", params.get("allow_different_nesting", False))
+        known: List[set] = [set() for _ in range(7)]
+        previous = 0
+        for heading in document.headings:
+            if siblings_only:
+                if heading.level > previous:
+                    for level in range(previous + 1, heading.level + 1):
+                        known[level] = set()
+                scope = known[heading.level]
+            else:
+                scope = known[0]
+            if heading.text in scope:
+                out.append(LintViolation("MD024", heading.index + 1, context=heading.text))
+            scope.add(heading.text)
+            previous = heading.level
+
+    def _md025(self, document: _Document, params, out: List[LintViolation]) -> None:
+        level = params.get("level", 1)
+        title = params.get("front_matter_title", r"^\s*title\s*[:=]")
+        has_title = bool(title) and any(re.search(title, line, re.IGNORECASE)
+                                        for line in document.lines[1:max(document.start - 1, 1)])
+        first_content = next((index for index in range(document.start, len(document.lines))
+                              if document.kinds[index] not in (BLANK, COMMENT)), None)
+        for heading in document.headings:
+            if heading.level != level:
+                continue
+            if has_title:
+                out.append(LintViolation("MD025", heading.index + 1, context=heading.text))
+            elif heading.index == first_content:
+                has_title = True
+
+    def _md026(self, document: _Document, params, out: List[LintViolation]) -> None:
+        punctuation = params.get("punctuation", DEFAULTS["MD026"]["punctuation"])
+        for heading in document.headings:
+            text = heading.text
+            if text and text[-1] in punctuation and not HTML_ENTITY_END.search(text):
+                line = document.lines[heading.index]
+                column = line.rstrip(" \t#").rfind(text[-1]) + 1 if heading.style != "setext" else len(line.rstrip())
+                out.append(LintViolation("MD026", heading.index + 1, f"Punctuation: '{text[-1]}'",
+                                         column=column, length=1))
+
+    def _md029(self, document: _Document, params, out: List[LintViolation]) -> None:
+        style = params.get("style", "one_or_ordered")
+        for item_list in document.lists:
+            if not item_list.ordered:
+                continue
+            items = item_list.items
+            current = 1
+            incrementing = False
+            if len(items) >= 2 and (items[1][2] != "1" or items[0][2] == "0"):
+                incrementing = True
+                if items[0][2] == "0":
+                    current = 0
+            effective = style
+            if effective == "one_or_ordered":
+                effective = "ordered" if incrementing else "one"
+            if effective == "zero":
+                current = 0
+            elif effective == "one":
+                current = 1
+            shown = {"one": "1/1/1", "ordered": "1/2/3", "zero": "0/0/0"}.get(effective, effective)
+            if effective == "ordered" and current == 0:
+                shown = "0/1/2"
+            for index, indent, number in items:
+                if int(number) != current:
+                    out.append(LintViolation("MD029", index + 1,
+                                             f"Expected: {current}; Actual: {int(number)}; Style: {shown}",
+                                             column=indent + 1, length=len(number)))
+                if effective == "ordered":
+                    current += 1
+
+    def _md031(self, document: _Document, params, out: List[LintViolation]) -> None:
+        list_items = params.get("list_items", True)
+        lines = document.lines
+        for opening, closing in document.fences:
+            if not list_items and _indent(lines[opening]) > 0:
+                continue
+            if opening > document.start and not document.blank(opening - 1):
+                out.append(LintViolation("MD031", opening + 1, context=lines[opening].strip()))
+            if closing is not None and closing + 1 < len(lines) and not document.blank(closing + 1):
+                out.append(LintViolation("MD031", closing + 1, context=lines[closing].strip()))
+
+    def _md033(self, document: _Document, params, out: List[LintViolation]) -> None:
+        allowed = {element.lower() for element in params.get("allowed_elements", [])}
+        for index, text in document.inline_lines():
+            if "<" not in text:
+                continue
+            for match in HTML_ELEMENT.finditer(text):
+                name = match.group(1)
+                if name.lower() not in allowed:
+                    out.append(LintViolation("MD033", index + 1, f"Element: {name}",
+                                             column=match.start() + 1, length=len(match.group(0))))
+
+    def _md036(self, document: _Document, params, out: List[LintViolation]) -> None:
+        punctuation = params.get("punctuation", DEFAULTS["MD036"]["punctuation"])
+        lines, kinds = document.lines, document.kinds
+        for index, line in enumerate(lines):
+            # 1 行だけの段落（フェンス・見出し・リストで区切られる場合も含む）のみ対象
+            if kinds[index] != TEXT or not _paragraph_start(document, index) or \
+                    not _paragraph_end(document, index) or _indent(line) >= 4:
+                continue
+            stripped = line.strip()
+            for pattern in EMPHASIS_ONLY:
+                match = pattern.match(stripped)
+                if match:
+                    text = match.group(1).strip()
+                    if text and text[-1] not in punctuation:
+                        out.append(LintViolation("MD036", index + 1, context=text))
+                    break
+
+    def _md046(self, document: _Document, params, out: List[LintViolation]) -> None:
+        expected = params.get("style", "consistent")
+        blocks = sorted([(opening, "fenced") for opening, _ in document.fences] +
+                        [(index, "indented") for index in document.indented_blocks])
+        for index, style in blocks:
+            if expected == "consistent":
+                expected = style
+            if style != expected:
+                out.append(LintViolation("MD046", index + 1, f"Expected: {expected}; Actual: {style}"))
+
+    def _md049(self, document: _Document, params, out: List[LintViolation]) -> None:
+        self._emphasis_style("MD049", EMPHASIS, document, params, out)
+
+    def _md050(self, document: _Document, params, out: List[LintViolation]) -> None:
+        self._emphasis_style("MD050", STRONG, document, params, out)
+
+    def _emphasis_style(self, rule: str, patterns: Dict[str, "re.Pattern"], document: _Document, params,
+                        out: List[LintViolation]) -> None:
+        expected = params.get("style", "consistent")
+        marker = 1 if rule == "MD049" else 2
+        characters = {"underscore": "_" * marker, "asterisk": "*" * marker}
+        # スタイルが決まっていれば、それ以外のスタイルの記号を含む行だけを調べる
+        searched = {style: sequence for style, sequence in characters.items() if style != expected}
+        for index, text in document.inline_lines():
+            styles = [style for style, sequence in searched.items() if sequence in text]
+            if not styles:
+                continue
+            if rule == "MD049" and "asterisk" in styles and "**" in text:
+                text = _blank_spans(_blank_spans(text, STRONG["asterisk"]), STRONG["underscore"])
+            found = sorted((match.start(), style) for style in styles for match in patterns[style].finditer(text))
+            for start, style in found:
+                if expected == "consistent":
+                    expected = style
+                    searched = {other: sequence for other, sequence in characters.items() if other != expected}
+                if style != expected:
+                    out.append(LintViolation(rule, index + 1, f"Expected: {expected}; Actual: {style}",
+                                             column=start + 1, length=marker))
+
+    # ------------------------------------------------------------------
+    # 自動修正
+    # ------------------------------------------------------------------
+    def fix(self, content: str) -> str:
+        """修正可能な違反を直した内容（違反が無ければ content そのもの）"""
+        for _ in range(FIX_PASSES):
+            fixed = self._fix_once(content)
+            if fixed == content:
+                break
+            content = fixed
+        return content
+
+    def fix_file(self, path) -> bool:
+        """ファイルを修正し、内容が変わった場合のみ書き込む（書き込んだら True）"""
+        path = Path(path)
+        content = path.read_text(encoding="utf-8")
+        fixed = self.fix(content)
+        if fixed == content:
+            return False
+        atomic_write_text(path, fixed)
+        return True
+
+    def _fix_once(self, content: str) -> str:
+        newline = "\r\n" if "\r\n" in content else "\n"
+        lines = content.split(newline)
+        trailing_newline = len(lines) > 1 and lines[-1] == ""
+        if trailing_newline:
+            lines.pop()
+
+        violations = self.lint(list(lines))
+        if not any(violation.rule in FIXABLE for violation in violations):
+            return content
+
+        replaced = list(lines)
+        deleted: set = set()
+        blank_before: set = set()
+        blank_after: set = set()
+        document = None
+        for violation in violations:
+            index = violation.line - 1
+            line = replaced[index]
+            rule = violation.rule
+            if rule == "MD009":
+                replaced[index] = line.rstrip()
+            elif rule == "MD010":
+                replaced[index] = line.replace("\t", " " * self.params["MD010"].get("spaces_per_tab", 1))
+            elif rule == "MD012":
+                deleted.add(index)
+            elif rule == "MD018":
+                hashes = len(line) - len(line.lstrip("#"))
+                replaced[index] = line[:hashes] + " " + line[hashes:]
+            elif rule == "MD019":
+                replaced[index] = re.sub(r"^( {0,3}#+)[ \t]{2,}", r"\1 ", line)
+            elif rule == "MD022":
+                if violation.detail.endswith("Above"):
+                    blank_before.add(index)
+                else:
+                    document = document or scan(lines)
+                    end = next(heading.end for heading in document.headings if heading.index == index)
+                    blank_after.add(end)
+            elif rule == "MD026":
+                body = line.rstrip()
+                closing = re.search(r"[ \t]+#+$", body)
+                head, tail = (body[:closing.start()], body[closing.start():]) if closing else (body, "")
+                replaced[index] = head.rstrip()[:-1] + tail
+            elif rule == "MD031":
+                document = document or scan(lines)
+                if any(opening == index for opening, _ in document.fences):
+                    blank_before.add(index)
+                else:
+                    blank_after.add(index)
+            elif rule in ("MD049", "MD050"):
+                replaced[index] = self._fix_emphasis(rule, replaced[index], violation)
+
+        output: List[str] = []
+        for index, line in enumerate(replaced):
+            if index in deleted:
+                continue
+            if index in blank_before and (not output or output[-1].strip()):
+                output.append("")
+            output.append(line)
+            if index in blank_after:
+                output.append("")
+        if trailing_newline:
+            output.append("")
+        return newline.join(output)
+
+    def _fix_emphasis(self, rule: str, line: str, violation: LintViolation) -> str:
+        expected = violation.detail.split(";")[0].split(": ")[1]
+        actual = "underscore" if expected == "asterisk" else "asterisk"
+        pattern = (EMPHASIS if rule == "MD049" else STRONG)[actual]
+        marker = ("*" if expected == "asterisk" else "_") * (1 if rule == "MD049" else 2)
+        start = violation.column - 1
+        match = pattern.match(line, start)
+        if match is None:
+            return line
+        return line[:start] + marker + match.group(1) + marker + line[match.end():]
+
+
+def _blank_run(document: _Document, index: int, step: int) -> int:
+    """index から step 方向に連続する空行数"""
+    run = 0
+    while 0 <= index < len(document.lines) and document.blank(index):
+        run += 1
+        index += step
+    return run
+
+
+def _paragraph_start(document: _Document, index: int) -> bool:
+    # 直前がリスト項目・表の行なら遅延継続行として前のブロックに含まれる
+    return index <= document.start or document.kinds[index - 1] not in (TEXT, LIST_ITEM, TABLE)
+
+
+def _paragraph_end(document: _Document, index: int) -> bool:
+    return index + 1 >= len(document.lines) or document.kinds[index + 1] != TEXT
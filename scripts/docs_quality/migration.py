@@ -0,0 +1,274 @@
+# -*- coding: utf-8 -*-
+
+"""
+ドキュメント移行プランナー
+作成日: 2026-10-19
+目的: 宣言的な移動計画からファイル移動とリンク書き換えを1パスで実行する
+
+従来の docs-restructure.sh → update-*-links.py の組み合わせはリンクを文字列置換で
+書き換えていたため、リンク元ファイルの位置が考慮されず相対リンクが壊れていた。
+本モジュールは全リンクをコーパス内の絶対パスへ解決してから、移動後のリンク元から
+移動後のリンク先への相対パスを計算し直す。各ファイルの読み込み・書き込みは1回ずつ。
+
+移動計画（JSON）:
+    {
+      "moves": [
+        {"from": "01_概要/01_概要.md", "to": "core/README.md"},
+        {"from": "03_機能仕様/", "to": "features/"}
+      ]
+    }
+パスは docs ルートからの相対パス。末尾が "/" の場合はディレクトリ単位の移動。
+"""
+
+import json
+import os
+import posixpath
+import re
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import quote
+
+from docs_quality.corpus import Corpus
+from docs_quality.fsutil import atomic_write_text
+from docs_quality.links import is_external, relative_link, resolve_link
+from docs_quality.walker import relative_files
+
+# [text](target "title") / ![alt](target)
+INLINE_LINK = re.compile(r'(!?\[[^\]]*\]\(\s*)(<?)([^)\s>]*)(>?(?:\s+"[^"]*")?\s*\))')
+# [id]: target
+REFERENCE_LINK = re.compile(r'^(\s{0,3}\[[^\]]+\]:\s*)(\S+)', re.MULTILINE)
+FENCE = re.compile(r'^\s{0,3}(```|~~~)')
+
+
+class MigrationError(Exception):
+    """移動計画の検証エラー"""
+
+
+def fenced_ranges(content: str) -> List[Tuple[int, int]]:
+    """フェンスドコードブロックの文字範囲（リンク書き換え対象外）"""
+    ranges = []
+    offset = 0
+    start = None
+    marker = None
+    for line in content.splitlines(keepends=True):
+        match = FENCE.match(line)
+        if match:
+            if start is None:
+                start, marker = offset, match.group(1)
+            elif match.group(1) == marker:
+                ranges.append((start, offset + len(line)))
+                start = marker = None
+        offset += len(line)
+    if start is not None:
+        ranges.append((start, len(content)))
+    return ranges
+
+
+def _in_ranges(position: int, ranges: List[Tuple[int, int]]) -> bool:
+    return any(start <= position < end for start, end in ranges)
+
+
+class MigrationPlan:
+    """移動計画（旧パス → 新パス の対応表へ展開済み）"""
+
+    def __init__(self, moves: List[Dict[str, str]]):
+        self.moves = moves
+        self.mapping: Dict[str, str] = {}
+        self.order: List[str] = []
+        self.directory_moves: List[Tuple[str, str]] = []
+
+    @classmethod
+    def load(cls, path) -> "MigrationPlan":
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        moves = data.get("moves", [])
+        if isinstance(moves, dict):
+            # update-*-links.py と同じ {旧: 新} 形式も受け付ける
+            moves = [{"from": source, "to": target} for source, target in moves.items()]
+        return cls(moves)
+
+    def expand(self, all_files: List[str]) -> Dict[str, str]:
+        """ディレクトリ単位の移動を個別ファイルへ展開し、衝突を検証する"""
+        mapping: Dict[str, str] = {}
+        existing = set(all_files)
+
+        for move in self.moves:
+            source = move["from"].strip("/") if move["from"].endswith("/") else move["from"]
+            target = move["to"]
+            if move["from"].endswith("/"):
+                prefix = source + "/"
+                matched = [path for path in all_files if path.startswith(prefix)]
+                if not matched:
+                    raise MigrationError(f"移動元ディレクトリが見つかりません: {move['from']}")
+                target_dir = target.strip("/")
+                self.directory_moves.append((source, target_dir))
+                for path in matched:
+                    mapping[path] = posixpath.join(target_dir, path[len(prefix):]) if target_dir else path[len(prefix):]
+            else:
+                if source not in existing:
+                    raise MigrationError(f"移動元ファイルが見つかりません: {source}")
+                if target.endswith("/"):
+                    target = posixpath.join(target.strip("/"), posixpath.basename(source))
+                mapping[source] = posixpath.normpath(target)
+
+        # 移動先の重複・既存ファイルへの上書きを検出
+        targets: Dict[str, str] = {}
+        for source, target in mapping.items():
+            if target.startswith("../"):
+                raise MigrationError(f"移動先がドキュメントルート外です: {target}")
+            if target in targets:
+                raise MigrationError(f"移動先が重複しています: {targets[target]} / {source} → {target}")
+            targets[target] = source
+            if target in existing and target not in mapping:
+                raise MigrationError(f"移動先に既存ファイルがあります: {target}")
+
+        self.mapping = {source: target for source, target in mapping.items() if source != target}
+        self.order = self._order_moves(self.mapping)
+        return self.mapping
+
+    def map_path(self, path: str) -> str:
+        """旧パス（ファイルまたはディレクトリ）の移動後のパス"""
+        if path in self.mapping:
+            return self.mapping[path]
+        for source_dir, target_dir in self.directory_moves:
+            if path == source_dir:
+                return target_dir or "."
+            if path.startswith(source_dir + "/"):
+                return posixpath.join(target_dir, path[len(source_dir) + 1:]) if target_dir else path[len(source_dir) + 1:]
+        return path
+
+    @staticmethod
+    def _order_moves(mapping: Dict[str, str]) -> List[str]:
+        """移動先が未移動の移動元と重ならない順序（A→B, B→C なら B→C を先に）"""
+        pending = dict(mapping)
+        order = []
+        while pending:
+            ready = [source for source, target in pending.items() if target not in pending]
+            if not ready:
+                raise MigrationError(f"移動計画が循環しています: {sorted(pending)[:5]}")
+            for source in sorted(ready):
+                order.append(source)
+                del pending[source]
+        return order
+
+
+class MigrationPlanner:
+    """ファイル移動とリンク書き換えの計画・実行"""
+
+    def __init__(self, docs_dir, plan: MigrationPlan, exclude: Sequence[str] = ()):
+        self.docs_dir = Path(docs_dir)
+        self.plan = plan
+        self.exclude = tuple(exclude)
+        self.corpus = Corpus(self.docs_dir, exclude=self.exclude)
+        self.rewrites: Dict[str, str] = {}   # 新パス -> 書き換え後の内容
+        self.link_changes: List[Dict[str, str]] = []
+
+    def _all_files(self) -> List[str]:
+        return relative_files(self.docs_dir, exclude=self.exclude)
+
+    def prepare(self) -> Dict[str, Any]:
+        """全Markdownを1回ずつ読み込み、書き換え内容を計算する（ディスクへは書かない）"""
+        mapping = self.plan.expand(self._all_files())
+        self.corpus.scan()
+        self.rewrites = {}
+        self.link_changes = []
+
+        for entry in self.corpus:
+            old_source = self.corpus.relative_path(entry)
+            new_source = mapping.get(old_source, old_source)
+            content = self._rewrite(entry.content, old_source, new_source, mapping)
+            if content != entry.content:
+                self.rewrites[new_source] = content
+
+        return {
+            "moves": len(mapping),
+            "rewritten_files": len(self.rewrites),
+            "link_changes": len(self.link_changes),
+        }
+
+    def _new_target(self, old_source: str, new_source: str, target: str,
+                    mapping: Dict[str, str]) -> Optional[str]:
+        if is_external(target) or target.startswith("#"):
+            return None
+        # ドキュメントルート外（リポジトリ直下の README 等）へのリンクも位置を保って書き換える
+        resolved = resolve_link(old_source, target, allow_outside=True)
+        if resolved is None:
+            return None
+        old_target, anchor = resolved
+        new_target = self.plan.map_path(old_target)
+        if new_source == old_source and new_target == old_target:
+            return None
+
+        if target.split("#", 1)[0].startswith("/"):
+            link = "/" + new_target
+        else:
+            link = relative_link(new_source, new_target)
+            if target.startswith("./") and not link.startswith("../"):
+                link = "./" + link
+        if "%" in target:
+            link = quote(link)
+        if target.split("#", 1)[0].endswith("/") and not link.endswith("/"):
+            link += "/"
+        if anchor:
+            link += "#" + anchor
+        return link
+
+    def _rewrite(self, content: str, old_source: str, new_source: str, mapping: Dict[str, str]) -> str:
+        ranges = fenced_ranges(content)
+
+        def replace(match, group: int) -> str:
+            if _in_ranges(match.start(), ranges):
+                return match.group(0)
+            target = match.group(group)
+            new_target = self._new_target(old_source, new_source, target, mapping)
+            if new_target is None or new_target == target:
+                return match.group(0)
+            self.link_changes.append({"file": new_source, "from": target, "to": new_target})
+            start, end = match.span(group)
+            base = match.start()
+            text = match.group(0)
+            return text[:start - base] + new_target + text[end - base:]
+
+        content = INLINE_LINK.sub(lambda m: replace(m, 3), content)
+        content = REFERENCE_LINK.sub(lambda m: replace(m, 2), content)
+        return content
+
+    def apply(self) -> Dict[str, int]:
+        """prepare() の結果を適用（書き換え対象は原子的に書き込み、その他は rename）"""
+        mapping = self.plan.mapping
+        written = moved = 0
+
+        for old_path in self.plan.order:
+            new_path = mapping[old_path]
+            destination = self.docs_dir / new_path
+            destination.parent.mkdir(parents=True, exist_ok=True)
+            if new_path in self.rewrites:
+                atomic_write_text(destination, self.rewrites.pop(new_path))
+                os.unlink(self.docs_dir / old_path)
+                written += 1
+            else:
+                os.replace(self.docs_dir / old_path, destination)
+            moved += 1
+
+        # 移動していないファイルのリンク書き換え
+        for path, content in self.rewrites.items():
+            atomic_write_text(self.docs_dir / path, content)
+            written += 1
+        self.rewrites = {}
+
+        removed_dirs = self._remove_empty_dirs({posixpath.dirname(path) for path in mapping})
+        return {"moved": moved, "written": written, "removed_dirs": removed_dirs}
+
+    def _remove_empty_dirs(self, directories) -> int:
+        removed = 0
+        for directory in sorted(directories, key=len, reverse=True):
+            current = directory
+            while current:
+                path = self.docs_dir / current
+                try:
+                    path.rmdir()
+                except OSError:
+                    break
+                removed += 1
+                current = posixpath.dirname(current)
+        return removed
@@ -0,0 +1,242 @@
+# -*- coding: utf-8 -*-
+
+"""
+段階パイプライン（読み込み → 解析 → 集約）
+作成日: 2026-10-19
+目的: ファイルI/OとCPU処理を重ね合わせ、上限付きキューで背圧をかけながら流す
+
+    読み込みスレッド群 ──[read_queue]──▶ 振り分けスレッド ──▶ 解析ワーカー（プロセス） ──▶ 集約（呼び出し元スレッド）
+
+- 読み込み: スレッドプール（I/O待ちの間は GIL を解放するため、ネットワークマウントでも先読みが効く）
+- 解析: プロセスプール（GIL の影響を受けない）。workers=0 の場合は振り分けスレッド内で逐次解析
+- 集約: 呼び出し元スレッドのみが結果を反映するため、集約処理にロックは不要
+- キュー上限（queue_size）: 読み込み済み・解析中の件数がこれを超えると上流が待つため、メモリ使用量が一定
+"""
+
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+_DONE = object()
+
+# 解析ワーカープロセス内の分析器（init_analysis_worker で生成）
+_worker_analyzer = None
+
+
+def default_workers() -> int:
+    return min(4, os.cpu_count() or 1)
+
+
+def init_analysis_worker(script: str, docs_dir: str, output_dir: str, rules_path: Optional[str],
+                         spell_config: Optional[str] = None, spell_cache: Optional[str] = None,
+                         lint_config: Optional[str] = None, checks: Optional[Tuple[str, ...]] = None,
+                         spell_system_dictionaries: bool = False) -> None:
+    """解析ワーカープロセスの初期化（分析スクリプトを読み込み、分析器を1つ生成）"""
+    global _worker_analyzer
+    from docs_quality.loader import load_script
+
+    module = load_script(script)
+    _worker_analyzer = module.AIQualityAnalyzer(docs_dir, output_dir, rules_path=rules_path,
+                                                spell_config=spell_config, spell_cache=spell_cache,
+                                                spell_system_dictionaries=spell_system_dictionaries,
+                                                lint_config=lint_config, checks=checks)
+
+
+def analyze_in_worker(key: str, content: str) -> Tuple[Tuple[Any, Dict[str, Any], Dict[str, Any]], float]:
+    """ワーカープロセスで1ファイルを分析（結果は FileRecord。ルール統計・チェック統計は集約側で合算）"""
+    begin = time.perf_counter()
+    result = _worker_analyzer._analyze_single_file(Path(key), content)
+    return (result, _worker_analyzer.rules.drain_stats(), _worker_analyzer.plan.drain_stats()), \
+        time.perf_counter() - begin
+
+
+class StageStats:
+    """ステージ別の稼働統計"""
+
+    __slots__ = ("name", "workers", "items", "busy_seconds", "blocked_seconds", "max_queue")
+
+    def __init__(self, name: str, workers: int):
+        self.name = name
+        self.workers = workers
+        self.items = 0
+        self.busy_seconds = 0.0
+        self.blocked_seconds = 0.0
+        self.max_queue = 0
+
+    def to_dict(self, wall_seconds: float) -> Dict[str, Any]:
+        capacity = wall_seconds * max(self.workers, 1)
+        return {
+            "workers": self.workers,
+            "items": self.items,
+            "busy_seconds": round(self.busy_seconds, 4),
+            "blocked_seconds": round(self.blocked_seconds, 4),
+            "utilization": round(self.busy_seconds / capacity, 3) if capacity else 0.0,
+            "max_queue": self.max_queue,
+        }
+
+
+class StagedPipeline:
+    """読み込み・解析・集約の3段パイプライン
+
+    read(item) -> Optional[(payload, task)]  読み込みスレッドで実行。None なら以降の段を省略
+    analyze(*task) -> (result, busy_seconds) 解析ワーカーで実行（プロセスプール時は pickle 可能な関数）
+    aggregate(payload, result)               呼び出し元スレッドで実行
+    """
+
+    def __init__(self, read: Callable, analyze: Callable, aggregate: Callable,
+                 readers: int = 4, workers: int = 0, queue_size: int = 16,
+                 initializer: Optional[Callable] = None, initargs: Tuple = ()):
+        self.read = read
+        self.analyze = analyze
+        self.aggregate = aggregate
+        self.readers = max(1, readers)
+        self.workers = max(0, workers)
+        self.queue_size = max(1, queue_size)
+        self.initializer = initializer
+        self.initargs = initargs
+        self.stats = {
+            "read": StageStats("read", self.readers),
+            "analyze": StageStats("analyze", self.workers or 1),
+            "aggregate": StageStats("aggregate", 1),
+        }
+        self.wall_seconds = 0.0
+
+    def _executor(self) -> Optional[ProcessPoolExecutor]:
+        if not self.workers:
+            return None
+        # 読み込みスレッド起動後に fork すると子プロセスがロックを引き継ぐため、forkserver を優先
+        methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context("forkserver" if "forkserver" in methods else None)
+        return ProcessPoolExecutor(self.workers, mp_context=context,
+                                   initializer=self.initializer, initargs=self.initargs)
+
+    def run(self, items: Iterable[Any]) -> Dict[str, Any]:
+        started = time.perf_counter()
+        executor = self._executor()
+        try:
+            self._run(list(items), executor)
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=True)
+        self.wall_seconds = time.perf_counter() - started
+        return self.report()
+
+    def _run(self, items: List[Any], executor: Optional[ProcessPoolExecutor]) -> None:
+        input_queue: "queue.Queue" = queue.Queue()
+        read_queue: "queue.Queue" = queue.Queue(maxsize=self.queue_size)
+        result_queue: "queue.Queue" = queue.Queue()
+        # 解析中＋集約待ちの件数上限（集約が遅い場合も解析側が先行しすぎない）
+        in_flight = threading.BoundedSemaphore(self.queue_size)
+        read_stats = self.stats["read"]
+        analyze_stats = self.stats["analyze"]
+        stats_lock = threading.Lock()
+        errors: List[BaseException] = []
+
+        for item in items:
+            input_queue.put(item)
+        for _ in range(self.readers):
+            input_queue.put(_DONE)
+
+        def reader() -> None:
+            while True:
+                item = input_queue.get()
+                if item is _DONE:
+                    read_queue.put(_DONE)
+                    return
+                begin = time.perf_counter()
+                try:
+                    loaded = self.read(item)
+                except BaseException as e:  # 集約側へ伝えて停止させる
+                    errors.append(e)
+                    loaded = None
+                elapsed = time.perf_counter() - begin
+                with stats_lock:
+                    read_stats.items += 1
+                    read_stats.busy_seconds += elapsed
+                if loaded is None:
+                    continue
+                begin = time.perf_counter()
+                read_queue.put(loaded)
+                with stats_lock:
+                    read_stats.blocked_seconds += time.perf_counter() - begin
+                    read_stats.max_queue = max(read_stats.max_queue, read_queue.qsize())
+
+        def dispatcher() -> None:
+            finished_readers = 0
+            submitted = 0
+            failed = False
+            while finished_readers < self.readers:
+                loaded = read_queue.get()
+                if loaded is _DONE:
+                    finished_readers += 1
+                    continue
+                if failed:
+                    # 解析側が使えなくなった後も読み込みスレッドが止まらないよう読み捨てる
+                    continue
+                payload, task = loaded
+                begin = time.perf_counter()
+                in_flight.acquire()
+                analyze_stats.blocked_seconds += time.perf_counter() - begin
+
+                if executor is None:
+                    future: Future = Future()
+                    try:
+                        future.set_result(self.analyze(*task))
+                    except BaseException as e:
+                        future.set_exception(e)
+                else:
+                    try:
+                        future = executor.submit(self.analyze, *task)
+                    except BaseException as e:
+                        errors.append(e)
+                        in_flight.release()
+                        failed = True
+                        continue
+                future.add_done_callback(lambda done, payload=payload: result_queue.put((payload, done)))
+                submitted += 1
+            # 完了コールバックは _DONE の後に届くこともあるため、投入件数を伝える
+            result_queue.put((_DONE, submitted))
+
+        threads = [threading.Thread(target=reader, name=f"pipeline-reader-{n}", daemon=True)
+                   for n in range(self.readers)]
+        threads.append(threading.Thread(target=dispatcher, name="pipeline-dispatcher", daemon=True))
+        for thread in threads:
+            thread.start()
+
+        aggregate_stats = self.stats["aggregate"]
+        submitted: Optional[int] = None
+        aggregated = 0
+        try:
+            while submitted is None or aggregated < submitted:
+                payload, future = result_queue.get()
+                if payload is _DONE:
+                    submitted = future
+                    continue
+                in_flight.release()
+                analyze_stats.max_queue = max(analyze_stats.max_queue, result_queue.qsize() + 1)
+                result, busy = future.result()
+                analyze_stats.items += 1
+                analyze_stats.busy_seconds += busy
+                begin = time.perf_counter()
+                self.aggregate(payload, result)
+                aggregate_stats.items += 1
+                aggregate_stats.busy_seconds += time.perf_counter() - begin
+                aggregated += 1
+        finally:
+            for thread in threads:
+                thread.join(timeout=1)
+
+        if errors:
+            raise errors[0]
+
+    def report(self) -> Dict[str, Any]:
+        return {
+            "wall_seconds": round(self.wall_seconds, 4),
+            "queue_size": self.queue_size,
+            "stages": {name: stats.to_dict(self.wall_seconds) for name, stats in self.stats.items()},
+        }
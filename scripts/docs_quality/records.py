@@ -0,0 +1,356 @@
+# -*- coding: utf-8 -*-
+
+"""
+ファイル別分析結果のコンパクトなレコード
+作成日: 2026-10-19
+目的: 1ファイルの分析結果を入れ子の dict / list ではなく __slots__ のレコードと配列の列で保持する
+
+- 見出しは レベル（array 'B'）・行番号（array 'I'）・テキストの3列、リンク・画像はタプルの列
+- コードブロックは言語名と本文の位置（array 'I'）のみを持ち、本文はコーパスの内容から出力時に切り出す
+  （ワーカーからの転送量の大半を占める本文をプロセス間で送らない）
+- 繰り返し現れる文字列（リンク先・画像パス・言語名・見出し・ルールID・提案文）は sys.intern で共有する
+- 派生値（hierarchy_issues・languages・readability_level 等）は保持せず、出力時に計算する
+- プロセス間は __reduce__ による位置引数のタプル、部分結果ファイルには to_state() のリスト
+  （with_source() で本文を切り出し済みのレコードのみ）で受け渡す
+- 既存のJSONスキーマ（content_analysis の1ファイル分の dict）への変換は to_dict()（レポート出力時のみ）
+"""
+
+import sys
+from array import array
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from docs_quality.markdownlint import violation_to_dict
+from docs_quality.tokenizer import SCRIPT_NAMES
+
+SCRIPT_KEYS = tuple(SCRIPT_NAMES.values())
+_intern = sys.intern
+
+
+def readability_level(score: float) -> str:
+    """可読性レベル判定"""
+    if score >= 90:
+        return "非常に読みやすい"
+    elif score >= 80:
+        return "読みやすい"
+    elif score >= 70:
+        return "やや読みやすい"
+    elif score >= 60:
+        return "普通"
+    elif score >= 50:
+        return "やや読みにくい"
+    else:
+        return "読みにくい"
+
+
+def _pairs(items: Sequence[Sequence[str]]) -> Tuple[Tuple[str, str], ...]:
+    """(ラベル, パス) 等の列。2要素目（パス・言語名）は共有されやすいため intern する"""
+    return tuple((first, _intern(second)) for first, second in items)
+
+
+class HeaderColumns:
+    """見出しの列（レベル・行番号・テキスト）"""
+
+    __slots__ = ("levels", "line_numbers", "texts")
+
+    def __init__(self, levels=None, line_numbers=None, texts=None):
+        self.levels = array("B", levels or ())
+        self.line_numbers = array("I", line_numbers or ())
+        self.texts: List[str] = [_intern(text) for text in texts or ()]
+
+    def append(self, level: int, text: str, line_number: int) -> None:
+        self.levels.append(min(level, 255))
+        self.line_numbers.append(line_number)
+        self.texts.append(_intern(text))
+
+    def __len__(self) -> int:
+        return len(self.levels)
+
+    def hierarchy_issues(self) -> List[Tuple[int, int, int]]:
+        """レベルが2段以上深くなった見出し (行番号, レベル, 直前のレベル)"""
+        levels = self.levels
+        return [(self.line_numbers[i], levels[i], levels[i - 1])
+                for i in range(1, len(levels)) if levels[i] > levels[i - 1] + 1]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "total": len(self),
+            "hierarchy": [{"level": level, "text": text, "line_number": line_number}
+                          for level, text, line_number in zip(self.levels, self.texts, self.line_numbers)],
+            "hierarchy_issues": [{"line": line, "issue": f"見出しレベル{level}が{previous}から飛躍"}
+                                 for line, level, previous in self.hierarchy_issues()],
+            "deepest_level": max(self.levels) if self.levels else 0,
+        }
+
+    def __reduce__(self):
+        return HeaderColumns, (self.levels, self.line_numbers, self.texts)
+
+
+class CodeBlocks:
+    """コードブロックの列（言語名・本文の位置、または切り出し済みの本文）"""
+
+    __slots__ = ("languages", "spans", "texts")
+
+    def __init__(self, languages=None, spans=None, texts=None):
+        self.languages: List[str] = [_intern(language) for language in languages or ()]
+        self.spans = array("I", spans or ())
+        self.texts: Optional[List[str]] = texts
+
+    def append(self, language: str, start: int, end: int) -> None:
+        self.languages.append(_intern(language))
+        self.spans.extend((start, end))
+
+    def __len__(self) -> int:
+        return len(self.languages)
+
+    def with_source(self, content: str) -> "CodeBlocks":
+        """本文を切り出した列（部分結果ファイル・レポート出力用）"""
+        if self.texts is not None:
+            return self
+        spans = self.spans
+        texts = [content[spans[i]:spans[i + 1]] for i in range(0, len(spans), 2)]
+        return CodeBlocks(self.languages, texts=texts)
+
+    def details(self) -> List[List[str]]:
+        if self.texts is None:
+            raise ValueError("コードブロックの本文が未解決です（with_source() を先に呼び出してください）")
+        return [[language, text] for language, text in zip(self.languages, self.texts)]
+
+    def __reduce__(self):
+        return CodeBlocks, (self.languages, self.spans, self.texts)
+
+
+class FileRecord:
+    """1ファイルの分析結果"""
+
+    __slots__ = (
+        "lines", "words", "characters",
+        "headers", "internal_links", "external_links", "empty_links",
+        "images", "images_without_alt", "code_blocks", "inline_code", "tables", "table_rows",
+        "readability_score", "sentences", "avg_words_per_sentence", "long_sentences", "scripts",
+        "structure_score", "ai_score", "suggestions", "findings", "ai_enabled", "overall_score", "error",
+        "misspellings", "lint_violations", "checks",
+    )
+
+    def __init__(self, lines: int = 0, words: int = 0, characters: int = 0,
+                 headers: Optional[HeaderColumns] = None,
+                 internal_links: Sequence = (), external_links: Sequence = (), empty_links: int = 0,
+                 images: Sequence = (), images_without_alt: int = 0,
+                 code_blocks: Optional[CodeBlocks] = None, inline_code: int = 0, tables: int = 0, table_rows: int = 0,
+                 readability_score: float = 0, sentences: int = 0, avg_words_per_sentence: float = 0,
+                 long_sentences: int = 0, scripts: Sequence[int] = (),
+                 structure_score: float = 0, ai_score: Optional[float] = None,
+                 suggestions: Sequence[str] = (), findings: Sequence = (), ai_enabled: bool = False,
+                 overall_score: Optional[float] = None, error: Optional[str] = None,
+                 misspellings: Optional[Sequence] = None, lint_violations: Optional[Sequence] = None,
+                 checks: Optional[Sequence[str]] = None):
+        self.lines = lines
+        self.words = words
+        self.characters = characters
+        self.headers = headers if headers is not None else HeaderColumns()
+        self.internal_links = _pairs(internal_links)
+        self.external_links = _pairs(external_links)
+        self.empty_links = empty_links
+        self.images = _pairs(images)
+        self.images_without_alt = images_without_alt
+        self.code_blocks = code_blocks if code_blocks is not None else CodeBlocks()
+        self.inline_code = inline_code
+        self.tables = tables
+        self.table_rows = table_rows
+        self.readability_score = readability_score
+        self.sentences = sentences
+        self.avg_words_per_sentence = avg_words_per_sentence
+        self.long_sentences = long_sentences
+        self.scripts = tuple(scripts)
+        self.structure_score = structure_score
+        self.ai_score = ai_score
+        self.suggestions = tuple(_intern(message) for message in suggestions)
+        self.findings = tuple((_intern(rule), _intern(severity)) for rule, severity in findings)
+        self.ai_enabled = ai_enabled
+        self.overall_score = overall_score
+        self.error = error
+        # 未知語 (語, 出現回数, 最初の行)。スペルチェック無効時は None
+        self.misspellings = None if misspellings is None else tuple(
+            (word, count, line) for word, count, line in misspellings
+        )
+        # Markdown 構文違反 (ルールID, 行, 詳細, 文脈, 桁, 長さ)。構文チェック無効時は None
+        self.lint_violations = None if lint_violations is None else tuple(
+            (_intern(rule), *rest) for rule, *rest in lint_violations
+        )
+        # 実行したチェック名（docs_quality.checks）。None は全チェック（出力する節の判定に使う）
+        self.checks = None if checks is None else tuple(_intern(name) for name in checks)
+
+    @classmethod
+    def failed(cls, error: str) -> "FileRecord":
+        return cls(error=error)
+
+    # ------------------------------------------------------------------
+    # 直列化（プロセス間・部分結果ファイル）
+    # ------------------------------------------------------------------
+    def _values(self) -> Tuple:
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __reduce__(self):
+        return FileRecord, self._values()
+
+    def with_source(self, content: str) -> "FileRecord":
+        """コードブロックの本文を content から切り出したレコード（切り出し済みなら自身）"""
+        if self.code_blocks.texts is not None:
+            return self
+        record = object.__new__(FileRecord)
+        for name, value in zip(self.__slots__, self._values()):
+            setattr(record, name, value)
+        record.code_blocks = self.code_blocks.with_source(content)
+        return record
+
+    def to_state(self) -> List[Any]:
+        """JSON化できる状態（部分結果ファイル用、フィールド順の配列）"""
+        state = list(self._values())
+        headers = self.headers
+        state[3] = [list(headers.levels), list(headers.line_numbers), headers.texts]
+        state[_CODE_BLOCKS] = self.code_blocks.details()
+        return state
+
+    @classmethod
+    def from_state(cls, state: List[Any]) -> "FileRecord":
+        values = list(state)
+        values[3] = HeaderColumns(*values[3])
+        blocks = values[_CODE_BLOCKS]
+        values[_CODE_BLOCKS] = CodeBlocks([language for language, _ in blocks], texts=[text for _, text in blocks])
+        return cls(*values)
+
+    @classmethod
+    def coerce(cls, value) -> "FileRecord":
+        """レコード、または部分結果ファイルから読み込んだ状態"""
+        return value if isinstance(value, cls) else cls.from_state(value)
+
+    # ------------------------------------------------------------------
+    # 特徴量（ルール条件）
+    # ------------------------------------------------------------------
+    def feature(self, path: str) -> Any:
+        """ルール条件の特徴量パス（"basic_metrics.words" 等）の値"""
+        getter = FEATURES.get(path)
+        if getter is not None:
+            return getter(self)
+        value: Any = self.to_dict()
+        for key in path.split("."):
+            if not isinstance(value, dict) or key not in value:
+                return None
+            value = value[key]
+        return value
+
+    # ------------------------------------------------------------------
+    # 既存のJSONスキーマへの変換（レポート出力時）
+    # ------------------------------------------------------------------
+    def to_dict(self) -> Dict[str, Any]:
+        if self.error is not None:
+            return {"error": self.error}
+
+        ran = self.checks
+        result: Dict[str, Any] = {}
+        if ran is None or "basic_metrics" in ran:
+            result["basic_metrics"] = {
+                "lines": self.lines,
+                "words": self.words,
+                "characters": self.characters,
+                "avg_line_length": self.characters / self.lines if self.lines else 0
+            }
+        if ran is None or "structure" in ran:
+            languages: Dict[str, int] = {}
+            for language in self.code_blocks.languages:
+                if language:
+                    languages[language] = languages.get(language, 0) + 1
+            result["structure_analysis"] = {
+                "headers": self.headers.to_dict(),
+                "links": {
+                    "total": len(self.internal_links) + len(self.external_links),
+                    "internal": len(self.internal_links),
+                    "external": len(self.external_links),
+                    "empty": self.empty_links,
+                    "internal_details": [list(link) for link in self.internal_links],
+                    "external_details": [list(link) for link in self.external_links]
+                },
+                "images": {
+                    "total": len(self.images),
+                    "with_alt": sum(1 for alt, _ in self.images if alt),
+                    "without_alt": self.images_without_alt,
+                    "details": [list(image) for image in self.images]
+                },
+                "code_blocks": {
+                    "total_blocks": len(self.code_blocks),
+                    "inline_code": self.inline_code,
+                    "languages": languages,
+                    "details": self.code_blocks.details()
+                },
+                "tables": {
+                    "total": self.tables,
+                    "total_rows": self.table_rows
+                }
+            }
+        if ran is None or "readability" in ran:
+            result["readability"] = {
+                "score": self.readability_score,
+                "sentences": self.sentences,
+                "avg_words_per_sentence": self.avg_words_per_sentence,
+                "long_sentences": self.long_sentences,
+                "scripts": dict(zip(SCRIPT_KEYS, self.scripts)),
+                "readability_level": readability_level(self.readability_score)
+            }
+        if ran is None or "structure" in ran:
+            result["structure_score"] = self.structure_score
+        if self.ai_score is not None:
+            result["ai_analysis"] = {
+                "score": self.ai_score,
+                "suggestions": list(self.suggestions),
+                "findings": [{"rule": rule, "severity": severity} for rule, severity in self.findings],
+                "ai_enabled": self.ai_enabled,
+                "analysis_method": "rule_based_simulation" if not self.ai_enabled else "gpt_analysis"
+            }
+        if self.overall_score is not None:
+            result["overall_score"] = self.overall_score
+        if self.misspellings is not None:
+            result["spelling"] = {
+                "unknown_words": len(self.misspellings),
+                "occurrences": sum(count for _, count, _ in self.misspellings),
+                "details": [{"word": word, "count": count, "line": line} for word, count, line in self.misspellings]
+            }
+        if self.lint_violations is not None:
+            rules: Dict[str, int] = {}
+            for violation in self.lint_violations:
+                rules[violation[0]] = rules.get(violation[0], 0) + 1
+            result["markdownlint"] = {
+                "violations": len(self.lint_violations),
+                "rules": rules,
+                "details": [violation_to_dict(violation) for violation in self.lint_violations]
+            }
+        return result
+
+
+_CODE_BLOCKS = FileRecord.__slots__.index("code_blocks")
+
+# よく使う特徴量パスは to_dict() を経由せずに直接読む
+FEATURES: Dict[str, Callable[[FileRecord], Any]] = {
+    "basic_metrics.lines": lambda record: record.lines,
+    "basic_metrics.words": lambda record: record.words,
+    "basic_metrics.characters": lambda record: record.characters,
+    "structure_analysis.headers.total": lambda record: len(record.headers),
+    "structure_analysis.headers.deepest_level": lambda record: max(record.headers.levels, default=0),
+    "structure_analysis.links.total": lambda record: len(record.internal_links) + len(record.external_links),
+    "structure_analysis.links.internal": lambda record: len(record.internal_links),
+    "structure_analysis.links.external": lambda record: len(record.external_links),
+    "structure_analysis.links.empty": lambda record: record.empty_links,
+    "structure_analysis.images.total": lambda record: len(record.images),
+    "structure_analysis.images.without_alt": lambda record: record.images_without_alt,
+    "structure_analysis.code_blocks.total_blocks": lambda record: len(record.code_blocks),
+    "structure_analysis.code_blocks.inline_code": lambda record: record.inline_code,
+    "structure_analysis.tables.total": lambda record: record.tables,
+    "structure_analysis.tables.total_rows": lambda record: record.table_rows,
+    "readability.score": lambda record: record.readability_score,
+    "readability.sentences": lambda record: record.sentences,
+    "readability.long_sentences": lambda record: record.long_sentences,
+    "structure_score": lambda record: record.structure_score,
+    "ai_analysis.score": lambda record: record.ai_score,
+    "overall_score": lambda record: record.overall_score,
+    "spelling.unknown_words": lambda record: None if record.misspellings is None else len(record.misspellings),
+    "markdownlint.violations":
+        lambda record: None if record.lint_violations is None else len(record.lint_violations),
+}
@@ -0,0 +1,292 @@
+# -*- coding: utf-8 -*-
+
+"""
+関連ドキュメント推定（TF-IDF + 疎行列の類似度上位k件）
+作成日: 2026-10-19
+目的: 内容が近いのに相互にリンクしていない文書の組を見つけ、相互リンクを推奨する
+
+- トークン化: 検索インデックスと同じ CJK 文字バイグラム + 英数字単語（docs_quality.tokenizer）。
+  フェンス付きコードブロックとリンク先URLは除く
+- 語の出現回数は内容ハッシュ（CorpusEntry.digest）ごとにキャッシュし、変更された文書だけを再トークン化する
+- 重みは (1 + log tf) × log((1 + N) / (1 + df)) + 1 を L2 正規化したもの。
+  文書の過半に現れる語（max_df）はストップワードとして除き、1文書にしか現れない語はノルムにのみ寄与させて行列には入れない
+- ベクトルは CSR 形式の疎行列（array 'I' の indptr / indices、array 'd' の data）で保持し、
+  類似度 A·Aᵀ は転置（CSC）の列ごとのポスティングとの積和で上三角のみを計算する
+- 全語での積和は共通語の多い大規模コーパスで文書数の2乗近くに膨らむため、まず各文書の重み上位
+  candidate_terms 語だけの行列で候補（文書ごとに k × candidate_factor 件）を選び、候補の組のみ全語で
+  正確なコサイン類似度を計算し直す（docs/ では候補が全語での上位k件を全て含むことを確認済み）
+"""
+
+import heapq
+import math
+import pickle
+import re
+import sys
+from array import array
+from bisect import bisect_right
+from collections import Counter
+from itertools import repeat
+from operator import mul
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from docs_quality.corpus import Corpus, CorpusEntry
+from docs_quality.fsutil import atomic_write
+from docs_quality.links import LinkGraph, relative_link
+from docs_quality.tokenizer import search_terms
+
+CODE_FENCE = re.compile(r"```.*?```", re.DOTALL)
+LINK_TARGET = re.compile(r"\]\([^)]*\)")
+
+DEFAULT_TOP_K = 5
+DEFAULT_THRESHOLD = 0.35
+# この割合を超える文書に現れる語はストップワードとして除く
+DEFAULT_MAX_DF = 0.5
+# 候補選択に使う文書ごとの語数と、上位k件に対する候補数の倍率
+CANDIDATE_TERMS = 64
+CANDIDATE_FACTOR = 4
+
+
+def document_terms(content: str) -> Counter:
+    """文書の語の出現回数（コードブロック・リンク先URLを除く）"""
+    text = LINK_TARGET.sub("]", CODE_FENCE.sub(" ", content))
+    return Counter(search_terms(text))
+
+
+class TermCountCache:
+    """内容ハッシュ → (語のタプル, 出現回数 array 'I')"""
+
+    VERSION = 1
+
+    def __init__(self):
+        self.counts: Dict[str, Tuple[Tuple[str, ...], array]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def load(cls, path) -> "TermCountCache":
+        cache = cls()
+        path = Path(path)
+        if not path.exists():
+            return cache
+        try:
+            with open(path, "rb") as f:
+                version, counts = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, ValueError):
+            return cache
+        if version == cls.VERSION:
+            cache.counts = counts
+        return cache
+
+    def save(self, path, keep: Optional[Iterable[str]] = None) -> None:
+        """keep（現存する文書の内容ハッシュ）以外のエントリは捨てて保存"""
+        if keep is not None:
+            keep = set(keep)
+            self.counts = {digest: value for digest, value in self.counts.items() if digest in keep}
+        atomic_write(Path(path), pickle.dumps((self.VERSION, self.counts), protocol=pickle.HIGHEST_PROTOCOL))
+
+    def get(self, entry: CorpusEntry) -> Tuple[Tuple[str, ...], array]:
+        cached = self.counts.get(entry.digest)
+        if cached is not None:
+            self.hits += 1
+            return cached
+        self.misses += 1
+        counter = document_terms(entry.content)
+        # 語は intern して文書間・pickle 内で共有する
+        cached = tuple(sys.intern(term) for term in counter), array("I", counter.values())
+        self.counts[entry.digest] = cached
+        return cached
+
+
+class SparseMatrix:
+    """CSR 形式の疎行列（行 = 文書、列 = 語）"""
+
+    __slots__ = ("columns", "indptr", "indices", "data")
+
+    def __init__(self, columns: int):
+        self.columns = columns
+        self.indptr = array("I", [0])
+        self.indices = array("I")
+        self.data = array("d")
+
+    @property
+    def rows(self) -> int:
+        return len(self.indptr) - 1
+
+    @property
+    def nnz(self) -> int:
+        return len(self.indices)
+
+    def append_row(self, indices: Iterable[int], values: Iterable[float]) -> None:
+        self.indices.extend(indices)
+        self.data.extend(values)
+        self.indptr.append(len(self.indices))
+
+    def row(self, row: int) -> Tuple[array, array]:
+        start, end = self.indptr[row], self.indptr[row + 1]
+        return self.indices[start:end], self.data[start:end]
+
+    def pruned(self, max_terms: int) -> "SparseMatrix":
+        """各行の重み上位 max_terms 列のみを残した行列"""
+        pruned = SparseMatrix(self.columns)
+        for row in range(self.rows):
+            indices, data = self.row(row)
+            if len(indices) > max_terms:
+                kept = sorted(heapq.nlargest(max_terms, zip(data, indices)), key=lambda item: item[1])
+                pruned.append_row((column for _, column in kept), (weight for weight, _ in kept))
+            else:
+                pruned.append_row(indices, data)
+        return pruned
+
+    def transpose(self) -> "SparseMatrix":
+        """転置（CSR → CSC 相当）。各列の行番号は昇順になる"""
+        counts = array("I", bytes(4 * (self.columns + 1)))
+        for column in self.indices:
+            counts[column + 1] += 1
+        for column in range(self.columns):
+            counts[column + 1] += counts[column]
+
+        transposed = SparseMatrix(self.rows)
+        transposed.indptr = array("I", counts)
+        transposed.indices = array("I", bytes(4 * self.nnz))
+        transposed.data = array("d", bytes(8 * self.nnz))
+        cursor = counts[:-1]
+        indptr, indices, data = self.indptr, self.indices, self.data
+        for row in range(self.rows):
+            for position in range(indptr[row], indptr[row + 1]):
+                column = indices[position]
+                target = cursor[column]
+                transposed.indices[target] = row
+                transposed.data[target] = data[position]
+                cursor[column] = target + 1
+        return transposed
+
+
+def tfidf_matrix(documents: List[Tuple[Tuple[str, ...], array]],
+                 max_df: float = DEFAULT_MAX_DF) -> Tuple[SparseMatrix, Dict[str, int]]:
+    """語の出現回数から L2 正規化済み TF-IDF 行列と語彙（語 → 列番号）を作る"""
+    total = len(documents)
+    df: Counter = Counter()
+    for terms, _ in documents:
+        df.update(terms)
+
+    stop_df = max(2, max_df * total)
+    idf = {term: math.log((1 + total) / (1 + count)) + 1 for term, count in df.items() if count <= stop_df}
+    vocabulary = {term: column for column, term in enumerate(sorted(term for term in idf if df[term] > 1))}
+
+    matrix = SparseMatrix(len(vocabulary))
+    for terms, counts in documents:
+        weights = {term: (1 + math.log(count)) * idf[term] for term, count in zip(terms, counts) if term in idf}
+        norm = math.sqrt(sum(weight * weight for weight in weights.values())) or 1.0
+        row = sorted((vocabulary[term], weight / norm) for term, weight in weights.items() if term in vocabulary)
+        matrix.append_row((column for column, _ in row), (weight for _, weight in row))
+    return matrix, vocabulary
+
+
+class _TopK:
+    """行ごとの上位k件（最小ヒープ）"""
+
+    def __init__(self, rows: int, k: int):
+        self.k = k
+        self.heaps: List[List[Tuple[float, int]]] = [[] for _ in range(rows)]
+
+    def push(self, row: int, score: float, other: int) -> None:
+        heap = self.heaps[row]
+        if len(heap) < self.k:
+            heapq.heappush(heap, (score, other))
+        elif score > heap[0][0]:
+            heapq.heapreplace(heap, (score, other))
+
+    def results(self) -> List[List[Tuple[float, int]]]:
+        return [sorted(heap, reverse=True) for heap in self.heaps]
+
+
+def _top_k_products(matrix: SparseMatrix, k: int, threshold: float) -> List[List[Tuple[float, int]]]:
+    """行 i と列（語）を共有する行 j > i との積和だけを計算し、結果は両方の行の上位k件に反映する"""
+    columns = matrix.transpose()
+    column_ptr, column_rows, column_data = columns.indptr, columns.indices, columns.data
+    indptr, indices, data = matrix.indptr, matrix.indices, matrix.data
+    top = _TopK(matrix.rows, k)
+    push = top.push
+
+    for row in range(matrix.rows):
+        scores: Dict[int, float] = {}
+        get = scores.get
+        for position in range(indptr[row], indptr[row + 1]):
+            column = indices[position]
+            weight = data[position]
+            end = column_ptr[column + 1]
+            start = bisect_right(column_rows, row, column_ptr[column], end)
+            for other, other_weight in zip(column_rows[start:end], column_data[start:end]):
+                scores[other] = get(other, 0.0) + weight * other_weight
+        for other, score in scores.items():
+            if score >= threshold:
+                push(row, score, other)
+                push(other, score, row)
+
+    return top.results()
+
+
+def top_k_similar(matrix: SparseMatrix, k: int = DEFAULT_TOP_K, threshold: float = DEFAULT_THRESHOLD,
+                  candidate_terms: int = CANDIDATE_TERMS,
+                  candidate_factor: int = CANDIDATE_FACTOR) -> List[List[Tuple[float, int]]]:
+    """各行について、コサイン類似度が threshold 以上の上位k行 [(類似度, 行番号)]（類似度の降順）"""
+    candidates = _top_k_products(matrix.pruned(candidate_terms), k * candidate_factor, 0.0)
+
+    pairs: Dict[int, set] = {}
+    for row, neighbours in enumerate(candidates):
+        for _, other in neighbours:
+            low, high = min(row, other), max(row, other)
+            pairs.setdefault(low, set()).add(high)
+
+    # 候補の組のみ全語で再計算（map による積和で、行ごとの Python ループを避ける）
+    top = _TopK(matrix.rows, k)
+    for row in sorted(pairs):
+        weights = dict(zip(*matrix.row(row)))
+        for other in sorted(pairs[row]):
+            other_indices, other_data = matrix.row(other)
+            score = sum(map(mul, other_data, map(weights.get, other_indices, repeat(0.0))))
+            if score >= threshold:
+                top.push(row, score, other)
+                top.push(other, score, row)
+    return top.results()
+
+
+def related_documents(corpus: Corpus, cache: TermCountCache, top_k: int = DEFAULT_TOP_K,
+                      threshold: float = DEFAULT_THRESHOLD, max_df: float = DEFAULT_MAX_DF) -> Dict[str, Any]:
+    """コーパス全体の関連ドキュメントと、リンクグラフに無い相互リンク候補"""
+    entries = sorted(corpus, key=lambda entry: entry.key)
+    paths = [corpus.relative_path(entry) for entry in entries]
+    matrix, vocabulary = tfidf_matrix([cache.get(entry) for entry in entries], max_df=max_df)
+    similar = top_k_similar(matrix, top_k, threshold)
+
+    outgoing = {path: set(targets) for path, targets in LinkGraph.build(corpus).outgoing.items()}
+    related: Dict[str, List[Dict[str, Any]]] = {}
+    missing: Dict[Tuple[str, str], float] = {}
+    for row, neighbours in enumerate(similar):
+        source = paths[row]
+        items = []
+        for score, other in neighbours:
+            target = paths[other]
+            linked = target in outgoing.get(source, ()) or source in outgoing.get(target, ())
+            items.append({"path": target, "similarity": round(score, 4), "linked": linked})
+            if not linked:
+                missing[min(source, target), max(source, target)] = score
+        if items:
+            related[source] = items
+
+    missing_links = [
+        {"source": source, "target": target, "similarity": round(score, 4), "link": relative_link(source, target)}
+        for (source, target), score in sorted(missing.items(), key=lambda item: (-item[1], item[0]))
+    ]
+    return {
+        "documents": matrix.rows,
+        "vocabulary": len(vocabulary),
+        "nonzeros": matrix.nnz,
+        "top_k": top_k,
+        "threshold": threshold,
+        "vectorized": cache.misses,
+        "cached": cache.hits,
+        "related": related,
+        "missing_links": missing_links,
+    }
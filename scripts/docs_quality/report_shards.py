@@ -0,0 +1,271 @@
+# -*- coding: utf-8 -*-
+
+"""
+分割レポート出力（シェルページ + ディレクトリ別JSONシャード）
+作成日: 2026-10-19
+目的: 全ファイル分のレポートを小さなHTMLシェルと遅延読み込みのJSONシャードで提供する
+
+出力構成:
+    <report_dir>/index.html        静的シェル（毎回同一バイト列）
+    <report_dir>/manifest.json     サマリー・推奨事項・シャード一覧（内容ハッシュ付き）
+    <report_dir>/shards/<名前>.<ハッシュ>.json   ディレクトリ単位のファイル別分析
+
+シャードのファイル名は内容ハッシュを含むため、内容が変わらない限り同じファイルが
+バイト単位でそのまま再利用され、静的ホスティングやブラウザキャッシュが有効に働く。
+"""
+
+import hashlib
+import json
+import re
+from pathlib import Path
+from typing import Any, Dict, List
+
+from docs_quality.fsutil import atomic_write
+
+SHARD_DIR = "shards"
+MANIFEST_NAME = "manifest.json"
+SHELL_NAME = "index.html"
+
+
+def _stable_json(data: Any) -> bytes:
+    """キー順・区切り文字を固定したJSON（同一内容なら同一バイト列）"""
+    return json.dumps(data, ensure_ascii=False, sort_keys=True, separators=(",", ":")).encode("utf-8")
+
+
+def _digest(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def _shard_slug(directory: str) -> str:
+    """ディレクトリ名からファイル名に使える短い識別子を作る"""
+    slug = re.sub(r"[^0-9A-Za-z_-]+", "-", directory).strip("-").lower()
+    return (slug[:32] or "dir") + "-" + hashlib.sha1(directory.encode("utf-8")).hexdigest()[:8]
+
+
+def _file_record(rel_path: str, file_data: Dict[str, Any]) -> Dict[str, Any]:
+    """シャードに載せるファイル別レコード（表示に必要な項目のみ）"""
+    if "overall_score" not in file_data:
+        return {"path": rel_path, "error": file_data.get("error", "unknown")}
+
+    structure = file_data["structure_analysis"]
+    return {
+        "path": rel_path,
+        "overall_score": file_data["overall_score"],
+        "structure_score": round(file_data["structure_score"], 2),
+        "readability_score": file_data["readability"]["score"],
+        "readability_level": file_data["readability"]["readability_level"],
+        "ai_score": file_data["ai_analysis"]["score"],
+        "words": file_data["basic_metrics"]["words"],
+        "lines": file_data["basic_metrics"]["lines"],
+        "headers": structure["headers"]["total"],
+        "hierarchy_issues": len(structure["headers"]["hierarchy_issues"]),
+        "links": structure["links"]["total"],
+        "images": structure["images"]["total"],
+        "code_blocks": structure["code_blocks"]["total_blocks"],
+        "tables": structure["tables"]["total"],
+        "suggestions": file_data["ai_analysis"]["suggestions"],
+    }
+
+
+def group_by_directory(content_analysis: Dict[str, Any], docs_dir: Path) -> Dict[str, List[Dict[str, Any]]]:
+    """content_analysis をディレクトリ（docs_dir 相対）ごとにまとめる"""
+    groups: Dict[str, List[Dict[str, Any]]] = {}
+    for key in sorted(content_analysis):
+        path = Path(key)
+        try:
+            rel_path = path.relative_to(docs_dir).as_posix()
+        except ValueError:
+            rel_path = path.as_posix()
+        directory = rel_path.rsplit("/", 1)[0] if "/" in rel_path else "."
+        groups.setdefault(directory, []).append(_file_record(rel_path, content_analysis[key]))
+    return groups
+
+
+class ShardedReportWriter:
+    """分割レポートの書き出し（変更のないシャードは書き直さない）"""
+
+    def __init__(self, report_dir: Path):
+        self.report_dir = Path(report_dir)
+        self.shard_dir = self.report_dir / SHARD_DIR
+
+    def write(self, analysis_data: Dict[str, Any], docs_dir: Path) -> Dict[str, int]:
+        groups = group_by_directory(analysis_data["content_analysis"], Path(docs_dir))
+        self.shard_dir.mkdir(parents=True, exist_ok=True)
+
+        directories = []
+        referenced = set()
+        written = reused = 0
+
+        for directory, records in groups.items():
+            body = _stable_json({"directory": directory, "files": records})
+            digest = _digest(body)
+            name = f"{_shard_slug(directory)}.{digest[:16]}.json"
+            referenced.add(name)
+
+            shard_path = self.shard_dir / name
+            if shard_path.exists():
+                reused += 1
+            else:
+                atomic_write(shard_path, body)
+                written += 1
+
+            scores = [r["overall_score"] for r in records if "overall_score" in r]
+            directories.append({
+                "directory": directory,
+                "files": len(records),
+                "average_score": round(sum(scores) / len(scores), 2) if scores else 0,
+                "poor_files": len([s for s in scores if s < 70]),
+                "shard": f"{SHARD_DIR}/{name}",
+                "sha256": digest,
+                "bytes": len(body),
+            })
+
+        manifest = {
+            "metadata": analysis_data["metadata"],
+            "quality_summary": analysis_data["quality_summary"],
+            "ai_recommendations": analysis_data["ai_recommendations"],
+            "directories": directories,
+        }
+        # マニフェストを先に差し替えてから、参照されなくなったシャードを削除する
+        atomic_write(self.report_dir / MANIFEST_NAME, _stable_json(manifest))
+        self._write_shell()
+
+        removed = 0
+        for stale in self.shard_dir.glob("*.json"):
+            if stale.name not in referenced:
+                stale.unlink()
+                removed += 1
+
+        return {"shards": len(directories), "written": written, "reused": reused, "removed": removed}
+
+    def _write_shell(self) -> None:
+        shell_path = self.report_dir / SHELL_NAME
+        body = SHELL_HTML.encode("utf-8")
+        if shell_path.exists() and shell_path.read_bytes() == body:
+            return
+        atomic_write(shell_path, body)
+
+
+SHELL_HTML = """<!DOCTYPE html>
+<html lang="ja">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>AI品質分析レポート - WebSys</title>
+    <style>
+        body { font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif; margin: 0; background: #f8fafc; }
+        .header { background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); color: white; padding: 40px; text-align: center; }
+        .container { max-width: 1400px; margin: 0 auto; padding: 30px; }
+        .dashboard { display: grid; grid-template-columns: repeat(auto-fit, minmax(250px, 1fr)); gap: 25px; margin-bottom: 40px; }
+        .widget { background: white; border-radius: 16px; padding: 30px; box-shadow: 0 8px 32px rgba(0,0,0,0.1); }
+        .widget h3 { margin-top: 0; color: #2d3748; font-size: 1.3em; }
+        .metric-value { font-size: 1.5em; font-weight: bold; color: #667eea; }
+        .metric-label { color: #718096; font-size: 0.9em; margin-top: 5px; }
+        .recommendations { background: white; border-radius: 16px; padding: 30px; margin: 30px 0; box-shadow: 0 8px 32px rgba(0,0,0,0.1); }
+        .recommendation { background: #f0fff4; border-left: 4px solid #48bb78; padding: 20px; margin: 15px 0; border-radius: 0 8px 8px 0; }
+        details.directory { background: white; border-radius: 12px; padding: 15px 25px; margin-bottom: 12px; box-shadow: 0 4px 16px rgba(0,0,0,0.08); }
+        details.directory summary { cursor: pointer; font-weight: 600; color: #2d3748; }
+        table { width: 100%; border-collapse: collapse; margin-top: 15px; }
+        th, td { text-align: left; padding: 8px; border-bottom: 1px solid #e2e8f0; font-size: 0.9em; }
+        .score-excellent { color: #38a169; font-weight: bold; }
+        .score-good { color: #3182ce; font-weight: bold; }
+        .score-fair { color: #dd6b20; font-weight: bold; }
+        .score-poor { color: #e53e3e; font-weight: bold; }
+        .suggestion { background: #ebf8ff; border-left: 4px solid #4299e1; padding: 6px 10px; margin: 4px 0; }
+    </style>
+</head>
+<body>
+    <div class="header">
+        <h1>🤖 AI品質分析レポート</h1>
+        <p>WebSys Phase2 高度品質分析システム</p>
+        <p id="generated-at"></p>
+    </div>
+    <div class="container">
+        <div class="dashboard" id="dashboard"></div>
+        <div class="recommendations"><h2>💡 AI推奨改善事項</h2><div id="recommendations"></div></div>
+        <h2>📋 ディレクトリ別詳細分析</h2>
+        <div id="directories"></div>
+    </div>
+    <script>
+    (function () {
+        function el(tag, attrs, text) {
+            var node = document.createElement(tag);
+            Object.keys(attrs || {}).forEach(function (k) { node.setAttribute(k, attrs[k]); });
+            if (text !== undefined) { node.textContent = text; }
+            return node;
+        }
+        function scoreClass(score) {
+            return score >= 90 ? 'excellent' : score >= 80 ? 'good' : score >= 70 ? 'fair' : 'poor';
+        }
+        function widget(title, value, label) {
+            var w = el('div', {'class': 'widget'});
+            w.appendChild(el('h3', {}, title));
+            w.appendChild(el('div', {'class': 'metric-value'}, String(value)));
+            w.appendChild(el('div', {'class': 'metric-label'}, label));
+            return w;
+        }
+        function renderShard(container, shard) {
+            var table = el('table');
+            var head = el('tr');
+            ['ファイル', '総合', '構造', '可読性', '単語数', '見出し', 'リンク', '改善提案'].forEach(function (h) {
+                head.appendChild(el('th', {}, h));
+            });
+            table.appendChild(head);
+            shard.files.forEach(function (f) {
+                var row = el('tr');
+                row.appendChild(el('td', {}, f.path));
+                if (f.error) {
+                    row.appendChild(el('td', {'colspan': '7'}, 'エラー: ' + f.error));
+                } else {
+                    row.appendChild(el('td', {'class': 'score-' + scoreClass(f.overall_score)}, String(f.overall_score)));
+                    row.appendChild(el('td', {}, String(f.structure_score)));
+                    row.appendChild(el('td', {}, f.readability_level));
+                    row.appendChild(el('td', {}, String(f.words)));
+                    row.appendChild(el('td', {}, String(f.headers)));
+                    row.appendChild(el('td', {}, String(f.links)));
+                    var cell = el('td');
+                    f.suggestions.forEach(function (s) { cell.appendChild(el('div', {'class': 'suggestion'}, s)); });
+                    row.appendChild(cell);
+                }
+                table.appendChild(row);
+            });
+            container.appendChild(table);
+        }
+        fetch('manifest.json', {cache: 'no-cache'}).then(function (r) { return r.json(); }).then(function (m) {
+            var s = m.quality_summary;
+            document.getElementById('generated-at').textContent = '生成日時: ' + m.metadata.timestamp;
+            var dashboard = document.getElementById('dashboard');
+            dashboard.appendChild(widget('📊 総合品質スコア', s.average_score, s.quality_level));
+            dashboard.appendChild(widget('📚 分析対象', s.total_files, 'ファイル'));
+            dashboard.appendChild(widget('🏆 優秀ファイル', s.score_distribution.excellent, '90点以上'));
+            dashboard.appendChild(widget('⚠️ 要改善ファイル', s.score_distribution.poor, '70点未満'));
+
+            var recs = document.getElementById('recommendations');
+            m.ai_recommendations.forEach(function (rec) {
+                var box = el('div', {'class': 'recommendation'});
+                box.appendChild(el('h4', {}, rec.title));
+                box.appendChild(el('p', {}, '説明: ' + rec.description));
+                box.appendChild(el('p', {}, '推奨アクション: ' + rec.action));
+                recs.appendChild(box);
+            });
+
+            var list = document.getElementById('directories');
+            m.directories.forEach(function (d) {
+                var details = el('details', {'class': 'directory'});
+                details.appendChild(el('summary', {},
+                    d.directory + '（' + d.files + '件 / 平均 ' + d.average_score + ' / 要改善 ' + d.poor_files + '件）'));
+                details.addEventListener('toggle', function () {
+                    if (!details.open || details.dataset.loaded) { return; }
+                    details.dataset.loaded = '1';
+                    fetch(d.shard).then(function (r) { return r.json(); }).then(function (shard) {
+                        renderShard(details, shard);
+                    });
+                });
+                list.appendChild(details);
+            });
+        });
+    })();
+    </script>
+</body>
+</html>
+"""
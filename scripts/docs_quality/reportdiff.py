@@ -0,0 +1,245 @@
+# -*- coding: utf-8 -*-
+
+"""
+品質レポートの差分（ストリーミング）
+作成日: 2026-10-19
+目的: 2つの ai-quality-*.json をファイル単位で突き合わせ、スコアの増減・新規／解消した指摘・サマリーの変化を出す
+
+- 両レポートを JsonStream で並行して読み、content_analysis のファイル記録を1件ずつ
+  (スコア, 指摘ID) に縮約してから突き合わせる
+- 相手側に未出現の記録のみ保持する（content_analysis はキー順に出力されるため、通常は変化分のみ）
+- 指摘IDはルールID（findings）。どちらかが findings のない旧形式のレポートなら、両方とも改善提案の文言で突き合わせる
+"""
+
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from docs_quality.jsonstream import JsonStream, JsonStreamError
+
+SUMMARY_FIELDS = ("average_score", "total_files")
+
+
+class ReportDiffError(Exception):
+    """レポートの形式エラー"""
+
+
+# ファイル記録の縮約: (スコア, ルールID（旧形式は None）, 改善提案の文言)
+Reduced = Tuple[Optional[float], Optional[List[str]], List[str]]
+
+
+def _reduce_record(record: Dict[str, Any]) -> Reduced:
+    ai = record.get("ai_analysis", {})
+    findings = ai.get("findings")
+    rules = [finding["rule"] for finding in findings] if findings is not None else None
+    return record.get("overall_score"), rules, list(ai.get("suggestions", []))
+
+
+def _issues(reduced: Reduced) -> List[str]:
+    _, rules, suggestions = reduced
+    return rules if rules is not None else suggestions
+
+
+class _ReportReader:
+    """1つのレポートを content_analysis の手前・記録ごと・残りの3段階で読む"""
+
+    def __init__(self, path):
+        self.path = str(path)
+        self.stream = JsonStream.open(path)
+        self.top = self.stream.members()
+        self.metadata: Dict[str, Any] = {}
+        self.quality_summary: Dict[str, Any] = {}
+        self.recommendations = 0
+        self.records: Optional[Iterator[str]] = None
+        self._advance_to_records()
+
+    def _consume_top(self, key: str) -> None:
+        if key == "metadata":
+            self.metadata = self.stream.value()
+        elif key == "quality_summary":
+            summary = self.stream.value()
+            self.quality_summary = {field: summary.get(field) for field in
+                                    SUMMARY_FIELDS + ("score_distribution", "quality_level")}
+        elif key == "ai_recommendations":
+            self.recommendations = 0
+            for _ in self.stream.items():
+                self.stream.skip()
+                self.recommendations += 1
+        else:
+            self.stream.skip()
+
+    def _advance_to_records(self) -> None:
+        for key in self.top:
+            if key == "content_analysis":
+                self.records = self.stream.members()
+                return
+            self._consume_top(key)
+
+    def next_record(self) -> Optional[Tuple[str, Reduced]]:
+        if self.records is None:
+            return None
+        for key in self.records:
+            return key, _reduce_record(self.stream.value())
+        self.records = None
+        return None
+
+    def finish(self) -> None:
+        while self.next_record() is not None:
+            pass
+        for key in self.top:
+            self._consume_top(key)
+        self.stream.close()
+
+
+def _delta(base, head) -> Dict[str, Any]:
+    result = {"base": base, "head": head}
+    if isinstance(base, (int, float)) and isinstance(head, (int, float)):
+        result["delta"] = round(head - base, 2)
+    return result
+
+
+class ReportDiff:
+    """2つの ai-quality レポートの差分"""
+
+    def __init__(self, min_delta: float = 0.01):
+        self.min_delta = min_delta
+        self.changed: List[Dict[str, Any]] = []
+        self.added: List[Dict[str, Any]] = []
+        self.removed: List[Dict[str, Any]] = []
+        self.unchanged = 0
+        self.max_pending = 0
+
+    def _compare(self, path: str, base: Reduced, head: Reduced) -> None:
+        base_score, base_rules, base_suggestions = base
+        head_score, head_rules, head_suggestions = head
+        # 旧形式と新形式の比較ではルールIDと文言が一致しないため、両方とも文言で比べる
+        if base_rules is None or head_rules is None:
+            base_issues, head_issues = base_suggestions, head_suggestions
+        else:
+            base_issues, head_issues = base_rules, head_rules
+        new_issues = [issue for issue in head_issues if issue not in base_issues]
+        resolved = [issue for issue in base_issues if issue not in head_issues]
+        delta = round((head_score or 0) - (base_score or 0), 2)
+        if abs(delta) < self.min_delta and not new_issues and not resolved:
+            self.unchanged += 1
+            return
+        self.changed.append({
+            "path": path,
+            "base": base_score,
+            "head": head_score,
+            "delta": delta,
+            "new_issues": new_issues,
+            "resolved_issues": resolved,
+        })
+
+    def run(self, base_path, head_path) -> Dict[str, Any]:
+        try:
+            base, head = _ReportReader(base_path), _ReportReader(head_path)
+            pending_base: Dict[str, Tuple] = {}
+            pending_head: Dict[str, Tuple] = {}
+            base_record = base.next_record()
+            head_record = head.next_record()
+            # キー順のマージ結合（順序が崩れていても pending で突き合わせる）
+            while base_record is not None or head_record is not None:
+                if head_record is None or (base_record is not None and base_record[0] <= head_record[0]):
+                    key, summary = base_record
+                    if key in pending_head:
+                        self._compare(key, summary, pending_head.pop(key))
+                    elif head_record is not None and head_record[0] == key:
+                        self._compare(key, summary, head_record[1])
+                        head_record = head.next_record()
+                    else:
+                        pending_base[key] = summary
+                    base_record = base.next_record()
+                else:
+                    key, summary = head_record
+                    if key in pending_base:
+                        self._compare(key, pending_base.pop(key), summary)
+                    else:
+                        pending_head[key] = summary
+                    head_record = head.next_record()
+                self.max_pending = max(self.max_pending, len(pending_base) + len(pending_head))
+            base.finish()
+            head.finish()
+        except JsonStreamError as e:
+            raise ReportDiffError(str(e)) from None
+
+        self.removed = [{"path": key, "score": reduced[0], "issues": _issues(reduced)}
+                        for key, reduced in sorted(pending_base.items())]
+        self.added = [{"path": key, "score": reduced[0], "issues": _issues(reduced)}
+                      for key, reduced in sorted(pending_head.items())]
+        self.changed.sort(key=lambda item: (-abs(item["delta"]), item["path"]))
+
+        base_summary, head_summary = base.quality_summary, head.quality_summary
+        distribution_keys = list(dict.fromkeys(list((base_summary.get("score_distribution") or {}).keys()) +
+                                               list((head_summary.get("score_distribution") or {}).keys())))
+        return {
+            "base": {"path": base.path, "timestamp": base.metadata.get("timestamp")},
+            "head": {"path": head.path, "timestamp": head.metadata.get("timestamp")},
+            "summary": {
+                **{field: _delta(base_summary.get(field), head_summary.get(field)) for field in SUMMARY_FIELDS},
+                "quality_level": {"base": base_summary.get("quality_level"), "head": head_summary.get("quality_level")},
+                "score_distribution": {
+                    key: _delta((base_summary.get("score_distribution") or {}).get(key, 0),
+                                (head_summary.get("score_distribution") or {}).get(key, 0))
+                    for key in distribution_keys
+                },
+                "recommendations": _delta(base.recommendations, head.recommendations),
+            },
+            "files": {
+                "changed": self.changed,
+                "added": self.added,
+                "removed": self.removed,
+                "unchanged": self.unchanged,
+                "improved": sum(1 for item in self.changed if item["delta"] > 0),
+                "regressed": sum(1 for item in self.changed if item["delta"] < 0),
+            },
+        }
+
+
+def _signed(value) -> str:
+    if isinstance(value, int):
+        return f"{value:+d}"
+    return f"{value:+.2f}" if isinstance(value, float) else "-"
+
+
+def render_markdown(diff: Dict[str, Any], limit: int = 20) -> str:
+    """PRコメント用のMarkdown"""
+    summary = diff["summary"]
+    files = diff["files"]
+    average = summary["average_score"]
+    lines = [
+        "## 📊 ドキュメント品質の変化",
+        "",
+        "| 指標 | 変更前 | 変更後 | 差分 |",
+        "|---|---:|---:|---:|",
+        f"| 平均スコア | {average['base']} | {average['head']} | {_signed(average.get('delta'))} |",
+    ]
+    rows = [("分析ファイル数", summary["total_files"]), ("改善提案", summary["recommendations"])]
+    rows += list(summary["score_distribution"].items())
+    for label, values in rows:
+        lines.append(f"| {label} | {values['base']} | {values['head']} | {_signed(values.get('delta'))} |")
+    level = summary["quality_level"]
+    if level["base"] != level["head"]:
+        lines.append(f"| 品質レベル | {level['base']} | {level['head']} | |")
+    lines += [
+        "",
+        f"改善 {files['improved']}件 / 低下 {files['regressed']}件 / 追加 {len(files['added'])}件 / "
+        f"削除 {len(files['removed'])}件 / 変化なし {files['unchanged']}件",
+    ]
+
+    if files["changed"]:
+        lines += ["", "### スコアが変化したファイル", "",
+                  "| ファイル | 変更前 | 変更後 | 差分 | 新規の指摘 | 解消した指摘 |", "|---|---:|---:|---:|---|---|"]
+        for item in files["changed"][:limit]:
+            lines.append(f"| `{item['path']}` | {item['base']} | {item['head']} | {_signed(item['delta'])} | "
+                         f"{', '.join(item['new_issues']) or '-'} | {', '.join(item['resolved_issues']) or '-'} |")
+        if len(files["changed"]) > limit:
+            lines.append(f"| … 他 {len(files['changed']) - limit}件 | | | | | |")
+
+    for title, key in (("追加されたファイル", "added"), ("削除されたファイル", "removed")):
+        if files[key]:
+            lines += ["", f"### {title}", ""]
+            for item in files[key][:limit]:
+                lines.append(f"- `{item['path']}` ({item['score']})")
+            if len(files[key]) > limit:
+                lines.append(f"- … 他 {len(files[key]) - limit}件")
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,343 @@
+# -*- coding: utf-8 -*-
+
+"""
+品質レポートの保持・圧縮・ロールアップ
+作成日: 2026-10-19
+目的: docs/quality-reports の無制限な増加を防ぎ、一覧・トレンド照会をインデックスのみで行う
+
+- reports-index.json: 保持中レポートの一覧とサマリー指標（一覧・トレンド照会はこれだけを読む）
+- rollups/<種別>.daily.json.gz / .weekly.json.gz: 圧縮済みレポートのサマリー指標の日次・週次集計
+- 最新N件を超えたレポートは集計へ畳み込んだ後に削除する
+
+インデックス更新・圧縮はロックファイルで排他し、レポート生成側は一時ファイル経由で
+書き込むため、生成処理と同時に実行しても書きかけのファイルを扱わない。
+"""
+
+import datetime
+import gzip
+import json
+import os
+import re
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from docs_quality.fsutil import atomic_write
+
+try:
+    import fcntl
+except ImportError:  # Windows ではロックなしで動作
+    fcntl = None
+
+INDEX_NAME = "reports-index.json"
+LOCK_NAME = ".reports-index.lock"
+ROLLUP_DIR = "rollups"
+
+REPORT_KINDS = ("ai-quality", "dynamic-report", "advanced-quality")
+REPORT_PATTERN = re.compile(r"^(ai-quality|dynamic-report|advanced-quality)-(\d{8}-\d{6})\.(json|html)$")
+
+
+def summarize_report(kind: str, data: Dict[str, Any]) -> Dict[str, float]:
+    """レポートJSONからトレンド用のサマリー指標を抽出"""
+    if kind == "ai-quality":
+        summary = data.get("quality_summary", {})
+        distribution = summary.get("score_distribution", {})
+        return {
+            "average_score": summary.get("average_score", 0),
+            "total_files": summary.get("total_files", 0),
+            "excellent_files": distribution.get("excellent", 0),
+            "poor_files": distribution.get("poor", 0),
+        }
+    if kind == "dynamic-report":
+        content = data.get("content_analysis", {})
+        return {
+            "average_quality_score": content.get("average_quality_score", 0),
+            "total_files": data.get("file_analysis", {}).get("total_files", 0),
+            "total_words": content.get("total_words", 0),
+            "total_links": content.get("total_links", 0),
+        }
+    if kind == "advanced-quality":
+        summary = data.get("summary", {})
+        return {
+            "quality_score": summary.get("quality_score", 0),
+            "total_files": summary.get("total_files", 0),
+            "total_issues": summary.get("total_issues", 0),
+            "auto_fixed": summary.get("auto_fixed", 0),
+        }
+    raise ValueError(f"未知のレポート種別: {kind}")
+
+
+def _report_timestamp(data: Dict[str, Any]) -> Optional[str]:
+    return data.get("timestamp") or data.get("metadata", {}).get("timestamp")
+
+
+def _stamp_to_datetime(stamp: str) -> datetime.datetime:
+    return datetime.datetime.strptime(stamp, "%Y%m%d-%H%M%S")
+
+
+class ReportIndex:
+    """docs/quality-reports のレポートインデックス"""
+
+    def __init__(self, output_dir):
+        self.output_dir = Path(output_dir)
+        self.index_path = self.output_dir / INDEX_NAME
+        self.lock_path = self.output_dir / LOCK_NAME
+
+    def exists(self) -> bool:
+        return self.index_path.exists()
+
+    @contextmanager
+    def lock(self) -> Iterator[None]:
+        """インデックス更新の排他ロック（プロセス間）"""
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        with open(self.lock_path, "a") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+    def load(self) -> Dict[str, Any]:
+        if not self.index_path.exists():
+            return {"version": 1, "reports": []}
+        with open(self.index_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def save(self, index: Dict[str, Any]) -> None:
+        index["reports"].sort(key=lambda r: (r["stamp"], r["kind"]))
+        atomic_write(self.index_path, json.dumps(index, ensure_ascii=False, indent=2).encode("utf-8"))
+
+    def register(self, kind: str, stamp: str, files: List[str], summary: Dict[str, float],
+                 timestamp: Optional[str] = None) -> None:
+        """生成したレポートをインデックスへ登録（同じ種別・時刻の既存エントリは統合）"""
+        with self.lock():
+            index = self.load()
+            self._upsert(index, kind, stamp, files, summary, timestamp)
+            self.save(index)
+
+    def register_file(self, path: Path) -> bool:
+        """既存のレポートファイルを解析して登録（シェルスクリプト等から利用）"""
+        path = Path(path)
+        match = REPORT_PATTERN.match(path.name)
+        if not match:
+            return False
+        kind, stamp, ext = match.groups()
+        summary, timestamp = {}, None
+        if ext == "json":
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            summary = summarize_report(kind, data)
+            timestamp = _report_timestamp(data)
+        self.register(kind, stamp, [path.name], summary, timestamp)
+        return True
+
+    def _upsert(self, index: Dict[str, Any], kind: str, stamp: str, files: List[str],
+                summary: Dict[str, float], timestamp: Optional[str]) -> None:
+        for report in index["reports"]:
+            if report["kind"] == kind and report["stamp"] == stamp:
+                report["files"] = sorted(set(report["files"]) | set(files))
+                if summary:
+                    report["summary"] = summary
+                if timestamp:
+                    report["timestamp"] = timestamp
+                return
+        index["reports"].append({
+            "kind": kind,
+            "stamp": stamp,
+            "timestamp": timestamp or _stamp_to_datetime(stamp).isoformat(),
+            "files": sorted(files),
+            "summary": summary,
+        })
+
+    def sync(self, grace_seconds: float = 120) -> Dict[str, int]:
+        """ディレクトリとインデックスを突き合わせる（未登録ファイルの取り込み・消失ファイルの除去）
+
+        解析できないJSONと、更新から grace_seconds 経っていないHTMLは書き込み中とみなして
+        取り込まない。一覧・トレンド照会では呼ばず、保持処理や初回構築時のみ使う。
+        """
+        with self.lock():
+            index = self.load()
+            return self._sync_locked(index, grace_seconds)
+
+    def _sync_locked(self, index: Dict[str, Any], grace_seconds: float) -> Dict[str, int]:
+        present = {}
+        now = time.time()
+        with os.scandir(self.output_dir) as it:
+            for entry in it:
+                if entry.is_file() and REPORT_PATTERN.match(entry.name):
+                    present[entry.name] = entry.stat().st_mtime
+
+        known = set()
+        removed = 0
+        for report in list(index["reports"]):
+            report["files"] = [name for name in report["files"] if name in present]
+            if not report["files"]:
+                index["reports"].remove(report)
+                removed += 1
+            known.update(report["files"])
+
+        added = 0
+        for name in sorted(set(present) - known):
+            kind, stamp, ext = REPORT_PATTERN.match(name).groups()
+            if ext != "json" and now - present[name] < grace_seconds:
+                continue
+            summary, timestamp = {}, None
+            if ext == "json":
+                try:
+                    with open(self.output_dir / name, "r", encoding="utf-8") as f:
+                        data = json.load(f)
+                except (OSError, ValueError):
+                    continue
+                summary = summarize_report(kind, data)
+                timestamp = _report_timestamp(data)
+            self._upsert(index, kind, stamp, [name], summary, timestamp)
+            added += 1
+
+        self.save(index)
+        return {"added": added, "removed": removed}
+
+    def reports(self, kind: Optional[str] = None) -> List[Dict[str, Any]]:
+        """保持中レポート一覧（古い順）"""
+        reports = self.load()["reports"]
+        if kind:
+            reports = [r for r in reports if r["kind"] == kind]
+        return reports
+
+    def history(self, kind: str, limit: int = 5) -> List[Dict[str, Any]]:
+        """サマリー指標付きの直近レポート（JSONを持つもののみ）"""
+        return [r for r in self.reports(kind) if r["summary"]][-limit:]
+
+
+class RollupStore:
+    """圧縮済みレポートの日次・週次集計（gzip JSON）"""
+
+    PERIODS = ("daily", "weekly")
+
+    def __init__(self, output_dir):
+        self.rollup_dir = Path(output_dir) / ROLLUP_DIR
+
+    def path(self, kind: str, period: str) -> Path:
+        return self.rollup_dir / f"{kind}.{period}.json.gz"
+
+    def load(self, kind: str, period: str) -> Dict[str, Dict[str, Any]]:
+        path = self.path(kind, period)
+        if not path.exists():
+            return {}
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            return json.load(f)
+
+    def save(self, kind: str, period: str, buckets: Dict[str, Dict[str, Any]]) -> None:
+        body = json.dumps(buckets, ensure_ascii=False, sort_keys=True, separators=(",", ":")).encode("utf-8")
+        # mtime=0 で同一内容なら同一バイト列にする
+        atomic_write(self.path(kind, period), gzip.compress(body, mtime=0))
+
+    @staticmethod
+    def period_key(stamp: str, period: str) -> str:
+        moment = _stamp_to_datetime(stamp)
+        if period == "daily":
+            return moment.strftime("%Y-%m-%d")
+        year, week, _ = moment.isocalendar()
+        return f"{year}-W{week:02d}"
+
+    @staticmethod
+    def fold(bucket: Optional[Dict[str, Any]], report: Dict[str, Any]) -> Dict[str, Any]:
+        """集計バケットへレポート1件を畳み込む（件数・合計・最小・最大・最新値）"""
+        if bucket is None:
+            bucket = {"count": 0, "first": report["stamp"], "last": report["stamp"], "metrics": {}}
+        bucket["count"] += 1
+        bucket["first"] = min(bucket["first"], report["stamp"])
+        is_latest = report["stamp"] >= bucket["last"]
+        bucket["last"] = max(bucket["last"], report["stamp"])
+
+        for name, value in report["summary"].items():
+            metric = bucket["metrics"].get(name)
+            if metric is None:
+                bucket["metrics"][name] = {"count": 1, "sum": value, "min": value, "max": value, "last": value}
+                continue
+            metric["count"] += 1
+            metric["sum"] += value
+            metric["min"] = min(metric["min"], value)
+            metric["max"] = max(metric["max"], value)
+            if is_latest:
+                metric["last"] = value
+        return bucket
+
+
+class RetentionManager:
+    """最新N件の保持と古いレポートの集計・削除"""
+
+    def __init__(self, output_dir, keep: int = 10, grace_seconds: float = 120):
+        self.output_dir = Path(output_dir)
+        self.keep = keep
+        self.grace_seconds = grace_seconds
+        self.index = ReportIndex(output_dir)
+        self.rollups = RollupStore(output_dir)
+
+    def compact(self, dry_run: bool = False) -> Dict[str, Any]:
+        """種別ごとに最新 keep 件を残し、それ以前を日次・週次集計へ畳み込んで削除"""
+        stats = {"compacted": 0, "deleted_files": 0, "freed_bytes": 0, "kinds": {}}
+
+        with self.index.lock():
+            index = self.index.load()
+            self.index._sync_locked(index, self.grace_seconds)
+
+            for kind in REPORT_KINDS:
+                reports = [r for r in index["reports"] if r["kind"] == kind]
+                expired = reports[:-self.keep] if self.keep > 0 else reports
+                stats["kinds"][kind] = {"kept": len(reports) - len(expired), "compacted": len(expired)}
+                if not expired:
+                    continue
+
+                if not dry_run:
+                    for period in RollupStore.PERIODS:
+                        buckets = self.rollups.load(kind, period)
+                        for report in expired:
+                            key = RollupStore.period_key(report["stamp"], period)
+                            buckets[key] = RollupStore.fold(buckets.get(key), report)
+                        self.rollups.save(kind, period, buckets)
+
+                for report in expired:
+                    for name in report["files"]:
+                        path = self.output_dir / name
+                        try:
+                            size = path.stat().st_size
+                            if not dry_run:
+                                path.unlink()
+                        except FileNotFoundError:
+                            continue
+                        stats["deleted_files"] += 1
+                        stats["freed_bytes"] += size
+                    if not dry_run:
+                        index["reports"].remove(report)
+                stats["compacted"] += len(expired)
+
+            if not dry_run:
+                self.index.save(index)
+
+        return stats
+
+    def trend(self, kind: str, period: Optional[str] = None) -> List[Dict[str, Any]]:
+        """トレンド系列（period 指定時は集計済み期間 + 保持中レポート）"""
+        points = []
+        if period:
+            for key, bucket in sorted(self.rollups.load(kind, period).items()):
+                points.append({
+                    "period": key,
+                    "count": bucket["count"],
+                    "source": "rollup",
+                    "metrics": {
+                        name: round(metric["sum"] / metric["count"], 2)
+                        for name, metric in bucket["metrics"].items()
+                    },
+                })
+        for report in self.index.reports(kind):
+            points.append({
+                "period": RollupStore.period_key(report["stamp"], period) if period else report["stamp"],
+                "count": 1,
+                "source": "report",
+                "metrics": report["summary"],
+            })
+        return points
@@ -0,0 +1,495 @@
+# -*- coding: utf-8 -*-
+
+"""
+宣言的ルールエンジン（改善提案・推奨事項）
+作成日: 2026-10-19
+目的: ハードコードされた if 連鎖を設定ファイルのルールへ置き換え、1文書1回の走査で評価する
+
+ルール設定（JSON）:
+    {
+      "base_score": 75,
+      "rules": [
+        {
+          "id": "code-example-missing",
+          "severity": "info",
+          "penalty": 5,
+          "message": "技術ドキュメントにコード例があると理解しやすくなります。",
+          "when": {
+            "filename_contains": ["api", "code"],
+            "path": ["03_機能仕様/**"],
+            "features": {"structure_analysis.code_blocks.total_blocks": {"eq": 0}},
+            "text": {"pattern": "TODO|FIXME", "flags": "i", "present": true}
+          }
+        }
+      ],
+      "recommendations": [
+        {
+          "id": "low-quality-files",
+          "priority": "high", "category": "content_quality",
+          "title": "...", "description": "{count}件のファイルが...", "action": "...",
+          "affected_files": 5,
+          "when": {"features": {"overall_score": {"lt": 70}}}
+        }
+      ]
+    }
+
+評価順序: パス条件 → 抽出済み特徴量 → テキストパターン。
+特徴量のみのルールは本文を参照しない。テキスト条件を持つルールは、前段を通過したものを集めて
+1回の結合走査でまとめて判定する。
+
+結合走査: 前段を通過したテキスト条件のパターンをフラグごとに1つの選択（(?:a)|(?:b)|...）へ結合し、
+文書の先頭から search を繰り返す。一致した位置では未検出のルールだけをその位置に match して
+出現ありと判定し、検出したルールを選択から外して次の位置から走査を続ける。本文をたどるのは1回で、
+search の回数はルール数ではなく出現したルール数（+1）に比例する。
+後方参照・名前付きグループ・先頭のインラインフラグを含むパターンは結合すると意味が変わるため個別に search する。
+
+トライグラム絞り込み（結合走査の前段の最適化）: テキスト条件のルールが PREFILTER_MIN_RULES 件以上のときだけ、
+文書ごとに1回作る文字トライグラム集合とパターン中の必須リテラル（3文字以上）を比べ、本文に含まれないルールを
+結合前に除く。ルールが少ない場合はトライグラム集合の作成の方が結合走査より高くつくため行わない。
+"""
+
+import fnmatch
+import json
+import re
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Set, Tuple
+
+from docs_quality.sharding import merge_smallest, smallest
+
+try:
+    from re import _parser as sre_parse
+    from re import _constants as sre_constants
+except ImportError:  # Python 3.10 以前
+    import sre_constants
+    import sre_parse
+
+OPERATORS: Dict[str, Callable[[Any, Any], bool]] = {
+    "lt": lambda value, target: value < target,
+    "le": lambda value, target: value <= target,
+    "gt": lambda value, target: value > target,
+    "ge": lambda value, target: value >= target,
+    "eq": lambda value, target: value == target,
+    "ne": lambda value, target: value != target,
+    "empty": lambda value, target: (not value) == target,
+}
+
+ALLOWED_FLAGS = set("imsx")
+REGEX_FLAGS = {"i": re.IGNORECASE, "m": re.MULTILINE, "s": re.DOTALL, "x": re.VERBOSE}
+TRIGRAM = 3
+# トライグラム絞り込みを使うテキスト条件ルール数の下限（少数なら結合走査の方がトライグラム集合の作成より安い）
+PREFILTER_MIN_RULES = 64
+# 結合すると意味が変わる構文（後方参照・条件分岐・名前付きグループ・先頭のインラインフラグ）
+STANDALONE_SYNTAX = re.compile(r"\\[1-9]|\(\?P[<=]|\(\?\(|\(\?<\w|^\(\?[aiLmsux]+\)")
+
+
+class RuleConfigError(Exception):
+    """ルール設定の検証エラー"""
+
+
+def _feature_getter(path: str) -> Callable[[Any], Any]:
+    """特徴量パスの値を読む関数（features は入れ子の dict、または feature(path) を持つレコード）"""
+    keys = path.split(".")
+
+    def get(features: Any) -> Any:
+        if not isinstance(features, dict):
+            return features.feature(path)
+        value: Any = features
+        for key in keys:
+            if not isinstance(value, dict) or key not in value:
+                return None
+            value = value[key]
+        return value
+
+    return get
+
+
+def required_literal(pattern: str, flags: int) -> str:
+    """パターンがマッチするなら必ず本文に含まれるリテラル（最長の連続リテラル、なければ空）"""
+    try:
+        parsed = sre_parse.parse(pattern, flags)
+    except re.error:
+        return ""
+
+    best, run = "", []
+    for op, argument in parsed:
+        # トップレベルの並びは全て必須。選択・繰り返し等で連続リテラルは途切れる
+        if op is sre_constants.LITERAL:
+            run.append(chr(argument))
+            continue
+        if len(run) > len(best):
+            best = "".join(run)
+        run = []
+    if len(run) > len(best):
+        best = "".join(run)
+
+    if flags & re.IGNORECASE and not best.isascii():
+        # 非ASCIIの大文字小文字畳み込みは lower() と一致しない場合がある
+        return ""
+    return best.lower()
+
+
+def trigrams(text: str) -> Set[str]:
+    return {text[i:i + TRIGRAM] for i in range(len(text) - TRIGRAM + 1)}
+
+
+class Condition:
+    """when 節（パス・特徴量・テキスト）をコンパイルしたもの"""
+
+    __slots__ = ("filename_contains", "path_patterns", "features", "text_regex", "text_flags", "text_combinable",
+                 "text_trigrams", "text_present")
+
+    def __init__(self, when: Dict[str, Any], rule_id: str):
+        self.filename_contains = tuple(s.lower() for s in when.get("filename_contains", []))
+        self.path_patterns = tuple(when.get("path", []))
+
+        self.features: List[Tuple[Callable, Callable, Any]] = []
+        for feature, checks in when.get("features", {}).items():
+            getter = _feature_getter(feature)
+            for operator, target in checks.items():
+                if operator not in OPERATORS:
+                    raise RuleConfigError(f"{rule_id}: 未対応の比較演算子です: {operator}")
+                self.features.append((getter, OPERATORS[operator], target))
+
+        self.text_regex: Optional["re.Pattern"] = None
+        self.text_flags = 0
+        self.text_combinable = False
+        self.text_trigrams: FrozenSet[str] = frozenset()
+        self.text_present = True
+        text = when.get("text")
+        if text:
+            if not set(text.get("flags", "")) <= ALLOWED_FLAGS:
+                raise RuleConfigError(f"{rule_id}: 未対応の正規表現フラグです: {text['flags']}")
+            flags = 0
+            for flag in text.get("flags", ""):
+                flags |= REGEX_FLAGS[flag]
+            try:
+                self.text_regex = re.compile(text["pattern"], flags)
+            except re.error as e:
+                raise RuleConfigError(f"{rule_id}: 正規表現エラー: {e}")
+            self.text_flags = flags
+            self.text_combinable = STANDALONE_SYNTAX.search(text["pattern"]) is None
+            self.text_trigrams = frozenset(trigrams(required_literal(text["pattern"], flags)))
+            self.text_present = text.get("present", True)
+
+    def matches_path(self, relative_path: str, filename: str) -> bool:
+        if self.filename_contains:
+            lower = filename.lower()
+            if not any(s in lower for s in self.filename_contains):
+                return False
+        if self.path_patterns:
+            if not any(fnmatch.fnmatchcase(relative_path, pattern) for pattern in self.path_patterns):
+                return False
+        return True
+
+    def matches_features(self, features: Dict[str, Any]) -> bool:
+        for getter, operator, target in self.features:
+            value = getter(features)
+            if value is None or not operator(value, target):
+                return False
+        return True
+
+
+class _PatternGroup:
+    """同じフラグのテキストパターンを1つの選択へ結合したもの
+
+    選択肢は非捕捉グループで包む（名前付きグループで包むと re が先頭文字集合による読み飛ばしを
+    行わなくなり、走査が桁違いに遅くなる）。一致した位置でどのルールが一致したかは、
+    未検出のルールの正規表現をその位置に match して確かめる。
+    """
+
+    # 未検出ルールの組み合わせごとに結合し直すパターンの上限（超えたら全ルールの結合か直前の結合を使う）
+    MAX_COMBINED = 64
+
+    def __init__(self, rules: List["Rule"], flags: int):
+        self.flags = flags
+        self.regexes = {rule.index: rule.condition.text_regex for rule in rules}
+        self._combined: Dict[Tuple[int, ...], "re.Pattern"] = {}
+        self.full = self._compile(tuple(self.regexes))
+
+    def _compile(self, indexes: Tuple[int, ...]) -> "re.Pattern":
+        # x フラグではパターン末尾のコメントを改行で閉じる
+        end = "\n" if self.flags & re.VERBOSE else ""
+        return re.compile("|".join(f"(?:{self.regexes[index].pattern}{end})" for index in indexes), self.flags)
+
+    def combined(self, indexes: Tuple[int, ...]) -> Optional["re.Pattern"]:
+        pattern = self._combined.get(indexes)
+        if pattern is None and len(self._combined) < self.MAX_COMBINED:
+            pattern = self._combined[indexes] = self._compile(indexes)
+        return pattern
+
+    def scan(self, content: str, wanted: Set[int], found: Set[int]) -> None:
+        """wanted のうち本文に出現するルール番号を found へ追加（本文を先頭から1回たどる）
+
+        検出したルールは選択から外して走査を続ける（残りのルールはそれより前の位置では一致しない）。
+        """
+        pending = tuple(index for index in self.regexes if index in wanted)
+        combined = self.combined(pending) or self.full
+        position = 0
+        while pending:
+            match = combined.search(content, position)
+            if match is None:
+                return
+            start = match.start()
+            hits = [index for index in pending if self.regexes[index].match(content, start)]
+            if hits:
+                found.update(hits)
+                pending = tuple(index for index in pending if index not in found)
+                combined = self.combined(pending) or combined
+            position = start + 1
+
+
+class Rule:
+    """ファイル単位のルール"""
+
+    __slots__ = ("index", "id", "severity", "penalty", "message", "condition")
+
+    def __init__(self, index: int, data: Dict[str, Any]):
+        if "id" not in data or "message" not in data:
+            raise RuleConfigError(f"ルール{index + 1}: id と message は必須です")
+        self.index = index
+        self.id = data["id"]
+        self.severity = data.get("severity", "info")
+        self.penalty = data.get("penalty", 0)
+        self.message = data["message"]
+        self.condition = Condition(data.get("when", {}), self.id)
+
+
+class RuleStats:
+    """ルール別の評価回数・ヒット数・評価時間"""
+
+    __slots__ = ("evaluated", "hits", "seconds")
+
+    def __init__(self):
+        self.evaluated = 0
+        self.hits = 0
+        self.seconds = 0.0
+
+
+class RuleEngine:
+    """ルール設定を読み込み、文書ごとに1パスで評価する"""
+
+    def __init__(self, config: Dict[str, Any]):
+        self.base_score = config.get("base_score", 75)
+        self.rules = [Rule(index, data) for index, data in enumerate(config.get("rules", []))]
+        ids = [rule.id for rule in self.rules]
+        if len(ids) != len(set(ids)):
+            raise RuleConfigError("ルールIDが重複しています")
+
+        self.recommendations = config.get("recommendations", [])
+        self.recommendation_ids = [
+            item.get("id", f"recommendation-{number}") for number, item in enumerate(self.recommendations)
+        ]
+        self.recommendation_conditions = [
+            Condition(item.get("when", {}), item_id)
+            for item_id, item in zip(self.recommendation_ids, self.recommendations)
+        ]
+
+        combinable: Dict[int, List[Rule]] = {}
+        for rule in self.rules:
+            if rule.condition.text_regex is not None and rule.condition.text_combinable:
+                combinable.setdefault(rule.condition.text_flags, []).append(rule)
+        self.text_groups = {flags: _PatternGroup(rules, flags) for flags, rules in combinable.items()}
+
+        self.stats: Dict[str, RuleStats] = {rule.id: RuleStats() for rule in self.rules}
+        self.scan_stats = RuleStats()
+        self.prefiltered = 0
+
+    @classmethod
+    def load(cls, path) -> "RuleEngine":
+        with open(path, "r", encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    # ------------------------------------------------------------------
+    # ファイル単位の評価
+    # ------------------------------------------------------------------
+    def evaluate(self, content: str, relative_path: str, features: Dict[str, Any]) -> List[Rule]:
+        """条件を満たしたルール（設定順）"""
+        filename = Path(relative_path).name
+        matched: List[Rule] = []
+        text_rules: List[Rule] = []
+        stats = self.stats
+        clock = time.perf_counter
+
+        for rule in self.rules:
+            started = clock()
+            rule_stats = stats[rule.id]
+            rule_stats.evaluated += 1
+            condition = rule.condition
+            passed = condition.matches_path(relative_path, filename) and condition.matches_features(features)
+            rule_stats.seconds += clock() - started
+            if not passed:
+                continue
+            if condition.text_regex is not None:
+                text_rules.append(rule)
+            else:
+                matched.append(rule)
+                rule_stats.hits += 1
+
+        if text_rules:
+            # 本文の走査は文書ごとに1回（テキスト条件のルールが前段を通過した場合のみ）
+            scan_started = clock()
+            found = self._scan_text(content, text_rules)
+            for rule in text_rules:
+                if (rule.index in found) == rule.condition.text_present:
+                    matched.append(rule)
+                    stats[rule.id].hits += 1
+            matched.sort(key=lambda rule: rule.index)
+            self.scan_stats.evaluated += 1
+            self.scan_stats.seconds += clock() - scan_started
+
+        return matched
+
+    def _scan_text(self, content: str, rules: List[Rule]) -> Set[int]:
+        """本文に出現するテキストパターンのルール番号（トライグラムで絞り込み、フラグごとに結合して走査）"""
+        found: Set[int] = set()
+        document_trigrams: Optional[Set[str]] = None
+        groups: Dict[int, List[Rule]] = {}
+        prefilter = len(rules) >= PREFILTER_MIN_RULES
+        for rule in rules:
+            condition = rule.condition
+            if prefilter and condition.text_trigrams:
+                if document_trigrams is None:
+                    document_trigrams = trigrams(content.lower())
+                if not condition.text_trigrams <= document_trigrams:
+                    self.prefiltered += 1
+                    continue
+            if condition.text_combinable:
+                groups.setdefault(condition.text_flags, []).append(rule)
+            elif condition.text_regex.search(content) is not None:
+                found.add(rule.index)
+
+        for flags, members in groups.items():
+            self.text_groups[flags].scan(content, {rule.index for rule in members}, found)
+        return found
+
+    def apply(self, content: str, relative_path: str, features: Dict[str, Any]) -> Dict[str, Any]:
+        """ルール評価結果をスコア・提案文へ変換"""
+        matched = self.evaluate(content, relative_path, features)
+        score = self.base_score - sum(rule.penalty for rule in matched)
+        return {
+            "score": max(0, score),
+            "suggestions": [rule.message for rule in matched],
+            "findings": [{"rule": rule.id, "severity": rule.severity} for rule in matched],
+        }
+
+    # ------------------------------------------------------------------
+    # 全体推奨事項
+    # ------------------------------------------------------------------
+    def recommendation_aggregates(self, content_analysis: Dict[str, Any], docs_dir: Path) -> Dict[str, Dict[str, Any]]:
+        """推奨事項ごとの該当件数と該当ファイル（キー昇順の先頭K件）。シャード間でマージ可能
+
+        content_analysis はファイルキー → FileRecord（docs_quality.records）。
+        """
+        aggregates = {}
+        for item_id, item, condition in zip(self.recommendation_ids, self.recommendations,
+                                            self.recommendation_conditions):
+            affected = []
+            for file_path, record in content_analysis.items():
+                if record.error is not None:
+                    continue
+                path = Path(file_path)
+                try:
+                    relative_path = path.relative_to(docs_dir).as_posix()
+                except ValueError:
+                    relative_path = path.as_posix()
+                if condition.matches_path(relative_path, path.name) and condition.matches_features(record):
+                    affected.append(file_path)
+            aggregates[item_id] = {
+                "count": len(affected),
+                "affected": smallest(affected, item.get("affected_files") or 0),
+            }
+        return aggregates
+
+    def merge_recommendation_aggregates(self, target: Dict[str, Dict[str, Any]],
+                                        source: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        for item_id, item in zip(self.recommendation_ids, self.recommendations):
+            merged = target.setdefault(item_id, {"count": 0, "affected": []})
+            other = source.get(item_id, {"count": 0, "affected": []})
+            merged["count"] += other["count"]
+            merged["affected"] = merge_smallest([merged["affected"], other["affected"]],
+                                                item.get("affected_files") or 0)
+        return target
+
+    def render_recommendations(self, aggregates: Dict[str, Dict[str, Any]]) -> List[Dict[str, Any]]:
+        recommendations = []
+        for item_id, item in zip(self.recommendation_ids, self.recommendations):
+            aggregate = aggregates.get(item_id)
+            if not aggregate or not aggregate["count"]:
+                continue
+            recommendation = {
+                key: item[key] for key in ("priority", "category", "title", "action", "impact") if key in item
+            }
+            recommendation["description"] = item.get("description", "").format(count=aggregate["count"])
+            if item.get("affected_files"):
+                recommendation["affected_files"] = aggregate["affected"]
+            recommendations.append(recommendation)
+        return recommendations
+
+    def recommend(self, content_analysis: Dict[str, Any], docs_dir: Path) -> List[Dict[str, Any]]:
+        """ファイル別分析結果（特徴量）のみから推奨事項を生成（本文は参照しない）"""
+        return self.render_recommendations(self.recommendation_aggregates(content_analysis, docs_dir))
+
+    # ------------------------------------------------------------------
+    # 統計
+    # ------------------------------------------------------------------
+    def export_stats(self) -> Dict[str, Any]:
+        """統計カウンタ（JSON化・マージ可能な形式）"""
+        return {
+            "rules": {rule_id: [stats.evaluated, stats.hits, stats.seconds] for rule_id, stats in self.stats.items()},
+            "scan": [self.scan_stats.evaluated, self.scan_stats.seconds],
+            "prefiltered": self.prefiltered,
+        }
+
+    def drain_stats(self) -> Dict[str, Any]:
+        """統計を取り出してリセット（別プロセスのワーカーから集約側へ渡す）"""
+        drained = self.export_stats()
+        self.stats = {rule.id: RuleStats() for rule in self.rules}
+        self.scan_stats = RuleStats()
+        self.prefiltered = 0
+        return drained
+
+    def merge_stats(self, drained: Dict[str, Any]) -> None:
+        for rule_id, (evaluated, hits, seconds) in drained["rules"].items():
+            stats = self.stats.get(rule_id)
+            if stats is not None:
+                stats.evaluated += evaluated
+                stats.hits += hits
+                stats.seconds += seconds
+        evaluated, seconds = drained["scan"]
+        self.scan_stats.evaluated += evaluated
+        self.scan_stats.seconds += seconds
+        self.prefiltered += drained["prefiltered"]
+
+    def stats_report(self) -> Dict[str, Any]:
+        return rule_stats_report(self.export_stats())
+
+
+def rule_stats_report(counters: Dict[str, Any]) -> Dict[str, Any]:
+    """export_stats() 形式のカウンタからレポート用の統計を作成"""
+    documents, seconds = counters["scan"]
+    return {
+        "rules": {
+            rule_id: {
+                "evaluated": evaluated,
+                "hits": hits,
+                "seconds": round(rule_seconds, 6),
+            }
+            for rule_id, (evaluated, hits, rule_seconds) in counters["rules"].items()
+        },
+        "text_scan": {
+            "documents": documents,
+            "seconds": round(seconds, 6),
+            "prefiltered": counters["prefiltered"],
+        },
+    }
+
+
+def merge_rule_counters(target: Dict[str, Any], source: Dict[str, Any]) -> Dict[str, Any]:
+    for rule_id, values in source["rules"].items():
+        current = target["rules"].setdefault(rule_id, [0, 0, 0.0])
+        for position, value in enumerate(values):
+            current[position] += value
+    target["scan"] = [a + b for a, b in zip(target["scan"], source["scan"])]
+    target["prefiltered"] += source["prefiltered"]
+    return target
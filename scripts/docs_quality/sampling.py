@@ -0,0 +1,223 @@
+# -*- coding: utf-8 -*-
+
+"""
+層化サンプリング（信頼区間つき概算）
+作成日: 2026-10-19
+目的: 大規模なドキュメント群の品質を、全件分析せずに層化無作為抽出で概算する
+
+- 層はトップレベルディレクトリ × ファイルサイズ区分（stat のみで決まり、読み込み前に割り当てられる）
+- 抽出順は seed と docs ルートからの相対パスのハッシュで決まるため、同じ seed・同じファイル群なら
+  列挙順やマシンによらず同じ標本になる
+- 抽出順は各層の先頭1件を最初に置き、以降は層の大きさに比例して並ぶ（どの時点で打ち切っても比例配分）
+- バッチごとに層化推定量の信頼区間を更新し、主指標の半幅が precision 以下になった時点で打ち切る
+
+    sampler = StratifiedSampler(SampleSpec(seed=1, precision=1.0), population)
+    for batch in sampler:
+        for key in batch:
+            sampler.observe(key, {"overall_score": analyze(key)})
+    sampler.estimate("overall_score")   # Estimate(mean, half_width, low, high, stderr)
+"""
+
+import hashlib
+import math
+from statistics import NormalDist
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+ROOT_STRATUM = "."
+# サイズ区分の境界（バイト）。1KB未満 / 4KB未満 / 16KB未満 / 64KB未満 / それ以上
+SIZE_BUCKETS = (1024, 4096, 16384, 65536)
+
+
+class SampleSpec:
+    """サンプリング条件"""
+
+    __slots__ = ("seed", "precision", "confidence", "batch_size", "min_files", "max_files")
+
+    def __init__(self, seed: int = 0, precision: float = 1.0, confidence: float = 0.95,
+                 batch_size: int = 64, min_files: int = 30, max_files: Optional[int] = None):
+        if not 0 < confidence < 1:
+            raise ValueError(f"信頼水準は 0〜1 の範囲で指定してください: {confidence}")
+        if precision <= 0 or batch_size < 1:
+            raise ValueError("精度（信頼区間の半幅）・バッチサイズは正の値で指定してください")
+        self.seed = seed
+        self.precision = precision
+        self.confidence = confidence
+        self.batch_size = batch_size
+        self.min_files = min_files
+        self.max_files = max_files
+
+
+class Estimate(NamedTuple):
+    """層化推定量（平均）と信頼区間"""
+    mean: float
+    half_width: float
+    low: float
+    high: float
+    stderr: float
+
+    def scaled(self, factor: float) -> "Estimate":
+        """合計の推定（平均 × 母集団サイズ）"""
+        return Estimate(*(value * factor for value in self))
+
+    def to_dict(self, digits: int = 2) -> Dict[str, float]:
+        values = (round(value, digits) if digits else round(value) for value in self)
+        return dict(zip(("estimate", "half_width", "low", "high", "stderr"), values))
+
+
+def stratum_of(relative_path: str, size: int) -> Tuple[str, int]:
+    """層（トップレベルディレクトリ, サイズ区分）"""
+    top = relative_path.split("/", 1)[0] if "/" in relative_path else ROOT_STRATUM
+    bucket = sum(1 for bound in SIZE_BUCKETS if size >= bound)
+    return top, bucket
+
+
+def _uniform(seed: int, relative_path: str) -> float:
+    """seed と相対パスから決まる [0, 1) の一様乱数"""
+    digest = hashlib.blake2b(f"{seed}:{relative_path}".encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big") / 2 ** 64
+
+
+class _Accumulator:
+    """層内の件数・合計・二乗和"""
+
+    __slots__ = ("count", "total", "squares")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.squares = 0.0
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        self.total += value
+        self.squares += value * value
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count
+
+    @property
+    def variance(self) -> Optional[float]:
+        """不偏分散（2件未満は None）"""
+        if self.count < 2:
+            return None
+        return max(self.squares - self.total * self.total / self.count, 0.0) / (self.count - 1)
+
+
+class StratifiedSampler:
+    """層化無作為抽出と逐次打ち切り
+
+    population はキー → (docs ルートからの相対パス, サイズ)。
+    イテレートすると抽出順にバッチ（キーのリスト）を返し、打ち切り条件を満たすと終了する。
+    """
+
+    def __init__(self, spec: SampleSpec, population: Dict[str, Tuple[str, int]], metric: str = "score"):
+        self.spec = spec
+        self.metric = metric
+        self.population = len(population)
+        self.z = NormalDist().inv_cdf((1 + spec.confidence) / 2)
+
+        strata: Dict[Tuple[str, int], List[Tuple[float, str]]] = {}
+        for key, (relative_path, size) in population.items():
+            strata.setdefault(stratum_of(relative_path, size), []).append((_uniform(spec.seed, relative_path), key))
+
+        self.stratum_sizes: Dict[Tuple[str, int], int] = {}
+        self.stratum_of_key: Dict[str, Tuple[str, int]] = {}
+        ordered = []
+        for stratum, members in strata.items():
+            members.sort()
+            size = len(members)
+            self.stratum_sizes[stratum] = size
+            for index, (u, key) in enumerate(members):
+                self.stratum_of_key[key] = stratum
+                # 先頭1件は最初のバッチへ、以降は層内の位置 / 層の大きさ（比例配分）の順
+                ordered.append(((index + u) / size if index else u - 1, key))
+        ordered.sort()
+        self.order = [key for _, key in ordered]
+
+        self.observations: Dict[str, Dict[Tuple[str, int], _Accumulator]] = {}
+        self.sampled = 0
+        self.stop_reason: Optional[str] = None
+
+    def __iter__(self) -> Iterator[List[str]]:
+        limit = min(self.population, self.spec.max_files or self.population)
+        position = 0
+        while position < limit:
+            batch = self.order[position:min(position + self.spec.batch_size, limit)]
+            position += len(batch)
+            self.sampled = position
+            yield batch
+            if self.precise_enough():
+                self.stop_reason = "precision"
+                return
+        self.stop_reason = "exhausted" if limit == self.population else "max_files"
+
+    def observe(self, key: str, values: Dict[str, float]) -> None:
+        """分析済みファイルの指標値を記録"""
+        stratum = self.stratum_of_key[key]
+        for metric, value in values.items():
+            self.observations.setdefault(metric, {}).setdefault(stratum, _Accumulator()).add(value)
+
+    def precise_enough(self) -> bool:
+        if self.sampled < min(self.spec.min_files, self.population):
+            return False
+        observed = self.observations.get(self.metric, {})
+        if len(observed) < len(self.stratum_sizes):
+            return False
+        return self.estimate(self.metric).half_width <= self.spec.precision
+
+    def estimate(self, metric: str) -> Estimate:
+        """層化推定量 Σ W_h ȳ_h と、有限母集団修正つきの分散 Σ W_h² (1 - n_h/N_h) s_h² / n_h
+
+        標本が1件の層の分散は、標本全体の分散で代用する。未抽出の層は重みから除く。
+        """
+        observed = self.observations.get(metric, {})
+        covered = sum(self.stratum_sizes[stratum] for stratum in observed)
+        if not covered:
+            return Estimate(0.0, 0.0, 0.0, 0.0, 0.0)
+
+        pooled = _Accumulator()
+        for accumulator in observed.values():
+            pooled.count += accumulator.count
+            pooled.total += accumulator.total
+            pooled.squares += accumulator.squares
+        pooled_variance = pooled.variance or 0.0
+
+        mean = variance = 0.0
+        for stratum, accumulator in observed.items():
+            size = self.stratum_sizes[stratum]
+            weight = size / covered
+            mean += weight * accumulator.mean
+            stratum_variance = accumulator.variance
+            if stratum_variance is None:
+                stratum_variance = pooled_variance
+            correction = max(0.0, 1 - accumulator.count / size)
+            variance += weight * weight * correction * stratum_variance / accumulator.count
+
+        stderr = math.sqrt(variance)
+        half_width = self.z * stderr
+        return Estimate(mean, half_width, mean - half_width, mean + half_width, stderr)
+
+    def summary(self) -> Dict[str, object]:
+        """レポートの metadata.sampling 用"""
+        observed = self.observations.get(self.metric, {})
+        directories = sorted({top for top, _ in self.stratum_sizes})
+        return {
+            "seed": self.spec.seed,
+            "confidence": self.spec.confidence,
+            "precision": self.spec.precision,
+            "metric": self.metric,
+            "population": self.population,
+            "sampled": self.sampled,
+            "analyzed": sum(accumulator.count for accumulator in observed.values()),
+            "sampling_rate": round(self.sampled / self.population, 4) if self.population else 0,
+            "strata": len(self.stratum_sizes),
+            "unsampled_strata": len(self.stratum_sizes) - len(observed),
+            "directories": len(directories),
+            "stop_reason": self.stop_reason,
+        }
+
+
+def population_of(stats: Dict[str, Tuple], docs_dir) -> Dict[str, Tuple[str, int]]:
+    """Corpus.stat_files() の結果から母集団（キー → (相対パス, サイズ)）を作る"""
+    return {key: (file.relative_to(docs_dir).as_posix(), size) for key, (file, size, _) in stats.items()}
@@ -0,0 +1,291 @@
+# -*- coding: utf-8 -*-
+
+"""
+ドキュメント全文検索インデックス
+作成日: 2026-10-19
+目的: grep による全ツリー走査を、増分更新される転置インデックス + BM25 検索に置き換える
+
+- トークン化: CJK は文字バイグラム、英数字は単語（docs_quality.tokenizer）
+- ポスティングリスト: 文書IDの差分を最小幅の整数配列（array 'B'/'H'/'I'）で保持
+- 増分更新: (size, mtime_ns) が一致するファイルは読まず、内容ハッシュが同じなら再索引しない。
+  削除・更新された文書は墓標として残し、一定割合を超えたら詰め直す
+- docs-site 向けに静的JSONシャードとして書き出せる
+"""
+
+import heapq
+import json
+import math
+import pickle
+import zlib
+from array import array
+from collections import Counter
+from itertools import accumulate
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from docs_quality.corpus import Corpus
+from docs_quality.fsutil import atomic_write
+from docs_quality.tokenizer import search_terms
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+# 墓標（無効文書）がこの割合を超えたらポスティングを詰め直す
+COMPACT_RATIO = 0.2
+MAX_TF = 65535
+
+
+def _array_for(max_value: int) -> str:
+    if max_value < 1 << 8:
+        return "B"
+    if max_value < 1 << 16:
+        return "H"
+    return "I"
+
+
+class PostingList:
+    """文書IDの差分配列と出現回数配列"""
+
+    __slots__ = ("deltas", "tfs", "last_doc")
+
+    def __init__(self):
+        self.deltas = array("B")
+        self.tfs = array("B")
+        self.last_doc = -1
+
+    def append(self, doc_id: int, tf: int) -> None:
+        # 文書IDは単調増加で追加されるため、末尾への差分追加だけで整列が保たれる
+        delta = doc_id - self.last_doc if self.last_doc >= 0 else doc_id
+        if delta >= 1 << (8 * self.deltas.itemsize):
+            self.deltas = array(_array_for(delta), self.deltas)
+        tf = min(tf, MAX_TF)
+        if tf >= 1 << (8 * self.tfs.itemsize):
+            self.tfs = array(_array_for(tf), self.tfs)
+        self.deltas.append(delta)
+        self.tfs.append(tf)
+        self.last_doc = doc_id
+
+    def doc_ids(self) -> List[int]:
+        return list(accumulate(self.deltas))
+
+    def __len__(self) -> int:
+        return len(self.deltas)
+
+    def __getstate__(self):
+        return (self.deltas.typecode, self.deltas.tobytes(), self.tfs.typecode, self.tfs.tobytes(), self.last_doc)
+
+    def __setstate__(self, state):
+        delta_code, delta_bytes, tf_code, tf_bytes, self.last_doc = state
+        self.deltas = array(delta_code)
+        self.deltas.frombytes(delta_bytes)
+        self.tfs = array(tf_code)
+        self.tfs.frombytes(tf_bytes)
+
+
+def _title(content: str, fallback: str) -> str:
+    for line in content.split("\n"):
+        if line.startswith("# "):
+            return line[2:].strip()
+    return fallback
+
+
+class SearchIndex:
+    """BM25 で検索できる転置インデックス"""
+
+    VERSION = 1
+
+    def __init__(self):
+        # 文書ID -> メタ情報（None は削除済み）
+        self.docs: List[Optional[Dict[str, Any]]] = []
+        self.by_path: Dict[str, int] = {}
+        self.postings: Dict[str, PostingList] = {}
+        self.lengths = array("I")
+        self.total_length = 0
+        self.live_docs = 0
+
+    # ------------------------------------------------------------------
+    # 永続化
+    # ------------------------------------------------------------------
+    @classmethod
+    def load(cls, path) -> "SearchIndex":
+        path = Path(path)
+        if not path.exists():
+            return cls()
+        with open(path, "rb") as f:
+            version, state = pickle.load(f)
+        index = cls()
+        if version != cls.VERSION:
+            return index
+        index.docs, index.postings, lengths = state
+        index.lengths = array("I", lengths)
+        index.by_path = {doc["path"]: doc_id for doc_id, doc in enumerate(index.docs) if doc}
+        index.total_length = sum(doc["length"] for doc in index.docs if doc)
+        index.live_docs = len(index.by_path)
+        return index
+
+    def save(self, path) -> None:
+        state = (self.docs, self.postings, self.lengths)
+        atomic_write(Path(path), pickle.dumps((self.VERSION, state), protocol=pickle.HIGHEST_PROTOCOL))
+
+    # ------------------------------------------------------------------
+    # 更新
+    # ------------------------------------------------------------------
+    def update(self, corpus: Corpus) -> Dict[str, int]:
+        """コーパスとの差分のみ反映（stat が一致するファイルは読み込まない）"""
+        stats = {"added": 0, "updated": 0, "removed": 0, "unchanged": 0}
+        files = corpus.stat_files()
+
+        for key, (file, size, mtime_ns) in files.items():
+            doc_id = self.by_path.get(key)
+            current = self.docs[doc_id] if doc_id is not None else None
+            if current and current["size"] == size and current["mtime_ns"] == mtime_ns:
+                stats["unchanged"] += 1
+                continue
+
+            entry = corpus.get(key)
+            if entry is None or entry.mtime_ns != mtime_ns or entry.size != size:
+                entry = corpus.read(file, size, mtime_ns)
+                if entry is None:
+                    continue
+            if current and current["digest"] == entry.digest:
+                current["size"], current["mtime_ns"] = size, mtime_ns
+                stats["unchanged"] += 1
+                continue
+
+            if doc_id is not None:
+                self._remove(doc_id)
+                stats["updated"] += 1
+            else:
+                stats["added"] += 1
+            self._add(key, corpus, entry)
+
+        for key in [key for key in self.by_path if key not in files]:
+            self._remove(self.by_path[key])
+            stats["removed"] += 1
+
+        if len(self.docs) and (len(self.docs) - self.live_docs) / len(self.docs) > COMPACT_RATIO:
+            self.compact()
+        return stats
+
+    def _add(self, key: str, corpus: Corpus, entry) -> None:
+        terms = Counter(search_terms(entry.content))
+        doc_id = len(self.docs)
+        length = sum(terms.values())
+        rel_path = entry.path.relative_to(corpus.docs_dir).as_posix()
+        self.docs.append({
+            "path": key,
+            "rel_path": rel_path,
+            "title": _title(entry.content, entry.path.stem),
+            "digest": entry.digest,
+            "size": entry.size,
+            "mtime_ns": entry.mtime_ns,
+            "length": length,
+        })
+        self.lengths.append(length)
+        self.by_path[key] = doc_id
+        self.total_length += length
+        self.live_docs += 1
+
+        postings = self.postings
+        for term, tf in terms.items():
+            posting = postings.get(term)
+            if posting is None:
+                posting = postings[term] = PostingList()
+            posting.append(doc_id, tf)
+
+    def _remove(self, doc_id: int) -> None:
+        doc = self.docs[doc_id]
+        self.docs[doc_id] = None
+        del self.by_path[doc["path"]]
+        self.total_length -= doc["length"]
+        self.live_docs -= 1
+
+    def compact(self) -> None:
+        """削除済み文書をポスティングから除き、文書IDを詰め直す"""
+        remap = {}
+        docs = []
+        lengths = array("I")
+        for doc_id, doc in enumerate(self.docs):
+            if doc is not None:
+                remap[doc_id] = len(docs)
+                docs.append(doc)
+                lengths.append(doc["length"])
+
+        postings = {}
+        for term, posting in self.postings.items():
+            rebuilt = PostingList()
+            for doc_id, tf in zip(posting.doc_ids(), posting.tfs):
+                new_id = remap.get(doc_id)
+                if new_id is not None:
+                    rebuilt.append(new_id, tf)
+            if len(rebuilt):
+                postings[term] = rebuilt
+
+        self.docs = docs
+        self.lengths = lengths
+        self.postings = postings
+        self.by_path = {doc["path"]: doc_id for doc_id, doc in enumerate(docs)}
+
+    # ------------------------------------------------------------------
+    # 検索
+    # ------------------------------------------------------------------
+    def search(self, query: str, limit: int = 10) -> List[Tuple[float, Dict[str, Any]]]:
+        """BM25 スコア上位の文書"""
+        if not self.live_docs:
+            return []
+
+        total_docs = self.live_docs
+        avg_length = self.total_length / total_docs
+        docs = self.docs
+        lengths = self.lengths
+        scores: Dict[int, float] = {}
+        length_factor = BM25_K1 * BM25_B / avg_length
+        base_norm = BM25_K1 * (1 - BM25_B)
+
+        for term in set(search_terms(query)):
+            posting = self.postings.get(term)
+            if posting is None:
+                continue
+            df = len(posting)
+            idf = math.log(1 + (total_docs - df + 0.5) / (df + 0.5))
+            weight = idf * (BM25_K1 + 1)
+            get = scores.get
+            for doc_id, tf in zip(posting.doc_ids(), posting.tfs):
+                scores[doc_id] = get(doc_id, 0.0) + weight * tf / (tf + base_norm + length_factor * lengths[doc_id])
+
+        top = heapq.nlargest(limit, ((score, doc_id) for doc_id, score in scores.items() if docs[doc_id]))
+        return [(round(score, 4), docs[doc_id]) for score, doc_id in top]
+
+    # ------------------------------------------------------------------
+    # 静的エクスポート（docs-site）
+    # ------------------------------------------------------------------
+    def export_static(self, out_dir, shard_count: int = 64) -> Dict[str, int]:
+        """manifest.json + terms-NN.json（語 → [文書ID差分配列, 出現回数配列]）として書き出す"""
+        if len(self.docs) != self.live_docs:
+            self.compact()
+
+        out_dir = Path(out_dir)
+        shards: List[Dict[str, List[List[int]]]] = [{} for _ in range(shard_count)]
+        for term, posting in self.postings.items():
+            shard = zlib.crc32(term.encode("utf-8")) % shard_count
+            shards[shard][term] = [list(posting.deltas), list(posting.tfs)]
+
+        for number, terms in enumerate(shards):
+            body = json.dumps(terms, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+            atomic_write(out_dir / f"terms-{number:02d}.json", body.encode("utf-8"))
+
+        manifest = {
+            "version": self.VERSION,
+            "tokenizer": "cjk-bigram+latin-word/nfkc-lower",
+            "shard_hash": "crc32(utf8(term)) % shard_count",
+            "shard_count": shard_count,
+            "bm25": {"k1": BM25_K1, "b": BM25_B},
+            "total_docs": self.live_docs,
+            "average_length": self.total_length / self.live_docs if self.live_docs else 0,
+            "docs": [
+                {"id": doc_id, "path": doc["rel_path"], "title": doc["title"], "length": doc["length"]}
+                for doc_id, doc in enumerate(self.docs)
+            ],
+        }
+        atomic_write(out_dir / "manifest.json",
+                     json.dumps(manifest, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+        return {"shards": shard_count, "terms": len(self.postings), "docs": self.live_docs}
@@ -0,0 +1,278 @@
+# -*- coding: utf-8 -*-
+
+"""
+品質データ常駐サービス（asyncio HTTP）
+作成日: 2026-10-19
+目的: docs-site・社内ダッシュボードへ品質データを即時提供する
+
+コーパスとファイル別分析結果をメモリに保持し、バックグラウンドで変更ファイルのみ再分析する。
+リクエスト処理はメモリ上のスナップショットのみを参照し、ディスクには触れない。
+"""
+
+import asyncio
+import datetime
+import hashlib
+import json
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+from urllib.parse import unquote, urlsplit
+
+from docs_quality.links import LinkGraph
+
+JSON_TYPE = "application/json; charset=utf-8"
+HTML_TYPE = "text/html; charset=utf-8"
+
+STATUS_TEXT = {
+    200: "OK",
+    304: "Not Modified",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    503: "Service Unavailable",
+}
+
+
+def _etag(body: bytes) -> str:
+    return '"' + hashlib.blake2b(body, digest_size=12).hexdigest() + '"'
+
+
+def _json_body(data: Any) -> bytes:
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _etag_matches(header: Optional[str], etag: str) -> bool:
+    """If-None-Match ヘッダ判定（弱いETag比較）"""
+    if not header:
+        return False
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+class Snapshot:
+    """ある時点の分析結果一式（リクエスト処理中は不変）"""
+
+    def __init__(self, generation: int, analysis: Dict[str, Any], dynamic_report: Dict[str, Any],
+                 link_graph: Dict[str, Any], file_keys: Dict[str, str]):
+        self.generation = generation
+        self.analysis = analysis
+        self.dynamic_report = dynamic_report
+        self.link_graph = link_graph
+        # 相対パス -> content_analysis のキー
+        self.file_keys = file_keys
+        self.created_at = time.time()
+        # ルート -> (body, etag, content_type)
+        self.responses: Dict[str, Tuple[bytes, str, str]] = {}
+
+    def response(self, route: str, content_type: str, build: Callable[[], bytes]) -> Tuple[bytes, str, str]:
+        cached = self.responses.get(route)
+        if cached is None:
+            body = build()
+            cached = (body, _etag(body), content_type)
+            self.responses[route] = cached
+        return cached
+
+
+class QualityService:
+    """AIQualityAnalyzer / DynamicReportGenerator を常駐させるHTTPサービス"""
+
+    def __init__(self, analyzer, generator, refresh_interval: float = 5.0):
+        self.analyzer = analyzer
+        self.generator = generator
+        self.refresh_interval = refresh_interval
+        self.snapshot: Optional[Snapshot] = None
+
+    def rebuild(self) -> bool:
+        """変更ファイルを再分析し、スナップショットを差し替える（変更なしなら False）"""
+        changes = self.analyzer.refresh_analysis()
+        if not changes and self.snapshot is not None:
+            return False
+
+        now = datetime.datetime.now()
+        self.analyzer.timestamp = now
+        self.generator.timestamp = now
+
+        corpus = self.analyzer.corpus
+        analysis = self.analyzer.assemble_results()
+        dynamic_report = self.generator.generate_comprehensive_report()
+        link_graph = LinkGraph.build(corpus).to_dict()
+        file_keys = {corpus.relative_path(entry): entry.key for entry in corpus}
+
+        snapshot = Snapshot(corpus.generation, analysis, dynamic_report, link_graph, file_keys)
+
+        # レポートページはここで描画しておき、リクエスト時の処理を参照のみにする
+        snapshot.response("/report/ai.html", HTML_TYPE,
+                          lambda: self.analyzer.generate_detailed_report(analysis).encode("utf-8"))
+        snapshot.response("/report/dynamic.html", HTML_TYPE,
+                          lambda: self.generator.generate_html_report(dynamic_report).encode("utf-8"))
+
+        self.snapshot = snapshot
+        print(f"♻️ スナップショット更新: 世代{snapshot.generation} "
+              f"(変更{len(changes.changed)}件 / 削除{len(changes.removed)}件)")
+        return True
+
+    async def _refresh_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(self.refresh_interval)
+            try:
+                await loop.run_in_executor(None, self.rebuild)
+            except Exception as e:
+                print(f"⚠️ バックグラウンド更新エラー: {e}")
+
+    async def serve(self, host: str, port: int) -> None:
+        self.rebuild()
+        server = await asyncio.start_server(self._handle, host, port)
+        refresher = asyncio.create_task(self._refresh_loop())
+        print(f"🌐 品質サービス起動: http://{host}:{port}/")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            refresher.cancel()
+
+    def route(self, path: str) -> Tuple[int, Optional[Tuple[bytes, str, str]]]:
+        """パスに対応するレスポンスを返す（メモリ上のスナップショットのみ参照）"""
+        snapshot = self.snapshot
+        if snapshot is None:
+            return 503, None
+
+        analysis = snapshot.analysis
+
+        if path in ("/", "/api"):
+            return 200, snapshot.response(path, JSON_TYPE, lambda: _json_body({
+                "endpoints": [
+                    "/api/summary", "/api/files", "/api/files/<path>", "/api/links",
+                    "/api/recommendations", "/api/dynamic", "/report/ai.html",
+                    "/report/dynamic.html", "/healthz"
+                ]
+            }))
+        if path == "/healthz":
+            # 世代・経過時間は毎回変わるためキャッシュしない
+            body = _json_body({
+                "status": "ok",
+                "generation": snapshot.generation,
+                "files": len(snapshot.file_keys),
+                "snapshot_age_seconds": round(time.time() - snapshot.created_at, 3),
+            })
+            return 200, (body, _etag(body), JSON_TYPE)
+        if path == "/api/summary":
+            return 200, snapshot.response(path, JSON_TYPE, lambda: _json_body({
+                "metadata": analysis["metadata"],
+                "quality_summary": analysis["quality_summary"],
+                "dynamic_summary": {
+                    "average_quality_score": snapshot.dynamic_report["content_analysis"]["average_quality_score"],
+                    "total_words": snapshot.dynamic_report["content_analysis"]["total_words"],
+                    "quality_trend": snapshot.dynamic_report["trend_analysis"]["quality_trend"],
+                },
+            }))
+        if path == "/api/files":
+            return 200, snapshot.response(path, JSON_TYPE, lambda: _json_body({
+                "files": [
+                    {
+                        "path": rel_path,
+                        "overall_score": analysis["content_analysis"][key].get("overall_score"),
+                    }
+                    for rel_path, key in snapshot.file_keys.items()
+                ]
+            }))
+        if path.startswith("/api/files/"):
+            rel_path = unquote(path[len("/api/files/"):])
+            key = snapshot.file_keys.get(rel_path)
+            if key is None:
+                return 404, None
+            return 200, snapshot.response(path, JSON_TYPE, lambda: _json_body({
+                "path": rel_path,
+                "analysis": analysis["content_analysis"][key],
+            }))
+        if path == "/api/links":
+            return 200, snapshot.response(path, JSON_TYPE, lambda: _json_body(snapshot.link_graph))
+        if path == "/api/recommendations":
+            return 200, snapshot.response(path, JSON_TYPE, lambda: _json_body(analysis["ai_recommendations"]))
+        if path == "/api/dynamic":
+            return 200, snapshot.response(path, JSON_TYPE, lambda: _json_body(snapshot.dynamic_report))
+        if path in snapshot.responses:
+            return 200, snapshot.responses[path]
+
+        return 404, None
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+
+                parts = request_line.decode("latin-1").split()
+                if len(parts) != 3:
+                    await self._write(writer, 400, None, head_only=False, keep_alive=False)
+                    break
+                method, target, version = parts
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                connection = headers.get("connection", "").lower()
+                keep_alive = connection != "close" if version == "HTTP/1.1" else connection == "keep-alive"
+
+                if method not in ("GET", "HEAD"):
+                    await self._write(writer, 405, None, head_only=False, keep_alive=keep_alive)
+                else:
+                    status, response = self.route(urlsplit(target).path)
+                    if response is not None and _etag_matches(headers.get("if-none-match"), response[1]):
+                        status = 304
+                    await self._write(writer, status, response, head_only=(method == "HEAD"),
+                                      keep_alive=keep_alive)
+
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _write(self, writer: asyncio.StreamWriter, status: int,
+                     response: Optional[Tuple[bytes, str, str]], head_only: bool, keep_alive: bool) -> None:
+        if response is None:
+            body, etag, content_type = _json_body({"error": STATUS_TEXT[status]}), None, JSON_TYPE
+        else:
+            body, etag, content_type = response
+
+        header_lines = [
+            f"HTTP/1.1 {status} {STATUS_TEXT[status]}",
+            f"Content-Type: {content_type}",
+            "Cache-Control: no-cache",
+            "Access-Control-Allow-Origin: *",
+            f"Connection: {'keep-alive' if keep_alive else 'close'}",
+        ]
+        if etag:
+            header_lines.append(f"ETag: {etag}")
+        if status == 304:
+            body = b""
+        else:
+            header_lines.append(f"Content-Length: {len(body)}")
+
+        writer.write(("\r\n".join(header_lines) + "\r\n\r\n").encode("latin-1"))
+        if not head_only:
+            writer.write(body)
+        await writer.drain()
+
+
+def serve(analyzer, generator, host: str = "127.0.0.1", port: int = 8765, refresh_interval: float = 5.0) -> None:
+    """品質サービスを起動（Ctrl+C で停止）"""
+    service = QualityService(analyzer, generator, refresh_interval)
+    try:
+        asyncio.run(service.serve(host, port))
+    except KeyboardInterrupt:
+        print("\n🛑 品質サービス停止")
@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+
+"""
+分散分析（シャード）と部分結果のマージ
+作成日: 2026-10-19
+目的: 1台のCIランナーに収まらないドキュメント群を N 台で分担し、部分結果を1つのレポートへ統合する
+
+    # シャードごとに部分結果を出力（i は 1 始まり）
+    python3 scripts/ai-quality-analyzer.py --shard 1/4 --partial-out partials/ai-1.json
+    ...
+    # 全シャードの部分結果をマージして最終レポートを出力
+    python3 scripts/ai-quality-analyzer.py --merge partials/ai-*.json
+
+ファイルの割り当ては docs ルートからの相対パス（POSIX形式）のハッシュで決まるため、
+チェックアウト先やマシンが異なっても同じファイルは必ず同じシャードに入る。
+部分結果は件数・合計・ヒストグラム・上位K件・ディレクトリ別集計などのマージ可能な集計値で構成し、
+単一ノード実行も「1シャード分の部分結果をマージして仕上げる」同じ経路を通るため、結果は一致する。
+"""
+
+import hashlib
+import heapq
+import json
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from docs_quality.fsutil import atomic_write_text
+
+PARTIAL_VERSION = 1
+
+
+class ShardError(Exception):
+    """シャード指定・部分結果の検証エラー"""
+
+
+class ShardSpec:
+    """シャード指定（i/N、i は 1 始まり）"""
+
+    __slots__ = ("index", "count")
+
+    def __init__(self, index: int, count: int):
+        if count < 1 or not 1 <= index <= count:
+            raise ShardError(f"シャード指定が不正です: {index}/{count}")
+        self.index = index
+        self.count = count
+
+    @classmethod
+    def parse(cls, text: str) -> "ShardSpec":
+        try:
+            index, count = (int(part) for part in text.split("/"))
+        except ValueError:
+            raise ShardError(f"シャード指定は i/N 形式です: {text}")
+        return cls(index, count)
+
+    def contains(self, relative_path: str) -> bool:
+        return shard_of(relative_path, self.count) == self.index
+
+    def __str__(self) -> str:
+        return f"{self.index}/{self.count}"
+
+
+def shard_of(relative_path: str, count: int) -> int:
+    """相対パスの割り当て先シャード（1 始まり、プロセス・マシン間で安定）"""
+    digest = hashlib.blake2b(relative_path.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big") % count + 1
+
+
+# ----------------------------------------------------------------------
+# マージ可能な集計値
+# ----------------------------------------------------------------------
+def merge_counts(target: Dict[str, Any], source: Dict[str, Any]) -> Dict[str, Any]:
+    """件数・合計（数値の辞書）の加算"""
+    for key, value in source.items():
+        target[key] = target.get(key, 0) + value
+    return target
+
+
+def merge_disjoint(target: Dict[str, Any], source: Dict[str, Any], label: str) -> Dict[str, Any]:
+    """ファイル単位の結果の和集合（シャード間でキーが重複する場合は割り当て不整合）"""
+    for key, value in source.items():
+        if key in target:
+            raise ShardError(f"{label}: 複数のシャードに同じファイルがあります: {key}")
+        target[key] = value
+    return target
+
+
+def smallest(items: Iterable[str], limit: int) -> List[str]:
+    """上位K件（キー昇順の先頭K件）。各シャードの上位K件をマージしても全体の上位K件と一致する"""
+    return heapq.nsmallest(limit, items)
+
+
+def merge_smallest(lists: Iterable[List[str]], limit: int) -> List[str]:
+    return heapq.nsmallest(limit, (item for items in lists for item in items))
+
+
+# ----------------------------------------------------------------------
+# 部分結果ファイル
+# ----------------------------------------------------------------------
+def _state_of(value: Any) -> Any:
+    """JSON化できない値のうち to_state() を持つもの（FileRecord 等）は状態の配列で書き出す"""
+    if hasattr(value, "to_state"):
+        return value.to_state()
+    raise TypeError(f"部分結果にJSON化できない値があります: {type(value).__name__}")
+
+
+def write_partial(path, kind: str, shard: Optional[ShardSpec], data: Dict[str, Any]) -> Path:
+    path = Path(path)
+    document = {
+        "kind": kind,
+        "version": PARTIAL_VERSION,
+        "shard": [shard.index, shard.count] if shard else [1, 1],
+        "data": data,
+    }
+    atomic_write_text(path, json.dumps(document, ensure_ascii=False, default=_state_of))
+    return path
+
+
+def load_partials(paths: Iterable, kind: str) -> List[Dict[str, Any]]:
+    """部分結果を読み込み、全シャードが1件ずつ揃っていることを検証する"""
+    partials: Dict[int, Tuple[Path, Dict[str, Any]]] = {}
+    count = None
+    for path in paths:
+        path = Path(path)
+        with open(path, "r", encoding="utf-8") as f:
+            document = json.load(f)
+        if document.get("kind") != kind or document.get("version") != PARTIAL_VERSION:
+            raise ShardError(f"部分結果の種別・バージョンが一致しません: {path}")
+        index, shard_count = document["shard"]
+        if count is None:
+            count = shard_count
+        elif shard_count != count:
+            raise ShardError(f"シャード数が一致しません: {path} ({shard_count} != {count})")
+        if index in partials:
+            raise ShardError(f"シャード{index}/{count}が重複しています: {partials[index][0]} / {path}")
+        partials[index] = (path, document["data"])
+
+    if count is None:
+        raise ShardError("部分結果が指定されていません")
+    missing = [index for index in range(1, count + 1) if index not in partials]
+    if missing:
+        raise ShardError(f"シャードが不足しています: {', '.join(f'{index}/{count}' for index in missing)}")
+    return [partials[index][1] for index in range(1, count + 1)]
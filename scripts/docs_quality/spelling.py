@@ -0,0 +1,382 @@
+# -*- coding: utf-8 -*-
+
+"""
+スペルチェック（.cspell.json の語彙 + 基本辞書）
+作成日: 2026-10-19
+目的: cspell を別プロセスで全ツリー再読込せず、品質分析の1パス内で英単語のスペルを確認する
+
+- 語彙: .cspell.json の words / ignoreWords（大文字小文字を区別しない）と dictionaryDefinitions の単語リスト
+- 基本辞書: 同梱の dictionaries/en_base.txt。システム辞書（/usr/share/dict・hunspell）は環境ごとに内容が異なり
+  結果が変わるため、system_dictionaries=True を指定したときだけ存在するものを加える。
+  大きな辞書でもメモリが一定になるよう、ブルームフィルタ（偽陽性率 0.1%）に格納する
+- 読み込んだ辞書（種別・パス・語数）は dictionaries に記録し、レポートのメタデータへ出力する
+- 対象: 英字の連続（docs_quality.tokenizer）。コードブロック・インラインコード・URL・リンク先・HTMLタグ・
+  ファイル名・16進数と、ignoreRegExpList に一致する範囲は除く（コードブロック以外は未知語を含む行のみで判定）。
+  camelCase は語に分けて確認する
+- 判定: 語彙・基本辞書 → 語尾変化（-s, -ed, -ing 等）・接頭辞（re-, un- 等）を除いた形 →
+  allowCompoundWords の場合は3文字以上の既知語の連結
+- 結果は内容ハッシュごとにキャッシュし（辞書が変わると破棄）、同じ語の判定は1プロセス内で1回だけ行う
+"""
+
+import hashlib
+import json
+import math
+import os
+import re
+from array import array
+from bisect import bisect_right
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from docs_quality.corpus import content_digest
+from docs_quality.fsutil import atomic_write_text
+from docs_quality.tokenizer import latin_words
+from docs_quality.walker import IgnoreRules
+
+BASE_DICTIONARY = Path(__file__).resolve().parent / "dictionaries" / "en_base.txt"
+# system_dictionaries=True のときだけ読み込む
+SYSTEM_DICTIONARIES = (
+    "/usr/share/dict/words",
+    "/usr/share/dict/american-english",
+    "/usr/share/dict/british-english",
+    "/usr/share/hunspell/en_US.dic",
+    "/usr/share/myspell/en_US.dic",
+)
+CACHE_VERSION = 1
+
+# コードブロック（語の抽出前に同じ長さの空白に置き換え、行番号を保つ）
+CODE_FENCE = re.compile(r"^[ \t]{0,3}(```|~~~)[^\n]*\n.*?^[ \t]{0,3}\1", re.MULTILINE | re.DOTALL)
+# 確認しない範囲（未知語を含む行にだけ適用する）
+SKIP_PATTERNS = [
+    re.compile(r"`[^`\n]+`"),
+    re.compile(r"\]\([^)\n]*\)"),
+    re.compile(r"<[^>\n]+>"),
+    re.compile(r"\b[a-zA-Z][a-zA-Z0-9+.-]*://\S+"),
+    re.compile(r"\b[A-Za-z0-9_.+-]+@[A-Za-z0-9_-]+\.[A-Za-z0-9_.-]+"),
+    re.compile(r"\b[A-Za-z0-9_-]+\.(?:md|json|ya?ml|ts|js|vue|py|sh|html|css|scss|txt|env|log|sql|prisma|tsx|jsx)\b"),
+    re.compile(r"\\u[0-9a-fA-F]{4}"),
+    re.compile(r"#[0-9a-fA-F]{3,8}\b"),
+]
+CAMEL_PART = re.compile(r"[A-Z]+(?![a-z])|[A-Z]?[a-z]+")
+
+SUFFIXES = (
+    ("ies", "y"), ("ied", "y"), ("ier", "y"), ("iest", "y"), ("ily", "y"),
+    ("ations", ""), ("ations", "e"), ("ation", ""), ("ation", "e"), ("ations", "ate"), ("ation", "ate"),
+    ("ions", ""), ("ion", ""),
+    ("ments", ""), ("ment", ""), ("ness", ""), ("ally", ""),
+    ("ing", ""), ("ing", "e"), ("ers", ""), ("ers", "e"), ("est", ""), ("est", "e"),
+    ("es", ""), ("ed", ""), ("ed", "e"), ("er", ""), ("er", "e"), ("ly", ""),
+    ("able", ""), ("able", "e"), ("ity", ""), ("ize", ""), ("ized", ""), ("izes", ""), ("izing", ""),
+    ("s", ""), ("'s", ""),
+)
+PREFIXES = ("re", "un", "pre", "non", "sub", "multi", "auto", "de", "dis", "mis", "over", "under",
+            "inter", "cross", "co", "in", "im", "post", "super", "micro", "mini", "self")
+
+
+class BloomFilter:
+    """文字列集合のブルームフィルタ（ビット列は bytearray、位置は blake2b の二重ハッシュ）"""
+
+    __slots__ = ("size", "hashes", "bits", "count")
+
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        capacity = max(capacity, 1)
+        self.size = max(64, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, word: str) -> Iterator[int]:
+        digest = hashlib.blake2b(word.encode("utf-8"), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        size = self.size
+        for i in range(self.hashes):
+            yield (first + i * second) % size
+
+    def add(self, word: str) -> None:
+        bits = self.bits
+        for position in self._positions(word):
+            bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, word: str) -> bool:
+        bits = self.bits
+        return all(bits[position >> 3] & (1 << (position & 7)) for position in self._positions(word))
+
+
+def _read_word_list(path: Path) -> List[str]:
+    """1行1語の単語リスト（hunspell の .dic は先頭の語数行と `/` 以降のフラグを除く）"""
+    try:
+        lines = path.read_text(encoding="utf-8", errors="replace").splitlines()
+    except OSError:
+        return []
+    if path.suffix == ".dic" and lines and lines[0].strip().isdigit():
+        lines = lines[1:]
+    words = []
+    for line in lines:
+        word = line.split("/", 1)[0].strip()
+        if word and not word.startswith("#"):
+            words.append(word)
+    return words
+
+
+def _js_regex(pattern: str) -> Optional["re.Pattern"]:
+    """cspell の ignoreRegExpList（`/.../flags` 形式または素の正規表現）を Python の正規表現へ"""
+    flags = 0
+    match = re.fullmatch(r"/(.*)/([a-z]*)", pattern, re.DOTALL)
+    if match:
+        pattern, js_flags = match.groups()
+        if "i" in js_flags:
+            flags |= re.IGNORECASE
+        if "m" in js_flags:
+            flags |= re.MULTILINE
+    try:
+        return re.compile(pattern, flags)
+    except re.error:
+        return None
+
+
+def _blank(match: "re.Match") -> str:
+    """一致範囲を改行以外空白にする（オフセット・行番号を保つ）"""
+    return re.sub(r"[^\n]", " ", match.group(0))
+
+
+class SpellChecker:
+    """英単語のスペルチェック（1ファイル単位、内容ハッシュでキャッシュ）"""
+
+    def __init__(self, words: Iterable[str] = (), base_words: Sequence[str] = (),
+                 ignore_patterns: Sequence["re.Pattern"] = (), ignore_paths: Sequence[str] = (),
+                 min_word_length: int = 4, allow_compound_words: bool = False,
+                 max_problems: int = 100, config_dir: Optional[Path] = None, fingerprint: str = "",
+                 dictionaries: Sequence[Dict[str, object]] = ()):
+        self.words = set()
+        for word in words:
+            self.words.add(word.lower())
+            self.words.update(part.lower() for _, part in latin_words(word))
+        self.base = BloomFilter(len(base_words))
+        for word in base_words:
+            self.base.add(word.lower())
+        self.ignore_patterns = list(ignore_patterns)
+        self.ignore_paths = IgnoreRules(ignore_paths) if ignore_paths else None
+        self.min_word_length = min_word_length
+        self.allow_compound_words = allow_compound_words
+        self.max_problems = max_problems
+        self.config_dir = config_dir
+        self.fingerprint = fingerprint
+        # 読み込んだ辞書（{"source": bundled / config / system, "path", "words"}）
+        self.dictionaries = list(dictionaries)
+        # 語 → 既知か（1プロセス内のメモ）、内容ハッシュ → 結果
+        self.known: Dict[str, bool] = {}
+        self.results: Dict[str, Tuple[Tuple[str, int, int], ...]] = {}
+        self.cache_hits = 0
+        self.checked = 0
+
+    @classmethod
+    def load(cls, config_path, system_dictionaries: bool = False) -> "SpellChecker":
+        """.cspell.json と基本辞書から作成（設定ファイルが無い場合は基本辞書のみ、システム辞書は指定時のみ）"""
+        config_path = Path(config_path)
+        config = {}
+        if config_path.exists():
+            with open(config_path, "r", encoding="utf-8") as f:
+                config = json.load(f)
+        config_dir = config_path.resolve().parent
+
+        words = list(config.get("words", [])) + list(config.get("ignoreWords", []))
+        # (種別, 表示用のパス, 実際のパス)。同梱辞書は環境に依存しないようファイル名で記録する
+        sources = [("bundled", BASE_DICTIONARY.name, BASE_DICTIONARY)]
+        if system_dictionaries:
+            sources.extend(("system", path, Path(path)) for path in SYSTEM_DICTIONARIES if os.path.exists(path))
+        for definition in config.get("dictionaryDefinitions", []):
+            if definition.get("path"):
+                sources.append(("config", definition["path"], config_dir / definition["path"]))
+        base_words = []
+        dictionaries = []
+        for kind, label, source in sources:
+            if not source.is_file():
+                continue
+            source_words = _read_word_list(source)
+            base_words.extend(source_words)
+            dictionaries.append({"source": kind, "path": label, "words": len(source_words)})
+
+        allow_compound = config.get("allowCompoundWords", False) or any(
+            setting.get("allowCompoundWords") for setting in config.get("languageSettings", [])
+        )
+        patterns = [_js_regex(pattern) for pattern in config.get("ignoreRegExpList", [])]
+
+        fingerprint = hashlib.blake2b(digest_size=16)
+        fingerprint.update(json.dumps([CACHE_VERSION, config], sort_keys=True, ensure_ascii=False).encode("utf-8"))
+        for _, _, source in sources:
+            try:
+                stat = source.stat()
+            except OSError:
+                continue
+            fingerprint.update(f"{source}:{stat.st_size}:{stat.st_mtime_ns}".encode("utf-8"))
+
+        return cls(words, base_words, [pattern for pattern in patterns if pattern is not None],
+                   config.get("ignorePaths", []), min_word_length=config.get("minWordLength", 4),
+                   allow_compound_words=bool(allow_compound), max_problems=config.get("maxNumberOfProblems", 100),
+                   config_dir=config_dir, fingerprint=fingerprint.hexdigest(), dictionaries=dictionaries)
+
+    # ------------------------------------------------------------------
+    # キャッシュ（内容ハッシュ → 結果）
+    # ------------------------------------------------------------------
+    def load_cache(self, path) -> None:
+        path = Path(path)
+        if not path.exists():
+            return
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                document = json.load(f)
+        except (OSError, ValueError):
+            return
+        if document.get("fingerprint") != self.fingerprint:
+            return
+        for digest, problems in document.get("results", {}).items():
+            self.results[digest] = tuple(tuple(problem) for problem in problems)
+
+    def save_cache(self, path, keep: Optional[Iterable[str]] = None) -> None:
+        """keep（現存する文書の内容ハッシュ）以外のエントリは捨てて保存"""
+        results = self.results
+        if keep is not None:
+            keep = set(keep)
+            results = {digest: problems for digest, problems in results.items() if digest in keep}
+        document = {"fingerprint": self.fingerprint, "results": results}
+        atomic_write_text(Path(path), json.dumps(document, ensure_ascii=False, separators=(",", ":")))
+
+    def remember(self, content: str, problems: Optional[Tuple[Tuple[str, int, int], ...]]) -> None:
+        """別プロセスで確認した結果をキャッシュへ反映"""
+        if problems is not None:
+            self.results[content_digest(content.encode("utf-8"))] = problems
+
+    # ------------------------------------------------------------------
+    # 判定
+    # ------------------------------------------------------------------
+    def ignored_path(self, file_path: Path) -> bool:
+        if self.ignore_paths is None or self.config_dir is None:
+            return False
+        try:
+            relative = Path(os.path.abspath(file_path)).relative_to(self.config_dir).as_posix()
+        except ValueError:
+            return False
+        return bool(self.ignore_paths.match(relative, False))
+
+    def _in_dictionary(self, word: str) -> bool:
+        return word in self.words or word in self.base
+
+    def _known_form(self, word: str) -> bool:
+        """辞書の語、または語尾変化を除いた形が辞書にある語"""
+        if self._in_dictionary(word):
+            return True
+        for suffix, replacement in SUFFIXES:
+            if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+                stem = word[:-len(suffix)] + replacement
+                if self._in_dictionary(stem):
+                    return True
+                # 子音の重複（stopped → stop, running → run）
+                if not replacement and len(stem) >= 4 and stem[-1] == stem[-2] and self._in_dictionary(stem[:-1]):
+                    return True
+        return False
+
+    def _compound(self, word: str) -> bool:
+        """3文字以上の既知語の連結（permissionmatrix → permission + matrix）"""
+        length = len(word)
+        reachable = [False] * (length + 1)
+        reachable[0] = True
+        for start in range(length):
+            if not reachable[start]:
+                continue
+            for end in range(start + 3, length + 1):
+                if not reachable[end] and self._known_form(word[start:end]):
+                    reachable[end] = True
+        return reachable[length]
+
+    def is_known(self, word: str) -> bool:
+        """word は小文字化済み"""
+        known = self.known.get(word)
+        if known is None:
+            known = self._known_form(word)
+            if not known:
+                for prefix in PREFIXES:
+                    if word.startswith(prefix) and len(word) - len(prefix) >= 3 and \
+                            self._known_form(word[len(prefix):]):
+                        known = True
+                        break
+            if not known and self.allow_compound_words and len(word) >= 6:
+                known = self._compound(word)
+            self.known[word] = known
+        return known
+
+    def _words(self, content: str) -> Iterator[Tuple[int, str]]:
+        """確認対象の語 (オフセット, 語)。camelCase は分割し、語彙に一致する語はそのまま"""
+        minimum = self.min_word_length
+        words = self.words
+        for offset, token in latin_words(content):
+            if len(token) < minimum or token.isupper():
+                continue
+            lowered = token.lower()
+            if lowered in words:
+                continue
+            if token.islower() or token[1:].islower():
+                yield offset, token
+                continue
+            for part in CAMEL_PART.finditer(token):
+                if len(part.group(0)) >= minimum and not part.group(0).isupper():
+                    yield offset + part.start(), part.group(0)
+
+    def _skipped_spans(self, line: str) -> List[Tuple[int, int]]:
+        spans = []
+        for pattern in SKIP_PATTERNS:
+            spans.extend(match.span() for match in pattern.finditer(line))
+        for pattern in self.ignore_patterns:
+            spans.extend(match.span() for match in pattern.finditer(line))
+        return spans
+
+    def check(self, content: str, file_path: Optional[Path] = None) -> Tuple[Tuple[str, int, int], ...]:
+        """未知語の (語, 出現回数, 最初の行) を出現順に（最大 max_problems 語）
+
+        除外範囲（SKIP_PATTERNS・ignoreRegExpList）は全文には適用せず、未知語が現れた行だけで確認する。
+        ほとんどの語は辞書で判定が済むため、正規表現の全文走査を語の数によらず避けられる
+        """
+        if file_path is not None and self.ignored_path(file_path):
+            return ()
+        digest = content_digest(content.encode("utf-8"))
+        cached = self.results.get(digest)
+        if cached is not None:
+            self.cache_hits += 1
+            return cached
+
+        self.checked += 1
+        if "```" in content or "~~~" in content:
+            content = CODE_FENCE.sub(_blank, content)
+        unknown: "OrderedDict[str, List]" = OrderedDict()
+        line_starts = None
+        line_spans: Dict[int, List[Tuple[int, int]]] = {}
+        for offset, word in self._words(content):
+            lowered = word.lower()
+            problem = unknown.get(lowered)
+            if problem is None and (len(unknown) >= self.max_problems or self.is_known(lowered)):
+                continue
+            if line_starts is None:
+                line_starts = array("I", [0] + [match.end() for match in re.finditer("\n", content)])
+            line = _line_of(line_starts, offset)
+            spans = line_spans.get(line)
+            if spans is None:
+                start = line_starts[line - 1]
+                end = content.find("\n", start)
+                spans = line_spans[line] = [(span_start + start, span_end + start) for span_start, span_end in
+                                            self._skipped_spans(content[start:end if end >= 0 else len(content)])]
+            if any(span_start <= offset < span_end for span_start, span_end in spans):
+                continue
+            if problem is not None:
+                problem[1] += 1
+            else:
+                unknown[lowered] = [word, 1, line]
+
+        problems = tuple((word, count, line) for word, count, line in unknown.values())
+        self.results[digest] = problems
+        return problems
+
+
+def _line_of(line_starts: array, offset: int) -> int:
+    return bisect_right(line_starts, offset)
@@ -0,0 +1,292 @@
+# -*- coding: utf-8 -*-
+
+"""
+ストリーミング統計（マージ可能）
+作成日: 2026-10-19
+目的: スコア・サイズ等を1パスで集計し、平均・分散・パーセンタイル・ヒストグラム・ディレクトリ別集計を出す
+
+- ExactMoments: 件数・合計・二乗和を 1/scale 単位の整数で保持（加算順序によらず同じ値、桁落ちなし）
+- QuantileSketch: 対数バケットによる分位点スケッチ（DDSketch 方式、相対誤差 relative_accuracy 以内）
+- Histogram: 固定幅ビンの疎なヒストグラム
+- StreamingStats: 上記3つの組み合わせ。値を保持しないため、グループあたりのメモリは値の件数に依存しない
+- DirectoryRollup: docs ルートからの相対ディレクトリパスをキーに、祖先ディレクトリ全てへ集計する
+
+いずれも state() / from_state() で JSON 化でき、merge() の結果は分割方法・順序によらず一致する
+（docs_quality.sharding の部分結果に格納する）。値は 0 以上を前提とする。
+"""
+
+import math
+import posixpath
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
+ROOT = "."
+
+
+class ExactMoments:
+    """件数・平均・分散・最小・最大（1/scale 単位の整数で厳密に集計）"""
+
+    __slots__ = ("scale", "count", "total", "squares", "minimum", "maximum")
+
+    def __init__(self, scale: int = 1):
+        self.scale = scale
+        self.count = 0
+        self.total = 0
+        self.squares = 0
+        self.minimum: Optional[int] = None
+        self.maximum: Optional[int] = None
+
+    def add(self, value: float) -> None:
+        scaled = round(value * self.scale)
+        self.count += 1
+        self.total += scaled
+        self.squares += scaled * scaled
+        if self.minimum is None or scaled < self.minimum:
+            self.minimum = scaled
+        if self.maximum is None or scaled > self.maximum:
+            self.maximum = scaled
+
+    def merge(self, other: "ExactMoments") -> None:
+        self.count += other.count
+        self.total += other.total
+        self.squares += other.squares
+        if other.minimum is not None and (self.minimum is None or other.minimum < self.minimum):
+            self.minimum = other.minimum
+        if other.maximum is not None and (self.maximum is None or other.maximum > self.maximum):
+            self.maximum = other.maximum
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.scale / self.count if self.count else 0.0
+
+    @property
+    def variance(self) -> float:
+        """母分散"""
+        if not self.count:
+            return 0.0
+        return (self.count * self.squares - self.total * self.total) / (self.count * self.count) / (self.scale * self.scale)
+
+    def state(self) -> Dict[str, Any]:
+        return {"scale": self.scale, "count": self.count, "total": self.total, "squares": self.squares,
+                "min": self.minimum, "max": self.maximum}
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> "ExactMoments":
+        moments = cls(state["scale"])
+        moments.count = state["count"]
+        moments.total = state["total"]
+        moments.squares = state["squares"]
+        moments.minimum = state["min"]
+        moments.maximum = state["max"]
+        return moments
+
+
+class QuantileSketch:
+    """対数バケットの分位点スケッチ（バケット数は値域の対数にのみ比例）"""
+
+    __slots__ = ("relative_accuracy", "gamma", "log_gamma", "zero_count", "buckets")
+
+    def __init__(self, relative_accuracy: float = 0.01):
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.log_gamma = math.log(self.gamma)
+        self.zero_count = 0
+        self.buckets: Dict[int, int] = {}
+
+    def add(self, value: float) -> None:
+        if value <= 0:
+            self.zero_count += 1
+            return
+        index = math.ceil(math.log(value) / self.log_gamma)
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+
+    def merge(self, other: "QuantileSketch") -> None:
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("relative_accuracy の異なるスケッチはマージできません")
+        self.zero_count += other.zero_count
+        for index, count in other.buckets.items():
+            self.buckets[index] = self.buckets.get(index, 0) + count
+
+    @property
+    def count(self) -> int:
+        return self.zero_count + sum(self.buckets.values())
+
+    def quantile(self, q: float) -> float:
+        total = self.count
+        if not total:
+            return 0.0
+        rank = q * (total - 1)
+        seen = self.zero_count
+        if rank < seen:
+            return 0.0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if rank < seen:
+                # バケット [gamma^(i-1), gamma^i] の代表値（相対誤差が最小になる点）
+                return 2 * self.gamma ** index / (self.gamma + 1)
+        return 2 * self.gamma ** max(self.buckets) / (self.gamma + 1)
+
+    def state(self) -> Dict[str, Any]:
+        return {"relative_accuracy": self.relative_accuracy, "zero": self.zero_count,
+                "buckets": {str(index): count for index, count in sorted(self.buckets.items())}}
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> "QuantileSketch":
+        sketch = cls(state["relative_accuracy"])
+        sketch.zero_count = state["zero"]
+        sketch.buckets = {int(index): count for index, count in state["buckets"].items()}
+        return sketch
+
+
+class Histogram:
+    """固定幅ビンの疎なヒストグラム（ビン i は [lower + i*width, lower + (i+1)*width)）"""
+
+    __slots__ = ("width", "lower", "bins")
+
+    def __init__(self, width: float, lower: float = 0):
+        self.width = width
+        self.lower = lower
+        self.bins: Dict[int, int] = {}
+
+    def add(self, value: float) -> None:
+        index = math.floor((value - self.lower) / self.width)
+        self.bins[index] = self.bins.get(index, 0) + 1
+
+    def merge(self, other: "Histogram") -> None:
+        for index, count in other.bins.items():
+            self.bins[index] = self.bins.get(index, 0) + count
+
+    def count_between(self, low: Optional[float] = None, high: Optional[float] = None) -> int:
+        """[low, high) に下端が入るビンの件数（low・high はビン境界である前提）"""
+        total = 0
+        for index, count in self.bins.items():
+            start = self.lower + index * self.width
+            if (low is None or start >= low) and (high is None or start < high):
+                total += count
+        return total
+
+    def items(self) -> Iterator[Tuple[float, int]]:
+        for index in sorted(self.bins):
+            yield self.lower + index * self.width, self.bins[index]
+
+    def state(self) -> Dict[str, Any]:
+        return {"width": self.width, "lower": self.lower,
+                "bins": {str(index): count for index, count in sorted(self.bins.items())}}
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> "Histogram":
+        histogram = cls(state["width"], state["lower"])
+        histogram.bins = {int(index): count for index, count in state["bins"].items()}
+        return histogram
+
+
+class StreamingStats:
+    """1パス・マージ可能な要約統計（厳密な平均・分散、近似パーセンタイル、ヒストグラム）"""
+
+    __slots__ = ("moments", "sketch", "histogram")
+
+    def __init__(self, scale: int = 1, bin_width: float = 1, relative_accuracy: float = 0.01):
+        self.moments = ExactMoments(scale)
+        self.sketch = QuantileSketch(relative_accuracy)
+        self.histogram = Histogram(bin_width)
+
+    def add(self, value: float) -> None:
+        self.moments.add(value)
+        self.sketch.add(value)
+        self.histogram.add(value)
+
+    def merge(self, other: "StreamingStats") -> None:
+        self.moments.merge(other.moments)
+        self.sketch.merge(other.sketch)
+        self.histogram.merge(other.histogram)
+
+    @property
+    def count(self) -> int:
+        return self.moments.count
+
+    def summary(self, digits: int = 2, histogram: bool = True) -> Dict[str, Any]:
+        moments = self.moments
+        scale = moments.scale
+        # digits=0 の場合は整数で出力
+        ndigits = digits or None
+        summary = {
+            "count": moments.count,
+            "mean": round(moments.mean, ndigits),
+            "stddev": round(math.sqrt(moments.variance), ndigits),
+            "min": round(moments.minimum / scale, ndigits) if moments.minimum is not None else 0,
+            "max": round(moments.maximum / scale, ndigits) if moments.maximum is not None else 0,
+            "p50": round(self.sketch.quantile(0.5), ndigits),
+            "p90": round(self.sketch.quantile(0.9), ndigits),
+            "p99": round(self.sketch.quantile(0.99), ndigits),
+        }
+        if histogram:
+            summary["histogram"] = {
+                "bin_width": self.histogram.width,
+                "bins": {_format_edge(start): count for start, count in self.histogram.items()},
+            }
+        return summary
+
+    def state(self) -> Dict[str, Any]:
+        return {"moments": self.moments.state(), "sketch": self.sketch.state(), "histogram": self.histogram.state()}
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> "StreamingStats":
+        stats = cls.__new__(cls)
+        stats.moments = ExactMoments.from_state(state["moments"])
+        stats.sketch = QuantileSketch.from_state(state["sketch"])
+        stats.histogram = Histogram.from_state(state["histogram"])
+        return stats
+
+
+def _format_edge(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else str(value)
+
+
+class DirectoryRollup:
+    """ディレクトリ階層別の集計（キーは docs ルートからの相対パス、ルートは "."）
+
+    add("a/b/c.md", v) は "."・"a"・"a/b" の3グループへ加算する（配下全体の集計）。
+    同名のサブディレクトリでもパスが異なれば別グループになる。
+    """
+
+    def __init__(self, factory: Callable[[], StreamingStats]):
+        self.factory = factory
+        self.groups: Dict[str, StreamingStats] = {}
+
+    @staticmethod
+    def ancestors(relative_path: str) -> Iterator[str]:
+        directory = posixpath.dirname(relative_path)
+        yield ROOT
+        if directory:
+            parts = directory.split("/")
+            for depth in range(1, len(parts) + 1):
+                yield "/".join(parts[:depth])
+
+    def add(self, relative_path: str, value: float) -> None:
+        for directory in self.ancestors(relative_path):
+            group = self.groups.get(directory)
+            if group is None:
+                group = self.groups[directory] = self.factory()
+            group.add(value)
+
+    def merge(self, other: "DirectoryRollup") -> None:
+        for directory, stats in other.groups.items():
+            group = self.groups.get(directory)
+            if group is None:
+                group = self.groups[directory] = self.factory()
+            group.merge(stats)
+
+    def summary(self, digits: int = 2) -> Dict[str, Dict[str, Any]]:
+        return {
+            directory: dict(self.groups[directory].summary(digits, histogram=False),
+                            depth=0 if directory == ROOT else directory.count("/") + 1)
+            for directory in sorted(self.groups)
+        }
+
+    def state(self) -> Dict[str, Any]:
+        return {directory: stats.state() for directory, stats in sorted(self.groups.items())}
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any], factory: Callable[[], StreamingStats]) -> "DirectoryRollup":
+        rollup = cls(factory)
+        rollup.groups = {directory: StreamingStats.from_state(stats) for directory, stats in state.items()}
+        return rollup
@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+
+"""
+日英混在テキストのトークン化
+作成日: 2026-10-19
+目的: 日本語（CJK）は文字バイグラム、英数字は単語単位でトークン化する
+      可読性・コンテンツ量の指標には字種（漢字・ひらがな・カタカナ・英字・数字）の連続を1語として数える
+
+字種の判定は1文字ずつ分岐せず、文字→字種コードの変換表（str.translate）で本文全体を一括変換し、
+字種コード列に対する正規表現・str.count で語数・文数を数える。
+"""
+
+import re
+import unicodedata
+from operator import methodcaller
+from typing import Dict, Iterator, List, NamedTuple, Tuple
+
+# ひらがな・カタカナ・CJK統合漢字（拡張A・互換漢字含む）・長音・繰り返し記号
+CJK_CHARS = "々〆぀-ヿ㐀-䶿一-鿿豈-﫿"
+TOKEN_PATTERN = re.compile(f"([{CJK_CHARS}]+)|([0-9a-zÀ-ɏ]+)")
+# スペルチェック対象の英単語（大文字小文字を保持、アポストロフィを含む語は1語）
+LATIN_WORD = re.compile(r"[A-Za-z]+(?:'[A-Za-z]+)*")
+
+
+def normalize(text: str) -> str:
+    """全角英数字の半角化・小文字化（NFKC）"""
+    return unicodedata.normalize("NFKC", text).lower()
+
+
+def search_terms(text: str) -> List[str]:
+    """検索用トークン（CJKは文字バイグラム、1文字のみの連続はその文字）"""
+    terms = []
+    for cjk, latin in TOKEN_PATTERN.findall(normalize(text)):
+        if latin:
+            terms.append(latin)
+        elif len(cjk) == 1:
+            terms.append(cjk)
+        else:
+            terms.extend(cjk[i:i + 2] for i in range(len(cjk) - 1))
+    return terms
+
+
+def latin_words(text: str) -> Iterator[Tuple[int, str]]:
+    """英単語 (オフセット, 語)。正規化せず原文のまま返す（camelCase の分割・行番号の算出用）"""
+    for match in LATIN_WORD.finditer(text):
+        yield match.start(), match.group(0)
+
+
+# ---------------------------------------------------------------------------
+# 字種によるトークン化（語数・文数）
+# ---------------------------------------------------------------------------
+# 字種コード（変換表に無い文字＝記号・絵文字などはそのまま残り、どの字種にも一致しない）
+LATIN, DIGIT, HIRAGANA, KATAKANA, KANJI = "a", "d", "h", "k", "K"
+SPACE, PERIOD, SENTENCE_END = " ", ".", "S"
+SCRIPT_NAMES = {KANJI: "kanji", HIRAGANA: "hiragana", KATAKANA: "katakana", LATIN: "latin", DIGIT: "digit"}
+
+# 英字と数字の連続（v2, utf8 など）は1語、それ以外は同じ字種の連続を1語とする
+WORD_RUN = re.compile(r"[ad]+|h+|k+|K+")
+
+
+def _build_script_table() -> Dict[int, str]:
+    table = {code: SPACE for code in range(128)}
+    ranges = [
+        (LATIN, "AZ"), (LATIN, "az"), (LATIN, "ＡＺ"), (LATIN, "ａｚ"), (LATIN, "ÀÖ"), (LATIN, "Øö"), (LATIN, "øɏ"),
+        (DIGIT, "09"), (DIGIT, "０９"),
+        (HIRAGANA, "ぁゟ"),
+        (KATAKANA, "゠ヿ"), (KATAKANA, "ㇰㇿ"), (KATAKANA, "ｦﾟ"),
+        (KANJI, "㐀䶿"), (KANJI, "一鿿"), (KANJI, "豈﫿"), (KANJI, "々〆"),
+    ]
+    for script, (first, last) in ranges:
+        for code in range(ord(first), ord(last) + 1):
+            table[code] = script
+    # 中黒（カタカナ語の区切り）
+    table[ord("・")] = SPACE
+    for char in "。！？!?\n":
+        table[ord(char)] = SENTENCE_END
+    table[ord(".")] = PERIOD
+    return table
+
+
+SCRIPT_TABLE = _build_script_table()
+
+
+class TextStats(NamedTuple):
+    """字種トークン化の集計"""
+    words: int
+    sentences: int
+    long_sentences: int
+    scripts: Dict[str, int]
+
+
+def count_words(text: str) -> int:
+    """字種の連続を1語とした語数"""
+    return len(WORD_RUN.findall(text.translate(SCRIPT_TABLE)))
+
+
+def text_stats(text: str, long_sentence_words: int = 20) -> TextStats:
+    """語数・文数・長文数・字種別文字数
+
+    文末は「。！？!?」、空白が続く「.」（example.com, v1.2 は分割しない）、
+    改行（見出し・箇条書きは句点なしで1文になるため）。
+    """
+    classes = text.translate(SCRIPT_TABLE)
+    # 語を1文字 "w" に畳み込み、文ごとの "w" の数を語数とする
+    runs = WORD_RUN.sub("w", classes).replace(PERIOD + SPACE, SENTENCE_END).replace(PERIOD + SENTENCE_END, SENTENCE_END)
+    counts = [count for count in map(methodcaller("count", "w"), runs.split(SENTENCE_END)) if count]
+    scripts = {name: classes.count(code) for code, name in SCRIPT_NAMES.items()}
+    return TextStats(sum(counts), len(counts), sum(1 for count in counts if count > long_sentence_words), scripts)
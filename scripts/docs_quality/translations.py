@@ -0,0 +1,451 @@
+# -*- coding: utf-8 -*-
+
+"""
+翻訳の鮮度判定（原文ツリーと翻訳ツリーの節単位の対応づけ）
+作成日: 2026-10-19
+目的: 日本語の docs/ と英語版ツリー（docs_english_backup_*）の対応ファイル・対応節を求め、翻訳後に原文が変更された節を報告する
+
+- ファイルの対応: 1) 翻訳側のパスの各要素を名前の対応表（update-japanese-links.py と同じ形式、
+  フォルダは末尾 "/"）で原文側の名前へ置き換え、順序コード（"01_"）を除いたパスで照合。
+  一致しなければファイル名だけで照合（原文側で一意な場合のみ）
+  2) それでも対応しないファイルは、内容の指紋（見出し文字列・コードブロックのハッシュ）の転置インデックスで
+  候補を絞り、Jaccard 係数が閾値以上のものを係数の高い順に1対1で対応させる
+- 節: フェンス外の ATX 見出しで区切った範囲（最初の見出しより前は level 0 の節）。
+  見出しレベル・見出し文字列・コードブロックの指紋・本文のハッシュを持ち、内容ハッシュごとにキャッシュする
+- 節の対応: (見出しレベル, コードブロック指紋) の列を difflib で照合し、一致しなかった区間は同じレベル同士を位置順に対応させる
+- 鮮度: 対応した節ごとに (原文の節ハッシュ, 翻訳の節ハッシュ) を状態ファイルへ記録する。
+  翻訳側が変わらず原文側だけ変わった節を stale、翻訳側が変わった節は翻訳が更新されたものとして記録し直す。
+  初めて見た節は基準として記録する（baseline）
+- 増分: ファイルの対応と両側の内容ハッシュを状態ファイルに保持し、両側とも変わっていない組は節の対応を省略して前回の判定を使う
+"""
+
+import difflib
+import hashlib
+import json
+import pickle
+import re
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from docs_quality.corpus import Corpus, CorpusEntry
+from docs_quality.fsutil import atomic_write, atomic_write_text
+
+ATX_HEADING = re.compile(r"^ {0,3}(#{1,6})[ \t]+(.*?)(?:[ \t]+#+)?[ \t]*$")
+FENCE = re.compile(r"^ {0,3}(```|~~~)")
+ORDERING_CODE = re.compile(r"^\d+_")
+# 見出し指紋の正規化（番号・記号・空白・絵文字を除く）
+HEADING_NOISE = re.compile(r"[\W\d_]+", re.UNICODE)
+DEFAULT_SIMILARITY = 0.3
+STATUSES = ("fresh", "stale", "baseline", "updated")
+
+
+class TranslationConfigError(Exception):
+    """翻訳設定（.docs-translations.json）の誤り"""
+
+
+class Section(NamedTuple):
+    level: int
+    title: str
+    line: int
+    digest: str
+    code: Tuple[str, ...]
+
+
+def _short_hash(text: str) -> str:
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=8).hexdigest()
+
+
+def split_sections(content: str) -> Tuple[Section, ...]:
+    """フェンス外の ATX 見出しで節に分割（本文ハッシュは行末空白を除いた本文、コード指紋はブロック本文）"""
+    sections: List[Section] = []
+    level, title, start = 0, "", 1
+    body: List[str] = []
+    code: List[str] = []
+    block: Optional[List[str]] = None
+    marker = ""
+
+    def close():
+        if level or any(body):
+            sections.append(Section(level, title, start, _short_hash("\n".join(body).strip()), tuple(code)))
+
+    for number, line in enumerate(content.split("\n"), 1):
+        line = line.rstrip()
+        fence = FENCE.match(line)
+        if block is not None:
+            if fence and fence.group(1) == marker:
+                code.append(_short_hash("\n".join(block)))
+                block = None
+            else:
+                block.append(line)
+            body.append(line)
+            continue
+        if fence:
+            block, marker = [], fence.group(1)
+            body.append(line)
+            continue
+        heading = ATX_HEADING.match(line)
+        if heading:
+            close()
+            level, title, start = len(heading.group(1)), heading.group(2).strip(), number
+            body, code = [], []
+            continue
+        body.append(line)
+    if block is not None:
+        code.append(_short_hash("\n".join(block)))
+    close()
+    return tuple(sections)
+
+
+def fingerprints(sections: Iterable[Section]) -> frozenset:
+    """内容照合用の指紋（正規化した見出し文字列とコードブロックのハッシュ）"""
+    prints = set()
+    for section in sections:
+        heading = HEADING_NOISE.sub("", section.title).lower()
+        if heading:
+            prints.add("h:" + heading)
+        prints.update("c:" + code for code in section.code)
+    return frozenset(prints)
+
+
+def align_sections(source: Tuple[Section, ...], target: Tuple[Section, ...]) -> List[Tuple[Optional[int], Optional[int]]]:
+    """節の対応（原文の添字, 翻訳の添字）。片側にしかない節は相手が None"""
+    source_keys = [(section.level, section.code) for section in source]
+    target_keys = [(section.level, section.code) for section in target]
+    matcher = difflib.SequenceMatcher(None, source_keys, target_keys, autojunk=False)
+    pairs: List[Tuple[Optional[int], Optional[int]]] = []
+    i = j = 0
+    for block_i, block_j, size in matcher.get_matching_blocks():
+        # 一致区間の間は同じレベル同士を位置順に対応させる
+        gap_j = list(range(j, block_j))
+        for index in range(i, block_i):
+            match = next((k for k in gap_j if target[k].level == source[index].level), None)
+            if match is None:
+                pairs.append((index, None))
+                continue
+            pairs.extend((None, k) for k in gap_j[:gap_j.index(match)])
+            gap_j = gap_j[gap_j.index(match) + 1:]
+            pairs.append((index, match))
+        pairs.extend((None, k) for k in gap_j)
+        pairs.extend((block_i + offset, block_j + offset) for offset in range(size))
+        i, j = block_i + size, block_j + size
+    return pairs
+
+
+def section_ids(sections: Tuple[Section, ...]) -> List[str]:
+    """節の識別子（祖先の見出しを " > " で連結、同名の兄弟は "#2" 等で区別）"""
+    ids = []
+    ancestors: List[Tuple[int, str]] = []
+    seen: Dict[str, int] = {}
+    for section in sections:
+        while ancestors and ancestors[-1][0] >= section.level:
+            ancestors.pop()
+        ancestors.append((section.level, section.title))
+        path = " > ".join(title for _, title in ancestors)
+        seen[path] = seen.get(path, 0) + 1
+        ids.append(path if seen[path] == 1 else f"{path}#{seen[path]}")
+    return ids
+
+
+class SectionCache:
+    """内容ハッシュ → 節の分解結果"""
+
+    VERSION = 1
+
+    def __init__(self):
+        self.sections: Dict[str, Tuple[Section, ...]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def load(cls, path) -> "SectionCache":
+        cache = cls()
+        path = Path(path)
+        if not path.exists():
+            return cache
+        try:
+            with open(path, "rb") as f:
+                version, sections = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, ValueError, AttributeError):
+            return cache
+        if version == cls.VERSION:
+            cache.sections = {digest: tuple(Section(*item) for item in items) for digest, items in sections.items()}
+        return cache
+
+    def save(self, path, keep: Optional[Iterable[str]] = None) -> None:
+        """keep（現存する文書の内容ハッシュ）以外のエントリは捨てて保存"""
+        if keep is not None:
+            keep = set(keep)
+            self.sections = {digest: value for digest, value in self.sections.items() if digest in keep}
+        state = {digest: [tuple(section) for section in items] for digest, items in self.sections.items()}
+        atomic_write(Path(path), pickle.dumps((self.VERSION, state), protocol=pickle.HIGHEST_PROTOCOL))
+
+    def get(self, entry: CorpusEntry) -> Tuple[Section, ...]:
+        cached = self.sections.get(entry.digest)
+        if cached is not None:
+            self.hits += 1
+            return cached
+        self.misses += 1
+        cached = self.sections[entry.digest] = split_sections(entry.content)
+        return cached
+
+
+class TranslationTree:
+    """翻訳ツリー1つの設定（言語・ディレクトリ・名前の対応表）"""
+
+    def __init__(self, language: str, directory: str, names: Dict[str, str]):
+        self.language = language
+        self.directory = directory
+        self.names = names
+
+    def source_path(self, relative: str) -> str:
+        """翻訳側の相対パスを原文側の名前へ置き換え、順序コードを除いたパス"""
+        parts = relative.split("/")
+        mapped = [self.names.get(part + "/", part).rstrip("/") for part in parts[:-1]]
+        mapped.append(self.names.get(parts[-1], parts[-1]))
+        return normalize_path("/".join(mapped))
+
+
+class TranslationConfig:
+    """.docs-translations.json
+
+        {
+          "translations": [
+            {"language": "en", "dir": "docs_english_backup_20250930_235444",
+             "names": {"core/": "概要/", "README.md": "概要.md"}}
+          ],
+          "similarity": 0.3
+        }
+    """
+
+    def __init__(self, trees: List[TranslationTree], similarity: float = DEFAULT_SIMILARITY):
+        self.trees = trees
+        self.similarity = similarity
+
+    @classmethod
+    def load(cls, path) -> "TranslationConfig":
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                document = json.load(f)
+        except (OSError, ValueError) as e:
+            raise TranslationConfigError(f"翻訳設定を読み込めません: {path}: {e}") from e
+        trees = []
+        for item in document.get("translations", []):
+            if "dir" not in item:
+                raise TranslationConfigError(f"翻訳設定に dir がありません: {item}")
+            trees.append(TranslationTree(item.get("language", Path(item["dir"]).name), item["dir"],
+                                         dict(item.get("names", {}))))
+        return cls(trees, float(document.get("similarity", DEFAULT_SIMILARITY)))
+
+
+def normalize_path(relative: str) -> str:
+    return "/".join(ORDERING_CODE.sub("", part) for part in relative.split("/"))
+
+
+class TranslationState:
+    """ファイルの対応と節ごとの同期記録（JSON）
+
+    files:    翻訳の相対パス → {"source", "method", "score", "digests": [原文, 翻訳]}
+    sections: 翻訳の相対パス → {節ID → {"source", "target", "synced", "changed"}}
+    results:  翻訳の相対パス → 前回の節の判定（両側とも変わっていなければ再利用）
+    """
+
+    VERSION = 1
+
+    def __init__(self, trees: Optional[Dict[str, Dict[str, Any]]] = None):
+        self.trees = trees or {}
+
+    @classmethod
+    def load(cls, path) -> "TranslationState":
+        path = Path(path)
+        if not path.exists():
+            return cls()
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                document = json.load(f)
+        except (OSError, ValueError):
+            return cls()
+        return cls(document.get("trees", {})) if document.get("version") == cls.VERSION else cls()
+
+    def save(self, path) -> None:
+        atomic_write_text(Path(path), json.dumps({"version": self.VERSION, "trees": self.trees},
+                                                 ensure_ascii=False, sort_keys=True))
+
+    def tree(self, language: str) -> Dict[str, Any]:
+        return self.trees.setdefault(language, {"files": {}, "sections": {}, "results": {}})
+
+
+def _pair_files(tree: TranslationTree, sources: Dict[str, CorpusEntry], targets: Dict[str, CorpusEntry],
+                cache: SectionCache, previous: Dict[str, Dict[str, Any]], similarity: float) -> Dict[str, Dict[str, Any]]:
+    """翻訳の相対パス → {"source", "method", "score"}（1対1）"""
+    by_path: Dict[str, str] = {}
+    by_name: Dict[str, List[str]] = {}
+    for relative in sources:
+        normalized = normalize_path(relative)
+        by_path[normalized] = relative
+        by_name.setdefault(normalized.rsplit("/", 1)[-1], []).append(relative)
+
+    pairs: Dict[str, Dict[str, Any]] = {}
+    taken = set()
+    for relative in targets:
+        mapped = tree.source_path(relative)
+        source = by_path.get(mapped)
+        method = "path"
+        if source is None:
+            candidates = by_name.get(mapped.rsplit("/", 1)[-1], [])
+            source = candidates[0] if len(candidates) == 1 else None
+            method = "name"
+        if source is not None and source not in taken:
+            pairs[relative] = {"source": source, "method": method, "score": 1.0}
+            taken.add(source)
+
+    # 前回内容で対応づけた組は、両方が現存し他の組に取られていなければ引き継ぐ
+    for relative, pair in previous.items():
+        if relative in targets and relative not in pairs and pair["method"] == "content" \
+                and pair["source"] in sources and pair["source"] not in taken:
+            pairs[relative] = {"source": pair["source"], "method": "content", "score": pair["score"]}
+            taken.add(pair["source"])
+
+    # 内容の指紋の転置インデックスで残りを対応づける
+    unmatched = [relative for relative in targets if relative not in pairs]
+    if unmatched:
+        index: Dict[str, List[str]] = {}
+        source_prints = {}
+        for relative, entry in sources.items():
+            if relative in taken:
+                continue
+            prints = source_prints[relative] = fingerprints(cache.get(entry))
+            for item in prints:
+                index.setdefault(item, []).append(relative)
+        scored = []
+        for relative in unmatched:
+            prints = fingerprints(cache.get(targets[relative]))
+            shared: Dict[str, int] = {}
+            for item in prints:
+                for source in index.get(item, ()):
+                    shared[source] = shared.get(source, 0) + 1
+            for source, count in shared.items():
+                score = count / (len(prints) + len(source_prints[source]) - count)
+                if score >= similarity:
+                    scored.append((score, relative, source))
+        for score, relative, source in sorted(scored, key=lambda item: (-item[0], item[1], item[2])):
+            if relative not in pairs and source not in taken:
+                pairs[relative] = {"source": source, "method": "content", "score": round(score, 4)}
+                taken.add(source)
+    return pairs
+
+
+def _judge_sections(source_sections: Tuple[Section, ...], target_sections: Tuple[Section, ...],
+                    records: Dict[str, Dict[str, Any]], now: str) -> Dict[str, Any]:
+    """節を対応づけて同期記録と照合し、records を更新して判定を返す"""
+    ids = section_ids(target_sections)
+    counts = {status: 0 for status in STATUSES}
+    stale = []
+    untranslated = []
+    orphaned = 0
+    current = {}
+    for source_index, target_index in align_sections(source_sections, target_sections):
+        if target_index is None:
+            section = source_sections[source_index]
+            untranslated.append([section.title, section.line])
+            continue
+        if source_index is None:
+            orphaned += 1
+            continue
+        source, target = source_sections[source_index], target_sections[target_index]
+        section_id = ids[target_index]
+        record = records.get(section_id)
+        if record is None:
+            status = "baseline"
+            record = {"source": source.digest, "target": target.digest, "synced": now, "changed": None}
+        elif record["target"] != target.digest:
+            status = "updated"
+            record = {"source": source.digest, "target": target.digest, "synced": now, "changed": None}
+        elif record["source"] != source.digest:
+            status = "stale"
+            record = dict(record, changed=record["changed"] or now)
+            stale.append([section_id, source.line, target.line, record["synced"], record["changed"]])
+        else:
+            status = "fresh"
+        counts[status] += 1
+        current[section_id] = record
+    records.clear()
+    records.update(current)
+    return {"counts": counts, "stale": stale, "untranslated": untranslated, "orphaned": orphaned}
+
+
+def translation_status(corpus: Corpus, config: TranslationConfig, state: TranslationState,
+                       cache: SectionCache, now: str) -> Dict[str, Any]:
+    """翻訳ツリーごとのファイル・節の対応と鮮度（state は更新される）"""
+    corpus.ensure_scanned()
+    sources = {corpus.relative_path(entry): entry for entry in corpus}
+    report: Dict[str, Any] = {}
+    for tree in config.trees:
+        translated = Corpus(tree.directory)
+        translated.scan()
+        targets = {translated.relative_path(entry): entry for entry in sorted(translated, key=lambda e: e.key)}
+        recorded = state.tree(tree.language)
+        pairs = _pair_files(tree, sources, targets, cache, recorded["files"], config.similarity)
+
+        counts = {status: 0 for status in STATUSES}
+        untranslated_sections = orphaned_sections = aligned = reused = 0
+        stale = []
+        files: Dict[str, Dict[str, Any]] = {}
+        results: Dict[str, Dict[str, Any]] = {}
+        for relative, pair in sorted(pairs.items()):
+            source_entry, target_entry = sources[pair["source"]], targets[relative]
+            digests = [source_entry.digest, target_entry.digest]
+            previous_pair = recorded["files"].get(relative)
+            result = recorded["results"].get(relative)
+            if previous_pair and previous_pair["source"] != pair["source"]:
+                # 対応先の原文が変わった場合は同期記録を捨てて基準を取り直す
+                recorded["sections"].pop(relative, None)
+            if previous_pair and previous_pair["source"] == pair["source"] and \
+                    previous_pair.get("digests") == digests and result is not None:
+                reused += 1
+                # 前回 baseline / updated と判定した節は、変わっていなければ fresh
+                result = dict(result, counts={**result["counts"],
+                                              "fresh": result["counts"]["fresh"] + result["counts"]["baseline"] +
+                                              result["counts"]["updated"], "baseline": 0, "updated": 0})
+            else:
+                aligned += 1
+                result = _judge_sections(cache.get(source_entry), cache.get(target_entry),
+                                         recorded["sections"].setdefault(relative, {}), now)
+            results[relative] = result
+            files[relative] = dict(pair, digests=digests)
+            for status, count in result["counts"].items():
+                counts[status] += count
+            untranslated_sections += len(result["untranslated"])
+            orphaned_sections += result["orphaned"]
+            for section_id, source_line, target_line, synced, changed in result["stale"]:
+                stale.append({"source": pair["source"], "target": relative, "section": section_id,
+                              "source_line": source_line, "target_line": target_line,
+                              "synced": synced, "changed": changed})
+
+        recorded["files"] = files
+        recorded["results"] = results
+        recorded["sections"] = {relative: records for relative, records in recorded["sections"].items()
+                                if relative in files}
+        methods = {"path": 0, "name": 0, "content": 0}
+        for pair in pairs.values():
+            methods[pair["method"]] += 1
+        paired_sources = {pair["source"] for pair in pairs.values()}
+        report[tree.language] = {
+            "directory": tree.directory,
+            "files": {
+                "sources": len(sources),
+                "translations": len(targets),
+                "paired": len(pairs),
+                "methods": methods,
+                "untranslated": sorted(relative for relative in sources if relative not in paired_sources),
+                "orphaned": sorted(relative for relative in targets if relative not in pairs),
+            },
+            "sections": dict(counts, untranslated=untranslated_sections, orphaned=orphaned_sections),
+            "aligned": aligned,
+            "reused": reused,
+            "stale": stale,
+            "pairs": [{"source": pair["source"], "target": relative, "method": pair["method"], "score": pair["score"],
+                       "stale": len(results[relative]["stale"]),
+                       "untranslated_sections": len(results[relative]["untranslated"])}
+                      for relative, pair in sorted(pairs.items())],
+        }
+    return report
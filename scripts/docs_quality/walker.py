@@ -0,0 +1,204 @@
+# -*- coding: utf-8 -*-
+
+"""
+除外ルールつきディレクトリ走査
+作成日: 2026-10-19
+目的: Path.glob("**/*.md") の全ディレクトリ列挙を、除外ディレクトリへ降りない os.scandir 走査に置き換える
+
+- 除外（exclude・無視ファイル）は .gitignore と同じ書式:
+  `#` コメント、`!` で再包含、末尾 `/` はディレクトリのみ、`/` を含むパターンは無視ファイルの場所からの相対、
+  含まないパターンは任意の階層の名前に一致。`**` は0個以上のディレクトリ
+- 除外されたディレクトリには降りない（git と同様、配下のファイルを `!` で再包含することはできない）
+- 各ディレクトリの無視ファイル（.gitignore / .docsignore）は、そのディレクトリ以下に適用する
+- 包含（include）は走査ルートからの相対パスに対するグロブ（既定 `**/*.md`）
+- 列挙順は名前順の深さ優先で、sorted(Path.glob(...)) と同じ順序になる
+- サイズ・更新時刻は DirEntry.stat() から取り、同じファイルを改めて stat しない
+"""
+
+import os
+import re
+from pathlib import Path
+from typing import Iterable, Iterator, List, NamedTuple, Optional, Sequence
+
+IGNORE_FILES = (".gitignore", ".docsignore")
+# ドキュメントを含まない生成物・依存・バックアップ（常に除外）
+DEFAULT_EXCLUDES = (
+    ".git/",
+    "node_modules/",
+    "__pycache__/",
+    "quality-reports/",
+    "docs_*_backup_*/",
+)
+
+
+def glob_to_regex(pattern: str) -> str:
+    """グロブ（`*` `?` `[...]` `**`）を、`/` 区切りのパス全体に一致させる正規表現へ変換"""
+    out = []
+    i = 0
+    while i < len(pattern):
+        if pattern.startswith("**/", i):
+            out.append("(?:.*/)?")
+            i += 3
+        elif pattern.startswith("**", i):
+            out.append(".*")
+            i += 2
+        elif pattern[i] == "*":
+            out.append("[^/]*")
+            i += 1
+        elif pattern[i] == "?":
+            out.append("[^/]")
+            i += 1
+        elif pattern[i] == "[":
+            end = pattern.find("]", i + 2)
+            if end < 0:
+                out.append(re.escape("["))
+                i += 1
+                continue
+            body = pattern[i + 1:end]
+            if body.startswith("!"):
+                body = "^" + body[1:]
+            out.append("[" + body.replace("\\", "\\\\") + "]")
+            i = end + 1
+        else:
+            out.append(re.escape(pattern[i]))
+            i += 1
+    return "".join(out)
+
+
+class IgnoreRule(NamedTuple):
+    regex: "re.Pattern"
+    negated: bool
+    directory_only: bool
+
+
+class IgnoreRules:
+    """1つの無視ファイル（または除外パターン列）のルール。base は走査ルートからの相対ディレクトリ"""
+
+    def __init__(self, patterns: Iterable[str], base: str = ""):
+        self.base = base
+        self.rules: List[IgnoreRule] = []
+        for line in patterns:
+            rule = self._parse(line)
+            if rule is not None:
+                self.rules.append(rule)
+
+    @staticmethod
+    def _parse(line: str) -> Optional[IgnoreRule]:
+        line = line.rstrip("\n").rstrip()
+        if not line or line.startswith("#"):
+            return None
+        negated = line.startswith("!")
+        if negated:
+            line = line[1:]
+        line = line.replace("\\#", "#").replace("\\!", "!")
+        directory_only = line.endswith("/")
+        line = line.rstrip("/")
+        if not line:
+            return None
+        anchored = "/" in line
+        body = glob_to_regex(line.lstrip("/"))
+        regex = re.compile(body if anchored else "(?:.*/)?" + body)
+        return IgnoreRule(regex, negated, directory_only)
+
+    @classmethod
+    def from_file(cls, path: Path, base: str = "") -> Optional["IgnoreRules"]:
+        try:
+            text = path.read_text(encoding="utf-8", errors="replace")
+        except OSError:
+            return None
+        rules = cls(text.splitlines(), base)
+        return rules if rules.rules else None
+
+    def match(self, relative: str, is_dir: bool) -> Optional[bool]:
+        """一致したルールのうち最後のものが除外なら True、再包含なら False、一致なしは None"""
+        if self.base:
+            relative = relative[len(self.base) + 1:]
+        result = None
+        for rule in self.rules:
+            if rule.directory_only and not is_dir:
+                continue
+            if rule.regex.fullmatch(relative):
+                result = not rule.negated
+        return result
+
+
+class WalkEntry(NamedTuple):
+    path: Path
+    relative: str
+    size: int
+    mtime_ns: int
+
+
+class Walker:
+    """除外ディレクトリを枝刈りする os.scandir 走査
+
+        for item in Walker("docs", exclude=["legacy/"]).files():
+            item.path, item.relative, item.size, item.mtime_ns
+    """
+
+    def __init__(self, root, include: Sequence[str] = ("**/*.md",), exclude: Sequence[str] = (),
+                 ignore_files: Sequence[str] = IGNORE_FILES, default_excludes: bool = True):
+        self.root = Path(root)
+        self.include = [re.compile(glob_to_regex(pattern)) for pattern in include]
+        self.ignore_files = tuple(ignore_files)
+        self.rules: List[IgnoreRules] = []
+        if default_excludes:
+            self.rules.append(IgnoreRules(DEFAULT_EXCLUDES))
+        if exclude:
+            self.rules.append(IgnoreRules(exclude))
+        self.directories = 0
+        self.pruned = 0
+
+    def _ignored(self, relative: str, is_dir: bool, rules: Sequence[IgnoreRules]) -> bool:
+        ignored = False
+        for rule_set in rules:
+            result = rule_set.match(relative, is_dir)
+            if result is not None:
+                ignored = result
+        return ignored
+
+    def _included(self, relative: str) -> bool:
+        return any(pattern.fullmatch(relative) for pattern in self.include)
+
+    def files(self) -> Iterator[WalkEntry]:
+        """包含パターンに一致し、除外されていないファイル（名前順の深さ優先）"""
+        yield from self._walk(str(self.root), "", self.rules)
+
+    def _walk(self, directory: str, relative_dir: str, rules: List[IgnoreRules]) -> Iterator[WalkEntry]:
+        self.directories += 1
+        try:
+            with os.scandir(directory) as it:
+                entries = sorted(it, key=lambda entry: entry.name)
+        except OSError:
+            return
+
+        names = {entry.name for entry in entries}
+        local = [IgnoreRules.from_file(Path(directory, name), relative_dir)
+                 for name in self.ignore_files if name in names]
+        if any(local):
+            rules = rules + [rule_set for rule_set in local if rule_set]
+
+        for entry in entries:
+            relative = f"{relative_dir}/{entry.name}" if relative_dir else entry.name
+            try:
+                is_dir = entry.is_dir(follow_symlinks=False)
+            except OSError:
+                continue
+            if self._ignored(relative, is_dir, rules):
+                if is_dir:
+                    self.pruned += 1
+                continue
+            if is_dir:
+                yield from self._walk(entry.path, relative, rules)
+            elif self._included(relative):
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                if entry.is_file():
+                    yield WalkEntry(Path(entry.path), relative, stat.st_size, stat.st_mtime_ns)
+
+
+def relative_files(root, include: Sequence[str] = ("**",), exclude: Sequence[str] = ()) -> List[str]:
+    """走査ルートからの相対パス一覧（ファイル移動計画等、内容を読まない用途）"""
+    return [item.relative for item in Walker(root, include=include, exclude=exclude).files()]
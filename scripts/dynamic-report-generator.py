@@ -12,21 +12,144 @@ import os
 import sys
 import datetime
 import glob
+import posixpath
 from pathlib import Path
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional, Tuple
 import argparse
 
+from docs_quality.corpus import Corpus, CorpusEntry
+from docs_quality.fsutil import atomic_write_text
+from docs_quality.retention import ReportIndex, summarize_report
+from docs_quality.sharding import (ShardError, ShardSpec, load_partials, merge_counts, merge_disjoint,
+                                   write_partial)
+from docs_quality.sampling import SampleSpec, StratifiedSampler, population_of
+from docs_quality.stats import ROOT, DirectoryRollup, StreamingStats
+from docs_quality.tokenizer import count_words
+
+NAMING_PATTERNS = ["numbered", "hyphenated", "underscore", "simple"]
+# ファイルサイズのヒストグラム幅（バイト）
+SIZE_BIN_WIDTH = 1024
+# content_analysis の合計値 → ファイル別メトリクス
+CONTENT_TOTALS = {
+    "total_lines": "lines",
+    "total_words": "words",
+    "total_headers": "headers",
+    "total_links": "links",
+    "total_images": "images",
+    "total_code_blocks": "code_blocks",
+    "total_tables": "tables",
+}
+
+
+def size_stats() -> StreamingStats:
+    return StreamingStats(scale=1, bin_width=SIZE_BIN_WIDTH)
+
+
 class DynamicReportGenerator:
-    def __init__(self, docs_dir: str = "docs", output_dir: str = "docs/quality-reports"):
+    def __init__(self, docs_dir: str = "docs", output_dir: str = "docs/quality-reports",
+                 corpus: Optional[Corpus] = None):
         self.docs_dir = Path(docs_dir)
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(exist_ok=True)
         self.timestamp = datetime.datetime.now()
 
+        # AIQualityAnalyzer とコーパスを共有できる（常駐サービスモード）
+        self.corpus = corpus if corpus is not None else Corpus(self.docs_dir)
+
     def generate_comprehensive_report(self) -> Dict[str, Any]:
-        """包括的レポート生成"""
+        """包括的レポート生成（単一ノードも部分結果のマージを経由）"""
         print("🔍 包括的分析開始...")
 
+        self.corpus.ensure_scanned()
+        return self.finalize(self.merge_partials([self.build_partial()]))
+
+    def build_partial(self) -> Dict[str, Any]:
+        """マージ可能な部分結果（件数・合計・ヒストグラム・ディレクトリ別集計・ファイル別スコア）"""
+        return {
+            "files": self._collect_files(),
+            "content": self._collect_content(),
+            "structure": self._collect_structure(),
+        }
+
+    def generate_sampled_report(self, spec: SampleSpec) -> Dict[str, Any]:
+        """層化サンプリングによる概算レポート
+
+        ファイル構造・ディレクトリ構造は stat のみで分かるため母集団全体から集計し、
+        読み込みが必要なコンテンツ分析のみ標本から推定する（要求精度に達した時点で打ち切り）。
+        """
+        print("🎲 サンプリング分析開始...")
+
+        stats = self.corpus.stat_files()
+        sampler = StratifiedSampler(spec, population_of(stats, self.docs_dir), metric="quality_score")
+        metrics: Dict[str, Dict[str, float]] = {}
+        for batch in sampler:
+            for key in batch:
+                entry = self.corpus.read(*stats[key])
+                if entry is None:
+                    continue
+                self.corpus.store(entry)
+                file_metrics = self._file_metrics(entry)
+                if file_metrics is not None:
+                    metrics[key] = file_metrics
+                    sampler.observe(key, file_metrics)
+            estimate = sampler.estimate("quality_score")
+            print(f"🎲 {sampler.sampled}/{sampler.population}件: 品質スコア {estimate.mean:.2f} ± {estimate.half_width:.2f}")
+        self.corpus.finish_scan(list(metrics), [])
+
+        population = [(key, file, size) for key, (file, size, _) in stats.items()]
+        report = self.finalize(self.merge_partials([{
+            "files": self._collect_files(population),
+            "content": self._collect_content(metrics),
+            "structure": self._collect_structure(population),
+        }]))
+        self._apply_sample_estimates(report, sampler)
+        return report
+
+    def _apply_sample_estimates(self, report: Dict[str, Any], sampler: StratifiedSampler) -> None:
+        """合計値・平均品質スコアを母集団の推定値（信頼区間つき）に置き換える。quality_scores は標本のみ"""
+        content = report["content_analysis"]
+        average = sampler.estimate("quality_score")
+        totals = {total: sampler.estimate(metric).scaled(sampler.population) for total, metric in CONTENT_TOTALS.items()}
+        content.update({total: round(estimate.mean) for total, estimate in totals.items()})
+        content["average_quality_score"] = round(average.mean, 2)
+        content["sampled_files"] = len(content["quality_scores"])
+        content["confidence_intervals"] = {
+            "average_quality_score": average.to_dict(),
+            **{total: estimate.to_dict(digits=0) for total, estimate in totals.items()},
+        }
+        report["metadata"]["analysis_scope"] = "sampled"
+        report["metadata"]["sampling"] = sampler.summary()
+
+    def merge_partials(self, partials: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """シャードごとの部分結果を1つに統合"""
+        merged = {
+            "files": {"sizes": size_stats(), "directories": {}, "rollup": DirectoryRollup(size_stats)},
+            "content": {"totals": {}, "quality_scores": {}},
+            "structure": {"depth_distribution": {}, "naming_patterns": {}},
+        }
+        files = merged["files"]
+        for partial in partials:
+            part = partial["files"]
+            files["sizes"].merge(StreamingStats.from_state(part["sizes"]))
+            files["rollup"].merge(DirectoryRollup.from_state(part["rollup"], size_stats))
+            for directory, direct in part["directories"].items():
+                current = files["directories"].setdefault(directory, {"count": 0, "total_size": 0, "files": []})
+                current["count"] += direct["count"]
+                current["total_size"] += direct["total_size"]
+                current["files"].extend(direct["files"])
+
+            merge_counts(merged["content"]["totals"], partial["content"]["totals"])
+            merge_disjoint(merged["content"]["quality_scores"], partial["content"]["quality_scores"], "quality_scores")
+            merge_counts(merged["structure"]["depth_distribution"],
+                         {int(depth): count for depth, count in partial["structure"]["depth_distribution"].items()})
+            merge_counts(merged["structure"]["naming_patterns"], partial["structure"]["naming_patterns"])
+
+        for direct in files["directories"].values():
+            direct["files"].sort()
+        return merged
+
+    def finalize(self, partial: Dict[str, Any]) -> Dict[str, Any]:
+        """統合済みの部分結果から最終レポートを作成"""
         report = {
             "metadata": {
                 "timestamp": self.timestamp.isoformat(),
@@ -34,9 +157,9 @@ class DynamicReportGenerator:
                 "docs_directory": str(self.docs_dir),
                 "analysis_scope": "comprehensive"
             },
-            "file_analysis": self._analyze_files(),
-            "content_analysis": self._analyze_content(),
-            "structure_analysis": self._analyze_structure(),
+            "file_analysis": self._analyze_files(partial["files"]),
+            "content_analysis": self._analyze_content(partial["content"]),
+            "structure_analysis": self._analyze_structure(partial["structure"]),
             "trend_analysis": self._analyze_trends(),
             "recommendations": self._generate_recommendations(),
             "dashboard_data": self._generate_dashboard_data()
@@ -44,89 +167,129 @@ class DynamicReportGenerator:
 
         return report
 
-    def _analyze_files(self) -> Dict[str, Any]:
-        """ファイル分析"""
+    def _file_records(self) -> List[Tuple[str, Path, int]]:
+        """(キー, パス, サイズ)"""
+        return [(entry.key, entry.path, entry.size) for entry in self.corpus]
+
+    def _collect_files(self, records: Optional[List[Tuple[str, Path, int]]] = None) -> Dict[str, Any]:
+        """ファイル集計（部分結果）"""
         print("📂 ファイル構造分析...")
 
-        md_files = list(self.docs_dir.glob("**/*.md"))
-        total_files = len(md_files)
+        sizes = size_stats()
+        rollup = DirectoryRollup(size_stats)
+
+        # ディレクトリ直下のファイル（キーは docs ルートからの相対パス、ファイルは並べ替え用のキー付きで保持）
+        directories: Dict[str, Dict[str, Any]] = {}
+        for key, path, size in records if records is not None else self._file_records():
+            relative_path = path.relative_to(self.docs_dir).as_posix()
+            directory = posixpath.dirname(relative_path) or ROOT
+            direct = directories.setdefault(directory, {"count": 0, "total_size": 0, "files": []})
+            direct["count"] += 1
+            direct["files"].append([key, path.name])
+            direct["total_size"] += size
+            sizes.add(size)
+            rollup.add(relative_path, size)
 
-        # ディレクトリ別分析
-        dir_analysis = {}
-        for file in md_files:
-            dir_name = file.parent.name
-            if dir_name not in dir_analysis:
-                dir_analysis[dir_name] = {"count": 0, "files": [], "total_size": 0}
+        return {
+            "sizes": sizes.state(),
+            "directories": directories,
+            "rollup": rollup.state(),
+        }
 
-            dir_analysis[dir_name]["count"] += 1
-            dir_analysis[dir_name]["files"].append(file.name)
-            dir_analysis[dir_name]["total_size"] += file.stat().st_size
+    def _analyze_files(self, files: Dict[str, Any]) -> Dict[str, Any]:
+        """ファイル分析"""
+        sizes = files["sizes"]
+        total_files = sizes.count
+
+        # ディレクトリ別分析（相対パス順。直下のファイルと、配下全体のサイズ統計）
+        dir_analysis = {}
+        subtrees = files["rollup"].summary(digits=0)
+        for directory, subtree in subtrees.items():
+            direct = files["directories"].get(directory, {"count": 0, "total_size": 0, "files": []})
+            dir_analysis[directory] = {
+                "count": direct["count"],
+                "files": [name for _, name in direct["files"]],
+                "total_size": direct["total_size"],
+                "subtree": subtree,
+            }
 
         # ファイルサイズ分析
-        file_sizes = [f.stat().st_size for f in md_files]
-        avg_size = sum(file_sizes) / len(file_sizes) if file_sizes else 0
+        size_summary = sizes.summary(digits=0)
 
         return {
             "total_files": total_files,
-            "directories": len(dir_analysis),
+            "directories": len(files["directories"]),
             "directory_analysis": dir_analysis,
             "size_statistics": {
-                "average_size": round(avg_size),
-                "total_size": sum(file_sizes),
-                "largest_file": max(file_sizes) if file_sizes else 0,
-                "smallest_file": min(file_sizes) if file_sizes else 0
+                "average_size": round(sizes.moments.mean),
+                "total_size": sizes.moments.total,
+                "largest_file": sizes.moments.maximum or 0,
+                "smallest_file": sizes.moments.minimum or 0,
+                "stddev": size_summary["stddev"],
+                "percentiles": {key: size_summary[key] for key in ("p50", "p90", "p99")},
+                "histogram": size_summary["histogram"]
             }
         }
 
-    def _analyze_content(self) -> Dict[str, Any]:
-        """コンテンツ分析"""
+    def _collect_content(self, metrics: Optional[Dict[str, Dict[str, float]]] = None) -> Dict[str, Any]:
+        """コンテンツ集計（部分結果）。metrics はサンプリング時に計測済みのファイル別メトリクス"""
         print("📝 コンテンツ品質分析...")
 
-        md_files = list(self.docs_dir.glob("**/*.md"))
-        content_metrics = {
-            "total_lines": 0,
-            "total_words": 0,
-            "total_headers": 0,
-            "total_links": 0,
-            "total_images": 0,
-            "total_code_blocks": 0,
-            "total_tables": 0,
-            "language_distribution": {},
-            "quality_scores": {}
-        }
+        if metrics is None:
+            metrics = {}
+            for entry in self.corpus:
+                file_metrics = self._file_metrics(entry)
+                if file_metrics is not None:
+                    metrics[entry.key] = file_metrics
+
+        totals = {total: 0 for total in CONTENT_TOTALS}
+        quality_scores = {}
+        for key, file_metrics in metrics.items():
+            for total, metric in CONTENT_TOTALS.items():
+                totals[total] += file_metrics[metric]
+            quality_scores[key] = file_metrics["quality_score"]
+
+        return {"totals": totals, "quality_scores": quality_scores}
+
+    def _file_metrics(self, entry: CorpusEntry) -> Optional[Dict[str, float]]:
+        """1ファイルのメトリクスと品質スコア"""
+        try:
+            content = entry.content
+            lines = content.split('\n')
+            words = count_words(content)
+
+            # メトリクス計算
+            headers = len([line for line in lines if line.strip().startswith('#')])
+            links = content.count('](')
+            images = content.count('![')
+            code_blocks = content.count('```')
+            tables = len([line for line in lines if '|' in line and line.strip().startswith('|')])
+
+            return {
+                "lines": len(lines),
+                "words": words,
+                "headers": headers,
+                "links": links,
+                "images": images,
+                "code_blocks": code_blocks,
+                "tables": tables,
+                # 品質スコア計算
+                "quality_score": self._calculate_quality_score(
+                    lines, words, headers, links, images, code_blocks, tables
+                ),
+            }
 
-        for file in md_files:
-            try:
-                with open(file, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                    lines = content.split('\n')
-                    words = len(content.split())
-
-                    # メトリクス計算
-                    headers = len([line for line in lines if line.strip().startswith('#')])
-                    links = content.count('](')
-                    images = content.count('![')
-                    code_blocks = content.count('```')
-                    tables = len([line for line in lines if '|' in line and line.strip().startswith('|')])
-
-                    content_metrics["total_lines"] += len(lines)
-                    content_metrics["total_words"] += words
-                    content_metrics["total_headers"] += headers
-                    content_metrics["total_links"] += links
-                    content_metrics["total_images"] += images
-                    content_metrics["total_code_blocks"] += code_blocks
-                    content_metrics["total_tables"] += tables
-
-                    # 品質スコア計算
-                    quality_score = self._calculate_quality_score(
-                        lines, words, headers, links, images, code_blocks, tables
-                    )
-                    content_metrics["quality_scores"][str(file)] = quality_score
-
-            except Exception as e:
-                print(f"⚠️ ファイル読み込みエラー {file}: {e}")
-
-        # 平均品質スコア
+        except Exception as e:
+            print(f"⚠️ ファイル分析エラー {entry.path}: {e}")
+            return None
+
+    def _analyze_content(self, content: Dict[str, Any]) -> Dict[str, Any]:
+        """コンテンツ分析"""
+        content_metrics = dict(content["totals"])
+        content_metrics["language_distribution"] = {}
+        content_metrics["quality_scores"] = {key: content["quality_scores"][key] for key in sorted(content["quality_scores"])}
+
+        # 平均品質スコア（パス順に合計するため、シャード数によらず同じ値）
         scores = list(content_metrics["quality_scores"].values())
         avg_quality = sum(scores) / len(scores) if scores else 0
         content_metrics["average_quality_score"] = round(avg_quality, 2)
@@ -161,24 +324,18 @@ class DynamicReportGenerator:
 
         return min(score, 100)
 
-    def _analyze_structure(self) -> Dict[str, Any]:
-        """構造分析"""
+    def _collect_structure(self, records: Optional[List[Tuple[str, Path, int]]] = None) -> Dict[str, Any]:
+        """構造集計（部分結果）"""
         print("🏗️ ドキュメント構造分析...")
 
-        md_files = list(self.docs_dir.glob("**/*.md"))
-        structure_analysis = {
-            "depth_distribution": {},
-            "naming_patterns": {},
-            "cross_references": {},
-            "orphaned_files": [],
-            "hub_files": []
-        }
+        md_files = [path for _, path, _ in (records if records is not None else self._file_records())]
+        depth_distribution: Dict[int, int] = {}
+        naming_patterns: Dict[str, int] = {}
 
         # ディレクトリ深度分析
         for file in md_files:
             depth = len(file.parts) - len(self.docs_dir.parts)
-            structure_analysis["depth_distribution"][depth] = \
-                structure_analysis["depth_distribution"].get(depth, 0) + 1
+            depth_distribution[depth] = depth_distribution.get(depth, 0) + 1
 
         # 命名パターン分析
         for file in md_files:
@@ -192,17 +349,31 @@ class DynamicReportGenerator:
             else:
                 pattern = "simple"
 
-            structure_analysis["naming_patterns"][pattern] = \
-                structure_analysis["naming_patterns"].get(pattern, 0) + 1
+            naming_patterns[pattern] = naming_patterns.get(pattern, 0) + 1
 
-        return structure_analysis
+        return {"depth_distribution": depth_distribution, "naming_patterns": naming_patterns}
+
+    def _analyze_structure(self, structure: Dict[str, Any]) -> Dict[str, Any]:
+        """構造分析"""
+        return {
+            "depth_distribution": dict(sorted(structure["depth_distribution"].items())),
+            "naming_patterns": {
+                pattern: structure["naming_patterns"][pattern]
+                for pattern in NAMING_PATTERNS if pattern in structure["naming_patterns"]
+            },
+            "cross_references": {},
+            "orphaned_files": [],
+            "hub_files": []
+        }
 
     def _analyze_trends(self) -> Dict[str, Any]:
         """トレンド分析"""
         print("📈 トレンド分析...")
 
-        # 過去のレポートファイルを検索
-        report_files = list(self.output_dir.glob("advanced-quality-*.json"))
+        # 過去のレポートはインデックスから参照（レポートファイル自体は読まない）
+        index = ReportIndex(self.output_dir)
+        if not index.exists():
+            index.sync()
 
         trends = {
             "historical_data": [],
@@ -211,19 +382,13 @@ class DynamicReportGenerator:
             "improvement_rate": 0
         }
 
-        # 過去のデータから傾向分析
-        for report_file in sorted(report_files)[-5:]:  # 最新5件
-            try:
-                with open(report_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    trends["historical_data"].append({
-                        "timestamp": data.get("timestamp"),
-                        "quality_score": data.get("summary", {}).get("quality_score", 0),
-                        "total_issues": data.get("summary", {}).get("total_issues", 0),
-                        "auto_fixed": data.get("summary", {}).get("auto_fixed", 0)
-                    })
-            except Exception as e:
-                print(f"⚠️ トレンド分析エラー {report_file}: {e}")
+        for report in index.history("advanced-quality", limit=5):  # 最新5件
+            trends["historical_data"].append({
+                "timestamp": report["timestamp"],
+                "quality_score": report["summary"].get("quality_score", 0),
+                "total_issues": report["summary"].get("total_issues", 0),
+                "auto_fixed": report["summary"].get("auto_fixed", 0)
+            })
 
         # 傾向判定
         if len(trends["historical_data"]) >= 2:
@@ -429,8 +594,19 @@ class DynamicReportGenerator:
 def main():
     parser = argparse.ArgumentParser(description='WebSys Dynamic Report Generator')
     parser.add_argument('--docs-dir', default='docs', help='ドキュメントディレクトリ')
+    parser.add_argument('--exclude', action='append', default=[], metavar='PATTERN',
+                        help='対象外とするパス（.gitignore 形式、複数指定可。例: legacy/）')
     parser.add_argument('--output-dir', default='docs/quality-reports', help='出力ディレクトリ')
     parser.add_argument('--format', choices=['json', 'html', 'both'], default='both', help='出力形式')
+    parser.add_argument('--shard', help='分散分析の担当シャード（i/N、i は 1 始まり）。部分結果のみ出力')
+    parser.add_argument('--partial-out', help='部分結果の出力先（--shard時、既定: <output-dir>/partials/dynamic-report-<i>-of-<N>.json）')
+    parser.add_argument('--merge', nargs='+', metavar='PARTIAL', help='全シャードの部分結果をマージして最終レポートを出力')
+    parser.add_argument('--sample', action='store_true', help='層化サンプリングによる概算レポート（信頼区間つき、要求精度で打ち切り）')
+    parser.add_argument('--sample-precision', type=float, default=1.0, help='平均品質スコアの信頼区間の半幅（点、--sample時）')
+    parser.add_argument('--sample-confidence', type=float, default=0.95, help='信頼水準（--sample時）')
+    parser.add_argument('--sample-seed', type=int, default=0, help='抽出順の乱数シード（--sample時）')
+    parser.add_argument('--sample-batch', type=int, default=64, help='精度判定ごとの分析件数（--sample時）')
+    parser.add_argument('--sample-max', type=int, help='分析件数の上限（--sample時）')
 
     args = parser.parse_args()
 
@@ -440,30 +616,75 @@ def main():
     print(f"出力形式: {args.format}")
     print()
 
-    generator = DynamicReportGenerator(args.docs_dir, args.output_dir)
-    report_data = generator.generate_comprehensive_report()
+    try:
+        shard = ShardSpec.parse(args.shard) if args.shard else None
+        sample = SampleSpec(seed=args.sample_seed, precision=args.sample_precision, confidence=args.sample_confidence,
+                            batch_size=args.sample_batch, max_files=args.sample_max) if args.sample else None
+    except (ShardError, ValueError) as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    if sample and (shard or args.merge):
+        print("❌ --sample は --shard / --merge と同時に指定できません")
+        sys.exit(1)
+
+    generator = DynamicReportGenerator(args.docs_dir, args.output_dir, corpus=Corpus(args.docs_dir, shard=shard, exclude=args.exclude))
+
+    if shard:
+        print(f"🧩 シャード {shard} を分析")
+        generator.corpus.scan()
+        partial_file = Path(args.partial_out or Path(args.output_dir) / "partials" /
+                            f"dynamic-report-{shard.index}-of-{shard.count}.json")
+        write_partial(partial_file, "dynamic-report", shard, generator.build_partial())
+        print(f"✅ 部分結果出力: {partial_file} ({len(generator.corpus)}ファイル)")
+        return
+
+    if args.merge:
+        try:
+            partials = load_partials(args.merge, "dynamic-report")
+            report_data = generator.finalize(generator.merge_partials(partials))
+        except ShardError as e:
+            print(f"❌ 部分結果のマージに失敗しました: {e}")
+            sys.exit(1)
+        print(f"🧩 {len(partials)}シャードの部分結果をマージ")
+    elif sample:
+        report_data = generator.generate_sampled_report(sample)
+    else:
+        report_data = generator.generate_comprehensive_report()
 
     timestamp = datetime.datetime.now().strftime('%Y%m%d-%H%M%S')
+    report_files = []
 
-    # JSON出力
+    # JSON出力（一時ファイル経由で書き込み、保持管理と同時実行しても書きかけを読ませない）
     if args.format in ['json', 'both']:
         json_file = Path(args.output_dir) / f"dynamic-report-{timestamp}.json"
-        with open(json_file, 'w', encoding='utf-8') as f:
-            json.dump(report_data, f, ensure_ascii=False, indent=2)
+        atomic_write_text(json_file, json.dumps(report_data, ensure_ascii=False, indent=2))
+        report_files.append(json_file.name)
         print(f"✅ JSONレポート出力: {json_file}")
 
     # HTML出力
     if args.format in ['html', 'both']:
         html_content = generator.generate_html_report(report_data)
         html_file = Path(args.output_dir) / f"dynamic-report-{timestamp}.html"
-        with open(html_file, 'w', encoding='utf-8') as f:
-            f.write(html_content)
+        atomic_write_text(html_file, html_content)
+        report_files.append(html_file.name)
         print(f"✅ HTMLレポート出力: {html_file}")
 
+    # レポートインデックスへ登録
+    ReportIndex(args.output_dir).register(
+        "dynamic-report", timestamp, report_files,
+        summarize_report("dynamic-report", report_data), report_data['metadata']['timestamp']
+    )
+
     print("\n🎉 動的レポート生成完了！")
     print(f"📊 品質スコア: {report_data['content_analysis']['average_quality_score']}/100")
     print(f"📚 対象ファイル: {report_data['file_analysis']['total_files']}件")
     print(f"📈 トレンド: {report_data['trend_analysis']['quality_trend']}")
+    if sample:
+        sampling = report_data['metadata']['sampling']
+        interval = report_data['content_analysis']['confidence_intervals']['average_quality_score']
+        print(f"🎲 サンプリング: {sampling['analyzed']}/{sampling['population']}件 ({sampling['strata']}層, "
+              f"seed {sampling['seed']}, 終了理由 {sampling['stop_reason']}) / "
+              f"品質スコア {sampling['confidence'] * 100:g}%信頼区間 {interval['low']}〜{interval['high']}")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -31,12 +31,29 @@ BROKEN_COUNT=0
 EXTERNAL_COUNT=0
 
 # Markdownファイル取得
-MARKDOWN_FILES=$(find docs -name "*.md" | sort)
+# 分析ツールと同じ走査（.gitignore / .docsignore・node_modules・バックアップを除外）。python3 がない場合は find
+if command -v python3 >/dev/null 2>&1; then
+    MARKDOWN_FILES=$(python3 scripts/docs-files.py --docs-dir docs)
+else
+    MARKDOWN_FILES=$(find docs -name "*.md" | sort)
+fi
 
 echo -e "${BLUE}📂 対象ファイル:${NC}"
 echo "$MARKDOWN_FILES" | sed 's/^/  - /'
 echo ""
 
+# 外部リンクは全ファイル分をまとめて並行検証（TTL付きキャッシュ: .quality-cache/external-links.json）
+declare -A EXTERNAL_STATUS
+if [ "$CHECK_EXTERNAL" = "true" ] && command -v python3 >/dev/null 2>&1; then
+    EXTERNAL_TSV=$(mktemp)
+    python3 scripts/docs-external-links.py --docs-dir docs --tsv "$EXTERNAL_TSV" --quiet || true
+    while IFS=$'\t' read -r state status url; do
+        [ -n "$url" ] && EXTERNAL_STATUS["$url"]="$state"
+    done < "$EXTERNAL_TSV"
+    rm -f "$EXTERNAL_TSV"
+    echo ""
+fi
+
 # 各ファイルのリンクチェック
 for file in $MARKDOWN_FILES; do
     echo -e "${BLUE}🔍 チェック中: $(basename "$file")${NC}"
@@ -53,7 +70,7 @@ for file in $MARKDOWN_FILES; do
     if [ -n "$INTERNAL_LINKS" ]; then
         while IFS= read -r link; do
             if [ -n "$link" ]; then
-                ((TOTAL_LINKS++))
+                TOTAL_LINKS=$((TOTAL_LINKS + 1))
 
                 # リンクテキストとパスを分離
                 LINK_TEXT=$(echo "$link" | sed -n 's/\[\(.*\)\](.*/\1/p')
@@ -65,7 +82,7 @@ for file in $MARKDOWN_FILES; do
                 else
                     BROKEN_LINKS+=("❌ $file → $LINK_PATH ($LINK_TEXT)")
                     echo -e "  ${RED}❌ $LINK_TEXT → $LINK_PATH${NC}"
-                    ((BROKEN_COUNT++))
+                    BROKEN_COUNT=$((BROKEN_COUNT + 1))
                 fi
             fi
         done <<< "$INTERNAL_LINKS"
@@ -75,21 +92,32 @@ for file in $MARKDOWN_FILES; do
     if [ "$CHECK_EXTERNAL" = "true" ] && [ -n "$EXTERNAL_FOUND" ]; then
         while IFS= read -r ext_link; do
             if [ -n "$ext_link" ]; then
-                ((TOTAL_LINKS++))
-                ((EXTERNAL_COUNT++))
+                TOTAL_LINKS=$((TOTAL_LINKS + 1))
+                EXTERNAL_COUNT=$((EXTERNAL_COUNT + 1))
 
                 LINK_TEXT=$(echo "$ext_link" | sed -n 's/\[\(.*\)\](.*/\1/p')
                 LINK_URL=$(echo "$ext_link" | sed -n 's/.*(\(.*\)).*/\1/p')
 
-                # 外部リンクの簡易チェック（HEADリクエスト）
-                if command -v curl >/dev/null 2>&1; then
+                LINK_STATE="${EXTERNAL_STATUS[${LINK_URL%%#*}]:-}"
+                if [ "$LINK_STATE" = "ok" ]; then
+                    EXTERNAL_LINKS+=("✅ $file → $LINK_URL ($LINK_TEXT)")
+                    echo -e "  ${GREEN}🌐 $LINK_TEXT → $(echo "$LINK_URL" | cut -c1-50)...${NC}"
+                elif [ "$LINK_STATE" = "rate_limited" ]; then
+                    EXTERNAL_LINKS+=("⚠️ $file → $LINK_URL ($LINK_TEXT) [レート制限]")
+                    echo -e "  ${YELLOW}🌐 $LINK_TEXT → $LINK_URL [レート制限]${NC}"
+                elif [ -n "$LINK_STATE" ]; then
+                    EXTERNAL_LINKS+=("❌ $file → $LINK_URL ($LINK_TEXT)")
+                    echo -e "  ${RED}🌐 $LINK_TEXT → $LINK_URL${NC}"
+                    BROKEN_COUNT=$((BROKEN_COUNT + 1))
+                # python3 がない場合の簡易チェック（HEADリクエスト）
+                elif command -v curl >/dev/null 2>&1; then
                     if curl -s --head --fail "$LINK_URL" >/dev/null 2>&1; then
                         EXTERNAL_LINKS+=("✅ $file → $LINK_URL ($LINK_TEXT)")
                         echo -e "  ${GREEN}🌐 $LINK_TEXT → $(echo "$LINK_URL" | cut -c1-50)...${NC}"
                     else
                         EXTERNAL_LINKS+=("❌ $file → $LINK_URL ($LINK_TEXT)")
                         echo -e "  ${RED}🌐 $LINK_TEXT → $LINK_URL${NC}"
-                        ((BROKEN_COUNT++))
+                        BROKEN_COUNT=$((BROKEN_COUNT + 1))
                     fi
                 else
                     EXTERNAL_LINKS+=("⚠️ $file → $LINK_URL ($LINK_TEXT) [curl未インストール]")
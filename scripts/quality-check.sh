@@ -37,7 +37,12 @@ TOTAL_FILES=0
 
 # 1. Markdownファイル存在チェック
 echo -e "${BLUE}📂 Markdownファイル検索...${NC}"
-MARKDOWN_FILES=$(find docs -name "*.md" | sort)
+# 分析ツールと同じ走査（.gitignore / .docsignore・node_modules・バックアップを除外）。python3 がない場合は find
+if command -v python3 >/dev/null 2>&1; then
+    MARKDOWN_FILES=$(python3 scripts/docs-files.py --docs-dir docs)
+else
+    MARKDOWN_FILES=$(find docs -name "*.md" | sort)
+fi
 FILE_COUNT=$(echo "$MARKDOWN_FILES" | wc -l)
 TOTAL_FILES=$FILE_COUNT
 
@@ -155,7 +160,7 @@ if [ -n "$DUPLICATE_NAMES" ]; then
         if [ -n "$dup_name" ]; then
             echo -e "${RED}❌ 重複ファイル名: $dup_name${NC}"
             echo "- 重複ファイル名: $dup_name" >> "$LOG_FILE"
-            find docs -name "$dup_name" | while IFS= read -r dup_file; do
+            awk -F/ -v name="$dup_name" '$NF == name' <<< "$MARKDOWN_FILES" | while IFS= read -r dup_file; do
                 echo "  → $dup_file"
                 echo "    → $dup_file" >> "$LOG_FILE"
             done
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+WebSys 品質レポート差分
+作成日: 2026-10-19
+目的: 2つの ai-quality レポートを比較し、ファイル単位のスコア増減と新規／解消した指摘をJSON・Markdownで出力する
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+from docs_quality.fsutil import atomic_write_text
+from docs_quality.reportdiff import ReportDiff, ReportDiffError, render_markdown
+
+
+def main():
+    parser = argparse.ArgumentParser(description='WebSys Quality Report Diff')
+    parser.add_argument('base', help='比較元のレポート（ai-quality-*.json）')
+    parser.add_argument('head', help='比較先のレポート（ai-quality-*.json）')
+    parser.add_argument('--min-delta', type=float, default=0.01, help='変化とみなすスコア差の最小値')
+    parser.add_argument('--limit', type=int, default=20, help='Markdownに載せるファイル数の上限')
+    parser.add_argument('--output', help='差分JSONの出力先')
+    parser.add_argument('--markdown', help='Markdown（PRコメント用）の出力先')
+    parser.add_argument('--fail-on-regression', action='store_true', help='平均スコアが低下した場合は終了コード1')
+
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    differ = ReportDiff(min_delta=args.min_delta)
+    try:
+        diff = differ.run(args.base, args.head)
+    except (OSError, ReportDiffError) as e:
+        print(f"❌ レポートを読み込めません: {e}")
+        sys.exit(2)
+    elapsed = time.perf_counter() - started
+
+    files = diff['files']
+    average = diff['summary']['average_score']
+    print(f"📊 平均スコア: {average['base']} → {average['head']} ({average.get('delta', 0):+})")
+    print(f"📈 改善 {files['improved']}件 / 📉 低下 {files['regressed']}件 / ➕ 追加 {len(files['added'])}件 / "
+          f"➖ 削除 {len(files['removed'])}件 / 変化なし {files['unchanged']}件")
+    print(f"⏱️ {elapsed:.2f}秒 (保留レコード最大 {differ.max_pending}件)")
+
+    if args.output:
+        atomic_write_text(Path(args.output), json.dumps(diff, ensure_ascii=False, indent=2))
+        print(f"✅ 差分JSON: {args.output}")
+    markdown = render_markdown(diff, limit=args.limit)
+    if args.markdown:
+        atomic_write_text(Path(args.markdown), markdown)
+        print(f"✅ Markdown: {args.markdown}")
+    elif not args.output:
+        print()
+        print(markdown, end="")
+
+    if args.fail_on_regression and average.get('delta', 0) < 0:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+WebSys 品質レポート保持管理
+作成日: 2026-10-19
+目的: docs/quality-reports の保持件数管理・日次/週次ロールアップ・インデックス照会
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+from docs_quality.retention import REPORT_KINDS, ReportIndex, RetentionManager, RollupStore
+
+
+def main():
+    parser = argparse.ArgumentParser(description='WebSys Quality Report Retention')
+    parser.add_argument('--output-dir', default='docs/quality-reports', help='レポートディレクトリ')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    compact_parser = subparsers.add_parser('compact', help='古いレポートをロールアップへ圧縮して削除')
+    compact_parser.add_argument('--keep', type=int, default=10, help='種別ごとに保持する最新レポート数')
+    compact_parser.add_argument('--grace', type=float, default=120, help='書き込み中とみなす更新経過秒数')
+    compact_parser.add_argument('--dry-run', action='store_true', help='削除せず対象のみ表示')
+
+    sync_parser = subparsers.add_parser('sync', help='ディレクトリ内容をインデックスへ反映')
+    sync_parser.add_argument('--grace', type=float, default=120, help='書き込み中とみなす更新経過秒数')
+
+    register_parser = subparsers.add_parser('register', help='レポートファイルをインデックスへ登録')
+    register_parser.add_argument('files', nargs='+', help='レポートファイル')
+
+    list_parser = subparsers.add_parser('list', help='保持中レポート一覧（インデックスのみ参照）')
+    list_parser.add_argument('--kind', choices=REPORT_KINDS, help='レポート種別')
+
+    trend_parser = subparsers.add_parser('trend', help='サマリー指標のトレンド（インデックス・ロールアップのみ参照）')
+    trend_parser.add_argument('--kind', choices=REPORT_KINDS, required=True, help='レポート種別')
+    trend_parser.add_argument('--period', choices=RollupStore.PERIODS, help='集計期間（指定時は圧縮済み分も含める）')
+
+    args = parser.parse_args()
+
+    if args.command == 'compact':
+        manager = RetentionManager(args.output_dir, keep=args.keep, grace_seconds=args.grace)
+        stats = manager.compact(dry_run=args.dry_run)
+        label = "（ドライラン）" if args.dry_run else ""
+        print(f"🗜️ レポート圧縮{label}: {stats['compacted']}件 → ロールアップ")
+        for kind, kind_stats in stats['kinds'].items():
+            print(f"  {kind}: 保持{kind_stats['kept']}件 / 圧縮{kind_stats['compacted']}件")
+        print(f"🧹 削除ファイル: {stats['deleted_files']}件 ({stats['freed_bytes']:,} bytes)")
+
+    elif args.command == 'sync':
+        stats = ReportIndex(args.output_dir).sync(grace_seconds=args.grace)
+        print(f"🔄 インデックス同期: 追加{stats['added']}件 / 除去{stats['removed']}件")
+
+    elif args.command == 'register':
+        index = ReportIndex(args.output_dir)
+        for file in args.files:
+            if index.register_file(Path(file)):
+                print(f"✅ 登録: {file}")
+            else:
+                print(f"⚠️ レポートファイル名ではありません: {file}", file=sys.stderr)
+
+    elif args.command == 'list':
+        for report in ReportIndex(args.output_dir).reports(args.kind):
+            print(f"{report['stamp']}  {report['kind']:<17} {', '.join(report['files'])}")
+
+    elif args.command == 'trend':
+        manager = RetentionManager(args.output_dir)
+        print(json.dumps(manager.trend(args.kind, args.period), ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+
+"""
+ページ重量分析のテスト（python -m unittest discover scripts/tests）
+"""
+
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from docs_quality.assets import AssetIndex, PageWeightAnalyzer  # noqa: E402
+from docs_quality.corpus import Corpus  # noqa: E402
+
+PNG = b"\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR\x00\x00\x00\x10\x00\x00\x00\x08" + b"\x00" * 2000
+
+
+class PageWeightTest(unittest.TestCase):
+    def _analyze(self, files, page_budget):
+        with tempfile.TemporaryDirectory() as directory:
+            for name, data in files.items():
+                Path(directory, name).write_bytes(data)
+            return PageWeightAnalyzer(Corpus(directory), AssetIndex(), page_budget=page_budget).analyze()
+
+    def test_page_without_images_is_checked_against_budget(self):
+        result = self._analyze({"long.md": ("本文" * 600).encode("utf-8"), "short.md": b"# short\n"}, 1024)
+        self.assertEqual(result["over_budget"], ["long.md"])
+        self.assertEqual(result["pages"]["short.md"]["total_bytes"], 8)
+        self.assertEqual((result["summary"]["pages"], result["summary"]["pages_with_images"]), (2, 0))
+
+    def test_image_bytes_count_once_per_page(self):
+        result = self._analyze({"a.md": b"![x](a.png)\n![y](a.png)\n", "a.png": PNG}, 2000)
+        page = result["pages"]["a.md"]
+        self.assertEqual((page["images"], page["unique_images"], page["image_bytes"]), (2, 1, len(PNG)))
+        self.assertEqual(result["over_budget"], ["a.md"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+
+"""
+チェック登録・時間予算のテスト（python -m unittest discover scripts/tests）
+"""
+
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from docs_quality.checks import CheckConfigError, CheckRegistry, CostModel  # noqa: E402
+
+
+def _registry() -> CheckRegistry:
+    registry = CheckRegistry()
+    registry.feature("text")(lambda owner, context: "")
+    registry.check("metrics", features=("text",))(lambda owner, fields, context: {})
+    registry.check("rules", checks=("metrics",), cost="moderate")(lambda owner, fields, context: {})
+    registry.check("score", checks=("metrics", "rules"))(lambda owner, fields, context: {})
+    registry.check("spelling", cost="expensive")(lambda owner, fields, context: {})
+    return registry
+
+
+class SelectTest(unittest.TestCase):
+    def test_zero_budget_keeps_required_checks(self):
+        registry = _registry()
+        names, budget = registry.select(list(registry.checks), 0.0, 100, CostModel(), required=("score",))
+        self.assertEqual(names, ["metrics", "rules", "score"])
+        self.assertEqual(budget["dropped"], ["spelling"])
+        self.assertEqual(budget["required"], ["metrics", "rules", "score"])
+
+    def test_without_required_zero_budget_selects_nothing(self):
+        registry = _registry()
+        names, _ = registry.select(list(registry.checks), 0.0, 100, CostModel())
+        self.assertEqual(names, [])
+
+    def test_required_outside_candidates_is_ignored(self):
+        registry = _registry()
+        names, _ = registry.select(["spelling"], 1000.0, 1, CostModel(), required=("score",))
+        self.assertEqual(names, ["spelling"])
+
+
+class CorpusScopeTest(unittest.TestCase):
+    def _registry(self) -> CheckRegistry:
+        registry = _registry()
+        registry.check("related", cost="moderate", outputs=("related",), scope="corpus")(
+            lambda owner, results, context: {"related": len(context["documents"])})
+        registry.check("samples", cost="expensive", outputs=("samples",), scope="corpus")(
+            lambda owner, results, context: {"samples": results["related"]})
+        return registry
+
+    def test_plan_runs_corpus_checks_once_after_file_checks(self):
+        plan = self._registry().plan(["score", "related"])
+        self.assertEqual([check.name for check in plan.checks], ["metrics", "rules", "score"])
+        self.assertEqual(plan.names, ("metrics", "rules", "score", "related"))
+        results = {}
+        counters = plan.run_corpus(None, results, {"documents": ["a.md", "b.md"]}, 2)
+        self.assertEqual(results, {"related": 2})
+        self.assertEqual(counters["checks"]["related"][0], 2)
+        self.assertEqual(plan.export_stats()["checks"]["related"][0], 2)
+
+    def test_profile_and_skip_apply_to_corpus_checks(self):
+        registry = self._registry()
+        self.assertNotIn("samples", registry.resolve("quick"))
+        self.assertNotIn("related", registry.resolve("full", exclude=("related",)))
+        _, budget = registry.select(registry.resolve("full"), 0.0, 10, CostModel(), required=("score",))
+        self.assertEqual(budget["dropped"], ["spelling", "related", "samples"])
+
+    def test_file_check_cannot_require_corpus_check(self):
+        registry = self._registry()
+        with self.assertRaises(CheckConfigError):
+            registry.check("late", checks=("related",))(lambda owner, fields, context: {})
+        with self.assertRaises(CheckConfigError):
+            registry.check("with_feature", features=("text",), scope="corpus")(lambda owner, fields, context: {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+
+"""
+外部リンクチェッカーのテスト（python -m unittest discover scripts/tests）
+"""
+
+import asyncio
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from docs_quality.linkcheck import ExternalLinkChecker  # noqa: E402
+
+LATENCY = 0.3
+
+
+async def _slow_server(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    """keep-alive で応答が LATENCY 秒遅れる HTTP サーバー"""
+    try:
+        while True:
+            request_line = await reader.readline()
+            if not request_line:
+                break
+            while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                pass
+            await asyncio.sleep(LATENCY)
+            writer.write(b"HTTP/1.1 200 OK\r\nContent-Length: 0\r\nConnection: keep-alive\r\n\r\n")
+            await writer.drain()
+    except (ConnectionError, asyncio.IncompleteReadError):
+        pass
+    finally:
+        writer.close()
+
+
+class ExternalLinkCheckerTimeoutTest(unittest.TestCase):
+    def test_queued_requests_do_not_time_out(self):
+        """同一ホストの同時実行数を超えて待たされたURLも、応答が timeout 内ならタイムアウトにしない"""
+        async def scenario():
+            server = await asyncio.start_server(_slow_server, "127.0.0.1", 0)
+            port = server.sockets[0].getsockname()[1]
+            # 16件 × 0.3秒 / 同時2件 = 待ち時間は最大約2.4秒（timeout の1秒を超える）
+            checker = ExternalLinkChecker(per_host=2, rate=0, timeout=1.0)
+            try:
+                return await checker.check_all([f"http://127.0.0.1:{port}/page/{i}" for i in range(16)])
+            finally:
+                server.close()
+                await server.wait_closed()
+
+        results = asyncio.run(scenario())
+        self.assertEqual({url: result["state"] for url, result in results.items() if result["state"] != "ok"}, {})
+
+    def test_slow_response_times_out(self):
+        async def scenario():
+            server = await asyncio.start_server(_slow_server, "127.0.0.1", 0)
+            port = server.sockets[0].getsockname()[1]
+            checker = ExternalLinkChecker(per_host=1, rate=0, timeout=LATENCY / 3)
+            try:
+                return await checker.check_all([f"http://127.0.0.1:{port}/slow"])
+            finally:
+                server.close()
+                await server.wait_closed()
+
+        results = asyncio.run(scenario())
+        self.assertEqual([result["state"] for result in results.values()], ["error"])
+        self.assertIn("タイムアウト", next(iter(results.values()))["error"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+
+"""
+ネイティブ markdownlint のテスト（python -m unittest discover scripts/tests）
+"""
+
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from docs_quality.markdownlint import MarkdownLinter  # noqa: E402
+
+
+def _md036(text: str):
+    return [violation.line for violation in MarkdownLinter().lint(text.split("\n")) if violation.rule == "MD036"]
+
+
+class MD036Test(unittest.TestCase):
+    def test_emphasis_between_blank_lines(self):
+        self.assertEqual(_md036("本文\n\n**診断**\n\n本文\n"), [3])
+
+    def test_emphasis_followed_by_fence(self):
+        self.assertEqual(_md036("本文\n\n**診断**\n```bash\nls\n```\n"), [3])
+
+    def test_emphasis_followed_by_list_or_heading(self):
+        self.assertEqual(_md036("**手順**\n- 項目\n"), [1])
+        self.assertEqual(_md036("## 見出し\n**補足**\n## 次\n"), [2])
+
+    def test_emphasis_inside_paragraph(self):
+        self.assertEqual(_md036("本文\n**診断**\n\n**診断**\n本文\n"), [])
+
+    def test_lazy_continuation_of_list_item(self):
+        self.assertEqual(_md036("- 項目\n**続き**\n"), [])
+
+    def test_count_is_stable_after_fix(self):
+        linter = MarkdownLinter()
+        text = "# タイトル\n\n本文\n\n**診断**\n```bash\nls\n```\n"
+        before = [v.rule for v in linter.lint(text.split("\n"))].count("MD036")
+        after = [v.rule for v in linter.lint(linter.fix(text).split("\n"))].count("MD036")
+        self.assertEqual((before, after), (1, 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+
+"""
+品質レポート差分のテスト（python -m unittest discover scripts/tests）
+"""
+
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from docs_quality.reportdiff import ReportDiff  # noqa: E402
+
+HEADING = "見出し構造を追加することを推奨します"
+EXAMPLE = "コード例を追加することを推奨します"
+
+
+def _report(records):
+    return {
+        "metadata": {"timestamp": "2026-10-19T00:00:00"},
+        "quality_summary": {"average_score": 70.0, "total_files": len(records)},
+        "content_analysis": records,
+        "ai_recommendations": [],
+    }
+
+
+def _legacy(score, suggestions):
+    return {"overall_score": score, "ai_analysis": {"suggestions": suggestions}}
+
+
+def _current(score, findings):
+    return {"overall_score": score, "ai_analysis": {
+        "suggestions": [message for _, message in findings],
+        "findings": [{"rule": rule, "message": message} for rule, message in findings],
+    }}
+
+
+class ReportDiffTest(unittest.TestCase):
+    def _diff(self, base, head):
+        with tempfile.TemporaryDirectory() as directory:
+            base_path, head_path = Path(directory, "base.json"), Path(directory, "head.json")
+            base_path.write_text(json.dumps(_report(base), ensure_ascii=False), encoding="utf-8")
+            head_path.write_text(json.dumps(_report(head), ensure_ascii=False), encoding="utf-8")
+            return ReportDiff().run(base_path, head_path)["files"]
+
+    def test_legacy_base_compares_suggestion_text(self):
+        files = self._diff({"a.md": _legacy(60.0, [HEADING, EXAMPLE])},
+                           {"a.md": _current(65.0, [("heading-missing", HEADING)])})
+        self.assertEqual(files["changed"][0]["new_issues"], [])
+        self.assertEqual(files["changed"][0]["resolved_issues"], [EXAMPLE])
+
+    def test_unchanged_across_formats(self):
+        files = self._diff({"a.md": _legacy(60.0, [HEADING])},
+                           {"a.md": _current(60.0, [("heading-missing", HEADING)])})
+        self.assertEqual((files["changed"], files["unchanged"]), ([], 1))
+
+    def test_current_reports_compare_rule_ids(self):
+        files = self._diff({"a.md": _current(60.0, [("heading-missing", HEADING)])},
+                           {"a.md": _current(65.0, [("code-example-missing", EXAMPLE)])})
+        self.assertEqual(files["changed"][0]["new_issues"], ["code-example-missing"])
+        self.assertEqual(files["changed"][0]["resolved_issues"], ["heading-missing"])
+
+
+if __name__ == "__main__":
+    unittest.main()
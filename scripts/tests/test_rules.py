@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+
+"""
+改善提案ルール（.docs-quality-rules.json）のテスト（python -m unittest discover scripts/tests）
+"""
+
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from docs_quality.rules import RuleEngine  # noqa: E402
+
+RULES_PATH = Path(__file__).resolve().parent.parent.parent / ".docs-quality-rules.json"
+
+
+def _features(headers: int = 1, code_blocks: int = 1, images: int = 1):
+    return {
+        "basic_metrics": {"words": 500},
+        "structure_analysis": {
+            "headers": {"total": headers},
+            "code_blocks": {"total_blocks": code_blocks},
+            "images": {"total": images},
+        },
+    }
+
+
+def _matched(features, relative_path: str = "guide.md", content: str = ""):
+    return [rule.id for rule in RuleEngine.load(RULES_PATH).evaluate(content, relative_path, features)]
+
+
+class BuiltinRulesTest(unittest.TestCase):
+    def test_heading_missing_uses_header_count(self):
+        self.assertIn("heading-missing", _matched(_features(headers=0)))
+        self.assertNotIn("heading-missing", _matched(_features(headers=2)))
+        # 本文は参照しない（コードブロック内の `# コメント` は見出しに数えない）
+        self.assertIn("heading-missing", _matched(_features(headers=0), content="```bash\n# コメント\n```\n"))
+
+    def test_code_example_missing_uses_code_block_count(self):
+        self.assertIn("code-example-missing", _matched(_features(code_blocks=0), "api.md"))
+        self.assertNotIn("code-example-missing", _matched(_features(code_blocks=1), "api.md"))
+        self.assertNotIn("code-example-missing", _matched(_features(code_blocks=0), "overview.md"))
+
+    def test_diagram_missing_uses_image_count(self):
+        self.assertIn("diagram-missing", _matched(_features(images=0)))
+        self.assertNotIn("diagram-missing", _matched(_features(images=1)))
+
+    def test_feature_only_rules_skip_text_scan(self):
+        engine = RuleEngine.load(RULES_PATH)
+        engine.evaluate("本文", "guide.md", _features(headers=0, images=0))
+        self.assertEqual(engine.export_stats()["scan"][0], 0)
+
+
+def _text_rule(rule_id: str, pattern: str, flags: str = "", present: bool = True):
+    return {"id": rule_id, "message": rule_id, "when": {"text": {"pattern": pattern, "flags": flags, "present": present}}}
+
+
+class TextScanTest(unittest.TestCase):
+    def _ids(self, rules, content):
+        return [rule.id for rule in RuleEngine({"rules": rules}).evaluate(content, "a.md", {})]
+
+    def test_overlapping_patterns_are_all_found(self):
+        rules = [_text_rule("todo", "TODO"), _text_rule("todo-fix", "TODO: fix"), _text_rule("fix", "fix"),
+                 _text_rule("absent", "XYZ", present=False), _text_rule("missing", "never-here")]
+        self.assertEqual(self._ids(rules, "前文 TODO: fix later"), ["todo", "todo-fix", "fix", "absent"])
+
+    def test_flags_are_grouped(self):
+        rules = [_text_rule("heading", "^#+ ", "m"), _text_rule("case", "todo", "i"), _text_rule("plain", "todo")]
+        self.assertEqual(self._ids(rules, "本文\n## 見出し\nTODO"), ["heading", "case"])
+
+    def test_verbose_comments_and_backreferences(self):
+        rules = [_text_rule("verbose", "foo  # コメント", "x"), _text_rule("repeat", r"(\w)\1"),
+                 _text_rule("after", "bar")]
+        self.assertEqual(self._ids(rules, "foo bar"), ["verbose", "repeat", "after"])
+        self.assertEqual(self._ids(rules, "ab"), [])
+
+    def test_one_scan_per_document(self):
+        engine = RuleEngine({"rules": [_text_rule(f"r{n}", f"word{n}") for n in range(10)]})
+        matched = engine.evaluate("word3 word7 word38", "a.md", {})
+        self.assertEqual([rule.id for rule in matched], ["r3", "r7"])
+        self.assertEqual(engine.export_stats()["scan"][0], 1)
+        self.assertEqual(engine.export_stats()["prefiltered"], 0)
+
+    def test_trigram_prefilter_for_many_rules(self):
+        engine = RuleEngine({"rules": [_text_rule(f"r{n}", f"word{n}") for n in range(80)]})
+        matched = engine.evaluate("word3 word7 word38", "a.md", {})
+        self.assertEqual([rule.id for rule in matched], ["r3", "r7", "r38"])
+        self.assertEqual(engine.export_stats()["prefiltered"], 77)
+
+if __name__ == "__main__":
+    unittest.main()
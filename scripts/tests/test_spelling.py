@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+
+"""
+スペルチェックの辞書読み込みのテスト（python -m unittest discover scripts/tests）
+"""
+
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from docs_quality import spelling  # noqa: E402
+from docs_quality.spelling import SpellChecker  # noqa: E402
+
+
+class DictionaryTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.root = Path(directory.name)
+        (self.root / "project.txt").write_text("frobnicate\n", encoding="utf-8")
+        (self.root / "words").write_text("zyzzyva\n", encoding="utf-8")
+        self.config = self.root / ".cspell.json"
+        self.config.write_text(json.dumps({"dictionaryDefinitions": [{"name": "project", "path": "project.txt"}]}),
+                               encoding="utf-8")
+        patcher = mock.patch.object(spelling, "SYSTEM_DICTIONARIES", (str(self.root / "words"),))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_system_dictionaries_are_opt_in(self):
+        checker = SpellChecker.load(self.config)
+        self.assertEqual([(item["source"], item["path"]) for item in checker.dictionaries],
+                         [("bundled", "en_base.txt"), ("config", "project.txt")])
+        self.assertEqual(checker.check("The zyzzyva and frobnicate words."), (("zyzzyva", 1, 1),))
+
+    def test_system_dictionaries_when_requested(self):
+        checker = SpellChecker.load(self.config, system_dictionaries=True)
+        self.assertEqual([item["source"] for item in checker.dictionaries], ["bundled", "system", "config"])
+        self.assertEqual(checker.check("The zyzzyva and frobnicate words."), ())
+
+
+if __name__ == "__main__":
+    unittest.main()
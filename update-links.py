@@ -6,7 +6,12 @@
 
 import os
 import re
-import glob
+import sys
+from pathlib import Path
+
+# 分析ツールと同じ走査（.gitignore / .docsignore・node_modules・バックアップを除外）
+sys.path.insert(0, str(Path(__file__).resolve().parent / "scripts"))
+from docs_quality.walker import Walker  # noqa: E402
 
 def update_links_in_file(file_path, link_mappings):
     """ファイル内のリンクを更新"""
@@ -66,7 +71,7 @@ def main():
 
     # すべてのMarkdownファイルを処理
     updated_files = []
-    for md_file in glob.glob('docs/**/*.md', recursive=True):
+    for md_file in (str(entry.path) for entry in Walker('docs').files()):
         if update_links_in_file(md_file, link_mappings):
             updated_files.append(md_file)
 